@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Design Tokens - cross-file index of colors, type, spacing and shadows
+
+Per-file auditors see one component at a time. This module collects the
+design values every file uses (from its style model) into one index:
+
+    colors        literal colors and Tailwind palette utilities, as #rrggbb
+                  where the value is known (bare-HSL custom properties too)
+    font_sizes    font-size declarations and text-* utilities, in px
+    font_weights  numeric weights from declarations and font-* utilities
+    font_families first font of every font-family stack
+    spacings      margin / padding / gap lengths and their utilities, in px
+    shadows       box-shadow values and shadow-* utilities
+
+The index keeps each file's tokens with the sha256 of its content, so it
+can be saved, reloaded and updated one file at a time as files change.
+analyze() aggregates counts and locations, reports palette sprawl and
+clusters near-duplicate colors by CIE76 distance in LAB space (one NumPy
+distance block at a time when NumPy is installed) around the most used
+values.
+
+Usage: from design_tokens import DesignTokenIndex, extract_tokens, analyze
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+import style_model as sm
+
+# ============ CONFIGURATION ============
+INDEX_VERSION = 1
+DEFAULT_INDEX_FILE = Path(".agent-cache") / "design-tokens.json"
+TOKEN_KINDS = ("colors", "font_sizes", "font_weights", "font_families", "spacings", "shadows")
+
+# Distinct values across the project before a kind counts as sprawl
+SPRAWL_LIMITS = {"colors": 24, "font_sizes": 10, "font_weights": 4, "font_families": 3,
+                 "spacings": 16, "shadows": 6}
+NEAR_DUPLICATE_DELTA_E = 3.0    # CIE76; about 2.3 is a just-noticeable difference
+NEAR_DUPLICATE_RATIO = 0.07     # px values closer than 7% (at least 1px) are near-duplicates
+NEAR_DUPLICATE_MIN_PX = 4.0     # hairlines and small gaps differ on purpose
+NUMPY_MIN_COLORS = 64           # fewer colors are faster in pure Python
+DISTANCE_BLOCK = 256            # rows per NumPy distance block (bounds memory at block x N)
+MAX_LOCATIONS = 3               # locations quoted per value in messages
+ROOT_FONT_PX = 16.0
+
+TAILWIND_TEXT_PX = {"xs": 12, "sm": 14, "base": 16, "lg": 18, "xl": 20, "2xl": 24, "3xl": 30,
+                    "4xl": 36, "5xl": 48, "6xl": 60, "7xl": 72, "8xl": 96, "9xl": 128}
+TAILWIND_PALETTE = ("slate", "gray", "zinc", "neutral", "stone", "red", "orange", "amber", "yellow",
+                    "lime", "green", "emerald", "teal", "cyan", "sky", "blue", "indigo", "violet",
+                    "purple", "fuchsia", "pink", "rose")
+COLOR_UTILITY = re.compile(r'(?:bg|text|border(?:-[xytrblse])?|ring|ring-offset|outline|divide|fill|stroke'
+                           r'|from|via|to|accent|caret|decoration|placeholder|shadow)-'
+                           r'((?:%s)-\d{2,3}|black|white)(?:/\d+)?$' % "|".join(TAILWIND_PALETTE))
+NAMED_COLORS = {"black": "#000000", "white": "#ffffff"}
+# Never proposed as the value to merge into: ux_audit flags pure black and white
+EXTREME_COLORS = {"#000000", "#ffffff"}
+SPACING_PROPERTY = re.compile(r'(?:margin|padding)(?:-(?:top|right|bottom|left|inline|block)(?:-start|-end)?)?$'
+                              r'|(?:row-|column-)?gap$')
+SPACING_UTILITY = re.compile(r'-?(?:p[xytrblse]?|m[xytrblse]?|gap(?:-[xy])?|space-[xy])-(.+)$')
+SHADOW_UTILITY = re.compile(r'shadow(?:-(?:sm|md|lg|xl|2xl|inner|\[.+\]))?$')
+LENGTH = re.compile(r'(-?\d*\.?\d+)(px|rem|em)?$')
+BARE_HSL = re.compile(r'(-?\d*\.?\d+)(?:deg)?\s+(\d*\.?\d+)%\s+(\d*\.?\d+)%$')
+COLOR_NUMBER = re.compile(r'-?\d*\.?\d+%?')
+
+
+# ============ COLOR MATH ============
+def _channel(text: str, scale: float) -> float:
+    return float(text[:-1]) * scale / 100 if text.endswith("%") else float(text)
+
+
+def hsl_to_rgb(hue: float, saturation: float, lightness: float) -> Tuple[int, int, int]:
+    """HSL (degrees, 0-1, 0-1) -> 8-bit RGB."""
+    def f(n):
+        k = (n + hue / 30) % 12
+        a = saturation * min(lightness, 1 - lightness)
+        return round(255 * (lightness - a * max(-1, min(k - 3, 9 - k, 1))))
+    return f(0), f(8), f(4)
+
+
+def parse_color(text: str) -> Optional[str]:
+    """Normalize a CSS color to #rrggbb (alpha dropped); None when not a literal color."""
+    text = text.strip().lower()
+    if text in NAMED_COLORS:
+        return NAMED_COLORS[text]
+    if text.startswith("#"):
+        digits = text[1:]
+        if len(digits) in (3, 4):
+            digits = "".join(c * 2 for c in digits[:3])
+        elif len(digits) in (6, 8):
+            digits = digits[:6]
+        else:
+            return None
+        return "#" + digits if all(c in "0123456789abcdef" for c in digits) else None
+    numbers = COLOR_NUMBER.findall(text)
+    if len(numbers) < 3 or "var(" in text:
+        return None
+    try:
+        if text.startswith("rgb"):
+            rgb = [min(255, max(0, round(_channel(n, 255)))) for n in numbers[:3]]
+        elif text.startswith("hsl"):
+            hue = float(numbers[0].rstrip("%"))
+            rgb = hsl_to_rgb(hue % 360, min(1.0, _channel(numbers[1], 1)), min(1.0, _channel(numbers[2], 1)))
+        else:
+            return None
+    except ValueError:
+        return None
+    return "#%02x%02x%02x" % tuple(rgb)
+
+
+def _linear(channel: float) -> float:
+    channel /= 255
+    return channel / 12.92 if channel <= 0.04045 else ((channel + 0.055) / 1.055) ** 2.4
+
+
+def _lab_f(t: float) -> float:
+    return t ** (1 / 3) if t > 216 / 24389 else (24389 / 27 * t + 16) / 116
+
+
+def hex_to_lab(color: str) -> Tuple[float, float, float]:
+    """#rrggbb (sRGB, D65) -> CIE L*a*b*."""
+    r, g, b = (_linear(int(color[i:i + 2], 16)) for i in (1, 3, 5))
+    x = (0.4124564 * r + 0.3575761 * g + 0.1804375 * b) / 0.95047
+    y = 0.2126729 * r + 0.7151522 * g + 0.0721750 * b
+    z = (0.0193339 * r + 0.1191920 * g + 0.9503041 * b) / 1.08883
+    fx, fy, fz = _lab_f(x), _lab_f(y), _lab_f(z)
+    return 116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)
+
+
+def close_color_pairs(colors: List[str], threshold: float = NEAR_DUPLICATE_DELTA_E) -> List[Tuple[int, int, float]]:
+    """
+    (i, j, delta_e) for every pair of colors closer than threshold in LAB
+    space. With NumPy the distance matrix is computed DISTANCE_BLOCK rows at a
+    time, so thousands of colors never need an N x N matrix in memory.
+    """
+    labs = [hex_to_lab(color) for color in colors]
+    pairs = []
+    if NUMPY_AVAILABLE and len(labs) >= NUMPY_MIN_COLORS:
+        points = np.asarray(labs, dtype=np.float64)
+        norms = (points ** 2).sum(axis=1)
+        for start in range(0, len(points), DISTANCE_BLOCK):
+            # |a - b|^2 = |a|^2 + |b|^2 - 2ab, against this block and every later point only
+            block, rest = points[start:start + DISTANCE_BLOCK], points[start:]
+            squared = norms[start:start + DISTANCE_BLOCK, None] + norms[None, start:] - 2 * block @ rest.T
+            rows, cols = np.nonzero(np.triu(squared < threshold ** 2, 1))
+            for row, col, value in zip(rows.tolist(), cols.tolist(), squared[rows, cols].tolist()):
+                pairs.append((start + row, start + col, math.sqrt(max(value, 0.0))))
+        return pairs
+    for i, (l1, a1, b1) in enumerate(labs):
+        for j in range(i + 1, len(labs)):
+            l2, a2, b2 = labs[j]
+            if abs(l1 - l2) < threshold:
+                distance = math.sqrt((l1 - l2) ** 2 + (a1 - a2) ** 2 + (b1 - b2) ** 2)
+                if distance < threshold:
+                    pairs.append((i, j, distance))
+    return pairs
+
+
+def close_length_pairs(lengths: List[float]) -> List[Tuple[int, int, float]]:
+    """(i, j, gap) for px lengths within NEAR_DUPLICATE_RATIO (or 1px) of each other."""
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    pairs = []
+    for position, i in enumerate(order):
+        if lengths[i] < NEAR_DUPLICATE_MIN_PX:
+            continue
+        for j in order[position + 1:]:
+            gap = lengths[j] - lengths[i]
+            if gap > max(1.0, lengths[j] * NEAR_DUPLICATE_RATIO):
+                break
+            pairs.append((min(i, j), max(i, j), gap))
+    return pairs
+
+
+def leader_clusters(counts: List[int], pairs: Iterable[Tuple[int, int, float]]) -> List[List[int]]:
+    """
+    Group values around the most used ones: in order of use, a value joins
+    the first leader it is close to, otherwise it leads a group itself.
+    Unlike connected components this never chains dissimilar values together
+    through intermediate ones. Leader first; single-member groups dropped.
+    """
+    close: Dict[int, set] = {}
+    for i, j, _ in pairs:
+        close.setdefault(i, set()).add(j)
+        close.setdefault(j, set()).add(i)
+    groups: Dict[int, List[int]] = {}
+    for i in sorted(close, key=lambda i: (-counts[i], i)):
+        leader = next((other for other in groups if other in close[i]), None)
+        groups.setdefault(i if leader is None else leader, []).append(i)
+    return [members for members in groups.values() if len(members) > 1]
+
+
+# ============ EXTRACTION ============
+def _px(value: str) -> Optional[float]:
+    match = LENGTH.match(value.strip())
+    if not match:
+        return None
+    number = float(match.group(1))
+    return abs(number) * (ROOT_FONT_PX if match.group(2) in ("rem", "em") else 1)
+
+
+def _px_token(px: float) -> str:
+    return f"{round(px, 2):g}px"
+
+
+def _spacing_utility_px(step: str) -> Optional[float]:
+    """Tailwind spacing step -> px ('4' -> 16, 'px' -> 1, '[18px]' -> 18)."""
+    if step == "px":
+        return 1.0
+    if step.startswith("["):
+        return _px(step[1:-1]) if step.endswith("]") else None
+    try:
+        return float(step) * 4
+    except ValueError:
+        return None
+
+
+def extract_tokens(model: Dict[str, Any]) -> Dict[str, List[list]]:
+    """Design tokens used by one file: {kind: [[value, line], ...]}."""
+    tokens: Dict[str, List[list]] = {kind: [] for kind in TOKEN_KINDS}
+
+    for prop, value, line, context in model["declarations"]:
+        if prop.startswith("--"):
+            bare = BARE_HSL.match(value.strip())
+            color = hsl_to_rgb(float(bare.group(1)) % 360, min(1.0, float(bare.group(2)) / 100),
+                               min(1.0, float(bare.group(3)) / 100)) if bare else None
+            if color:
+                tokens["colors"].append(["#%02x%02x%02x" % color, line])
+        for literal in sm.COLOR_VALUE.findall(value):
+            color = parse_color(literal)
+            if color:
+                tokens["colors"].append([color, line])
+        if prop == "font-family":
+            first = value.split(",")[0].strip().strip("\"'")
+            if first and "var(" not in first:
+                tokens["font_families"].append([first, line])
+        elif prop == "box-shadow" and value.strip() not in ("none", ""):
+            tokens["shadows"].append([" ".join(value.lower().split()), line])
+        elif SPACING_PROPERTY.match(prop):
+            for part in value.replace("!important", "").split():
+                px = _px(part)
+                if px:
+                    tokens["spacings"].append([_px_token(px), line])
+
+    for utility, _, line, _ in model["classes"]:
+        color = COLOR_UTILITY.match(utility)
+        if color:
+            tokens["colors"].append([NAMED_COLORS.get(color.group(1), color.group(1)), line])
+        else:
+            arbitrary = sm.ARBITRARY_VALUE.search(utility)
+            for literal in sm.COLOR_VALUE.findall(arbitrary.group(1).replace("_", " ") if arbitrary else ""):
+                literal = parse_color(literal)
+                if literal:
+                    tokens["colors"].append([literal, line])
+        if utility.startswith("text-") and utility[5:] in TAILWIND_TEXT_PX:
+            tokens["font_sizes"].append([_px_token(TAILWIND_TEXT_PX[utility[5:]]), line])
+        family = sm.arbitrary_value(utility, "font-")
+        if family and not family.isdigit():
+            tokens["font_families"].append([family.split(",")[0].strip().strip("\"'"), line])
+        spacing = SPACING_UTILITY.match(utility)
+        px = _spacing_utility_px(spacing.group(1)) if spacing else None
+        if px:
+            tokens["spacings"].append([_px_token(px), line])
+        if SHADOW_UTILITY.match(utility):
+            tokens["shadows"].append([utility, line])
+
+    for line, size, unit in sm.font_size_entries(model):
+        tokens["font_sizes"].append([_px_token(size * (ROOT_FONT_PX if unit in ("rem", "em") else 1)), line])
+    for line, weight in sm.font_weight_entries(model):
+        tokens["font_weights"].append([str(weight), line])
+
+    for kind in TOKEN_KINDS:
+        tokens[kind].sort(key=lambda token: (token[1], token[0]))
+    return tokens
+
+
+def content_digest(source: str) -> str:
+    return hashlib.sha256(source.encode("utf-8", "replace")).hexdigest()
+
+
+# ============ INDEX ============
+def default_index_path(project_path) -> Path:
+    """<project>/.agent-cache/design-tokens.json"""
+    return Path(project_path) / DEFAULT_INDEX_FILE
+
+
+class DesignTokenIndex:
+    """
+    Design tokens per file ({path: {"digest", "tokens"}}), persisted as one
+    JSON file and updated incrementally: unchanged files keep their entry,
+    changed files replace it, deleted files are pruned.
+    """
+
+    def __init__(self, files: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.files: Dict[str, Dict[str, Any]] = files or {}
+
+    @classmethod
+    def load(cls, path) -> "DesignTokenIndex":
+        """Read a saved index; a missing, corrupt or outdated file gives an empty one."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return cls()
+        return cls(data.get("files", {}))
+
+    def save(self, path):
+        """Write the index atomically (best effort, like the other caches)."""
+        path = Path(path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "files": dict(sorted(self.files.items()))},
+                          f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def is_current(self, path: str, digest: str) -> bool:
+        return self.files.get(path, {}).get("digest") == digest
+
+    def update(self, path: str, digest: str, tokens: Dict[str, List[list]]):
+        self.files[path] = {"digest": digest, "tokens": tokens}
+
+    def remove(self, path: str):
+        self.files.pop(path, None)
+
+    def prune(self, under: str, keep: Iterable[str]):
+        """Drop files below directory under that are not in keep (deleted or renamed)."""
+        prefix = os.path.join(os.path.abspath(under), "")
+        keep = set(keep)
+        for path in [p for p in self.files if p.startswith(prefix) and p not in keep]:
+            del self.files[path]
+
+    def aggregate(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """{kind: {value: {"count", "files", "locations": [[path, line], ...]}}}, values sorted."""
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {kind: {} for kind in TOKEN_KINDS}
+        for path in sorted(self.files):
+            for kind, tokens in self.files[path]["tokens"].items():
+                values = result.setdefault(kind, {})
+                for value, line in tokens:
+                    entry = values.setdefault(value, {"count": 0, "files": 0, "locations": []})
+                    entry["count"] += 1
+                    if not entry["locations"] or entry["locations"][-1][0] != path:
+                        entry["files"] += 1
+                    entry["locations"].append([path, line])
+        return {kind: dict(sorted(values.items())) for kind, values in result.items()}
+
+
+# ============ ANALYSIS ============
+def near_duplicates(values: Dict[str, Dict[str, Any]], kind: str) -> List[List[Tuple[str, int]]]:
+    """
+    Near-duplicate groups for a kind as [(value, count), ...], the value to
+    keep first: colors within NEAR_DUPLICATE_DELTA_E, px lengths within
+    NEAR_DUPLICATE_RATIO. Other kinds have no distance. The value to keep is
+    the most used one, except that pure black or white gives way to the most
+    used other color of its group.
+    """
+    if kind == "colors":
+        names = [value for value in values if value.startswith("#")]
+        pairs = close_color_pairs(names)
+    elif kind in ("font_sizes", "spacings"):
+        names = [value for value in values if value.endswith("px")]
+        pairs = close_length_pairs([float(value[:-2]) for value in names])
+    else:
+        return []
+    counts = [values[name]["count"] for name in names]
+    groups = [[(names[i], counts[i]) for i in members] for members in leader_clusters(counts, pairs)]
+    if kind == "colors":
+        # Stable sort: within each side, the most used first
+        groups = [sorted(group, key=lambda item: item[0] in EXTREME_COLORS) for group in groups]
+    return sorted(groups, key=lambda group: (-sum(count for _, count in group), group[0][0]))
+
+
+def analyze(index: DesignTokenIndex, relpath=None) -> Dict[str, Any]:
+    """
+    Aggregate the index and judge it: per kind the distinct values, the most
+    used ones and near-duplicate clusters, plus (level, category, message)
+    findings for sprawl and near-duplicates.
+    """
+    relpath = relpath or (lambda path: path)
+    aggregate = index.aggregate()
+    summary: Dict[str, Any] = {"files": len(index.files), "kinds": {}}
+    findings = []
+
+    def where(entry):
+        shown = [f"{relpath(path)}:{line}" for path, line in entry["locations"][:MAX_LOCATIONS]]
+        more = len(entry["locations"]) - len(shown)
+        return ", ".join(shown) + (f" +{more} more" if more > 0 else "")
+
+    for kind in TOKEN_KINDS:
+        values = aggregate.get(kind, {})
+        clusters = near_duplicates(values, kind)
+        top = sorted(values.items(), key=lambda item: (-item[1]["count"], item[0]))[:5]
+        summary["kinds"][kind] = {
+            "distinct": len(values),
+            "uses": sum(entry["count"] for entry in values.values()),
+            "top": [{"value": value, "count": entry["count"], "files": entry["files"]} for value, entry in top],
+            "near_duplicates": [[value for value, _ in cluster] for cluster in clusters],
+        }
+        label = kind.replace("_", " ")
+        limit = SPRAWL_LIMITS[kind]
+        if len(values) > limit:
+            findings.append(("warning", "Design Tokens",
+                             f"{'Palette' if kind == 'colors' else label.capitalize()} sprawl: {len(values)} distinct "
+                             f"{label} across {len(index.files)} files (limit {limit}). Consolidate into shared tokens."))
+        for cluster in clusters:
+            keep, _ = cluster[0]
+            others = ", ".join(f"{value} ({count}x, {where(values[value])})" for value, count in cluster[1:])
+            findings.append(("warning", "Design Tokens",
+                             f"Near-duplicate {label}: {others} ~ {keep} ({cluster[0][1]}x). Use {keep}."))
+    summary["findings"] = len(findings)
+    return {"summary": summary, "findings": findings}
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Drizzle Schema - tables, columns, foreign keys and indexes of Drizzle schemas
+
+Parses pgTable / mysqlTable / sqliteTable definitions from the shared token
+stream into plain dicts, keyed by the exported variable name:
+
+    export const auditLogs = pgTable("audit_logs", {
+      accountId: integer("account_id").references(() => accounts.id),
+      ...
+    }, (table) => [index("audit_logs_account_idx").on(table.accountId)]);
+
+    {"auditLogs": {"var": "auditLogs", "name": "audit_logs", "function": "pgTable", "file": ..., "line": 155,
+                   "columns": {"accountId": {"name": "account_id", "type": "integer",
+                               "references": "accounts.id", "primary": False,
+                               "unique": False, "not_null": False, "line": 157}, ...},
+                   "indexes": [{"name": "audit_logs_account_idx", "columns": ["accountId"],
+                                "unique": False, "line": 168}],
+                   "primary_key": ["id"]}}
+
+The third pgTable argument may return an array or an object of index(),
+uniqueIndex(), unique() and primaryKey() builders.
+
+Columns used in .where() / .xxxJoin() calls anywhere in the project are
+collected by scan_filters, so callers can compare them with the indexes.
+
+Usage: from drizzle_schema import load_drizzle_schema, indexed_columns, scan_filters
+"""
+
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from file_pool import walk_files
+from source_tokens import code_tokens, default_cache_dir, literal_text, load_tokens, match_bracket, split_args
+
+# ============ CONFIGURATION ============
+SCHEMA_EXTENSIONS = {".ts", ".js", ".mts", ".mjs"}
+SKIP_DIRS = {"node_modules", ".git", "dist", "build", ".next", "coverage", "__pycache__", ".agent-cache",
+             ".agent"}
+TABLE_FUNCTIONS = {"pgTable", "mysqlTable", "sqliteTable"}
+TABLE_HINT = re.compile(r"\b(?:pgTable|mysqlTable|sqliteTable)\s*\(")
+INDEX_BUILDERS = {"index": False, "uniqueIndex": True, "unique": True}
+FILTER_CALLS = {"where", "leftJoin", "innerJoin", "rightJoin", "fullJoin"}
+FILTER_HINT = re.compile(r"\.\s*(?:where|leftJoin|innerJoin|rightJoin|fullJoin)\s*\(")
+PATTERN_MATCHES = {"ilike", "like", "notIlike", "notLike"}   # '%x%' filters no B-tree index serves
+
+Token = Tuple[str, str, int]
+Table = Dict[str, Any]
+
+
+# ============ PARSING ============
+def _column_refs(tokens: List[Token], start: int, end: int) -> List[str]:
+    """Column properties referenced as table.column (or bare column) in each item of an argument list."""
+    columns = []
+    for item_start, item_end in split_args(tokens, start - 1, end):
+        idents = [t[1] for t in tokens[item_start:item_end] if t[0] == "ident"]
+        if idents:
+            columns.append(idents[-1])
+    return columns
+
+
+def _parse_column(tokens: List[Token], start: int, end: int, prop: str) -> Optional[Dict[str, Any]]:
+    """One column definition: type("sql_name", ...).primaryKey().notNull().references(() => t.id)..."""
+    if tokens[start][0] != "ident" or start + 1 >= end or tokens[start + 1][1] != "(":
+        return None
+    close = match_bracket(tokens, start + 1)
+    name = literal_text(tokens[start + 2]) if start + 2 < close else None
+    column = {"name": name or prop, "type": tokens[start][1], "references": None, "primary": False,
+              "unique": False, "not_null": False, "line": tokens[start][2]}
+    j = close + 1
+    while j + 2 < end and tokens[j][1] == "." and tokens[j + 1][0] == "ident" and tokens[j + 2][1] == "(":
+        method, call_close = tokens[j + 1][1], match_bracket(tokens, j + 2)
+        if method == "primaryKey":
+            column["primary"] = True
+        elif method == "unique":
+            column["unique"] = True
+        elif method == "notNull":
+            column["not_null"] = True
+        elif method == "references":
+            body = tokens[j + 3:call_close]
+            arrow = next((k for k, t in enumerate(body) if t[1] == "=>"), -1)
+            target = [t[1] for t in body[arrow + 1:] if t[0] == "ident"][:2]
+            if len(target) == 2:
+                column["references"] = ".".join(target)
+        j = call_close + 1
+    return column
+
+
+def _parse_constraints(tokens: List[Token], start: int, end: int, table: Table):
+    """index()/uniqueIndex()/unique()/primaryKey() builders in the third pgTable argument."""
+    j = start
+    while j < end - 1:
+        kind, text, line = tokens[j]
+        if kind != "ident" or tokens[j + 1][1] != "(" or (j and tokens[j - 1][1] == "."):
+            j += 1
+            continue
+        close = match_bracket(tokens, j + 1)
+        if text in INDEX_BUILDERS:
+            name = literal_text(tokens[j + 2]) if j + 2 < close else None
+            k = close + 1
+            columns: List[str] = []
+            while k + 2 < end and tokens[k][1] == "." and tokens[k + 2][1] == "(":
+                call_close = match_bracket(tokens, k + 2)
+                if tokens[k + 1][1] == "on":
+                    columns = _column_refs(tokens, k + 3, call_close)
+                k = call_close + 1
+            if columns:
+                table["indexes"].append({"name": name, "columns": columns, "unique": INDEX_BUILDERS[text], "line": line})
+            j = k
+            continue
+        if text == "primaryKey":
+            body = tokens[j + 2:close]
+            if body and body[0][1] == "{":
+                # primaryKey({ columns: [t.a, t.b] })
+                bracket = next((k for k, t in enumerate(body) if t[1] == "["), None)
+                if bracket is not None:
+                    table["primary_key"] = _column_refs(tokens, j + 2 + bracket + 1, j + 2 + match_bracket(body, bracket))
+            else:
+                table["primary_key"] = _column_refs(tokens, j + 2, close)
+        j = close + 1
+
+
+def parse_tables(tokens: List[Token], file: str) -> Dict[str, Table]:
+    """{variable name: table} for every `const x = pgTable("name", {...}, extras)` in a token stream."""
+    tables: Dict[str, Table] = {}
+    n = len(tokens)
+    for i in range(n - 4):
+        if tokens[i][1] not in TABLE_FUNCTIONS or tokens[i + 1][1] != "(" or tokens[i - 1][1] != "=":
+            continue
+        var = tokens[i - 2][1] if i >= 2 and tokens[i - 2][0] == "ident" else None
+        close = match_bracket(tokens, i + 1)
+        args = split_args(tokens, i + 1, close)
+        if len(args) < 2 or not var:
+            continue
+        name = literal_text(tokens[args[0][0]]) or var
+        table: Table = {"var": var, "name": name, "function": tokens[i][1], "file": file, "line": tokens[i][2],
+                        "columns": {}, "indexes": [], "primary_key": []}
+        columns_start, columns_end = args[1]
+        if tokens[columns_start][1] == "{":
+            for start, end in split_args(tokens, columns_start, match_bracket(tokens, columns_start)):
+                if end - start >= 3 and tokens[start + 1][1] == ":":
+                    prop = literal_text(tokens[start]) or tokens[start][1]
+                    column = _parse_column(tokens, start + 2, end, prop)
+                    if column:
+                        table["columns"][prop] = column
+        if len(args) > 2:
+            _parse_constraints(tokens, args[2][0], args[2][1], table)
+        if not table["primary_key"]:
+            table["primary_key"] = [prop for prop, column in table["columns"].items() if column["primary"]]
+        tables[var] = table
+    return tables
+
+
+def find_schema_files(project_path, skip_dirs=SKIP_DIRS) -> List[str]:
+    """Source files that define Drizzle tables, from one walk."""
+    found = []
+    for path in walk_files(str(project_path), SCHEMA_EXTENSIONS, skip_dirs):
+        if path.endswith(".d.ts"):
+            continue
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                if TABLE_HINT.search(f.read()):
+                    found.append(path)
+        except OSError:
+            continue
+    return found
+
+
+def load_drizzle_schema(project_path, cache_dir: Optional[Path] = None,
+                        files: Optional[List[str]] = None) -> Dict[str, Any]:
+    """{"tables": {var: table}, "files": [...]} for every Drizzle schema file of a project."""
+    if cache_dir is None:
+        cache_dir = default_cache_dir(project_path)
+    if files is None:
+        files = find_schema_files(project_path)
+    tables: Dict[str, Table] = {}
+    for path in files:
+        try:
+            tokens = code_tokens(load_tokens(path, cache_dir)[2])
+        except (OSError, ValueError):
+            continue
+        for var, table in parse_tables(tokens, path).items():
+            tables.setdefault(var, table)
+    return {"tables": tables, "files": files}
+
+
+# ============ FILTERS ============
+def filter_refs(tokens: List[Token], start: int, end: int, tables: Dict[str, Table]) -> List[Tuple[str, str]]:
+    """(table var, column property) of every table.column in tokens[start:end], except like/ilike operands."""
+    refs = []
+    for k in range(start, end - 2):
+        var = tokens[k][1]
+        if var in tables and tokens[k + 1][1] == "." and tokens[k + 2][1] in tables[var]["columns"]:
+            if k >= 2 and tokens[k - 1][1] == "(" and tokens[k - 2][1] in PATTERN_MATCHES:
+                continue
+            refs.append((var, tokens[k + 2][1]))
+    return refs
+
+
+def scan_filters(project_path, tables: Dict[str, Table], cache_dir: Optional[Path] = None,
+                 skip_dirs=SKIP_DIRS) -> Dict[Tuple[str, str], List[Tuple[str, int]]]:
+    """{(table var, column property): [(file, line), ...]} of columns in where/join conditions."""
+    if cache_dir is None:
+        cache_dir = default_cache_dir(project_path)
+    schema_files = {table["file"] for table in tables.values()}
+    filters: Dict[Tuple[str, str], List[Tuple[str, int]]] = {}
+    for path in walk_files(str(project_path), SCHEMA_EXTENSIONS, skip_dirs):
+        if path in schema_files or path.endswith(".d.ts"):
+            continue
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                if not FILTER_HINT.search(f.read()):
+                    continue
+            tokens = code_tokens(load_tokens(path, cache_dir)[2])
+        except (OSError, ValueError):
+            continue
+        for i in range(1, len(tokens) - 1):
+            if tokens[i][1] in FILTER_CALLS and tokens[i - 1][1] in (".", "?.") and tokens[i + 1][1] == "(":
+                for key in dict.fromkeys(filter_refs(tokens, i + 2, match_bracket(tokens, i + 1), tables)):
+                    filters.setdefault(key, []).append((path, tokens[i][2]))
+    return filters
+
+
+# ============ INDEX COVERAGE ============
+def indexed_columns(table: Table) -> Dict[str, str]:
+    """
+    {column property: what covers it} for columns that lead a primary key,
+    unique constraint or index, i.e. that a B-tree lookup can use.
+    """
+    covered: Dict[str, str] = {}
+    if table["primary_key"]:
+        covered[table["primary_key"][0]] = "primary key"
+    for prop, column in table["columns"].items():
+        if column["unique"]:
+            covered.setdefault(prop, "unique")
+    for index in table["indexes"]:
+        covered.setdefault(index["columns"][0], index["name"] or ("unique" if index["unique"] else "index"))
+    return covered
+
+
+def table_by_name(tables: Dict[str, Table]) -> Dict[str, Table]:
+    """Tables keyed by SQL name as well as variable name."""
+    lookup = dict(tables)
+    for table in tables.values():
+        lookup.setdefault(table["name"], table)
+    return lookup
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Element Tree - lightweight markup tree for HTML and JSX/TSX sources
+
+One pass over the source builds a tree of plain dicts that markup checkers
+(accessibility, SEO, GEO) can walk instead of regex-scanning the text:
+
+    {"tag": "button", "attrs": {"onclick": "{save}", "disabled": True},
+     "line": 12, "text": "Save", "exprs": 0, "children": [...]}
+
+Attribute names are lowercased; values are strings, "{expression}" strings
+for JSX expressions, or True for bare attributes. "text" is the element's own
+text, "exprs" counts its {expression} children. JSX inside expressions
+(items.map(i => <li/>), cond && <X/>, render={() => <X/>}) becomes children
+of the enclosing element, and fragments are transparent. Trees are cached on
+disk keyed by the sha256 of the file content, like source_tokens.
+
+Usage: from element_tree import load_tree, iter_elements, text_content
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# ============ CONFIGURATION ============
+TREE_VERSION = 1
+DEFAULT_CACHE_DIR = Path(".agent-cache") / "elements"
+JSX_EXTENSIONS = {".jsx", ".tsx", ".js", ".mjs"}
+HTML_EXTENSIONS = {".html", ".htm", ".vue", ".svelte"}
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+             "param", "source", "track", "wbr"}
+RAW_TEXT_TAGS = {"script", "style", "textarea", "title"}
+# HTML elements whose end tag is implied by the start of one of these siblings
+BLOCK_TAGS = {"address", "article", "aside", "blockquote", "div", "dl", "fieldset", "footer", "form", "h1",
+              "h2", "h3", "h4", "h5", "h6", "header", "hr", "main", "nav", "ol", "p", "pre", "section",
+              "table", "ul"}
+IMPLIED_END = {"p": BLOCK_TAGS, "li": {"li"}, "dt": {"dt", "dd"}, "dd": {"dt", "dd"},
+               "option": {"option", "optgroup"}, "tr": {"tr"}, "td": {"td", "th", "tr"},
+               "th": {"td", "th", "tr"}}
+
+TAG_NAME = re.compile(r'[A-Za-z][\w.:-]*')
+ATTR_NAME = re.compile(r'[^\s=/>{}"\'<]+')
+WHITESPACE = re.compile(r'\s*')
+JS_INTEREST = re.compile(r'["\'`/<(){}\[\]]')
+TEMPLATE_INTEREST = re.compile(r'[`\\]|\$\{')
+IDENT_TAIL = re.compile(r'[\w$]+$')
+
+# A '<' or '/' after one of these starts JSX / a regex rather than an operator
+EXPRESSION_START = set("(,=:?&|{}[;!>~+-*%^")
+EXPRESSION_KEYWORDS = {"return", "yield", "default", "case", "else", "do", "in", "of", "await", "typeof", "void"}
+
+Element = Dict[str, Any]
+
+
+# ============ PARSER ============
+def new_element(tag: str, line: int) -> Element:
+    return {"tag": tag, "attrs": {}, "line": line, "text": "", "exprs": 0, "children": []}
+
+
+class _Parser:
+    """Recursive-descent scanner; JSX mode interleaves JS and markup contexts."""
+
+    def __init__(self, source: str, jsx: bool):
+        self.s = source
+        self.n = len(source)
+        self.jsx = jsx
+        self.newlines = [m.start() for m in re.finditer("\n", source)]
+        self.open_tags: List[str] = []
+
+    def line(self, pos: int) -> int:
+        return bisect.bisect_right(self.newlines, pos) + 1
+
+    # -- JS context --
+    def _expression_position(self, pos: int) -> bool:
+        """Whether an expression (JSX, regex) can start at pos, judging by what precedes it."""
+        i = pos - 1
+        s = self.s
+        while i >= 0 and s[i].isspace():
+            i -= 1
+        if i < 0:
+            return True
+        if s[i] in EXPRESSION_START:
+            return True
+        word = IDENT_TAIL.search(s, max(0, i - 12), i + 1)
+        return bool(word) and word.group() in EXPRESSION_KEYWORDS
+
+    def _skip_string(self, pos: int) -> int:
+        quote = self.s[pos]
+        i = pos + 1
+        s = self.s
+        while i < self.n:
+            c = s[i]
+            if c == "\\":
+                i += 2
+                continue
+            if c == quote or c == "\n":
+                return i + 1
+            i += 1
+        return self.n
+
+    def _skip_template(self, pos: int, parent: Element) -> int:
+        i = pos + 1
+        while i < self.n:
+            m = TEMPLATE_INTEREST.search(self.s, i)
+            if not m:
+                return self.n
+            token = m.group()
+            if token == "\\":
+                i = m.end() + 1
+            elif token == "`":
+                return m.end()
+            else:
+                i = self.js(m.end(), parent, "}")
+        return self.n
+
+    def _skip_regex(self, pos: int) -> int:
+        i = pos + 1
+        s = self.s
+        in_class = False
+        while i < self.n:
+            c = s[i]
+            if c == "\\":
+                i += 2
+                continue
+            if c == "\n":
+                return pos + 1     # not a regex after all
+            if c == "[":
+                in_class = True
+            elif c == "]":
+                in_class = False
+            elif c == "/" and not in_class:
+                return i + 1
+            i += 1
+        return pos + 1
+
+    def js(self, pos: int, parent: Element, closer: Optional[str] = None) -> int:
+        """
+        Scan JS from pos up to the unmatched closer ('}' of an expression
+        container) or the end; JSX elements found are appended to parent.
+        Returns the position after the closer.
+        """
+        s = self.s
+        depth = 0
+        while pos < self.n:
+            m = JS_INTEREST.search(s, pos)
+            if not m:
+                return self.n
+            i = m.start()
+            c = s[i]
+            if c in "\"'":
+                pos = self._skip_string(i)
+            elif c == "`":
+                pos = self._skip_template(i, parent)
+            elif c == "/":
+                nxt = s[i + 1:i + 2]
+                if nxt == "/":
+                    end = s.find("\n", i)
+                    pos = self.n if end < 0 else end
+                elif nxt == "*":
+                    end = s.find("*/", i + 2)
+                    pos = self.n if end < 0 else end + 2
+                elif self._expression_position(i):
+                    pos = self._skip_regex(i)
+                else:
+                    pos = i + 1
+            elif c == "<":
+                end = None
+                if self._expression_position(i):
+                    end = self.element(i, parent)
+                pos = i + 1 if end is None else end
+            elif c in "([{":
+                depth += 1
+                pos = i + 1
+            else:  # ) ] }
+                if depth == 0:
+                    if c == closer:
+                        return i + 1
+                else:
+                    depth -= 1
+                pos = i + 1
+        return self.n
+
+    # -- markup --
+    def element(self, pos: int, parent: Element) -> Optional[int]:
+        """Parse the element (or fragment) opening at pos into parent; None if it is not markup."""
+        s = self.s
+        start = pos
+        pos += 1
+        if self.jsx and s.startswith(">", pos):
+            # fragment: its children belong to the parent
+            return self.children(pos + 1, parent, "")
+        m = TAG_NAME.match(s, pos)
+        if not m:
+            return None
+        tag = m.group()
+        html = not self.jsx
+        if html:
+            tag = tag.lower()
+        el = new_element(tag, self.line(start))
+        pos = m.end()
+
+        while True:
+            pos = WHITESPACE.match(s, pos).end()
+            if pos >= self.n:
+                return None
+            c = s[pos]
+            if s.startswith("/>", pos):
+                parent["children"].append(el)
+                return pos + 2
+            if c == ">":
+                pos += 1
+                break
+            if self.jsx and s.startswith("//", pos):
+                end = s.find("\n", pos)
+                pos = self.n if end < 0 else end
+                continue
+            if self.jsx and s.startswith("/*", pos):
+                end = s.find("*/", pos + 2)
+                pos = self.n if end < 0 else end + 2
+                continue
+            if c == "{" and self.jsx:
+                pos = self.js(pos + 1, new_element("#attr", 0), "}")    # {...spread}
+                el["attrs"]["..."] = True
+                continue
+            am = ATTR_NAME.match(s, pos)
+            if not am:
+                return None
+            name = am.group().lower()
+            if self.jsx and name in ("extends", ","):
+                return None     # TS generic, not JSX
+            pos = WHITESPACE.match(s, am.end()).end()
+            value: Any = True
+            if s.startswith("=", pos):
+                pos = WHITESPACE.match(s, pos + 1).end()
+                q = s[pos:pos + 1]
+                if q in ("\"", "'"):
+                    end = s.find(q, pos + 1)
+                    if end < 0:
+                        return None
+                    value = s[pos + 1:end]
+                    pos = end + 1
+                elif q == "{" and self.jsx:
+                    end = self.js(pos + 1, el, "}")     # render props, icon={<X/>}: rendered inside el
+                    value = "{" + s[pos + 1:end - 1].strip() + "}"
+                    pos = end
+                else:
+                    vm = ATTR_NAME.match(s, pos)
+                    if not vm:
+                        return None
+                    value = vm.group()
+                    pos = vm.end()
+            el["attrs"].setdefault(name, value)
+
+        parent["children"].append(el)
+        if html and tag in VOID_TAGS:
+            return pos
+        if html and tag in RAW_TEXT_TAGS:
+            m = re.compile(f"</{tag}", re.I).search(s, pos)
+            end = m.start() if m else self.n
+            el["text"] = s[pos:end].strip()
+            close = s.find(">", end)
+            return self.n if close < 0 else close + 1
+        return self.children(pos, el, tag)
+
+    def children(self, pos: int, el: Element, tag: str) -> int:
+        """Parse children of el up to its closing tag; returns the position after it."""
+        s = self.s
+        text: List[str] = [el["text"]] if el["text"] else []
+        self.open_tags.append(tag)
+        try:
+            while pos < self.n:
+                lt = s.find("<", pos)
+                brace = s.find("{", pos) if self.jsx else -1
+                stop = min(i for i in (lt, brace, self.n) if i >= 0)
+                chunk = s[pos:stop].strip()
+                if chunk:
+                    text.append(" ".join(chunk.split()))
+                if stop >= self.n:
+                    return self.n
+                if stop == brace:
+                    end = self.js(brace + 1, el, "}")
+                    inner = s[brace + 1:end - 1].strip()
+                    if inner and not (inner.startswith("/*") and inner.endswith("*/")):
+                        el["exprs"] += 1
+                    pos = end
+                    continue
+                if s.startswith("</", lt):
+                    m = TAG_NAME.match(s, lt + 2)
+                    name = (m.group() if m else "")
+                    if not self.jsx:
+                        name = name.lower()
+                    close = s.find(">", lt)
+                    after = self.n if close < 0 else close + 1
+                    if name == tag:
+                        return after
+                    if name in self.open_tags:
+                        return lt       # closes an ancestor: this element ends implicitly
+                    pos = after         # stray closing tag
+                    continue
+                if s.startswith("<!--", lt):
+                    end = s.find("-->", lt + 4)
+                    pos = self.n if end < 0 else end + 3
+                    continue
+                if s.startswith("<!", lt) or s.startswith("<?", lt):
+                    end = s.find(">", lt)
+                    pos = self.n if end < 0 else end + 1
+                    continue
+                if not self.jsx and tag in IMPLIED_END:
+                    m = TAG_NAME.match(s, lt + 1)
+                    if m and m.group().lower() in IMPLIED_END[tag]:
+                        return lt
+                end = self.element(lt, el)
+                if end is None:
+                    text.append("<")
+                    pos = lt + 1
+                else:
+                    pos = end
+            return self.n
+        finally:
+            self.open_tags.pop()
+            el["text"] = " ".join(text)
+
+
+def parse_markup(source: str, jsx: bool) -> Element:
+    """Build the element tree of a source; the root is a '#root' element."""
+    parser = _Parser(source, jsx)
+    root = new_element("#root", 1)
+    if jsx:
+        parser.js(0, root)
+    else:
+        pos = 0
+        while pos < parser.n:
+            pos = parser.children(pos, root, "#root")
+    return root
+
+
+def is_jsx_path(path) -> bool:
+    return Path(path).suffix.lower() in JSX_EXTENSIONS
+
+
+# ============ QUERIES ============
+def iter_elements(node: Element, with_ancestors: bool = False) -> Iterator:
+    """
+    Yield every element under node in document order (node itself excluded),
+    or (element, ancestors) pairs when with_ancestors is set.
+    """
+    stack: List[Tuple[Element, Tuple[Element, ...]]] = [(child, (node,)) for child in reversed(node["children"])]
+    while stack:
+        el, ancestors = stack.pop()
+        yield (el, ancestors) if with_ancestors else el
+        if el["children"]:
+            inner = ancestors + (el,)
+            stack.extend((child, inner) for child in reversed(el["children"]))
+
+
+def text_content(el: Element) -> str:
+    """Text of an element and all its descendants."""
+    parts = [el["text"]] if el["text"] else []
+    parts.extend(child["text"] for child in iter_elements(el) if child["text"])
+    return " ".join(parts)
+
+
+# ============ CACHE ============
+def default_cache_dir(project_path) -> Path:
+    """Element tree cache location for a project."""
+    return Path(project_path) / DEFAULT_CACHE_DIR
+
+
+def _cache_file(cache_dir: Path, digest: str) -> Path:
+    return cache_dir / digest[:2] / f"{digest}.json"
+
+
+def load_cached_tree(cache_dir: Optional[Path], digest: str, jsx: bool) -> Optional[Element]:
+    """Return a cached tree for a content digest, or None on a miss."""
+    if cache_dir is None:
+        return None
+    try:
+        with open(_cache_file(Path(cache_dir), digest), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if entry.get("version") != TREE_VERSION or entry.get("jsx") != jsx:
+        return None
+    return entry["tree"]
+
+
+def save_cached_tree(cache_dir: Optional[Path], digest: str, jsx: bool, tree: Element):
+    """Write a tree atomically so parallel workers never see a partial file."""
+    if cache_dir is None:
+        return
+    path = _cache_file(Path(cache_dir), digest)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": TREE_VERSION, "jsx": jsx, "tree": tree}, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError:
+        pass  # caching is best effort
+
+
+def load_tree(filepath, cache_dir: Optional[Path] = None,
+              data: Optional[bytes] = None) -> Tuple[str, str, Element]:
+    """
+    Read (or take) a file's bytes and return (digest, source, tree), going
+    through the cache when cache_dir is given. Raises OSError on read errors.
+    """
+    if data is None:
+        with open(filepath, "rb") as f:
+            data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    source = data.decode("utf-8", errors="replace")
+    jsx = is_jsx_path(filepath)
+    tree = load_cached_tree(cache_dir, digest, jsx)
+    if tree is None:
+        tree = parse_markup(source, jsx)
+        save_cached_tree(cache_dir, digest, jsx, tree)
+    return digest, source, tree
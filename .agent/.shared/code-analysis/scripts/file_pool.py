@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File Pool - process-pool helpers for per-file auditors
+
+Runs an auditor over many files, in worker processes when jobs > 1. Every
+worker audits one file in a fresh auditor and returns that file's findings
+and timing. Results come back in input order, so merging them is
+deterministic whatever the number of workers.
+
+Per-file results can be cached on disk keyed by the sha256 of the file
+content and a fingerprint of the rules that produced them
+(<project>/.agent-cache/<tool>/<digest[:2]>/<digest>.json).
+
+Usage: from file_pool import iter_audits, iter_pool, resolve_jobs, walk_files, slowest
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# ============ CONFIGURATION ============
+CHUNKS_PER_JOB = 4          # smaller chunks balance uneven file sizes across workers
+SLOW_FILE_SECONDS = 0.25    # files slower than this are called out in reports
+
+
+# ============ POOL ============
+def resolve_jobs(jobs: int) -> int:
+    """Translate a --jobs value into a worker count (0 = all cores)."""
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def iter_pool(func: Callable, items: List[Any], jobs: int = 1) -> Iterator[Any]:
+    """
+    Yield func(item) for every item, in order. Uses a process pool when
+    jobs > 1 and falls back to serial work where multiprocessing is broken.
+    """
+    jobs = resolve_jobs(jobs)
+    if jobs <= 1 or len(items) <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    chunk_size = max(1, -(-len(items) // (jobs * CHUNKS_PER_JOB)))
+    done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(items))) as pool:
+            # map() yields in submission order, so merging stays deterministic
+            for result in pool.map(func, items, chunksize=chunk_size):
+                yield result
+                done += 1
+    except (OSError, NotImplementedError, BrokenProcessPool):
+        for item in items[done:]:
+            yield func(item)
+
+
+# ============ AUDITORS ============
+def audit_one(auditor_class: type, filepath: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Audit a single file in a fresh auditor (auditor_class(**options)) and
+    return its findings, timing and any per-file data the auditor exposes as
+    file_data (for cross-file aggregation in the parent).
+    """
+    auditor = auditor_class(**(options or {}))
+    start = time.perf_counter()
+    auditor.audit_file(filepath)
+    return {
+        "file": filepath,
+        "checked": auditor.files_checked,
+        "issues": auditor.issues,
+        "warnings": auditor.warnings,
+        "passed": auditor.passed_count,
+        "seconds": time.perf_counter() - start,
+        "data": getattr(auditor, "file_data", None),
+    }
+
+
+def iter_audits(auditor_class: type, files: List[str], jobs: int = 1,
+                options: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """Per-file audit results for files, in order (see audit_one)."""
+    return iter_pool(partial(audit_one, auditor_class, options=options), files, jobs)
+
+
+# ============ RESULT CACHE ============
+def rules_fingerprint(module_file: str) -> str:
+    """Hash of an auditor's source file: cached results expire when its rules change."""
+    with open(module_file, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def result_key(content: str, fingerprint: str) -> str:
+    return hashlib.sha256(f"{fingerprint}\0{content}".encode("utf-8", "replace")).hexdigest()
+
+
+def default_result_cache_dir(project_path, tool: str) -> Path:
+    """<project>/.agent-cache/<tool>"""
+    return Path(project_path) / ".agent-cache" / tool
+
+
+def _result_file(cache_dir, key: str) -> Path:
+    return Path(cache_dir) / key[:2] / f"{key}.json"
+
+
+def load_result(cache_dir: Optional[str], key: str) -> Optional[Dict[str, Any]]:
+    """A cached per-file result, or None (no cache dir, miss or unreadable entry)."""
+    if cache_dir is None:
+        return None
+    try:
+        with open(_result_file(cache_dir, key), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_result(cache_dir: Optional[str], key: str, result: Dict[str, Any]):
+    """Write a per-file result atomically so parallel workers never see a partial file."""
+    if cache_dir is None:
+        return
+    path = _result_file(cache_dir, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(result, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError:
+        pass  # caching is best effort
+
+
+# ============ HELPERS ============
+def walk_files(directory: str, extensions: Iterable[str], skip_dirs: Iterable[str],
+               filenames: Iterable[str] = ()) -> List[str]:
+    """Files under directory with one of extensions (any case) or one of filenames, in a stable sorted order."""
+    extensions, skip_dirs, filenames = set(extensions), set(skip_dirs), set(filenames)
+    found = []
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if d not in skip_dirs)
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in extensions or name in filenames:
+                found.append(os.path.join(root, name))
+    return found
+
+
+def dedupe(messages: List[str]) -> List[str]:
+    """Drop repeated messages, keeping first-seen order."""
+    return list(dict.fromkeys(messages))
+
+
+def slowest(timings: List[Tuple[float, str]], count: int = 5) -> List[Dict[str, Any]]:
+    """The count slowest files as [{"file", "ms"}], slowest first."""
+    ranked = sorted(timings, key=lambda item: (-item[0], item[1]))[:count]
+    return [{"file": path, "ms": round(seconds * 1000, 1)} for seconds, path in ranked]
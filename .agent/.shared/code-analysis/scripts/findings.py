@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Findings - common findings schema, streaming writers and stream reader
+
+Every checker reports findings as flat dicts with the same keys, so results
+can be merged, exported to SARIF 2.1.0 or streamed as JSON Lines. Writers
+emit each finding as soon as it is reported; orchestrators read the stream
+line by line and can aggregate or stop a checker before it finishes.
+
+JSONL records:  {"type": "finding", "tool", "rule", "severity", "message", ...}
+                {"type": "summary", "tool", "counts", "total", "passed", ...}
+Usage: from findings import make_finding, FindingWriter, add_format_argument
+"""
+
+import json
+import re
+import subprocess
+import sys
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# ============ CONFIGURATION ============
+SEVERITIES = ("critical", "high", "medium", "low", "info")
+SEVERITY_RANK = {severity: rank for rank, severity in enumerate(reversed(SEVERITIES))}
+SARIF_LEVELS = {"critical": "error", "high": "error", "medium": "warning", "low": "note", "info": "note"}
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+OUTPUT_FORMATS = ("text", "jsonl", "sarif")
+
+# "[Category] file: message" strings produced by the auditors
+LEGACY_MESSAGE = re.compile(r'^\[(?P<category>[^\]]+)\]\s+(?:(?P<file>[^:]+):\s+)?(?P<message>.*)$', re.S)
+
+
+# ============ SCHEMA ============
+def slug(text: str) -> str:
+    """'Missing meta description (3)' -> 'missing-meta-description'."""
+    text = re.sub(r'\([^)]*\)|\d+', ' ', text.lower())
+    return re.sub(r'[^a-z]+', '-', text).strip('-') or "finding"
+
+
+def make_finding(tool: str, rule: str, severity: str, message: str,
+                 file: Optional[str] = None, line: Optional[int] = None,
+                 category: Optional[str] = None, fingerprint: Optional[str] = None,
+                 **properties) -> Dict[str, Any]:
+    """Build a finding in the common schema. Unknown severities become 'info'."""
+    finding = {
+        "tool": tool,
+        "rule": rule,
+        "severity": severity if severity in SEVERITY_RANK else "info",
+        "message": message,
+    }
+    if category:
+        finding["category"] = category
+    if file:
+        finding["file"] = str(file).replace("\\", "/")
+    if line:
+        finding["line"] = int(line)
+    if fingerprint:
+        finding["fingerprint"] = fingerprint
+    if properties:
+        finding["properties"] = properties
+    return finding
+
+
+def from_legacy_message(tool: str, text: str, severity: str, file: Optional[str] = None) -> Dict[str, Any]:
+    """Convert a '[Category] filename: message' string into a finding."""
+    match = LEGACY_MESSAGE.match(text)
+    if not match:
+        return make_finding(tool, slug(text), severity, text, file=file)
+    category = match.group("category")
+    return make_finding(tool, f"{slug(category)}/{slug(match.group('message'))[:48].rstrip('-')}", severity,
+                        match.group("message"), file=file or match.group("file"), category=category)
+
+
+def write_legacy(writer: "FindingWriter", tool: str, messages: Iterable[str], severity: str,
+                 file: Optional[str] = None):
+    """Stream '[Category] filename: message' strings through a writer."""
+    for text in messages:
+        writer.write(from_legacy_message(tool, text, severity, file=file))
+
+
+def at_least(severity: str, threshold: Optional[str]) -> bool:
+    """Whether severity is at or above threshold (None never matches)."""
+    if threshold is None:
+        return False
+    return SEVERITY_RANK.get(severity, 0) >= SEVERITY_RANK[threshold]
+
+
+# ============ WRITERS ============
+class FindingWriter:
+    """
+    Stream findings to a file object as JSON Lines or SARIF.
+    SARIF results are written as they arrive; rule metadata, which is only
+    complete at the end, follows the results array in the same run object.
+    """
+
+    def __init__(self, tool: str, fmt: str = "jsonl", stream=None):
+        if fmt not in ("jsonl", "sarif"):
+            raise ValueError(f"Unsupported findings format: {fmt}")
+        self.tool = tool
+        self.format = fmt
+        self.stream = stream or sys.stdout
+        self.counts = {severity: 0 for severity in SEVERITIES}
+        self.rules: Dict[str, Dict[str, Any]] = {}
+        self.closed = False
+        if fmt == "sarif":
+            self.stream.write('{"$schema": "%s", "version": "%s", "runs": [{"results": [\n'
+                              % (SARIF_SCHEMA, SARIF_VERSION))
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def write(self, finding: Dict[str, Any]):
+        """Emit one finding immediately."""
+        self.counts[finding["severity"]] += 1
+        if self.format == "jsonl":
+            self.stream.write(json.dumps({"type": "finding", **finding}) + "\n")
+        else:
+            self.rules.setdefault(finding["rule"], {
+                "id": finding["rule"],
+                "shortDescription": {"text": finding.get("category") or finding["rule"]},
+            })
+            prefix = ",\n" if self.total > 1 else ""
+            self.stream.write(prefix + json.dumps(sarif_result(finding)))
+        self.stream.flush()
+
+    def write_all(self, findings: Iterable[Dict[str, Any]]):
+        for finding in findings:
+            self.write(finding)
+
+    def close(self, passed: Optional[bool] = None, **summary):
+        """Finish the document; JSONL ends with a summary record."""
+        if self.closed:
+            return
+        self.closed = True
+        if self.format == "jsonl":
+            record = {"type": "summary", "tool": self.tool, "counts": self.counts, "total": self.total}
+            if passed is not None:
+                record["passed"] = passed
+            record.update(summary)
+            self.stream.write(json.dumps(record) + "\n")
+        else:
+            driver = {"name": self.tool, "rules": list(self.rules.values())}
+            invocation = {"executionSuccessful": True}
+            if passed is not None or summary:
+                invocation["properties"] = dict(summary, passed=passed)
+            self.stream.write('\n], "tool": %s, "invocations": [%s]}]}\n'
+                              % (json.dumps({"driver": driver}), json.dumps(invocation)))
+        self.stream.flush()
+
+
+def sarif_result(finding: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a common-schema finding to a SARIF result object."""
+    result = {
+        "ruleId": finding["rule"],
+        "level": SARIF_LEVELS[finding["severity"]],
+        "message": {"text": finding["message"]},
+        "properties": {"severity": finding["severity"], "tool": finding["tool"]},
+    }
+    if finding.get("category"):
+        result["properties"]["category"] = finding["category"]
+    if finding.get("file"):
+        location = {"artifactLocation": {"uri": finding["file"]}}
+        if finding.get("line"):
+            location["region"] = {"startLine": finding["line"]}
+        result["locations"] = [{"physicalLocation": location}]
+    if finding.get("fingerprint"):
+        result["partialFingerprints"] = {"contentHash/v1": finding["fingerprint"]}
+    return result
+
+
+def add_format_argument(parser):
+    """Add the shared --format option to an argparse parser."""
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="text",
+                        help="text report, or stream findings as JSON Lines / SARIF 2.1.0")
+
+
+def open_writer(tool: str, fmt: str) -> Optional[FindingWriter]:
+    """Return a stdout writer for jsonl/sarif, or None for the text report."""
+    return FindingWriter(tool, fmt) if fmt in ("jsonl", "sarif") else None
+
+
+# ============ READER (ORCHESTRATORS) ============
+def run_streaming(cmd: List[str], on_finding: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                  timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Run a checker that writes JSONL to stdout and hand each finding to
+    on_finding as it arrives. If on_finding returns True the checker is
+    terminated at once (fail fast). Non-JSON lines are kept as output.
+    Returns returncode, counts, summary, stopped, timed_out, output and error.
+    """
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            text=True, encoding="utf-8", errors="replace")
+    stderr_chunks: List[str] = []
+    drain = threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True)
+    drain.start()
+    timed_out = threading.Event()
+
+    def expire():
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, expire) if timeout else None
+    if timer:
+        timer.start()
+
+    counts = {severity: 0 for severity in SEVERITIES}
+    summary, stopped, output = None, False, []
+    try:
+        for line in proc.stdout:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                output.append(line)
+                continue
+            if not isinstance(record, dict):
+                output.append(line)
+            elif record.get("type") == "finding":
+                counts[record.get("severity", "info")] = counts.get(record.get("severity", "info"), 0) + 1
+                if on_finding and on_finding(record):
+                    stopped = True
+                    proc.terminate()
+                    break
+            elif record.get("type") == "summary":
+                summary = record
+            else:
+                output.append(line)
+    finally:
+        proc.stdout.close()
+        returncode = proc.wait()
+        if timer:
+            timer.cancel()
+        drain.join(timeout=5)
+
+    return {
+        "returncode": returncode,
+        "counts": counts,
+        "summary": summary,
+        "stopped": stopped,
+        "timed_out": timed_out.is_set(),
+        "output": "".join(output),
+        "error": "".join(stderr_chunks),
+    }
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Page DOM - streaming parse of served HTML for the SEO and GEO rule sets
+
+Source checkers see TSX, where titles and meta tags are often set at
+runtime. This module parses the HTML a server (or a static build) actually
+returns, chunk by chunk as it arrives, into a compact page summary: title,
+meta tags, headings, images, JSON-LD blocks, structural counts, visible
+text and links. The SEO and GEO rules then run over that one summary.
+
+Also holds the site-level duplicate pass shared with seo_checker.
+
+Usage: from page_dom import PageParser, parse_html, seo_issues, geo_signals
+"""
+
+import json
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, List, Optional
+
+# ============ CONFIGURATION ============
+MAX_TEXT_CHARS = 200_000    # visible text kept per page for the GEO text signals
+MAX_HEADING_CHARS = 300
+
+SKIP_TEXT_TAGS = {"script", "style", "noscript", "template", "svg"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+             "param", "source", "track", "wbr"}
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+COUNTED_TAGS = {"ul", "ol", "table", "details", "dfn", "article", "time"}
+
+# Site-level duplicates: signal -> (label, severity)
+SITE_SIGNALS = {
+    "title": ("<title>", "medium"),
+    "description": ("meta description", "medium"),
+    "h1": ("H1", "low"),
+}
+
+# Findings severity per SEO issue (anything else is medium)
+SEO_SEVERITY = {
+    "Missing <title> tag": "high",
+    "Missing meta description": "high",
+}
+
+AUTHOR_META = {"author", "article:author"}
+DATE_META = {"article:published_time", "article:modified_time", "date", "pubdate"}
+ENTITY_TYPES = {"Organization", "LocalBusiness", "Brand", "Person"}
+STAT_PATTERNS = re.compile(r'(?P<percent>\d+%)|(?P<money>\$[\d,]+)|(?P<study>study\s+(?:shows|found))'
+                           r'|(?P<according>according to)|(?P<data>data\s+(?:shows|reveals))'
+                           r'|(?P<multiple>\d+x\s+(?:faster|better|more))|(?P<large>million|billion|trillion)', re.I)
+DIRECT_ANSWER = re.compile(r'is defined as|refers to|means that|the answer is|in short,|simply put,', re.I)
+FAQ_TEXT = re.compile(r'\bfaq\b|frequently.?asked', re.I)
+
+
+# ============ PARSER ============
+class PageParser(HTMLParser):
+    """
+    Incremental HTML parser: feed() chunks as they arrive, then close() and
+    read .page. Only the summary is kept, never the document tree.
+    """
+
+    def __init__(self, url: str = ""):
+        super().__init__(convert_charrefs=True)
+        self.page: Dict[str, Any] = {
+            "url": url, "lang": None, "title": None, "meta": {}, "canonical": None,
+            "headings": {tag: [] for tag in sorted(HEADING_TAGS)}, "counts": {tag: 0 for tag in sorted(COUNTED_TAGS)},
+            "images": 0, "images_missing_alt": 0, "images_empty_alt": 0,
+            "json_ld": [], "rel_author": False, "itemtypes": [], "links": [], "text": "",
+        }
+        self._text: List[str] = []
+        self._text_len = 0
+        self._skip_depth = 0
+        self._capture: Optional[str] = None     # 'title', 'json_ld' or a heading tag
+        self._captured: List[str] = []
+
+    # -- tags --
+    def handle_starttag(self, tag, attrs):
+        attributes = {name: (value or "") for name, value in attrs}
+        page = self.page
+        if tag == "html" and page["lang"] is None:
+            page["lang"] = attributes.get("lang") or None
+        elif tag == "meta":
+            key = (attributes.get("name") or attributes.get("property") or "").lower()
+            if key and key not in page["meta"]:
+                page["meta"][key] = attributes.get("content", "")
+        elif tag == "link":
+            rel = attributes.get("rel", "").lower().split()
+            if "canonical" in rel and page["canonical"] is None:
+                page["canonical"] = attributes.get("href")
+            if "author" in rel:
+                page["rel_author"] = True
+        elif tag == "img":
+            page["images"] += 1
+            if "alt" not in attributes:
+                page["images_missing_alt"] += 1
+            elif not attributes["alt"].strip():
+                page["images_empty_alt"] += 1
+        elif tag == "a":
+            if "author" in attributes.get("rel", "").lower().split():
+                page["rel_author"] = True
+            if attributes.get("href"):
+                page["links"].append(attributes["href"])
+        if tag in COUNTED_TAGS:
+            page["counts"][tag] += 1
+        if attributes.get("itemtype"):
+            page["itemtypes"].append(attributes["itemtype"])
+        if tag in VOID_TAGS:
+            return
+
+        if tag == "script" and attributes.get("type", "").lower() == "application/ld+json":
+            self._start_capture("json_ld")
+        elif tag == "title" and page["title"] is None and not self._skip_depth:    # not an <svg> title
+            self._start_capture("title")
+        elif tag in HEADING_TAGS and self._capture is None:
+            self._start_capture(tag)
+        if tag in SKIP_TEXT_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TEXT_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        capture = self._capture
+        if capture is None:
+            return
+        if tag == capture or (capture == "json_ld" and tag == "script"):
+            data = "".join(self._captured)
+            if capture == "json_ld":
+                self.page["json_ld"].append(data)
+            elif capture == "title":
+                self.page["title"] = " ".join(data.split())
+            else:
+                self.page["headings"][capture].append(" ".join(data.split())[:MAX_HEADING_CHARS])
+            self._capture = None
+
+    def handle_data(self, data):
+        if self._capture is not None:
+            self._captured.append(data)
+        if self._skip_depth or self._text_len >= MAX_TEXT_CHARS:
+            return
+        self._text.append(data)
+        self._text_len += len(data)
+
+    def _start_capture(self, what: str):
+        self._capture = what
+        self._captured = []
+
+    def close(self):
+        super().close()
+        if self._capture in HEADING_TAGS:
+            self.handle_endtag(self._capture)
+        self.page["text"] = " ".join(" ".join(self._text).split())[:MAX_TEXT_CHARS]
+
+
+def parse_html(chunks: Iterable[str], url: str = "") -> Dict[str, Any]:
+    """Parse HTML given as an iterable of text chunks into a page summary."""
+    parser = PageParser(url)
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+    return parser.page
+
+
+def parse_json_ld(block: str) -> Optional[List[str]]:
+    """'@type' values of one JSON-LD block (including @graph members), or None if it is not valid JSON."""
+    try:
+        data = json.loads(block)
+    except ValueError:
+        return None
+    types: List[str] = []
+
+    def walk(node):
+        if isinstance(node, list):
+            for item in node:
+                walk(item)
+        elif isinstance(node, dict):
+            value = node.get("@type")
+            types.extend([value] if isinstance(value, str) else [v for v in value or [] if isinstance(v, str)])
+            walk(node.get("@graph"))
+            for key in ("mainEntity", "author", "publisher"):
+                walk(node.get(key))
+
+    walk(data)
+    return types
+
+
+def json_ld_types(page: Dict[str, Any]) -> List[str]:
+    """'@type' values of every JSON-LD block of a page that parses."""
+    return [t for block in page["json_ld"] for t in (parse_json_ld(block) or [])]
+
+
+# ============ SEO RULES ============
+def seo_issues(page: Dict[str, Any]) -> List[str]:
+    """SEO issues of a served page, worded like seo_checker's source checks."""
+    issues = []
+    meta = page["meta"]
+    if not page["title"]:
+        issues.append("Missing <title> tag")
+    if not meta.get("description", "").strip():
+        issues.append("Missing meta description")
+    if not any(key.startswith("og:") for key in meta):
+        issues.append("Missing Open Graph tags")
+    h1_count = len(page["headings"]["h1"])
+    if h1_count > 1:
+        issues.append(f"Multiple H1 tags ({h1_count})")
+    if page["images_missing_alt"]:
+        issues.append("Image missing alt attribute")
+    elif page["images_empty_alt"]:
+        issues.append("Image has empty alt attribute")
+    if not page["canonical"]:
+        issues.append("Missing canonical link")
+    if not page["lang"]:
+        issues.append("Missing <html lang> attribute")
+    return issues
+
+
+def seo_severity(issue: str) -> str:
+    if issue in ("Missing canonical link", "Missing <html lang> attribute"):
+        return "low"
+    return SEO_SEVERITY.get(issue, "medium")
+
+
+# ============ GEO RULES ============
+def has_statistics(text: str, needed: int = 2) -> bool:
+    """Whether text has at least `needed` kinds of statistic, stopping at the first that do."""
+    kinds = set()
+    for match in STAT_PATTERNS.finditer(text):
+        kinds.add(match.lastgroup)
+        if len(kinds) >= needed:
+            return True
+    return False
+
+
+def geo_signals(page: Dict[str, Any]) -> Dict[str, Any]:
+    """GEO passed/issues/score for a served page, worded like geo_checker's source checks."""
+    passed, issues = [], []
+    types = set(json_ld_types(page))
+    text = page["text"]
+    meta = page["meta"]
+
+    if page["json_ld"]:
+        passed.append("JSON-LD structured data found")
+        if types & {"Article", "BlogPosting", "NewsArticle"}:
+            passed.append("Article schema present")
+        if "FAQPage" in types:
+            passed.append("FAQ schema present")
+        if types & ENTITY_TYPES:
+            passed.append("Entity schema present")
+    else:
+        issues.append("No JSON-LD structured data (AI engines prefer structured content)")
+
+    h1_count = len(page["headings"]["h1"])
+    h2_count = len(page["headings"]["h2"])
+    if h1_count == 1:
+        passed.append("Single H1 heading (clear topic)")
+    elif h1_count == 0:
+        issues.append("No H1 heading - page topic unclear")
+    else:
+        issues.append(f"Multiple H1 headings ({h1_count}) - confusing for AI")
+    if h2_count >= 2:
+        passed.append(f"{h2_count} H2 subheadings (good structure)")
+    else:
+        issues.append("Add more H2 subheadings for scannable content")
+
+    if page["rel_author"] or AUTHOR_META & set(meta) or types & {"Person"}:
+        passed.append("Author attribution found")
+    else:
+        issues.append("No author info (AI prefers attributed content)")
+
+    if page["counts"]["time"] or DATE_META & set(meta) or any('"datePublished"' in b or '"dateModified"' in b
+                                                                for b in page["json_ld"]):
+        passed.append("Publication date found")
+    else:
+        issues.append("No publication date (freshness matters for AI)")
+
+    if page["counts"]["details"] or "FAQPage" in types or FAQ_TEXT.search(text):
+        passed.append("FAQ section detected (highly citable)")
+    lists = page["counts"]["ul"] + page["counts"]["ol"]
+    if lists >= 2:
+        passed.append(f"{lists} lists (structured content)")
+    if page["counts"]["table"]:
+        passed.append(f"{page['counts']['table']} table(s) (comparison data)")
+    if types & ENTITY_TYPES or page["rel_author"] or any(re.search(r'schema\.org/(Organization|Person|Brand)', t)
+                                                           for t in page["itemtypes"]):
+        passed.append("Entity/Brand recognition (E-E-A-T)")
+    if has_statistics(text):
+        passed.append("Original statistics/data (citation magnet)")
+    if page["counts"]["dfn"] or DIRECT_ANSWER.search(text):
+        passed.append("Direct answer patterns (LLM-friendly)")
+
+    total = len(passed) + len(issues)
+    return {"passed": passed, "issues": issues, "score": round(len(passed) / total * 100) if total else 0}
+
+
+# ============ SITE AGGREGATION ============
+def normalize_text(text: str) -> str:
+    """Collapse whitespace and case so near-identical strings compare equal."""
+    return " ".join(text.split()).lower()
+
+
+def page_site_signals(page: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Title, meta description and H1 texts of a served page, for site_duplicates()."""
+    signals = {"title": [page["title"] or ""], "description": [page["meta"].get("description", "")],
+               "h1": page["headings"]["h1"]}
+    return {key: sorted({normalize_text(v) for v in values if v.strip()}) for key, values in signals.items()}
+
+
+def site_duplicates(results: Iterable[dict]) -> List[dict]:
+    """
+    Group pages sharing a title, meta description or H1 text. Each result has
+    'file' and 'site' ({signal: [normalized texts]}); one dict pass per signal,
+    so thousands of pages cost no more than reading them.
+    """
+    seen: Dict[str, Dict[str, List[str]]] = {key: {} for key in SITE_SIGNALS}
+    for result in results:
+        for key, values in result.get("site", {}).items():
+            for value in values:
+                seen[key].setdefault(value, []).append(result["file"])
+    duplicates = []
+    for key, by_text in seen.items():
+        for text, files in by_text.items():
+            if len(files) > 1:
+                duplicates.append({"signal": key, "text": text, "files": files})
+    duplicates.sort(key=lambda d: (list(SITE_SIGNALS).index(d["signal"]), -len(d["files"]), d["text"]))
+    return duplicates
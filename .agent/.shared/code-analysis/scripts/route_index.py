@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Route Index - Express route registrations and the shared API contract
+
+Builds one entry per endpoint from the shared token stream instead of
+regex-scanning whole route files:
+
+    app.get(api.accounts.get.path, requireAuth(), async (req, res) => {...})
+    router.post("/api/accounts/:id/branding", upload.single("file"), handler)
+
+    {"method": "GET", "path": "/api/accounts/:id", "file": ..., "line": 315,
+     "contract": "api.accounts.get", "middleware": ["requireAuth"],
+     "handler_name": None, "handler": [tokens of the handler]}
+
+Paths written as api.<group>.<name>.path are resolved through the contract:
+top-level objects (shared/routes.ts) whose entries carry a method and a path,
+with their input schema and response status codes. Named handlers
+(smtpRoutes.handleConfigureSMTP) are looked up among the functions declared
+next to the route files.
+
+Usage: from route_index import build_route_index, index_functions
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from file_pool import walk_files
+from source_tokens import (code_tokens, default_cache_dir, dotted_name, literal_text, load_tokens, match_bracket,
+                           split_args)
+
+# ============ CONFIGURATION ============
+ROUTE_EXTENSIONS = {".ts", ".js", ".mts", ".mjs", ".cts", ".cjs"}
+SKIP_DIRS = {"node_modules", ".git", "dist", "build", ".next", "coverage", "__pycache__", ".agent-cache",
+             ".agent"}
+TEST_FILE = re.compile(r"\.(?:test|spec)\.[cm]?[jt]s$")
+
+HTTP_METHODS = {"get", "post", "put", "patch", "delete", "all", "head", "options"}
+ROUTER_RECEIVER = re.compile(r"^(?:app|router|server|routes|\w*Router|\w*App)$")
+REGISTRATION_HINT = re.compile(r"\b(?:app|router|server|routes|\w*Router|\w*App)\s*\.\s*"
+                               r"(?:get|post|put|patch|delete|all|head|options)\s*\(")
+# A contract file declares entries with both a method and a route path
+CONTRACT_HINTS = (re.compile(r"\bmethod\s*:\s*['\"](?:GET|POST|PUT|PATCH|DELETE)['\"]"),
+                  re.compile(r"\bpath\s*:\s*['\"`]/"))
+
+Token = Tuple[str, str, int]
+Route = Dict[str, Any]
+
+
+# ============ ROUTE HELPERS ============
+def callee_name(tokens: List[Token], start: int, end: int) -> str:
+    """Name of a middleware argument: 'requireAuth' for requireAuth(), 'upload.single' for upload.single(...)."""
+    j = start
+    while j + 2 < end and tokens[j][0] == "ident" and tokens[j + 1][1] in (".", "?.") and tokens[j + 2][0] == "ident":
+        j += 2
+    if tokens[j][0] == "ident" and (j + 1 == end or tokens[j + 1][1] == "("):
+        if tokens[start][1] not in ("async", "function"):
+            return dotted_name(tokens, start, j + 1) or tokens[j][1]
+    return "<inline>"
+
+
+def index_functions(tokens: List[Token]) -> Dict[str, Tuple[int, int]]:
+    """{name: (start, end)} of `function name(...) {...}` and `const name = (...) => {...}` declarations."""
+    functions = {}
+    n = len(tokens)
+    for i in range(n - 2):
+        kind, text, _ = tokens[i]
+        if kind != "ident":
+            continue
+        if text == "function" and tokens[i + 1][0] == "ident":
+            j = i + 2
+        elif text in ("const", "let", "var") and tokens[i + 1][0] == "ident" and tokens[i + 2][1] == "=":
+            j = i + 3
+            if j < n and tokens[j][1] == "async":
+                j += 1
+            if j < n and tokens[j][1] == "function":
+                j += 1
+        else:
+            continue
+        while j < n and tokens[j][1] not in ("(", "{", ";", "="):
+            j += 1
+        if j >= n or tokens[j][1] != "(":
+            continue
+        j = match_bracket(tokens, j) + 1
+        while j < n and tokens[j][1] not in ("{", ";"):
+            j += 1
+        if j < n and tokens[j][1] == "{":
+            functions.setdefault(tokens[i + 1][1], (i, match_bracket(tokens, j) + 1))
+    return functions
+
+
+# ============ CONTRACT ============
+def parse_object(tokens: List[Token], i: int) -> Tuple[Dict[str, Any], int]:
+    """The object literal opening at i as {key: nested dict | (start, end) value range}, and its close index."""
+    close = match_bracket(tokens, i)
+    obj: Dict[str, Any] = {}
+    for start, end in split_args(tokens, i, close):
+        if end - start < 3 or tokens[start + 1][1] != ":" or tokens[start][0] not in ("ident", "string", "number"):
+            continue
+        key = literal_text(tokens[start]) or tokens[start][1]
+        value = start + 2
+        if tokens[value][1] == "{" and match_bracket(tokens, value) == end - 1:
+            obj[key] = parse_object(tokens, value)[0]
+        else:
+            obj[key] = (value, end)
+    return obj, close
+
+
+def _contract_entries(obj: Dict[str, Any], prefix: str, tokens: List[Token], file: str,
+                      contract: Dict[str, Dict[str, Any]]):
+    method, path = obj.get("method"), obj.get("path")
+    if isinstance(method, tuple) and isinstance(path, tuple):
+        method_text, path_text = literal_text(tokens[method[0]]), literal_text(tokens[path[0]])
+        if method_text and path_text is not None:
+            responses = obj.get("responses") if isinstance(obj.get("responses"), dict) else {}
+            ok = responses.get("200") or responses.get("201")
+            contract[prefix] = {
+                "name": prefix, "method": method_text.upper(), "path": path_text, "file": file,
+                "line": tokens[method[0]][2], "input": "input" in obj,
+                "list": isinstance(ok, tuple) and [t[1] for t in tokens[ok[0]:ok[0] + 3]] == ["z", ".", "array"],
+                "statuses": sorted(int(code) for code in responses if code.isdigit()),
+            }
+            return
+    for key, value in obj.items():
+        if isinstance(value, dict):
+            _contract_entries(value, f"{prefix}.{key}", tokens, file, contract)
+
+
+def parse_contract(tokens: List[Token], file: str) -> Dict[str, Dict[str, Any]]:
+    """{'api.accounts.create': {...}} for every method+path entry of the file's top-level const objects."""
+    contract: Dict[str, Dict[str, Any]] = {}
+    i = 0
+    while i < len(tokens) - 3:
+        if (tokens[i][1] == "const" and tokens[i + 1][0] == "ident" and tokens[i + 2][1] == "="
+                and tokens[i + 3][1] == "{"):
+            obj, close = parse_object(tokens, i + 3)
+            _contract_entries(obj, tokens[i + 1][1], tokens, file, contract)
+            i = close
+        i += 1
+    return contract
+
+
+# ============ REGISTRATIONS ============
+def parse_registrations(tokens: List[Token], file: str) -> List[Route]:
+    """Every <router>.<method>(path, ...middleware, handler) call, in source order."""
+    routes = []
+    for i in range(len(tokens) - 3):
+        kind, text, line = tokens[i]
+        if (kind != "ident" or not ROUTER_RECEIVER.match(text) or tokens[i + 1][1] != "."
+                or tokens[i + 2][1] not in HTTP_METHODS or tokens[i + 3][1] != "("
+                or (i and tokens[i - 1][1] in (".", "?."))):
+            continue
+        close = match_bracket(tokens, i + 3)
+        args = split_args(tokens, i + 3, close)
+        if len(args) < 2:
+            continue
+        path_start, path_end = args[0]
+        path = literal_text(tokens[path_start]) if path_end - path_start == 1 else None
+        path_ref = None if path is not None else dotted_name(tokens, path_start, path_end)
+        if path is None and path_ref is None:
+            continue
+        handler_start, handler_end = args[-1]
+        handler_name = dotted_name(tokens, handler_start, handler_end)
+        routes.append({
+            "method": tokens[i + 2][1].upper(), "path": path, "path_ref": path_ref, "file": file, "line": line,
+            "contract": None,
+            "middleware": [callee_name(tokens, start, end) for start, end in args[1:-1]],
+            "handler_name": handler_name,
+            "handler": None if handler_name else tokens[handler_start:handler_end],
+        })
+    return routes
+
+
+def _read_tokens(path: str, cache_dir: Optional[Path]) -> Optional[List[Token]]:
+    try:
+        return code_tokens(load_tokens(path, cache_dir)[2])
+    except (OSError, ValueError):
+        return None
+
+
+def find_route_files(project_path, skip_dirs=SKIP_DIRS) -> Tuple[List[str], List[str], List[str]]:
+    """(registration files, contract files, all other server-side candidates) from one walk."""
+    registrations, contracts, others = [], [], []
+    for path in walk_files(str(project_path), ROUTE_EXTENSIONS, skip_dirs):
+        if path.endswith(".d.ts") or TEST_FILE.search(path):
+            continue
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                text = f.read()
+        except OSError:
+            continue
+        if REGISTRATION_HINT.search(text):
+            registrations.append(path)
+        elif all(hint.search(text) for hint in CONTRACT_HINTS):
+            contracts.append(path)
+        else:
+            others.append(path)
+    return registrations, contracts, others
+
+
+def build_route_index(project_path, cache_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Route index of a project: {"routes": [...], "contract": {...}, "files": [...]},
+    files being the route, contract and named-handler files it read.
+    Contract paths are resolved, and named handlers are looked up in files
+    under the directories of the route files.
+    """
+    project_path = Path(project_path)
+    if cache_dir is None:
+        cache_dir = default_cache_dir(project_path)
+    registration_files, contract_files, others = find_route_files(project_path)
+
+    contract: Dict[str, Dict[str, Any]] = {}
+    for path in contract_files:
+        tokens = _read_tokens(path, cache_dir)
+        if tokens:
+            contract.update(parse_contract(tokens, path))
+
+    routes: List[Route] = []
+    functions: Dict[str, Tuple[str, List[Token]]] = {}
+    for path in registration_files:
+        tokens = _read_tokens(path, cache_dir)
+        if not tokens:
+            continue
+        routes.extend(parse_registrations(tokens, path))
+        for name, (start, end) in index_functions(tokens).items():
+            functions.setdefault(name, (path, tokens[start:end]))
+
+    # Named handlers: search the route files' directories for the declarations
+    wanted = {r["handler_name"].rsplit(".", 1)[-1] for r in routes if r["handler_name"]} - set(functions)
+    route_dirs = {os.path.dirname(path) for path in registration_files}
+    for path in others + contract_files:
+        if not wanted:
+            break
+        if not any(path.startswith(d + os.sep) for d in route_dirs):
+            continue
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                text = f.read()
+        except OSError:
+            continue
+        if not any(name in text for name in wanted):
+            continue
+        tokens = _read_tokens(path, cache_dir) or []
+        for name, (start, end) in index_functions(tokens).items():
+            if name in wanted:
+                functions[name] = (path, tokens[start:end])
+                wanted.discard(name)
+
+    by_endpoint = {(entry["method"], entry["path"]): name for name, entry in contract.items()}
+    for route in routes:
+        if route["path_ref"] is None:
+            route["contract"] = by_endpoint.get((route["method"], route["path"]))
+        else:
+            entry = contract.get(route["path_ref"].rsplit(".", 1)[0])
+            if entry:
+                route["contract"] = entry["name"]
+                route["path"] = entry["path"]
+            else:
+                route["path"] = route["path_ref"]
+        if route["handler_name"]:
+            found = functions.get(route["handler_name"].rsplit(".", 1)[-1])
+            if found:
+                route["handler_file"], route["handler"] = found
+    used = {entry["file"] for entry in contract.values()} | {r["handler_file"] for r in routes if "handler_file" in r}
+    return {"routes": routes, "contract": contract, "files": registration_files + sorted(used - set(registration_files))}
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rule Engine - declarative, precompiled content rules for the auditors
+
+Auditors declare what they look for as data instead of inline re calls:
+
+    FEATURES = {"has_form": ("any", r'<form|<input|password', re.I),
+                "nav_items": ("count", r'<Link|<a\\s+href', re.I)}
+    RULES = [("warning", "Trust", "Form without labels", lambda f: f["has_form"] and not f["labels"]),
+             check_headings]   # analyzers: callable(content, features) -> [(level, category, message)]
+
+Every pattern is compiled once at import. Per file, a feature is computed
+the first time a rule asks for it and then shared by every other rule.
+Alternatives that are plain words ('hero|<h1|banner') are answered by
+substring checks against one lowered copy of the file; only the remaining
+alternatives go through the regex engine.
+
+Feature kinds: any (bool), count (number of matches), all (re.findall list),
+derived (callable of the other features).
+Usage: from rule_engine import compile_features, run_rules
+"""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# ============ CONFIGURATION ============
+FEATURE_KINDS = ("any", "count", "all", "derived")
+RULE_LEVELS = ("issue", "warning", "passed")
+
+# A literal alternative: no unescaped regex metacharacters
+LITERAL_ALTERNATIVE = re.compile(r'(?:[^\\.^$*+?{}\[\]()|]|\\[^\w\s])+')
+
+Finding = Tuple[str, Optional[str], Optional[str]]
+
+
+# ============ PATTERN ANALYSIS ============
+def split_alternatives(pattern: str) -> List[str]:
+    """Split a pattern on its top-level '|' (not inside groups or classes)."""
+    parts, start, depth, in_class = [], 0, 0, False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            if char == "]":
+                in_class = False
+        elif char == "[":
+            in_class = True
+            # ']' right after '[' or '[^' is a literal member
+            if pattern.startswith("^", i + 1):
+                i += 1
+            if pattern.startswith("]", i + 1):
+                i += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            parts.append(pattern[start:i])
+            start = i + 1
+        i += 1
+    parts.append(pattern[start:])
+    return parts
+
+
+def as_literal(alternative: str) -> Optional[str]:
+    """Return the plain text an alternative matches, or None if it is a real regex."""
+    if not LITERAL_ALTERNATIVE.fullmatch(alternative):
+        return None
+    return re.sub(r'\\(.)', r'\1', alternative)
+
+
+# ============ COMPILER ============
+def _compile_any(pattern: str, flags: int) -> Callable[["FileFeatures"], bool]:
+    ignore_case = bool(flags & re.IGNORECASE)
+    literals, residual = [], []
+    for alternative in split_alternatives(pattern):
+        literal = as_literal(alternative)
+        if literal is None:
+            residual.append(alternative)
+        else:
+            literals.append(literal.lower() if ignore_case else literal)
+    regex = re.compile("|".join(residual), flags) if residual else None
+
+    def evaluate(f: "FileFeatures") -> bool:
+        text = f.lowered if ignore_case else f.content
+        if any(literal in text for literal in literals):
+            return True
+        return bool(regex and regex.search(f.content))
+    return evaluate
+
+
+def _compile_count(pattern: str, flags: int) -> Callable[["FileFeatures"], int]:
+    literal = as_literal(pattern)
+    if literal is not None:
+        if flags & re.IGNORECASE:
+            literal = literal.lower()
+            return lambda f: f.lowered.count(literal)
+        return lambda f: f.content.count(literal)
+    regex = re.compile(pattern, flags)
+    return lambda f: sum(1 for _ in regex.finditer(f.content))
+
+
+def compile_feature(spec: tuple) -> Callable[["FileFeatures"], Any]:
+    """Compile one FEATURES entry: (kind, pattern[, flags]) or ("derived", fn)."""
+    kind = spec[0]
+    if kind == "derived":
+        return spec[1]
+    pattern, flags = spec[1], (spec[2] if len(spec) > 2 else 0)
+    if kind == "any":
+        return _compile_any(pattern, flags)
+    if kind == "count":
+        return _compile_count(pattern, flags)
+    if kind == "all":
+        regex = re.compile(pattern, flags)
+        return lambda f: regex.findall(f.content)
+    raise ValueError(f"Unknown feature kind: {kind}")
+
+
+def compile_features(features: Dict[str, tuple]) -> Dict[str, Callable[["FileFeatures"], Any]]:
+    """Compile a FEATURES table once, at import time."""
+    return {name: compile_feature(spec) for name, spec in features.items()}
+
+
+# ============ EVALUATION ============
+class FileFeatures(dict):
+    """
+    Feature values for one file, computed on first use and cached. path and
+    options are there for derived features that need more than the text
+    (e.g. a style model picked by file type, through a cache directory).
+    """
+
+    def __init__(self, content: str, compiled: Dict[str, Callable[["FileFeatures"], Any]],
+                 path: Optional[str] = None, options: Optional[Dict[str, Any]] = None):
+        super().__init__()
+        self.content = content
+        self.lowered = content.lower()
+        self.compiled = compiled
+        self.path = path or ""
+        self.options = options or {}
+
+    def __missing__(self, name: str):
+        value = self[name] = self.compiled[name](self)
+        return value
+
+
+def run_rules(rules: Iterable, features: FileFeatures) -> List[Finding]:
+    """
+    Evaluate rules in order and return (level, category, message) tuples.
+    Messages are formatted with the feature values ('{nav_items} nav items').
+    """
+    results: List[Finding] = []
+    for rule in rules:
+        if callable(rule):
+            results.extend(rule(features.content, features))
+            continue
+        level, category, message, condition = rule
+        if condition(features):
+            results.append((level, category, message.format_map(features) if message else message))
+    return results
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Site Crawl - async crawl of a running site or a static build
+
+Fetches same-origin pages breadth-first over a bounded pool of keep-alive
+connections and feeds each HTML body to the streaming page parser as the
+bytes arrive, so a page is parsed once and never held whole. Uses aiohttp
+when installed; otherwise a small HTTP/1.1 client over asyncio streams.
+
+A static build (e.g. a Vite dist/ directory) is read from disk instead:
+every .html file becomes a route, parsed in the file pool.
+
+Usage: from site_crawl import crawl_site, iter_static_pages
+"""
+
+import asyncio
+import codecs
+import os
+import ssl
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from file_pool import iter_pool
+from page_dom import PageParser
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# ============ CONFIGURATION ============
+DEFAULT_CONCURRENCY = 32
+DEFAULT_MAX_PAGES = 10_000
+REQUEST_TIMEOUT = 15.0
+READ_CHUNK = 64 * 1024
+USER_AGENT = "agent-site-audit/1.0"
+
+# Links to these are assets, not pages
+ASSET_EXTENSIONS = {
+    ".js", ".mjs", ".css", ".map", ".json", ".xml", ".txt", ".ico", ".png", ".jpg", ".jpeg", ".gif",
+    ".webp", ".avif", ".svg", ".woff", ".woff2", ".ttf", ".otf", ".eot", ".mp4", ".webm", ".mp3",
+    ".pdf", ".zip", ".gz", ".wasm", ".webmanifest",
+}
+STATIC_SKIP_DIRS = {"assets", "node_modules", ".git"}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+
+# ============ URLS ============
+def normalize_url(base: str, href: str) -> Optional[str]:
+    """Absolute http(s) URL for a link, without fragment; None for other schemes."""
+    href = href.strip()
+    if not href or href.startswith(("#", "mailto:", "tel:", "javascript:", "data:")):
+        return None
+    parts = urlsplit(urljoin(base, href))
+    if parts.scheme not in ("http", "https"):
+        return None
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path or "/", parts.query, ""))
+
+
+def origin_of(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc.lower()}"
+
+
+def is_page_url(url: str) -> bool:
+    """Whether a URL looks like a page rather than an asset."""
+    return os.path.splitext(urlsplit(url).path)[1].lower() not in ASSET_EXTENSIONS
+
+
+def _charset(headers: Dict[str, str]) -> str:
+    for param in headers.get("content-type", "").split(";")[1:]:
+        name, _, value = param.strip().partition("=")
+        if name.lower() == "charset" and value:
+            try:
+                return codecs.lookup(value.strip('"\' ')).name
+            except LookupError:
+                break
+    return "utf-8"
+
+
+class _PageSink:
+    """Decodes body bytes incrementally into a PageParser."""
+
+    def __init__(self, url: str):
+        self.parser = PageParser(url)
+        self.decoder = None
+        self.bytes = 0
+
+    def start(self, headers: Dict[str, str]):
+        self.decoder = codecs.getincrementaldecoder(_charset(headers))(errors="replace")
+
+    def feed(self, data: bytes):
+        self.bytes += len(data)
+        self.parser.feed(self.decoder.decode(data))
+
+    def close(self) -> Dict[str, Any]:
+        self.parser.feed(self.decoder.decode(b"", final=True))
+        self.parser.close()
+        return self.parser.page
+
+
+# ============ STDLIB CLIENT ============
+class ConnectionPool:
+    """Keep-alive HTTP/1.1 connections to one origin, at most `size` open at once."""
+
+    def __init__(self, origin: str, size: int):
+        parts = urlsplit(origin)
+        self.secure = parts.scheme == "https"
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or (443 if self.secure else 80)
+        self.host_header = parts.netloc
+        self.ssl = ssl.create_default_context() if self.secure else None
+        self.semaphore = asyncio.Semaphore(size)
+        self.idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def close(self):
+        while self.idle:
+            _, writer = self.idle.pop()
+            writer.close()
+
+    async def fetch(self, url: str, sink: _PageSink) -> Tuple[int, Dict[str, str]]:
+        async with self.semaphore:
+            for attempt in range(2):
+                reused = bool(self.idle)
+                if reused:
+                    reader, writer = self.idle.pop()
+                else:
+                    reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+                try:
+                    return await asyncio.wait_for(self._request(reader, writer, url, sink), REQUEST_TIMEOUT)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    # the server may have closed an idle connection; retry once on a fresh one
+                    if not reused or attempt or sink.decoder is not None:
+                        raise
+                except BaseException:
+                    writer.close()
+                    raise
+        raise ConnectionError(url)
+
+    async def _request(self, reader, writer, url: str, sink: _PageSink) -> Tuple[int, Dict[str, str]]:
+        parts = urlsplit(url)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        writer.write((f"GET {target} HTTP/1.1\r\nHost: {self.host_header}\r\nUser-Agent: {USER_AGENT}\r\n"
+                      f"Accept: text/html,*/*;q=0.5\r\nAccept-Encoding: identity\r\nConnection: keep-alive\r\n\r\n")
+                     .encode("latin-1"))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed")
+        status = int(status_line.split()[1])
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = headers.get("connection", "").lower() != "close"
+        if "text/html" not in headers.get("content-type", "") or status in REDIRECT_STATUSES:
+            writer.close()      # not parsed: drop the body instead of reading it
+            return status, headers
+
+        sink.start(headers)
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int(((await reader.readline()).split(b";")[0].strip() or b"0"), 16)
+                if not size:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass    # trailers
+                    break
+                sink.feed(await reader.readexactly(size))
+                await reader.readexactly(2)
+        elif "content-length" in headers:
+            remaining = int(headers["content-length"])
+            while remaining:
+                data = await reader.read(min(READ_CHUNK, remaining))
+                if not data:
+                    raise asyncio.IncompleteReadError(b"", remaining)
+                remaining -= len(data)
+                sink.feed(data)
+        else:
+            keep_alive = False
+            while True:
+                data = await reader.read(READ_CHUNK)
+                if not data:
+                    break
+                sink.feed(data)
+
+        if keep_alive:
+            self.idle.append((reader, writer))
+        else:
+            writer.close()
+        return status, headers
+
+
+# ============ CRAWLER ============
+async def _fetch_aiohttp(session, url: str, sink: _PageSink) -> Tuple[int, Dict[str, str]]:
+    async with session.get(url, allow_redirects=False) as response:
+        headers = {name.lower(): value for name, value in response.headers.items()}
+        if "text/html" in headers.get("content-type", "") and response.status not in REDIRECT_STATUSES:
+            sink.start(headers)
+            async for chunk in response.content.iter_chunked(READ_CHUNK):
+                sink.feed(chunk)
+        return response.status, headers
+
+
+async def crawl_site(start_urls: List[str], on_page: Callable[[Dict[str, Any]], None],
+                     concurrency: int = DEFAULT_CONCURRENCY,
+                     max_pages: int = DEFAULT_MAX_PAGES) -> Dict[str, Any]:
+    """
+    Crawl same-origin pages breadth-first from start_urls, calling on_page
+    with each parsed page (plus 'status', 'referrer' and 'ms'). Returns
+    crawl stats; 'truncated' is set when max_pages stopped the crawl, and
+    'referrers' maps every URL to the smallest URL linking to it, which,
+    unlike the referrer seen at fetch time, does not depend on timing.
+    """
+    origin = origin_of(start_urls[0])
+    queue: asyncio.Queue = asyncio.Queue()
+    referrers: Dict[str, Optional[str]] = {}
+    stats = {"origin": origin, "client": "aiohttp" if AIOHTTP_AVAILABLE else "asyncio",
+             "fetched": 0, "redirects": 0, "errors": 0, "bytes": 0, "truncated": False}
+
+    def enqueue(url: Optional[str], referrer: Optional[str]):
+        if not url or origin_of(url) != origin or not is_page_url(url):
+            return
+        if url in referrers:
+            if referrer and referrers[url] and referrer < referrers[url]:
+                referrers[url] = referrer
+            return
+        if len(referrers) >= max_pages:
+            stats["truncated"] = True
+            return
+        referrers[url] = referrer
+        queue.put_nowait(url)
+
+    for url in start_urls:
+        enqueue(normalize_url(url, url), None)
+
+    if AIOHTTP_AVAILABLE:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=concurrency),
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            headers={"User-Agent": USER_AGENT, "Accept": "text/html,*/*;q=0.5"})
+        fetch = lambda url, sink: _fetch_aiohttp(session, url, sink)
+    else:
+        pool = ConnectionPool(origin, concurrency)
+        fetch = pool.fetch
+
+    async def worker():
+        while True:
+            url = await queue.get()
+            started = time.perf_counter()
+            sink = _PageSink(url)
+            try:
+                status, headers = await fetch(url, sink)
+            except Exception as e:  # OSError, timeouts, malformed responses, aiohttp.ClientError
+                stats["errors"] += 1
+                on_page({"url": url, "status": None, "error": str(e) or type(e).__name__,
+                         "referrer": referrers.get(url)})
+                queue.task_done()
+                continue
+            stats["fetched"] += 1
+            stats["bytes"] += sink.bytes
+            if status in REDIRECT_STATUSES:
+                stats["redirects"] += 1
+                enqueue(normalize_url(url, headers.get("location", "")), referrers.get(url))
+            elif sink.decoder is not None:
+                page = sink.close()
+                page.update(status=status, referrer=referrers.get(url),
+                            ms=round((time.perf_counter() - started) * 1000, 1))
+                on_page(page)
+                for href in page["links"]:
+                    enqueue(normalize_url(url, href), url)
+            elif status >= 400:
+                on_page({"url": url, "status": status, "referrer": referrers.get(url)})
+            queue.task_done()
+
+    started = time.perf_counter()
+    workers = [asyncio.ensure_future(worker()) for _ in range(max(1, concurrency))]
+    try:
+        await queue.join()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        if AIOHTTP_AVAILABLE:
+            await session.close()
+        else:
+            await pool.close()
+    elapsed = time.perf_counter() - started
+    stats["seconds"] = round(elapsed, 2)
+    stats["pages_per_second"] = round(stats["fetched"] / elapsed, 1) if elapsed else 0.0
+    stats["referrers"] = referrers
+    return stats
+
+
+# ============ STATIC BUILD ============
+def static_route(root: Path, path: Path) -> str:
+    """'/' for index.html, '/about/' for about/index.html, '/about.html' otherwise."""
+    rel = path.relative_to(root).as_posix()
+    if rel == "index.html":
+        return "/"
+    if rel.endswith("/index.html"):
+        return "/" + rel[:-len("index.html")]
+    return "/" + rel
+
+
+def parse_static_page(filepath: str) -> Dict[str, Any]:
+    """Parse one built HTML file in READ_CHUNK pieces."""
+    parser = PageParser(filepath)
+    try:
+        with open(filepath, "r", encoding="utf-8", errors="replace") as f:
+            for chunk in iter(lambda: f.read(READ_CHUNK), ""):
+                parser.feed(chunk)
+    except OSError as e:
+        return {"url": filepath, "status": None, "error": str(e)}
+    parser.close()
+    page = parser.page
+    page["status"] = 200
+    return page
+
+
+def iter_static_pages(build_dir: Path, jobs: int = 1) -> Iterator[Dict[str, Any]]:
+    """Yield parsed pages of a static build, in path order, with their route as 'url'."""
+    files = []
+    for root, dirs, names in os.walk(build_dir):
+        dirs[:] = sorted(d for d in dirs if d not in STATIC_SKIP_DIRS)
+        files.extend(os.path.join(root, name) for name in sorted(names) if name.lower().endswith((".html", ".htm")))
+    for filepath, page in zip(files, iter_pool(parse_static_page, files, jobs)):
+        page["url"] = static_route(build_dir, Path(filepath))
+        page["referrer"] = None
+        yield page
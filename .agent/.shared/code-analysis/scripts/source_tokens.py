@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Source Tokens - shared tokenizer and token cache for the skill checkers
+
+Splits Python and JS/TS sources into (kind, text, line) tokens so checkers can
+tell code apart from strings and comments without a full parser. Token
+streams are cached on disk keyed by the sha256 of the file content, so every
+checker that runs over the same tree tokenizes each file once.
+
+Kinds: ident, number, string, template, regex, punct, comment
+Usage: from source_tokens import load_tokens, language_for, match_bracket, split_args
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+import tokenize
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+# ============ CONFIGURATION ============
+TOKENIZER_VERSION = 1
+DEFAULT_CACHE_DIR = Path(".agent-cache") / "tokens"
+
+LANGUAGE_EXTENSIONS = {
+    ".py": "python",
+    ".js": "javascript", ".jsx": "javascript", ".mjs": "javascript", ".cjs": "javascript",
+    ".ts": "typescript", ".tsx": "typescript", ".mts": "typescript", ".cts": "typescript",
+}
+
+Token = Tuple[str, str, int]
+OPENERS = {"(": ")", "[": "]", "{": "}"}
+CLOSERS = {")", "]", "}"}
+
+# Leading whitespace is folded into each match; the named group is the token
+JS_TOKEN_REGEX = re.compile(r"""
+    \s*(?:
+      (?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))
+    | (?P<string>"(?:[^"\\\n]|\\[\s\S])*"?|'(?:[^'\\\n]|\\[\s\S])*'?)
+    | (?P<template>`)
+    | (?P<ident>[A-Za-z_$\u0080-\uffff][\w$\u0080-\uffff]*)
+    | (?P<number>(?:0[xXbBoO][\da-fA-F_]+|(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)(?:[eE][+-]?\d+)?)n?)
+    | (?P<punct>>>>=|\.\.\.|===|!==|\*\*=|<<=|>>=|\?\?=|&&=|\|\|=|=>|==|!=|<=|>=|&&|\|\||\?\?|\?\.
+                |\+\+|--|\+=|-=|\*=|/=|%=|&=|\|=|\^=|\*\*|[{}()\[\];,<>+\-*/%&|^!~?:=.@\#]|\S)
+    )""", re.X)
+
+# A '/' after these starts a regex literal instead of a division
+JS_REGEX_PRECEDING_KEYWORDS = {"return", "typeof", "instanceof", "in", "of", "new", "delete",
+                               "void", "throw", "case", "do", "else", "yield", "await"}
+JS_REGEX_BODY = re.compile(r"/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[a-z]*")
+
+PY_TOKEN_KINDS = {
+    tokenize.NAME: "ident",
+    tokenize.NUMBER: "number",
+    tokenize.STRING: "string",
+    tokenize.OP: "punct",
+    tokenize.COMMENT: "comment",
+}
+PY_FSTRING_START = getattr(tokenize, "FSTRING_START", None)  # Python 3.12+
+PY_FSTRING_END = getattr(tokenize, "FSTRING_END", None)
+
+
+# ============ TOKENIZERS ============
+def language_for(path) -> Optional[str]:
+    """Return 'python', 'javascript' or 'typescript' for a path, else None."""
+    return LANGUAGE_EXTENSIONS.get(Path(path).suffix.lower())
+
+
+def _regex_allowed(previous: Optional[Token]) -> bool:
+    """Whether a '/' after the previous token starts a regex literal."""
+    if previous is None:
+        return True
+    kind, text, _ = previous
+    if kind == "ident":
+        return text in JS_REGEX_PRECEDING_KEYWORDS
+    if kind == "punct":
+        return text not in (")", "]", "}")
+    return kind == "comment"
+
+
+def _scan_template(source: str, pos: int) -> int:
+    """Return the index just past the template literal opening at pos."""
+    end = len(source)
+    i = pos + 1
+    while i < end:
+        char = source[i]
+        if char == "\\":
+            i += 2
+        elif char == "`":
+            return i + 1
+        elif char == "$" and source.startswith("{", i + 1):
+            i = _scan_substitution(source, i + 2)
+        else:
+            i += 1
+    return end
+
+
+def _scan_substitution(source: str, pos: int) -> int:
+    """Return the index just past the '}' closing a ${...} substitution."""
+    end = len(source)
+    depth = 1
+    i = pos
+    while i < end:
+        char = source[i]
+        if char == "`":
+            i = _scan_template(source, i)
+            continue
+        if char in "\"'":
+            match = JS_TOKEN_REGEX.match(source, i)
+            i = match.end() if match else i + 1
+            continue
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if not depth:
+                return i + 1
+        i += 1
+    return end
+
+
+def iter_js_tokens(source: str, pos: int = 0, line: int = 1) -> Iterator[Token]:
+    """
+    Lazily tokenize JS/TS (including JSX) from offset pos, which is on the
+    given line. Lets callers tokenize just the expression they need.
+    """
+    match_at = JS_TOKEN_REGEX.match
+    end = len(source)
+    previous: Optional[Token] = None
+
+    while pos < end:
+        match = match_at(source, pos)
+        if not match:
+            break  # trailing whitespace
+        kind = match.lastgroup
+        start = match.start(kind)
+        line += source.count("\n", pos, start)
+
+        if kind == "template":
+            stop = _scan_template(source, start)
+        elif kind == "punct" and source[start] == "/" and _regex_allowed(previous):
+            body = JS_REGEX_BODY.match(source, start)
+            if body:
+                kind, stop = "regex", body.end()
+            else:
+                stop = match.end()
+        else:
+            stop = match.end()
+
+        text = source[start:stop]
+        previous = (kind, text, line)
+        yield previous
+        if kind in ("comment", "template", "string"):
+            line += text.count("\n")
+        pos = stop
+
+
+def tokenize_js(source: str) -> List[Token]:
+    """Tokenize JS/TS (including JSX) source into (kind, text, line) tuples."""
+    return list(iter_js_tokens(source))
+
+
+def tokenize_python(source: str) -> List[Token]:
+    """
+    Tokenize Python source with the stdlib tokenizer. f-strings are always
+    returned as one 'template' token, whatever the Python version.
+    """
+    tokens: List[Token] = []
+    lines = source.splitlines(keepends=True)
+    fstring_start = None
+    depth = 0
+
+    try:
+        for tok in tokenize.generate_tokens(io.StringIO(source).readline):
+            if PY_FSTRING_START is not None and tok.type == PY_FSTRING_START:
+                if depth == 0:
+                    fstring_start = tok.start
+                depth += 1
+                continue
+            if depth:
+                if tok.type == PY_FSTRING_END:
+                    depth -= 1
+                    if depth == 0:
+                        (srow, scol), (erow, ecol) = fstring_start, tok.end
+                        if srow == erow:
+                            text = lines[srow - 1][scol:ecol]
+                        else:
+                            text = lines[srow - 1][scol:] + "".join(lines[srow:erow - 1]) + lines[erow - 1][:ecol]
+                        tokens.append(("template", text, srow))
+                continue
+
+            kind = PY_TOKEN_KINDS.get(tok.type)
+            if kind is None:
+                continue
+            if kind == "string" and re.match(r"[rRbBuU]*[fF]", tok.string):
+                kind = "template"
+            tokens.append((kind, tok.string, tok.start[0]))
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        pass  # keep what was tokenized before the error
+
+    return tokens
+
+
+TOKENIZERS = {
+    "python": tokenize_python,
+    "javascript": tokenize_js,
+    "typescript": tokenize_js,
+}
+
+
+# ============ CACHE ============
+def default_cache_dir(project_path) -> Path:
+    """Token cache location for a project."""
+    return Path(project_path) / DEFAULT_CACHE_DIR
+
+
+def _cache_file(cache_dir: Path, digest: str) -> Path:
+    return cache_dir / digest[:2] / f"{digest}.json"
+
+
+def load_cached_tokens(cache_dir: Optional[Path], digest: str, language: str) -> Optional[List[Token]]:
+    """Return cached tokens for a content digest, or None on a miss."""
+    if cache_dir is None:
+        return None
+    try:
+        with open(_cache_file(Path(cache_dir), digest), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if entry.get("version") != TOKENIZER_VERSION or entry.get("language") != language:
+        return None
+    return [tuple(token) for token in entry["tokens"]]
+
+
+def save_cached_tokens(cache_dir: Optional[Path], digest: str, language: str, tokens: List[Token]):
+    """Write tokens atomically so parallel workers never see a partial file."""
+    if cache_dir is None:
+        return
+    path = _cache_file(Path(cache_dir), digest)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": TOKENIZER_VERSION, "language": language, "tokens": tokens},
+                      f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError:
+        pass  # caching is best effort
+
+
+def tokenize_source(source: str, language: str, digest: Optional[str] = None,
+                    cache_dir: Optional[Path] = None) -> List[Token]:
+    """Tokenize source for a language, going through the cache when a digest is given."""
+    if digest:
+        cached = load_cached_tokens(cache_dir, digest, language)
+        if cached is not None:
+            return cached
+    tokens = TOKENIZERS[language](source)
+    if digest:
+        save_cached_tokens(cache_dir, digest, language, tokens)
+    return tokens
+
+
+def load_tokens(filepath, cache_dir: Optional[Path] = None,
+                data: Optional[bytes] = None) -> Tuple[str, str, List[Token]]:
+    """
+    Read (or take) a file's bytes and return (digest, source, tokens).
+    Raises ValueError for unsupported languages and OSError on read errors.
+    """
+    language = language_for(filepath)
+    if language is None:
+        raise ValueError(f"Unsupported language: {filepath}")
+    if data is None:
+        with open(filepath, "rb") as f:
+            data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    source = data.decode("utf-8", errors="replace")
+    return digest, source, tokenize_source(source, language, digest, cache_dir)
+
+
+def code_tokens(tokens: List[Token]) -> List[Token]:
+    """Drop comments, leaving the tokens that make up the program."""
+    return [token for token in tokens if token[0] != "comment"]
+
+
+# ============ TOKEN HELPERS ============
+def match_bracket(tokens: List[Token], i: int) -> int:
+    """Index of the bracket closing the one at i (or the last token)."""
+    depth = 0
+    for j in range(i, len(tokens)):
+        text = tokens[j][1]
+        if text in OPENERS:
+            depth += 1
+        elif text in CLOSERS:
+            depth -= 1
+            if depth == 0:
+                return j
+    return len(tokens) - 1
+
+
+def split_args(tokens: List[Token], open_index: int, close_index: int) -> List[Tuple[int, int]]:
+    """(start, end) ranges of the comma-separated items between two brackets."""
+    ranges = []
+    depth = 0
+    start = open_index + 1
+    for j in range(open_index + 1, close_index):
+        text = tokens[j][1]
+        if text in OPENERS:
+            depth += 1
+        elif text in CLOSERS:
+            depth -= 1
+        elif text == "," and depth == 0:
+            ranges.append((start, j))
+            start = j + 1
+    if start < close_index:
+        ranges.append((start, close_index))
+    return ranges
+
+
+def literal_text(token: Token) -> Optional[str]:
+    """Value of a string or substitution-free template token."""
+    kind, text, _ = token
+    if kind == "string" or (kind == "template" and "${" not in text):
+        return text[1:-1]
+    return None
+
+
+def dotted_name(tokens: List[Token], start: int, end: int) -> Optional[str]:
+    """'a.b.c' when tokens[start:end] is exactly an identifier chain."""
+    if end <= start or (end - start) % 2 == 0:
+        return None
+    for j in range(start, end):
+        if (j - start) % 2 == 0:
+            if tokens[j][0] != "ident":
+                return None
+        elif tokens[j][1] not in (".", "?."):
+            return None
+    return ".".join(tokens[j][1] for j in range(start, end, 2))
@@ -0,0 +1,677 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Style Model - CSS tokenizer, Tailwind class extractor and per-file style model
+
+Parses the styling in a file once and answers typography, color and motion
+questions from the result instead of regexes over raw text:
+
+    - CSS files, <style> blocks, style="" attributes, css``/styled`` templates
+      and inline style objects (style={{ fontWeight: 600 }}) become
+      declarations: [property, value, line, context]. Values spanning several
+      lines are joined; context lists the enclosing selectors and at-rules.
+    - class="", className=, cn()/clsx()/cva() strings and @apply become
+      Tailwind utilities: [utility, variants, line, group], where group ties
+      together the classes of one attribute.
+    - @keyframes blocks map to the properties they animate.
+
+Models are cached on disk keyed by the sha256 of the file content, next to
+the token cache (<project>/.agent-cache/styles).
+Usage: from style_model import load_style_model, font_weights, shadows
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from source_tokens import iter_js_tokens
+
+# ============ CONFIGURATION ============
+STYLE_MODEL_VERSION = 1
+DEFAULT_CACHE_DIR = Path(".agent-cache") / "styles"
+
+CSS_EXTENSIONS = {".css", ".scss", ".less", ".pcss"}
+MARKUP_EXTENSIONS = {".html", ".htm", ".vue", ".svelte"}
+SCRIPT_EXTENSIONS = {".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs"}
+
+# Flat parenthesized groups (rgba(...), var(...)) are one token; nested ones are tracked by depth
+CSS_TOKEN_REGEX = re.compile(r'''/\*[\s\S]*?(?:\*/|\Z)|"(?:\\.|[^"\\\n])*"?|'(?:\\.|[^'\\\n])*'?|\([^(){};"']*\)|[{};()]|[^{};()"'/]+|/''')
+# Fast path: a run of plain statement text, with its '{', ';' or '}' if it
+# reaches one before a comment, multi-line string or nested parenthesis
+CSS_STATEMENT = re.compile(r'''([^{};/"'()]*(?:(?:/(?!\*)|"[^"\\\n]*"|'[^'\\\n]*'|\([^(){};"']*\))[^{};/"'()]*)*)([{};])?''')
+PROPERTY_NAME = re.compile(r'-{0,2}[A-Za-z][\w-]*')
+KEYFRAMES_PRELUDE = re.compile(r'@(?:-[a-z]+-)?keyframes\s+(\S+)')
+
+# HTML/Vue/Svelte: <style> blocks and style/class attributes, in one pass
+MARKUP_STYLE = re.compile(r'''<style\b[^>]*>(?P<block>.*?)</style>
+    | (?<![\w-])(?P<attribute>class|className|:class|style)\s*=\s*(?P<quote>["'])(?P<value>.*?)(?P=quote)''',
+    re.S | re.X)
+CLASS_TOKEN = re.compile(r'!?-?[A-Za-z0-9@\[][\w:\-\[\]/.#%(),\'"&>*+=!@]*')
+
+# JS/TS: where class strings, style objects and CSS templates live. Only the
+# expression after each anchor is tokenized, not the whole file.
+SCRIPT_ANCHOR = re.compile(r'''
+      (?<![\w$.-])(?P<classes>className|class|tw)\s*=\s*(?=[{"'`])
+    | (?<![\w$.-])(?P<style>style|sx)\s*=\s*(?=\{\s*\{)
+    | (?<![\w$.])(?P<call>cn|clsx|classNames|classnames|twMerge|twJoin|cva|tv|cx)\s*(?=\()
+    | (?<![\w$])(?P<sheet>StyleSheet\.create)\s*(?=\()
+    | (?<![\w$.])(?P<tag>css|keyframes|createGlobalStyle|injectGlobal|tw
+                     |styled(?:\.\w+|\([^()`]*\))(?:\.attrs\([^`]*?\))?)\s*(?:<[^`]*?>\s*)?(?=`)
+''', re.X)
+# Cheap word search first; SCRIPT_ANCHOR is only tried where one of these starts
+SCRIPT_ANCHOR_HINT = re.compile(r'\b(?:className|class|tw|style|sx|cn|clsx|classNames|classnames|twMerge|twJoin'
+                                r'|cva|tv|cx|StyleSheet|css|keyframes|createGlobalStyle|injectGlobal|styled)\b')
+BRACKETS = {"{": "}", "(": ")", "[": "]"}
+KEYFRAMES_BINDING = re.compile(r'([\w$]+)\s*=\s*$')
+
+FONT_WEIGHT_NAMES = {"thin": 100, "hairline": 100, "extralight": 200, "light": 300, "normal": 400,
+                     "medium": 500, "semibold": 600, "bold": 700, "extrabold": 800, "black": 900}
+TAILWIND_LEADING = {"none": 1.0, "tight": 1.25, "snug": 1.375, "normal": 1.5, "relaxed": 1.625, "loose": 2.0}
+TAILWIND_TEXT_SIZES = {f"text-{size}" for size in ("xs", "sm", "base", "lg", "xl", "2xl", "3xl", "4xl", "5xl",
+                                                     "6xl", "7xl", "8xl", "9xl")}
+TAILWIND_DISPLAY_SIZES = {f"text-{size}" for size in ("4xl", "5xl", "6xl", "7xl", "8xl", "9xl")}
+UNITLESS_NUMBER = re.compile(r'-?(?:\d+\.?\d*|\.\d+)$')
+SIZE_VALUE = re.compile(r'(-?\d+(?:\.\d+)?)(px|rem|em)?$')
+TIME_VALUE = re.compile(r'(?<![\w.-])(\d*\.?\d+)(ms|s)\b')
+COLOR_VALUE = re.compile(r'#[0-9a-fA-F]{3,8}\b|(?:rgba?|hsla?)\([^)]*\)')
+ARBITRARY_VALUE = re.compile(r'\[(.+)\]$')
+
+
+# ============ CSS TOKENIZER ============
+def parse_css(text: str, first_line: int = 1, context: Tuple[str, ...] = ()) -> Dict[str, Any]:
+    """
+    Tokenize CSS (plain, nested SCSS/LESS, or bare declarations from a
+    style attribute or css`` template) in one pass. Returns declarations,
+    keyframes and @apply'd utilities.
+    """
+    result: Dict[str, Any] = {"declarations": [], "keyframes": {}, "applied": []}
+    stack = list(context)
+    buffer: List[str] = []
+    depth, start = 0, None
+    line, counted = first_line, 0
+    pos, end = 0, len(text)
+
+    def line_at(offset: int) -> int:
+        nonlocal line, counted
+        line += text.count("\n", counted, offset)
+        counted = offset
+        return line
+
+    def terminate(token: str):
+        nonlocal buffer, start
+        chunk = "".join(buffer).strip()
+        buffer = []
+        if token == "{":
+            stack.append(" ".join(chunk.split()))
+        else:
+            if chunk:
+                _add_statement(result, chunk, line_at(start), stack)
+            if token == "}" and len(stack) > len(context):
+                stack.pop()
+        start = None
+
+    while pos < end:
+        if depth == 0:
+            statement = CSS_STATEMENT.match(text, pos)
+            piece, terminator = statement.groups()
+            if piece:
+                if start is None and not piece.isspace():
+                    start = pos + len(piece) - len(piece.lstrip())
+                buffer.append(piece)
+            pos = statement.end()
+            if terminator:
+                terminate(terminator)
+                continue
+            if pos >= end:
+                break
+
+        match = CSS_TOKEN_REGEX.match(text, pos)
+        token = match.group()
+        pos = match.end()
+        if token.startswith("/*"):
+            continue
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth = max(0, depth - 1)
+
+        if depth == 0 and token in ("{", ";", "}"):
+            terminate(token)
+        else:
+            if start is None and not token.isspace():
+                start = match.start() + len(token) - len(token.lstrip())
+            buffer.append(token)
+
+    chunk = "".join(buffer).strip()
+    if chunk:
+        _add_statement(result, chunk, line_at(start), stack)
+    return result
+
+
+def _add_statement(result: Dict[str, Any], chunk: str, line: int, stack: List[str]):
+    """Record one ';'-terminated statement: a declaration or @apply."""
+    if chunk.startswith("@apply"):
+        result["applied"].append((chunk[len("@apply"):].replace("!important", ""), line))
+        return
+    if chunk.startswith("@"):
+        return  # @import, @include, @charset ...
+    prop, sep, value = chunk.partition(":")
+    prop = prop.strip()
+    if not sep or not PROPERTY_NAME.fullmatch(prop):
+        return
+    value = " ".join(value.split())
+    result["declarations"].append([prop.lower(), value, line, list(stack)])
+    for prelude in stack:
+        keyframes = KEYFRAMES_PRELUDE.match(prelude)
+        if keyframes:
+            animated = result["keyframes"].setdefault(keyframes.group(1), [])
+            if prop.lower() not in animated:
+                animated.append(prop.lower())
+
+
+# ============ TAILWIND ============
+def split_variants(class_name: str) -> Tuple[str, List[str]]:
+    """'md:hover:!bg-red-500' -> ('bg-red-500', ['md', 'hover']) (':' inside [] is kept)."""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(class_name):
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth = max(0, depth - 1)
+        elif char == ":" and depth == 0:
+            parts.append(class_name[start:i])
+            start = i + 1
+    utility = class_name[start:].lstrip("!")
+    return utility, parts
+
+
+def _new_group(model: Dict[str, Any]) -> int:
+    model["groups"] += 1
+    return model["groups"] - 1
+
+
+def _add_classes(model: Dict[str, Any], text: str, line: int, group: Optional[int] = None):
+    """Split a class string into utilities sharing one group id."""
+    if group is None:
+        group = _new_group(model)
+    for offset, row in enumerate(text.split("\n")):
+        for token in row.split():
+            if CLASS_TOKEN.fullmatch(token):
+                utility, variants = split_variants(token)
+                if utility:
+                    model["classes"].append([utility, variants, line + offset, group])
+
+
+# ============ SOURCES ============
+def _add_css(model: Dict[str, Any], text: str, first_line: int, context: Tuple[str, ...] = ()):
+    parsed = parse_css(text, first_line, context)
+    model["declarations"].extend(parsed["declarations"])
+    for name, props in parsed["keyframes"].items():
+        animated = model["keyframes"].setdefault(name, [])
+        animated.extend(prop for prop in props if prop not in animated)
+    for classes, line in parsed["applied"]:
+        _add_classes(model, classes, line)
+
+
+class _Lines:
+    """Line numbers for offsets in one source, via a bisect over newline offsets."""
+
+    def __init__(self, source: str):
+        self.newlines = [match.start() for match in re.finditer("\n", source)]
+
+    def __call__(self, index: int) -> int:
+        return bisect.bisect_left(self.newlines, index) + 1
+
+
+def _scan_markup(model: Dict[str, Any], source: str):
+    """HTML, Vue and Svelte: <style> blocks, style="" and class attributes."""
+    line_at = _Lines(source)
+    for match in MARKUP_STYLE.finditer(source):
+        if match.group("block") is not None:
+            _add_css(model, match.group("block"), line_at(match.start("block")))
+        elif match.group("attribute") == "style":
+            _add_css(model, match.group("value"), line_at(match.start("value")), ("style",))
+        else:
+            _add_classes(model, match.group("value"), line_at(match.start("value")))
+
+
+def _string_value(token: Tuple[str, str, int], placeholder: str = " var(--expr) ") -> str:
+    """Text of a string/template token without quotes; ${...} becomes placeholder."""
+    kind, text, _ = token
+    body = text[1:-1] if len(text) >= 2 else ""
+    if kind == "template":
+        previous = None
+        while previous != body:
+            previous = body
+            body = re.sub(r'\$\{[^{}]*\}', placeholder, body)
+    return body
+
+
+def _expression(source: str, pos: int, line: int) -> List[Tuple[str, str, int]]:
+    """
+    Code tokens of the expression starting at pos: one string/template, or a
+    bracket through its matching close.
+    """
+    tokens = []
+    depth = 0
+    for token in iter_js_tokens(source, pos, line):
+        kind, text, _ = token
+        if kind == "comment":
+            continue
+        tokens.append(token)
+        if kind == "punct" and text in BRACKETS:
+            depth += 1
+        elif kind == "punct" and text in ("}", ")", "]"):
+            depth -= 1
+        if depth <= 0:
+            break
+    return tokens
+
+
+def _camel_to_kebab(name: str) -> str:
+    kebab = re.sub(r'([A-Z])', r'-\1', name).lower()
+    return "-" + kebab if kebab.startswith(("webkit-", "moz-", "ms-")) else kebab
+
+
+def _object_declarations(model: Dict[str, Any], tokens: List[Tuple[str, str, int]], context: str):
+    """key: scalar pairs inside a JS object literal (any depth) as declarations."""
+    i, end = 0, len(tokens)
+    while i < end:
+        kind, text, line = tokens[i]
+        if kind in ("ident", "string") and i + 2 < end and tokens[i + 1][1] == ":":
+            value_token = tokens[i + 2]
+            following = tokens[i + 3][1] if i + 3 < end else "}"
+            if value_token[0] in ("string", "number", "template") and following in (",", "}"):
+                key = _string_value(tokens[i]) if kind == "string" else text
+                value = value_token[1] if value_token[0] == "number" else _string_value(value_token)
+                model["declarations"].append([_camel_to_kebab(key), value, line, [context]])
+                i += 3
+                continue
+        i += 1
+
+
+def _scan_script(model: Dict[str, Any], source: str):
+    """JS/TS/JSX: class strings, css``/styled`` templates and style objects."""
+    line_at = _Lines(source)
+    consumed = 0
+    for hint in SCRIPT_ANCHOR_HINT.finditer(source):
+        if hint.start() < consumed:
+            continue  # e.g. cn(...) inside an already collected className={...}
+        match = SCRIPT_ANCHOR.match(source, hint.start())
+        if not match:
+            continue
+        pos = match.end()
+        tokens = _expression(source, pos, line_at(pos))
+        if not tokens:
+            continue
+        consumed = pos + sum(len(token[1]) for token in tokens)
+        anchor = match.lastgroup
+
+        if anchor in ("classes", "call"):
+            group = _new_group(model)
+            for kind, text, line in tokens:
+                if kind in ("string", "template"):
+                    _add_classes(model, _string_value((kind, text, line), " "), line, group)
+        elif anchor in ("style", "sheet"):
+            _object_declarations(model, tokens, "style" if anchor == "style" else "StyleSheet")
+        elif tokens[0][0] == "template":
+            tag = match.group("tag")
+            if tag == "tw":
+                _add_classes(model, _string_value(tokens[0], " "), tokens[0][2])
+            elif tag == "keyframes":
+                binding = KEYFRAMES_BINDING.search(source, max(0, match.start() - 80), match.start())
+                name = binding.group(1) if binding else f"line-{tokens[0][2]}"
+                _add_css(model, _string_value(tokens[0]), tokens[0][2], (f"@keyframes {name}",))
+            else:
+                _add_css(model, _string_value(tokens[0]), tokens[0][2])
+
+
+def build_style_model(path: str, source: str) -> Dict[str, Any]:
+    """Parse all styling in one file into a style model."""
+    model: Dict[str, Any] = {"version": STYLE_MODEL_VERSION, "declarations": [], "classes": [],
+                             "keyframes": {}, "groups": 0}
+    suffix = Path(path).suffix.lower()
+    if suffix in CSS_EXTENSIONS:
+        _add_css(model, source, 1)
+    elif suffix in MARKUP_EXTENSIONS:
+        _scan_markup(model, source)
+    elif suffix in SCRIPT_EXTENSIONS:
+        _scan_script(model, source)
+    return model
+
+
+# ============ CACHE ============
+def default_cache_dir(project_path) -> Path:
+    """Style model cache location for a project."""
+    return Path(project_path) / DEFAULT_CACHE_DIR
+
+
+def _cache_file(cache_dir: Path, digest: str) -> Path:
+    return Path(cache_dir) / digest[:2] / f"{digest}.json"
+
+
+def load_style_model(path: str, source: str, cache_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Return the style model for a file, through the content-hash cache when cache_dir is set."""
+    if not cache_dir:
+        return build_style_model(path, source)
+    suffix = Path(path).suffix.lower()
+    digest = hashlib.sha256(suffix.encode() + b"\0" + source.encode("utf-8", "replace")).hexdigest()
+    cache_file = _cache_file(cache_dir, digest)
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            model = json.load(f)
+        if model.get("version") == STYLE_MODEL_VERSION:
+            return model
+    except (OSError, ValueError):
+        pass
+
+    model = build_style_model(path, source)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(model, f, separators=(",", ":"))
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass  # caching is best effort
+    return model
+
+
+# ============ QUERIES ============
+def declarations(model: Dict[str, Any], *properties: str) -> List[list]:
+    """Declarations for the given properties (all declarations when none given)."""
+    if not properties:
+        return model["declarations"]
+    return [decl for decl in model["declarations"] if decl[0] in properties]
+
+
+def utilities(model: Dict[str, Any]) -> List[str]:
+    """Tailwind utilities without their variants, in source order."""
+    return [cls[0] for cls in model["classes"]]
+
+
+def has_variant(model: Dict[str, Any], *variants: str) -> bool:
+    return any(variant in cls[1] for cls in model["classes"] for variant in variants)
+
+
+def class_groups(model: Dict[str, Any]) -> List[Dict[str, set]]:
+    """
+    Utilities grouped by the attribute / call they were written in, then by
+    variant prefix: [{"": {"bg-white", "text-gray-900"}, "dark": {"bg-black"}}].
+    """
+    groups: Dict[int, Dict[str, set]] = {}
+    for utility, variants, _, group in model["classes"]:
+        groups.setdefault(group, {}).setdefault(":".join(variants), set()).add(utility)
+    return list(groups.values())
+
+
+def arbitrary_value(utility: str, prefix: str) -> Optional[str]:
+    """'text-[22px]' with prefix 'text-' -> '22px'."""
+    if not utility.startswith(prefix):
+        return None
+    match = ARBITRARY_VALUE.match(utility[len(prefix):])
+    return match.group(1).replace("_", " ") if match else None
+
+
+# --- Typography ---
+def font_weight_entries(model: Dict[str, Any]) -> List[Tuple[int, int]]:
+    """(line, weight) for numeric font weights from declarations and font-* utilities."""
+    found = []
+    for _, value, line, _ in declarations(model, "font-weight"):
+        value = value.replace("!important", "").strip().lower()
+        if value.isdigit():
+            found.append((line, int(value)))
+        elif value in ("normal", "bold"):
+            found.append((line, FONT_WEIGHT_NAMES[value]))
+    for utility, _, line, _ in model["classes"]:
+        if utility.startswith("font-"):
+            name = utility[5:]
+            if name in FONT_WEIGHT_NAMES:
+                found.append((line, FONT_WEIGHT_NAMES[name]))
+            elif (arbitrary_value(utility, "font-") or "").isdigit():
+                found.append((line, int(arbitrary_value(utility, "font-"))))
+    return found
+
+
+def font_weights(model: Dict[str, Any]) -> List[int]:
+    """Numeric font weights, in line order."""
+    return [weight for _, weight in sorted(font_weight_entries(model), key=lambda item: item[0])]
+
+
+def font_families(model: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """(@font-face families, first font of every other font-family stack)."""
+    faces, stacks = [], []
+    for _, value, _, context in declarations(model, "font-family"):
+        first = value.split(",")[0].strip().strip("\"'")
+        if any(prelude.startswith("@font-face") for prelude in context):
+            faces.append(first)
+        elif first and "var(" not in first:
+            stacks.append(first)
+    for utility in utilities(model):
+        family = arbitrary_value(utility, "font-")
+        if family and not family.isdigit():
+            stacks.append(family.split(",")[0].strip().strip("\"'"))
+    return faces, stacks
+
+
+def font_size_entries(model: Dict[str, Any]) -> List[Tuple[int, float, str]]:
+    """(line, size, unit) for px/rem/em font sizes; unitless sizes (JS style objects) are px."""
+    values = [(decl[2], decl[1]) for decl in declarations(model, "font-size")]
+    values += [(cls[2], arbitrary_value(cls[0], "text-")) for cls in model["classes"]]
+    sizes = []
+    for line, value in values:
+        match = SIZE_VALUE.match(value.strip()) if value else None
+        if match:
+            sizes.append((line, float(match.group(1)), match.group(2) or "px"))
+    return sizes
+
+
+def font_sizes(model: Dict[str, Any]) -> List[Tuple[float, str]]:
+    """(size, unit) for every font size (see font_size_entries)."""
+    return [(size, unit) for _, size, unit in font_size_entries(model)]
+
+
+def has_font_sizes(model: Dict[str, Any]) -> bool:
+    return bool(declarations(model, "font-size")) or not TAILWIND_TEXT_SIZES.isdisjoint(utilities(model))
+
+
+def has_fluid_type(model: Dict[str, Any]) -> bool:
+    """font-size with clamp()/viewport units, or a text-[clamp(...)] utility."""
+    values = [decl[1] for decl in declarations(model, "font-size")]
+    values += [v for v in (arbitrary_value(u, "text-") for u in utilities(model)) if v]
+    return any("clamp(" in value or re.search(r'\d(?:vw|vi|cqi)\b', value) for value in values)
+
+
+def display_text(model: Dict[str, Any]) -> bool:
+    """Large display text: text-4xl and up, or font-size of 30px / 1.875rem and up."""
+    if not TAILWIND_DISPLAY_SIZES.isdisjoint(utilities(model)):
+        return True
+    return any(size * (16 if unit in ("rem", "em") else 1) >= 30 for size, unit in font_sizes(model))
+
+
+def line_heights(model: Dict[str, Any]) -> List[float]:
+    """Line-height ratios (unitless values and leading-* utilities)."""
+    ratios = []
+    for _, value, _, context in declarations(model, "line-height"):
+        value = value.replace("!important", "").strip()
+        # React Native line heights are absolute points, not ratios
+        if UNITLESS_NUMBER.match(value) and context != ["StyleSheet"]:
+            ratios.append(float(value))
+    for utility in utilities(model):
+        if utility.startswith("leading-"):
+            name = utility[len("leading-"):]
+            arbitrary = arbitrary_value(utility, "leading-")
+            if name in TAILWIND_LEADING:
+                ratios.append(TAILWIND_LEADING[name])
+            elif arbitrary and UNITLESS_NUMBER.match(arbitrary):
+                ratios.append(float(arbitrary))
+    return ratios
+
+
+def has_line_height(model: Dict[str, Any]) -> bool:
+    return bool(declarations(model, "line-height")) or any(u.startswith("leading-") for u in utilities(model))
+
+
+def has_uppercase(model: Dict[str, Any]) -> bool:
+    return any("uppercase" in decl[1].lower() for decl in declarations(model, "text-transform")) \
+        or "uppercase" in utilities(model)
+
+
+def has_tracking(model: Dict[str, Any], tight: bool = False) -> bool:
+    """Letter spacing set (tight=True: negative / tracking-tight only)."""
+    for _, value, _, _ in declarations(model, "letter-spacing"):
+        if not tight or value.strip().startswith("-"):
+            return True
+    for utility in utilities(model):
+        if utility.startswith(("tracking-", "-tracking-")):
+            if not tight or utility in ("tracking-tight", "tracking-tighter") or utility.startswith("-tracking-") \
+                    or (arbitrary_value(utility, "tracking-") or "").startswith("-"):
+                return True
+    return False
+
+
+def has_line_length_limit(model: Dict[str, Any]) -> bool:
+    """max-width in ch, or max-w-prose / max-w-[65ch]."""
+    if any(re.search(r'\d\s*ch\b', decl[1]) for decl in declarations(model, "max-width", "max-inline-size")):
+        return True
+    return any(utility == "max-w-prose" or (arbitrary_value(utility, "max-w-") or "").endswith("ch")
+               for utility in utilities(model))
+
+
+# --- Color ---
+def color_values(model: Dict[str, Any], properties: Tuple[str, ...] = (),
+                 utility_prefix: str = "") -> List[str]:
+    """
+    Literal colors (hex, rgb(a), hsl(a)) from declarations and arbitrary
+    utilities, optionally only for some properties / a utility prefix ('bg-').
+    """
+    colors = []
+    for _, value, _, _ in declarations(model, *properties):
+        colors.extend(COLOR_VALUE.findall(value))
+    for utility in utilities(model):
+        match = ARBITRARY_VALUE.search(utility) if utility.startswith(utility_prefix) else None
+        if match:
+            colors.extend(COLOR_VALUE.findall(match.group(1).replace("_", " ")))
+    return colors
+
+
+def hsl_hues(model: Dict[str, Any]) -> List[int]:
+    hues = []
+    for color in color_values(model):
+        match = re.match(r'hsla?\(\s*(\d+)', color)
+        if match:
+            hues.append(int(match.group(1)))
+    return hues
+
+
+def uses_dark_mode(model: Dict[str, Any]) -> bool:
+    """dark: variants, .dark selectors or prefers-color-scheme: dark media queries."""
+    if has_variant(model, "dark"):
+        return True
+    return any(".dark" in prelude or "prefers-color-scheme: dark" in prelude.replace("  ", " ")
+               for decl in model["declarations"] for prelude in decl[3])
+
+
+# --- Effects & motion ---
+def shadows(model: Dict[str, Any]) -> List[str]:
+    """Full box-shadow values (multi-line declarations joined)."""
+    return [decl[1] for decl in declarations(model, "box-shadow") if decl[1].strip() not in ("none", "")]
+
+
+def shadow_utilities(model: Dict[str, Any]) -> List[str]:
+    return [u for u in utilities(model) if (u == "shadow" or u.startswith("shadow-")) and u != "shadow-none"]
+
+
+def text_shadows(model: Dict[str, Any]) -> List[str]:
+    return [decl[1] for decl in declarations(model, "text-shadow") if decl[1].strip() != "none"]
+
+
+def blur_effects(model: Dict[str, Any]) -> int:
+    """Number of blur filters (declarations and blur-*/backdrop-blur-* utilities)."""
+    count = sum(1 for decl in declarations(model, "backdrop-filter", "-webkit-backdrop-filter", "filter")
+                if "blur(" in decl[1])
+    return count + sum(1 for u in utilities(model)
+                       if u.startswith(("blur", "backdrop-blur")) and not u.endswith("-none"))
+
+
+def has_translucent_background(model: Dict[str, Any]) -> bool:
+    """Semi-transparent backgrounds: rgba/hsla/alpha values, bg-x/NN or bg-opacity-*."""
+    for _, value, _, _ in declarations(model, "background", "background-color"):
+        if re.search(r'rgba\(|hsla\(|/\s*[\d.]+%?\s*\)|transparent', value):
+            return True
+    return any(re.match(r'bg-[\w-]+/\d+$|bg-opacity-\d+$', u) for u in utilities(model))
+
+
+def animated_properties(model: Dict[str, Any]) -> List[str]:
+    """Properties animated by @keyframes or named in transitions, first-seen order."""
+    animated: List[str] = []
+    for props in model["keyframes"].values():
+        animated.extend(props)
+    for _, value, _, _ in declarations(model, "transition-property"):
+        animated.extend(part.strip() for part in value.split(","))
+    for _, value, _, _ in declarations(model, "transition"):
+        animated.extend(part.split()[0] for part in value.split(",") if part.split())
+    for utility in utilities(model):
+        arbitrary = arbitrary_value(utility, "transition-")
+        if arbitrary:
+            animated.extend(part.strip() for part in arbitrary.split(","))
+    return list(dict.fromkeys(prop for prop in animated if prop and not TIME_VALUE.match(prop)))
+
+
+def motion_count(model: Dict[str, Any], include_utilities: bool = True) -> int:
+    """@keyframes blocks, animation/transition declarations and animate-* utilities."""
+    count = len(model["keyframes"])
+    count += sum(1 for decl in model["declarations"] if decl[0].startswith(("animation", "transition")))
+    if not include_utilities:
+        return count
+    return count + sum(1 for u in utilities(model) if u.startswith("animate-") and u != "animate-none")
+
+
+def reduced_motion(model: Dict[str, Any]) -> bool:
+    """prefers-reduced-motion media queries or motion-safe:/motion-reduce: variants."""
+    if has_variant(model, "motion-safe", "motion-reduce"):
+        return True
+    return any("prefers-reduced-motion" in prelude for decl in model["declarations"] for prelude in decl[3])
+
+
+def durations(model: Dict[str, Any]) -> List[Tuple[str, str, str]]:
+    """
+    (number, unit, kind) durations, kind being 'transition' or 'animation',
+    from declarations and duration-* utilities (Tailwind transition durations).
+    """
+    found = []
+    for prop, value, _, _ in model["declarations"]:
+        kind = prop.split("-")[0]
+        if prop in ("transition-duration", "animation-duration"):
+            found.extend((number, unit, kind) for number, unit in TIME_VALUE.findall(value))
+        elif prop in ("transition", "animation"):
+            for part in value.split(","):
+                first_time = TIME_VALUE.search(part)
+                if first_time:
+                    found.append(first_time.groups() + (kind,))
+    for utility in utilities(model):
+        if utility.startswith("duration-"):
+            name = utility[len("duration-"):]
+            if name.isdigit():
+                found.append((name, "ms", "transition"))
+            else:
+                found.extend((number, unit, "transition")
+                             for number, unit in TIME_VALUE.findall(arbitrary_value(utility, "duration-") or ""))
+    return found
+
+
+def will_change(model: Dict[str, Any]) -> List[str]:
+    """will-change values from declarations and will-change-* utilities."""
+    values = []
+    for _, value, _, _ in declarations(model, "will-change"):
+        values.extend(part.strip() for part in value.split(","))
+    for utility in utilities(model):
+        if utility.startswith("will-change-"):
+            arbitrary = arbitrary_value(utility, "will-change-")
+            values.extend(part.strip() for part in (arbitrary or utility[len("will-change-"):]).split(","))
+    return values
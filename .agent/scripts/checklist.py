@@ -26,6 +26,9 @@ import argparse
 from pathlib import Path
 from typing import List, Tuple, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".shared" / "code-analysis" / "scripts"))
+from findings import SEVERITIES, at_least, run_streaming
+
 # ANSI colors for terminal output
 class Colors:
     HEADER = '\033[95m'
@@ -69,16 +72,30 @@ PERFORMANCE_CHECKS = [
     ("Playwright E2E", ".agent/skills/webapp-testing/scripts/playwright_runner.py", False),
 ]
 
+# Checkers that can stream findings as JSON Lines (--format jsonl)
+STREAMING_SCRIPTS = {
+    "security_scan.py", "ux_audit.py", "mobile_audit.py",
+    "seo_checker.py", "geo_checker.py", "i18n_checker.py",
+}
+
+def format_counts(counts: dict) -> str:
+    """'2 critical, 5 high' for the non-zero severities."""
+    return ", ".join(f"{counts[s]} {s}" for s in SEVERITIES if counts.get(s)) or "no findings"
+
 def check_script_exists(script_path: Path) -> bool:
     """Check if script file exists"""
     return script_path.exists() and script_path.is_file()
 
-def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None) -> dict:
+def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None,
+               fail_on: Optional[str] = None) -> dict:
     """
     Run a validation script and capture results
     
+    Checkers in STREAMING_SCRIPTS are read as JSON Lines while they run; with
+    fail_on set, the first finding at or above that severity stops the checker.
+    
     Returns:
-        dict with keys: name, passed, output, skipped
+        dict with keys: name, passed, output, skipped (plus counts, stopped when streamed)
     """
     if not check_script_exists(script_path):
         print_warning(f"{name}: Script not found, skipping")
@@ -91,6 +108,9 @@ def run_script(name: str, script_path: Path, project_path: str, url: Optional[st
     if url and ("lighthouse" in script_path.name.lower() or "playwright" in script_path.name.lower()):
         cmd.append(url)
     
+    if script_path.name in STREAMING_SCRIPTS:
+        return run_streaming_script(name, cmd, fail_on)
+    
     # Run script
     try:
         result = subprocess.run(
@@ -125,6 +145,49 @@ def run_script(name: str, script_path: Path, project_path: str, url: Optional[st
         print_error(f"{name}: ERROR - {str(e)}")
         return {"name": name, "passed": False, "output": "", "error": str(e), "skipped": False}
 
+def run_streaming_script(name: str, cmd: List[str], fail_on: Optional[str]) -> dict:
+    """Run a checker with --format jsonl, aggregating findings as they arrive"""
+    trigger = {}
+    
+    def on_finding(finding: dict) -> bool:
+        if at_least(finding["severity"], fail_on):
+            trigger.update(finding)
+            return True
+        return False
+    
+    try:
+        stream = run_streaming(cmd + ["--format", "jsonl"], on_finding, timeout=300)
+    except Exception as e:
+        print_error(f"{name}: ERROR - {str(e)}")
+        return {"name": name, "passed": False, "output": "", "error": str(e), "skipped": False}
+    
+    result = {
+        "name": name,
+        "output": stream["output"],
+        "error": stream["error"],
+        "skipped": False,
+        "counts": stream["counts"],
+        "stopped": stream["stopped"],
+    }
+    
+    if stream["timed_out"]:
+        print_error(f"{name}: TIMEOUT (>5 minutes)")
+        return dict(result, passed=False, error="Timeout")
+    
+    if stream["stopped"]:
+        print_error(f"{name}: FAILED FAST on {trigger['severity']} finding")
+        print(f"  {trigger['rule']}: {trigger['message'][:200]} {trigger.get('file', '')}".rstrip())
+        return dict(result, passed=False, error=f"{trigger['severity']} finding: {trigger['message'][:200]}")
+    
+    passed = stream["returncode"] == 0
+    if passed:
+        print_success(f"{name}: PASSED - {format_counts(stream['counts'])}")
+    else:
+        print_error(f"{name}: FAILED - {format_counts(stream['counts'])}")
+        if stream["error"]:
+            print(f"  Error: {stream['error'][:200]}")
+    return dict(result, passed=passed)
+
 def print_summary(results: List[dict]):
     """Print final summary report"""
     print_header("📊 CHECKLIST SUMMARY")
@@ -137,6 +200,11 @@ def print_summary(results: List[dict]):
     print(f"{Colors.GREEN}✅ Passed: {passed_count}{Colors.ENDC}")
     print(f"{Colors.RED}❌ Failed: {failed_count}{Colors.ENDC}")
     print(f"{Colors.YELLOW}⏭️  Skipped: {skipped_count}{Colors.ENDC}")
+    
+    # Findings streamed by the checkers
+    totals = {severity: sum(r.get("counts", {}).get(severity, 0) for r in results) for severity in SEVERITIES}
+    if any(totals.values()):
+        print(f"Findings: {format_counts(totals)}")
     print()
     
     # Detailed results
@@ -148,7 +216,8 @@ def print_summary(results: List[dict]):
         else:
             status = f"{Colors.RED}❌{Colors.ENDC}"
         
-        print(f"{status} {r['name']}")
+        counts_str = f" - {format_counts(r['counts'])}" if r.get("counts") else ""
+        print(f"{status} {r['name']}{counts_str}")
     
     print()
     
@@ -167,10 +236,13 @@ def main():
 Examples:
   python scripts/checklist.py .                      # Core checks only
   python scripts/checklist.py . --url http://localhost:3000  # Include performance
+  python scripts/checklist.py . --fail-on high               # Stop at the first high finding
         """
     )
     parser.add_argument("project", help="Project path to validate")
     parser.add_argument("--url", help="URL for performance checks (lighthouse, playwright)")
+    parser.add_argument("--fail-on", choices=SEVERITIES, default=None,
+                        help="Stop a streaming checker at its first finding of this severity or higher")
     parser.add_argument("--skip-performance", action="store_true", help="Skip performance checks even if URL provided")
     
     args = parser.parse_args()
@@ -191,11 +263,11 @@ Examples:
     print_header("📋 CORE CHECKS")
     for name, script_path, required in CORE_CHECKS:
         script = project_path / script_path
-        result = run_script(name, script, str(project_path))
+        result = run_script(name, script, str(project_path), fail_on=args.fail_on)
         results.append(result)
         
-        # If required check fails, stop
-        if required and not result["passed"] and not result.get("skipped"):
+        # If required check fails (or a --fail-on finding stopped it), stop
+        if (required or result.get("stopped")) and not result["passed"] and not result.get("skipped"):
             print_error(f"CRITICAL: {name} failed. Stopping checklist.")
             print_summary(results)
             sys.exit(1)
@@ -29,6 +29,9 @@ from pathlib import Path
 from typing import List, Dict, Optional
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".shared" / "code-analysis" / "scripts"))
+from findings import SEVERITIES, at_least, run_streaming
+
 # ANSI colors
 class Colors:
     HEADER = '\033[95m'
@@ -111,6 +114,14 @@ VERIFICATION_SUITE = [
         ]
     },
     
+    # P6: Performance (static source checks)
+    {
+        "category": "Frontend Performance",
+        "checks": [
+            ("React Perf Audit", ".agent/skills/performance-profiling/scripts/react_perf_audit.py", False),
+        ]
+    },
+    
     # P6: Performance (requires URL)
     {
         "category": "Performance",
@@ -147,8 +158,24 @@ VERIFICATION_SUITE = [
     },
 ]
 
-def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None) -> dict:
-    """Run validation script"""
+# Checkers that can stream findings as JSON Lines (--format jsonl)
+STREAMING_SCRIPTS = {
+    "security_scan.py", "ux_audit.py", "mobile_audit.py",
+    "seo_checker.py", "geo_checker.py", "i18n_checker.py", "react_perf_audit.py",
+    "accessibility_checker.py",
+}
+
+def format_counts(counts: dict) -> str:
+    """'2 critical, 5 high' for the non-zero severities."""
+    return ", ".join(f"{counts[s]} {s}" for s in SEVERITIES if counts.get(s)) or "no findings"
+
+def run_script(name: str, script_path: Path, project_path: str, url: Optional[str] = None,
+               fail_on: Optional[str] = None) -> dict:
+    """
+    Run validation script. Checkers in STREAMING_SCRIPTS are read as JSON Lines
+    while they run; with fail_on set, the first finding at or above that
+    severity stops the checker and fails the check.
+    """
     if not script_path.exists():
         print_warning(f"{name}: Script not found, skipping")
         return {"name": name, "passed": True, "skipped": True, "duration": 0}
@@ -161,6 +188,9 @@ def run_script(name: str, script_path: Path, project_path: str, url: Optional[st
     if url and ("lighthouse" in script_path.name.lower() or "playwright" in script_path.name.lower()):
         cmd.append(url)
     
+    if script_path.name in STREAMING_SCRIPTS:
+        return run_streaming_script(name, cmd, start_time, fail_on)
+    
     # Run
     try:
         result = subprocess.run(
@@ -199,6 +229,53 @@ def run_script(name: str, script_path: Path, project_path: str, url: Optional[st
         print_error(f"{name}: ERROR - {str(e)}")
         return {"name": name, "passed": False, "skipped": False, "duration": duration, "error": str(e)}
 
+def run_streaming_script(name: str, cmd: List[str], start_time: datetime, fail_on: Optional[str]) -> dict:
+    """Run a checker with --format jsonl, aggregating findings as they arrive"""
+    trigger = {}
+    
+    def on_finding(finding: dict) -> bool:
+        if at_least(finding["severity"], fail_on):
+            trigger.update(finding)
+            return True
+        return False
+    
+    try:
+        stream = run_streaming(cmd + ["--format", "jsonl"], on_finding, timeout=600)
+    except Exception as e:
+        duration = (datetime.now() - start_time).total_seconds()
+        print_error(f"{name}: ERROR - {str(e)}")
+        return {"name": name, "passed": False, "skipped": False, "duration": duration, "error": str(e)}
+    
+    duration = (datetime.now() - start_time).total_seconds()
+    result = {
+        "name": name,
+        "output": stream["output"],
+        "error": stream["error"],
+        "skipped": False,
+        "duration": duration,
+        "counts": stream["counts"],
+        "stopped": stream["stopped"],
+    }
+    
+    if stream["timed_out"]:
+        print_error(f"{name}: TIMEOUT (>{duration:.0f}s)")
+        return dict(result, passed=False, error="Timeout")
+    
+    if stream["stopped"]:
+        location = trigger.get("file", "")
+        print_error(f"{name}: FAILED FAST on {trigger['severity']} finding ({duration:.1f}s)")
+        print(f"  {trigger['rule']}: {trigger['message'][:200]} {location}".rstrip())
+        return dict(result, passed=False, error=f"{trigger['severity']} finding: {trigger['message'][:200]}")
+    
+    passed = stream["returncode"] == 0
+    if passed:
+        print_success(f"{name}: PASSED ({duration:.1f}s) - {format_counts(stream['counts'])}")
+    else:
+        print_error(f"{name}: FAILED ({duration:.1f}s) - {format_counts(stream['counts'])}")
+        if stream["error"]:
+            print(f"  {stream['error'][:300]}")
+    return dict(result, passed=passed)
+
 def print_final_report(results: List[dict], start_time: datetime):
     """Print comprehensive final report"""
     total_duration = (datetime.now() - start_time).total_seconds()
@@ -216,6 +293,11 @@ def print_final_report(results: List[dict], start_time: datetime):
     print(f"{Colors.GREEN}✅ Passed: {passed}{Colors.ENDC}")
     print(f"{Colors.RED}❌ Failed: {failed}{Colors.ENDC}")
     print(f"{Colors.YELLOW}⏭️  Skipped: {skipped}{Colors.ENDC}")
+    
+    # Findings streamed by the checkers
+    totals = {severity: sum(r.get("counts", {}).get(severity, 0) for r in results) for severity in SEVERITIES}
+    if any(totals.values()):
+        print(f"Findings: {format_counts(totals)}")
     print()
     
     # Category breakdown
@@ -236,7 +318,8 @@ def print_final_report(results: List[dict], start_time: datetime):
             status = f"{Colors.RED}❌{Colors.ENDC}"
         
         duration_str = f"({r.get('duration', 0):.1f}s)" if not r.get("skipped") else ""
-        print(f"  {status} {r['name']} {duration_str}")
+        counts_str = f"- {format_counts(r['counts'])}" if r.get("counts") else ""
+        print(f"  {status} {r['name']} {duration_str} {counts_str}".rstrip())
     
     print()
     
@@ -268,12 +351,15 @@ def main():
 Examples:
   python scripts/verify_all.py . --url http://localhost:3000
   python scripts/verify_all.py . --url https://staging.example.com --no-e2e
+  python scripts/verify_all.py . --url http://localhost:3000 --fail-on critical --stop-on-fail
         """
     )
     parser.add_argument("project", help="Project path to validate")
     parser.add_argument("--url", required=True, help="URL for performance & E2E checks")
     parser.add_argument("--no-e2e", action="store_true", help="Skip E2E tests")
     parser.add_argument("--stop-on-fail", action="store_true", help="Stop on first failure")
+    parser.add_argument("--fail-on", choices=SEVERITIES, default=None,
+                        help="Stop a streaming checker at its first finding of this severity or higher")
     
     args = parser.parse_args()
     
@@ -308,12 +394,12 @@ Examples:
         
         for name, script_path, required in suite["checks"]:
             script = project_path / script_path
-            result = run_script(name, script, str(project_path), args.url)
+            result = run_script(name, script, str(project_path), args.url, args.fail_on)
             result["category"] = category
             results.append(result)
             
-            # Stop on critical failure if flag set
-            if args.stop_on_fail and required and not result["passed"] and not result.get("skipped"):
+            # Stop on critical failure (or a --fail-on finding) if flag set
+            if args.stop_on_fail and (required or result.get("stopped")) and not result["passed"] and not result.get("skipped"):
                 print_error(f"CRITICAL: {name} failed. Stopping verification.")
                 print_final_report(results, start_time)
                 sys.exit(1)
@@ -2,11 +2,27 @@
 """
 API Validator - Checks API endpoints for best practices.
 Validates OpenAPI specs, response formats, and common issues.
+
+Express route registrations (app.get('/api/accounts/:id', requireAuth(), handler))
+and the shared route contract (api.<group>.<name> = { method, path, input,
+responses }) are parsed into a per-endpoint index. Each endpoint reports
+whether it validates input, uses auth middleware, paginates list responses,
+handles errors and sets status codes; list endpoints that return unbounded
+arrays are flagged. Other API files get the file-level checks.
+
+Usage:
+    python api_validator.py <project_path> [--json] [--format jsonl|sarif]
 """
 import sys
 import json
 import re
+import argparse
 from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "code-analysis" / "scripts"))
+from findings import add_format_argument, make_finding, open_writer, slug
+from route_index import build_route_index
 
 # Fix Windows console encoding for Unicode output
 try:
@@ -15,6 +31,20 @@ try:
 except AttributeError:
     pass  # Python < 3.7
 
+MAX_API_FILES = 15
+INPUT_SOURCES = {'body', 'query', 'params'}
+VALIDATION_METHODS = {'parse', 'safeParse', 'parseAsync', 'safeParseAsync', 'validate', 'validateAsync',
+                      'validateSync'}
+AUTH_MIDDLEWARE = re.compile(r'auth|guard|protect|session|jwt|passport|login|admin', re.I)
+AUTH_CALLS = {'getAuth', 'isAuthenticated', 'requireAuth', 'verifyToken', 'verifyJwt', 'getServerSession'}
+PAGINATION_NAMES = {'limit', 'offset', 'page', 'pagesize', 'perpage', 'per_page', 'page_size', 'cursor',
+                    'take', 'skip', 'after', 'before'}
+BOUNDING_CALLS = {'slice', 'limit', 'take', 'paginate'}
+ARRAY_CALLS = {'map', 'filter', 'flatMap', 'concat'}
+LIST_CALL = re.compile(r'^(?:list|getAll|findAll|findMany|search)|(?:List|All)$')
+RESPONSE_CALLS = {'json', 'send'}
+MUTATING_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+
 def find_api_files(project_path: Path) -> list:
     """Find API-related files."""
     patterns = [
@@ -159,31 +189,229 @@ def check_api_code(file_path: Path) -> dict:
     
     return {'file': str(file_path), 'passed': passed, 'issues': issues, 'type': 'code'}
 
+# ============ ENDPOINTS ============
+def _request_name(tokens: List[tuple]) -> str:
+    """Name of the handler's request parameter (req in (req, res) => ...)."""
+    for j, (kind, text, _) in enumerate(tokens[:40]):
+        if text == '(' and j + 1 < len(tokens) and tokens[j + 1][0] == 'ident':
+            return tokens[j + 1][1]
+        if kind == 'ident' and j + 1 < len(tokens) and tokens[j + 1][1] == '=>':
+            return text
+    return 'req'
+
+def _is_call(tokens: List[tuple], j: int, names) -> bool:
+    """Whether tokens[j] is a method call .name( with name in names."""
+    return (tokens[j][1] in names and j and tokens[j - 1][1] in ('.', '?.')
+            and j + 1 < len(tokens) and tokens[j + 1][1] == '(')
+
+def _assigned_value(tokens: List[tuple], name: str, before: int) -> List[tuple]:
+    """Tokens of the last `name = ...` assignment before index `before`, up to the end of its statement."""
+    for j in range(before - 2, -1, -1):
+        if tokens[j][1] == name and tokens[j + 1][1] == '=' and tokens[j][0] == 'ident':
+            depth = 0
+            for k in range(j + 2, before):
+                text = tokens[k][1]
+                if text in ('(', '[', '{'):
+                    depth += 1
+                elif text in (')', ']', '}'):
+                    depth -= 1
+                    if depth < 0:
+                        return tokens[j + 2:k]
+                elif text == ';' and depth == 0:
+                    return tokens[j + 2:k]
+            return tokens[j + 2:before]
+    return []
+
+def _returns_array(value: List[tuple]) -> bool:
+    if value and value[0][1] == '[':
+        return True
+    for j, (kind, text, _) in enumerate(value):
+        if _is_call(value, j, ARRAY_CALLS):
+            return True
+        if kind == 'ident' and j + 1 < len(value) and value[j + 1][1] == '(' and LIST_CALL.search(text):
+            return True
+    return False
+
+def _responds_with_list(tokens: List[tuple]) -> bool:
+    """Whether a res.json(...)/res.send(...) call sends an array."""
+    for j in range(len(tokens)):
+        if not _is_call(tokens, j, RESPONSE_CALLS):
+            continue
+        depth = 0
+        for end in range(j + 1, len(tokens)):
+            if tokens[end][1] in ('(', '[', '{'):
+                depth += 1
+            elif tokens[end][1] in (')', ']', '}'):
+                depth -= 1
+                if depth == 0:
+                    break
+        arg = tokens[j + 2:end]
+        if len(arg) == 1 and arg[0][0] == 'ident':
+            arg = _assigned_value(tokens, arg[0][1], j)
+        if _returns_array(arg):
+            return True
+    return False
+
+def analyze_endpoint(route: Dict[str, Any], contract: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Per-endpoint verdicts for one route registration, with its issues as (severity, rule, message)."""
+    entry = contract.get(route['contract']) if route['contract'] else None
+    endpoint = {'method': route['method'], 'path': route['path'], 'file': route['file'], 'line': route['line'],
+                'contract': route['contract'], 'middleware': route['middleware'],
+                'handler': route.get('handler_name') or 'inline'}
+    label = f"{route['method']} {route['path']}"
+    issues = []
+    if entry and entry['method'] != route['method']:
+        issues.append(('high', 'contract/method-mismatch',
+                       f"{label}: registered as {route['method']} but the contract ({entry['name']}) says {entry['method']}"))
+
+    tokens = route['handler']
+    if tokens is None:
+        endpoint['issues'] = issues + [('low', 'endpoint/handler-not-found',
+                                        f"{label}: handler {route['handler_name']} not found")]
+        return endpoint
+
+    texts = [t[1] for t in tokens]
+    request = _request_name(tokens)
+    reads = sorted({texts[j + 2] for j in range(len(texts) - 2)
+                    if texts[j] == request and texts[j + 1] in ('.', '?.') and texts[j + 2] in INPUT_SOURCES})
+    validates = (any(_is_call(tokens, j, VALIDATION_METHODS) for j in range(len(tokens)))
+                 or any('valid' in name.lower() for name in route['middleware']))
+    if any(AUTH_MIDDLEWARE.search(name) for name in route['middleware']):
+        auth = 'middleware'
+    elif any(kind == 'ident' and text in AUTH_CALLS for kind, text, _ in tokens):
+        auth = 'inline'
+    else:
+        auth = None
+    statuses = sorted({int(tokens[j + 2][1]) for j in range(len(tokens) - 2)
+                       if _is_call(tokens, j, ('status', 'sendStatus')) and tokens[j + 2][0] == 'number'
+                       and tokens[j + 2][1].isdigit()})
+    is_list = route['method'] == 'GET' and ((entry is not None and entry['list']) or _responds_with_list(tokens))
+    paginated = (any(kind == 'ident' and text.lower() in PAGINATION_NAMES for kind, text, _ in tokens)
+                 or any(_is_call(tokens, j, BOUNDING_CALLS) for j in range(len(tokens))))
+    handles_errors = 'try' in texts or any(_is_call(tokens, j, ('catch',)) for j in range(len(tokens)))
+
+    endpoint.update(reads=reads, validates=validates, auth=auth, list=is_list,
+                    paginated=paginated if is_list else None, statuses=statuses, error_handling=handles_errors)
+
+    if is_list and not paginated:
+        issues.append(('high', 'endpoint/unbounded-list',
+                       f"{label}: list response is unbounded (no limit/offset/cursor)"))
+    if 'body' in reads and not validates:
+        declared = " (the contract declares an input schema)" if entry and entry['input'] else ""
+        issues.append(('medium', 'endpoint/unvalidated-body', f"{label}: reads req.body without schema validation{declared}"))
+    elif 'query' in reads and not validates:
+        issues.append(('low', 'endpoint/unvalidated-query', f"{label}: reads req.query without schema validation"))
+    if auth is None:
+        severity = 'medium' if route['method'] in MUTATING_METHODS else 'low'
+        issues.append((severity, 'endpoint/no-auth', f"{label}: no auth middleware"))
+    if 'await' in texts and not handles_errors:
+        issues.append(('medium', 'endpoint/no-error-handling', f"{label}: awaits without try/catch"))
+    if not statuses and route['method'] in MUTATING_METHODS:
+        issues.append(('low', 'endpoint/no-status-codes', f"{label}: sets no explicit status codes"))
+    endpoint['issues'] = issues
+    return endpoint
+
+def check_endpoints(project_path: Path) -> Dict[str, Any]:
+    """Endpoint index of every route registration, plus contract entries no route serves."""
+    index = build_route_index(project_path)
+    endpoints = [analyze_endpoint(route, index['contract']) for route in index['routes']]
+    served = {route['contract'] for route in index['routes']}
+    unregistered = [('low', 'contract/unregistered', f"{entry['method']} {entry['path']}: contract entry {name} has no route",
+                     entry['file'], entry['line'])
+                    for name, entry in sorted(index['contract'].items()) if name not in served]
+    return {'endpoints': endpoints, 'unregistered': unregistered, 'files': index['files'],
+            'contract_entries': len(index['contract'])}
+
+def endpoint_findings(endpoint_result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    findings = []
+    for endpoint in endpoint_result['endpoints']:
+        for severity, rule, message in endpoint['issues']:
+            findings.append(make_finding("api_validator", rule, severity, message, file=endpoint['file'],
+                                         line=endpoint['line'], category="Endpoints",
+                                         method=endpoint['method'], path=endpoint['path']))
+    for severity, rule, message, file, line in endpoint_result['unregistered']:
+        findings.append(make_finding("api_validator", rule, severity, message, file=file, line=line, category="Contract"))
+    return findings
+
+def _flag(value: Optional[bool]) -> str:
+    return '-' if value is None else ('yes' if value else 'NO')
+
+def print_endpoints(endpoint_result: Dict[str, Any], project_path: Path):
+    endpoints = endpoint_result['endpoints']
+    print(f"[ENDPOINTS] {len(endpoints)} routes, {endpoint_result['contract_entries']} contract entries")
+    print(f"   {'METHOD':<7}{'PATH':<52}{'AUTH':<6}{'VALID':<6}{'PAGED':<6}STATUS")
+    for e in endpoints:
+        if e['handler'] != 'inline' and 'reads' not in e:
+            print(f"   {e['method']:<7}{e['path'][:50]:<52}(handler {e['handler']} not found)")
+            continue
+        valid = _flag(e['validates']) if {'body', 'query'} & set(e['reads']) else '-'
+        statuses = ','.join(str(code) for code in e['statuses']) or '-'
+        print(f"   {e['method']:<7}{e['path'][:50]:<52}{_flag(bool(e['auth'])):<6}{valid:<6}"
+              f"{_flag(e['paginated']):<6}{statuses}")
+
+    issues = [(severity, message) for e in endpoints for severity, _, message in e['issues']]
+    issues += [(severity, message) for severity, _, message, _, _ in endpoint_result['unregistered']]
+    if issues:
+        print(f"\n[ENDPOINT ISSUES] {len(issues)}")
+        for severity, message in issues:
+            print(f"   {'[X]' if severity == 'high' else '[!]'} {message}")
+
 def main():
-    target = sys.argv[1] if len(sys.argv) > 1 else "."
-    project_path = Path(target)
-    
-    print("\n" + "=" * 60)
-    print("  API VALIDATOR - Endpoint Best Practices Check")
-    print("=" * 60 + "\n")
-    
-    api_files = find_api_files(project_path)
-    
-    if not api_files:
-        print("[!] No API files found.")
-        print("   Looking for: routes/, controllers/, api/, openapi.json/yaml")
-        sys.exit(0)
-    
+    parser = argparse.ArgumentParser(description="API endpoint best-practice checks")
+    parser.add_argument("project_path", nargs="?", default=".", help="Project directory")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    add_format_argument(parser)
+    args = parser.parse_args()
+    project_path = Path(args.project_path)
+
+    endpoint_result = check_endpoints(project_path)
+    indexed = {Path(f).resolve() for f in endpoint_result['files']}
+    api_files = [f for f in find_api_files(project_path) if f.resolve() not in indexed]
+
     results = []
-    for file_path in api_files[:15]:  # Limit
+    for file_path in api_files[:MAX_API_FILES]:
         if 'openapi' in file_path.name.lower() or 'swagger' in file_path.name.lower():
             result = check_openapi_spec(file_path)
         else:
             result = check_api_code(file_path)
         results.append(result)
-    
+
+    findings = endpoint_findings(endpoint_result)
+    critical = (sum(1 for f in findings if f['severity'] == 'high')
+                + sum(1 for r in results for item in r['issues'] if item.startswith("[X]")))
+
+    writer = open_writer("api_validator", args.format)
+    if writer:
+        writer.write_all(findings)
+        for result in results:
+            for item in result['issues']:
+                severity = 'high' if item.startswith("[X]") else 'medium'
+                message = re.sub(r'^\[.\]\s*', '', item)
+                writer.write(make_finding("api_validator", f"file/{slug(message)}", severity, message,
+                                          file=result['file'], category="API"))
+        writer.close(passed=critical == 0, endpoints=len(endpoint_result['endpoints']), files=len(results))
+        sys.exit(0 if critical == 0 else 1)
+
+    if args.json:
+        endpoints = [{**e, 'issues': [message for _, _, message in e['issues']]} for e in endpoint_result['endpoints']]
+        print(json.dumps({"script": "api_validator", "endpoints": endpoints, "files": results,
+                          "passed": critical == 0}, indent=2))
+        sys.exit(0 if critical == 0 else 1)
+
+    print("\n" + "=" * 60)
+    print("  API VALIDATOR - Endpoint Best Practices Check")
+    print("=" * 60 + "\n")
+
+    if not api_files and not endpoint_result['endpoints']:
+        print("[!] No API files found.")
+        print("   Looking for: routes/, controllers/, api/, openapi.json/yaml, app.get(...) registrations")
+        sys.exit(0)
+
+    if endpoint_result['endpoints']:
+        print_endpoints(endpoint_result, project_path)
+
     # Print results
-    total_issues = 0
+    total_issues = sum(1 for f in findings if f['severity'] == 'high')
     total_passed = 0
     
     for result in results:
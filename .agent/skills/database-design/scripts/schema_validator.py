@@ -1,24 +1,33 @@
 #!/usr/bin/env python3
 """
 Schema Validator - Database schema validation
-Validates Prisma schemas and checks for common issues.
+Validates Prisma and Drizzle schemas and checks for common issues.
 
 Usage:
-    python schema_validator.py <project_path>
+    python schema_validator.py <project_path> [--ddl]
 
 Checks:
     - Prisma schema syntax
     - Missing relations
     - Index recommendations
     - Naming conventions
+    - Drizzle tables (pgTable/mysqlTable/sqliteTable in any file, e.g.
+      shared/schema.ts): missing primary keys, and foreign-key columns or
+      columns used in .where()/.xxxJoin() that no declared index leads with,
+      with the CREATE INDEX statement for each (--ddl prints only those)
 """
 
 import sys
 import json
 import re
+import argparse
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "code-analysis" / "scripts"))
+from drizzle_schema import find_schema_files as find_drizzle_files
+from drizzle_schema import indexed_columns, load_drizzle_schema, scan_filters
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -34,14 +43,10 @@ def find_schema_files(project_path: Path) -> list:
     prisma_files = list(project_path.glob('**/prisma/schema.prisma'))
     schemas.extend([('prisma', f) for f in prisma_files])
     
-    # Drizzle schema files
-    drizzle_files = list(project_path.glob('**/drizzle/*.ts'))
-    drizzle_files.extend(project_path.glob('**/schema/*.ts'))
-    for f in drizzle_files:
-        if 'schema' in f.name.lower() or 'table' in f.name.lower():
-            schemas.append(('drizzle', f))
+    # Drizzle schema files: any source file that defines a table
+    schemas.extend([('drizzle', Path(f)) for f in find_drizzle_files(project_path)])
     
-    return schemas[:10]  # Limit
+    return schemas
 
 
 def validate_prisma_schema(file_path: Path) -> list:
@@ -91,8 +96,75 @@ def validate_prisma_schema(file_path: Path) -> list:
     return issues
 
 
+def index_ddl(table: dict, column: dict) -> str:
+    """CREATE INDEX statement for one column, in the table's dialect."""
+    name = f"{table['name']}_{column['name']}_idx"
+    if table.get('function') == 'mysqlTable':
+        return f"CREATE INDEX `{name}` ON `{table['name']}` (`{column['name']}`);"
+    return f"CREATE INDEX IF NOT EXISTS \"{name}\" ON \"{table['name']}\" (\"{column['name']}\");"
+
+
+def validate_drizzle_schema(file_path: Path, tables: dict, filters: dict, project_path: Path) -> tuple:
+    """
+    Validate the Drizzle tables defined in one file.
+    Returns (issues, index suggestions); filters are the where/join column
+    uses from scan_filters.
+    """
+    issues = []
+    suggestions = []
+    
+    for var, table in tables.items():
+        if Path(table['file']) != file_path:
+            continue
+        
+        if not table['primary_key']:
+            issues.append(f"Table '{table['name']}' has no primary key")
+        
+        covered = indexed_columns(table)
+        for prop, column in table['columns'].items():
+            if prop in covered:
+                continue
+            
+            uses = filters.get((var, prop), [])
+            reasons = []
+            if column['references']:
+                reasons.append(f"foreign key to {column['references']}")
+            if uses:
+                files = sorted({str(Path(f).relative_to(project_path)) for f, _ in uses})
+                reasons.append(f"filtered in {len(uses)} quer{'y' if len(uses) == 1 else 'ies'} ({', '.join(files[:3])})")
+            if not reasons:
+                continue
+            
+            issues.append(f"{table['name']}.{column['name']} ({'; '.join(reasons)}) has no index")
+            suggestions.append({
+                "table": table['name'],
+                "column": column['name'],
+                "line": column['line'],
+                "foreign_key": column['references'],
+                "filter_uses": len(uses),
+                "ddl": index_ddl(table, column),
+                "drizzle": f'index("{table["name"]}_{column["name"]}_idx").on(table.{prop})',
+            })
+    
+    return issues, suggestions
+
+
 def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    parser = argparse.ArgumentParser(description="Validate Prisma and Drizzle database schemas")
+    parser.add_argument("project_path", nargs="?", default=".", help="Project directory")
+    parser.add_argument("--ddl", action="store_true",
+                        help="Print only the suggested CREATE INDEX statements (for a migration)")
+    args = parser.parse_args()
+    project_path = Path(args.project_path).resolve()
+    
+    if args.ddl:
+        drizzle_files = find_drizzle_files(project_path)
+        tables = load_drizzle_schema(project_path, files=drizzle_files)['tables']
+        filters = scan_filters(project_path, tables)
+        for file_path in drizzle_files:
+            for suggestion in validate_drizzle_schema(Path(file_path), tables, filters, project_path)[1]:
+                print(suggestion["ddl"])
+        sys.exit(0)
     
     print(f"\n{'='*60}")
     print(f"[SCHEMA VALIDATOR] Database Schema Validation")
@@ -117,8 +189,16 @@ def main():
         print(json.dumps(output, indent=2))
         sys.exit(0)
     
+    # Drizzle tables reference each other across files: parse them all first
+    drizzle_files = [str(f) for schema_type, f in schemas if schema_type == 'drizzle']
+    tables, filters = {}, {}
+    if drizzle_files:
+        tables = load_drizzle_schema(project_path, files=drizzle_files)['tables']
+        filters = scan_filters(project_path, tables)
+    
     # Validate each schema
     all_issues = []
+    all_suggestions = []
     
     for schema_type, file_path in schemas:
         print(f"\nValidating: {file_path.name} ({schema_type})")
@@ -126,7 +206,10 @@ def main():
         if schema_type == 'prisma':
             issues = validate_prisma_schema(file_path)
         else:
-            issues = []  # Drizzle validation could be added
+            issues, suggestions = validate_drizzle_schema(file_path, tables, filters, project_path)
+            for suggestion in suggestions:
+                suggestion["file"] = str(file_path.relative_to(project_path))
+            all_suggestions.extend(suggestions)
         
         if issues:
             all_issues.append({
@@ -150,6 +233,13 @@ def main():
     else:
         print("No schema issues found!")
     
+    if all_suggestions:
+        print("\n" + "="*60)
+        print(f"SUGGESTED INDEXES ({len(all_suggestions)})")
+        print("="*60)
+        for suggestion in all_suggestions:
+            print(suggestion["ddl"])
+    
     total_issues = sum(len(item["issues"]) for item in all_issues)
     # Schema issues are warnings, not failures
     passed = True
@@ -160,7 +250,8 @@ def main():
         "schemas_checked": len(schemas),
         "issues_found": total_issues,
         "passed": passed,
-        "issues": all_issues
+        "issues": all_issues,
+        "index_suggestions": all_suggestions
     }
     
     print("\n" + json.dumps(output, indent=2))
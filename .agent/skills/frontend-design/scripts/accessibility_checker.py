@@ -1,24 +1,39 @@
 #!/usr/bin/env python3
 """
 Accessibility Checker - WCAG compliance audit
-Checks HTML files for accessibility issues.
+Checks HTML/JSX/TSX files for accessibility issues.
 
 Usage:
-    python accessibility_checker.py <project_path>
+    python accessibility_checker.py <project_path> [--jobs N] [--tree-cache [DIR]]
+                                    [--format jsonl|sarif]
 
 Checks:
-    - Form labels
-    - ARIA attributes
-    - Color contrast hints
-    - Keyboard navigation
-    - Semantic HTML
+    - Form labels (label for/htmlFor <-> id, wrapping <label>, aria-label)
+    - Accessible names of buttons and links (text, aria-label, alt of images)
+    - ARIA roles and keyboard access of clickable elements
+    - Tab order (positive tabindex)
+    - Semantic HTML (lang, skip link, autoplay media)
+
+Each file is parsed once into an element tree (element_tree.py), and every
+rule walks that tree, so nested markup and JSX inside {expressions} are seen.
+Trees are cached per file hash with --tree-cache; the cache is shared with
+any other checker that loads trees from the same directory.
 """
 
 import sys
+import os
 import json
 import re
+import argparse
+from functools import partial
 from pathlib import Path
 from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "code-analysis" / "scripts"))
+from findings import add_format_argument, make_finding, open_writer, slug
+from file_pool import iter_pool, walk_files
+from element_tree import default_cache_dir, iter_elements, load_tree
 
 # Fix Windows console encoding
 try:
@@ -27,101 +42,268 @@ except:
     pass
 
 
-def find_html_files(project_path: Path) -> list:
-    """Find all HTML/JSX/TSX files."""
-    patterns = ['**/*.html', '**/*.jsx', '**/*.tsx']
-    skip_dirs = {'node_modules', '.next', 'dist', 'build', '.git'}
-    
-    files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            if not any(skip in f.parts for skip in skip_dirs):
-                files.append(f)
-    
-    return files[:50]
-
-
-def check_accessibility(file_path: Path) -> list:
-    """Check a single file for accessibility issues."""
-    issues = []
-    
+EXTENSIONS = {'.html', '.jsx', '.tsx'}
+SKIP_DIRS = {'node_modules', '.next', 'dist', 'build', '.git'}
+
+# Findings severity per issue (anything else is medium)
+ISSUE_SEVERITY = {
+    "Input without label or aria-label": "high",
+    "Button without accessible text": "high",
+    "Link without accessible text": "high",
+    "Image without alt attribute": "high",
+    "Missing lang attribute on <html>": "high",
+    "Consider adding skip-to-main-content link": "low",
+}
+
+# Elements that are focusable and keyboard-operable without extra attributes
+NATIVE_INTERACTIVE = {'a', 'button', 'input', 'select', 'textarea', 'summary', 'option', 'label',
+                      'details', 'audio', 'video', 'iframe'}
+LABELABLE = {'input', 'select', 'textarea', 'Input', 'Textarea'}
+UNLABELLED_INPUT_TYPES = {'hidden', 'submit', 'button', 'reset', 'image'}
+LABEL_TAGS = {'label', 'Label', 'FormLabel'}
+# Form wrappers that wire a label to their control (shadcn/ui Form)
+LABELLING_WRAPPERS = {'FormControl', 'FormItem'}
+BUTTON_TAGS = {'button', 'Button'}
+LINK_TAGS = {'a', 'Link', 'NavLink'}
+
+# Roles that make an element interactive, so it needs to be focusable
+INTERACTIVE_ROLES = {'button', 'link', 'checkbox', 'menuitem', 'menuitemcheckbox', 'menuitemradio',
+                     'option', 'radio', 'switch', 'tab', 'slider', 'spinbutton', 'combobox', 'textbox',
+                     'searchbox', 'treeitem', 'gridcell'}
+ARIA_ROLES = INTERACTIVE_ROLES | {
+    'alert', 'alertdialog', 'application', 'article', 'banner', 'blockquote', 'caption', 'cell',
+    'code', 'columnheader', 'complementary', 'contentinfo', 'definition', 'deletion', 'dialog',
+    'directory', 'document', 'emphasis', 'feed', 'figure', 'form', 'generic', 'grid', 'group',
+    'heading', 'img', 'insertion', 'list', 'listbox', 'listitem', 'log', 'main', 'marquee', 'math',
+    'menu', 'menubar', 'meter', 'navigation', 'none', 'note', 'paragraph', 'presentation',
+    'progressbar', 'radiogroup', 'region', 'row', 'rowgroup', 'rowheader', 'scrollbar', 'search',
+    'separator', 'status', 'strong', 'subscript', 'superscript', 'table', 'tablist', 'tabpanel',
+    'term', 'time', 'timer', 'toolbar', 'tooltip', 'tree', 'treegrid',
+}
+
+# Components imported from these packages render an icon and no text
+ICON_IMPORT = re.compile(
+    r'import\s*\{([^}]*)\}\s*from\s*["\'](?:lucide-react|react-icons[^"\']*|@heroicons/[^"\']*|'
+    r'@radix-ui/react-icons|@tabler/icons-react|phosphor-react|@phosphor-icons/react)["\']')
+
+
+# ============ TREE HELPERS ============
+def is_expression(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith("{")
+
+
+def has_value(attrs: Dict[str, Any], name: str) -> bool:
+    """Attribute present with a non-empty literal or any expression."""
+    value = attrs.get(name)
+    return value is True or (isinstance(value, str) and value.strip() != "")
+
+
+def icon_components(source: str) -> Set[str]:
+    """Local names of components imported from icon packages."""
+    names = set()
+    for m in ICON_IMPORT.finditer(source):
+        for part in m.group(1).split(","):
+            part = part.strip()
+            if part:
+                names.add(part.split(" as ")[-1].strip())
+    return names
+
+
+def is_icon(tag: str, icons: Set[str]) -> bool:
+    return tag in icons or (tag[:1].isupper() and tag.endswith("Icon"))
+
+
+def has_accessible_name(el: Dict[str, Any], icons: Set[str]) -> bool:
+    """
+    Whether an element (or its content) gives it a name. Anything that may
+    render text - {expressions}, spread props, non-icon components - counts,
+    so only provably empty elements fail.
+    """
+    attrs = el["attrs"]
+    if "..." in attrs or any(has_value(attrs, a) for a in ("aria-label", "aria-labelledby", "title")):
+        return True
+    if el["text"] or el["exprs"]:
+        return True
+    for child in iter_elements(el):
+        tag, child_attrs = child["tag"], child["attrs"]
+        if child["text"] or child["exprs"] or "..." in child_attrs:
+            return True
+        if has_value(child_attrs, "aria-label") or has_value(child_attrs, "title"):
+            return True
+        if tag == "img" and has_value(child_attrs, "alt"):
+            return True
+        if tag[:1].isupper() and not is_icon(tag, icons):
+            return True
+    return False
+
+
+def tabindex_value(value: Any) -> Optional[int]:
+    """Literal tabindex as an int ("2" or {2}); None when dynamic."""
+    if isinstance(value, str):
+        m = re.fullmatch(r'\{?\s*["\']?(-?\d+)["\']?\s*\}?', value.strip())
+        if m:
+            return int(m.group(1))
+    return None
+
+
+# ============ RULES ============
+def check_tree(tree: Dict[str, Any], source: str) -> List[list]:
+    """Evaluate every rule over one element tree: [[issue, line], ...] in document order."""
+    icons = icon_components(source)
+    hits: List[list] = []
+    elements = list(iter_elements(tree, with_ancestors=True))
+
+    # Label association: literal ids of controls vs label for/htmlFor
+    label_targets: Set[str] = set()
+    dynamic_labels = False
+    ids: Set[str] = set()
+    for el, _ in elements:
+        attrs = el["attrs"]
+        if el["tag"] in LABEL_TAGS:
+            target = attrs.get("htmlfor", attrs.get("for"))
+            if is_expression(target):
+                dynamic_labels = True
+            elif isinstance(target, str) and target:
+                label_targets.add(target)
+        if isinstance(attrs.get("id"), str) and not is_expression(attrs["id"]):
+            ids.add(attrs["id"])
+
+    has_page_shell = False
+    has_skip_link = False
+
+    for el, ancestors in elements:
+        tag, attrs, line = el["tag"], el["attrs"], el["line"]
+        spread = "..." in attrs
+        role = attrs.get("role") if isinstance(attrs.get("role"), str) and not is_expression(attrs.get("role")) else None
+
+        if tag == "html" and "lang" not in attrs and not spread:
+            hits.append(["Missing lang attribute on <html>", line])
+        if tag in ("main", "body"):
+            has_page_shell = True
+
+        # Form controls need a label
+        if tag in LABELABLE and not spread:
+            input_type = attrs.get("type")
+            if not (isinstance(input_type, str) and input_type.lower() in UNLABELLED_INPUT_TYPES):
+                element_id = attrs.get("id")
+                labelled = (
+                    any(has_value(attrs, a) for a in ("aria-label", "aria-labelledby", "title"))
+                    or any(a["tag"] in LABEL_TAGS or a["tag"] in LABELLING_WRAPPERS for a in ancestors)
+                    or (isinstance(element_id, str) and element_id in label_targets)
+                    or (is_expression(element_id) and dynamic_labels)
+                )
+                if not labelled:
+                    hits.append(["Input without label or aria-label", line])
+
+        if tag in LABEL_TAGS:
+            target = attrs.get("htmlfor", attrs.get("for"))
+            if isinstance(target, str) and target and not is_expression(target) and target not in ids:
+                hits.append([f"Label for='{target}' matches no element id", line])
+
+        # Accessible names
+        if (tag in BUTTON_TAGS or role == "button") and not has_accessible_name(el, icons):
+            hits.append(["Button without accessible text", line])
+        elif tag in LINK_TAGS and ("href" in attrs or "to" in attrs) and not has_accessible_name(el, icons):
+            hits.append(["Link without accessible text", line])
+        if tag == "img" and "alt" not in attrs and not spread:
+            hits.append(["Image without alt attribute", line])
+
+        if tag in LINK_TAGS:
+            href = attrs.get("href")
+            label = " ".join([el["text"], str(attrs.get("aria-label", ""))]).lower()
+            if isinstance(href, str) and href.startswith("#") and ("skip" in label or href in ("#main", "#main-content", "#content")):
+                has_skip_link = True
+
+        # Keyboard access
+        native = tag in NATIVE_INTERACTIVE
+        if "onclick" in attrs and tag[:1].islower() and not native:
+            if not any(k in attrs for k in ("onkeydown", "onkeyup", "onkeypress")):
+                hits.append([f"onClick without keyboard handler (onKeyDown): <{tag}>", line])
+        if role:
+            for name in role.split()[:1]:
+                if name not in ARIA_ROLES:
+                    hits.append([f"Unknown ARIA role '{name}'", line])
+                elif name in INTERACTIVE_ROLES and not native and tag[:1].islower() and "tabindex" not in attrs:
+                    hits.append([f"role='{name}' without tabindex", line])
+        tabindex = tabindex_value(attrs.get("tabindex"))
+        if tabindex is not None and tabindex > 0:
+            hits.append(["Avoid positive tabIndex values", line])
+
+        # Media
+        if tag in ("video", "audio") and "autoplay" in attrs and "muted" not in attrs:
+            hits.append(["Autoplay media should be muted", line])
+
+    if has_page_shell and not has_skip_link:
+        hits.append(["Consider adding skip-to-main-content link", elements[0][0]["line"]])
+    return hits
+
+
+def check_accessibility(file_path: str, tree_cache: Optional[str] = None) -> Dict[str, Any]:
+    """Check a single file: {"file", "issues": unique issues, "hits": [[issue, line]]}."""
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
-        
-        # Check for form inputs without labels
-        inputs = re.findall(r'<input[^>]*>', content, re.IGNORECASE)
-        for inp in inputs:
-            if 'type="hidden"' not in inp.lower():
-                if 'aria-label' not in inp.lower() and 'id=' not in inp.lower():
-                    issues.append("Input without label or aria-label")
-                    break
-        
-        # Check for buttons without accessible text
-        buttons = re.findall(r'<button[^>]*>[^<]*</button>', content, re.IGNORECASE)
-        for btn in buttons:
-            # Check if button has text content or aria-label
-            if 'aria-label' not in btn.lower():
-                text = re.sub(r'<[^>]+>', '', btn)
-                if not text.strip():
-                    issues.append("Button without accessible text")
-                    break
-        
-        # Check for missing lang attribute
-        if '<html' in content.lower() and 'lang=' not in content.lower():
-            issues.append("Missing lang attribute on <html>")
-        
-        # Check for missing skip link
-        if '<main' in content.lower() or '<body' in content.lower():
-            if 'skip' not in content.lower() and '#main' not in content.lower():
-                issues.append("Consider adding skip-to-main-content link")
-        
-        # Check for click handlers without keyboard support
-        onclick_count = content.lower().count('onclick=')
-        onkeydown_count = content.lower().count('onkeydown=') + content.lower().count('onkeyup=')
-        if onclick_count > 0 and onkeydown_count == 0:
-            issues.append("onClick without keyboard handler (onKeyDown)")
-        
-        # Check for tabIndex misuse
-        if 'tabindex=' in content.lower():
-            if 'tabindex="-1"' not in content.lower() and 'tabindex="0"' not in content.lower():
-                positive_tabindex = re.findall(r'tabindex="([1-9]\d*)"', content, re.IGNORECASE)
-                if positive_tabindex:
-                    issues.append("Avoid positive tabIndex values")
-        
-        # Check for autoplay media
-        if 'autoplay' in content.lower():
-            if 'muted' not in content.lower():
-                issues.append("Autoplay media should be muted")
-        
-        # Check for role usage
-        if 'role="button"' in content.lower():
-            # Divs with role button should have tabindex
-            div_buttons = re.findall(r'<div[^>]*role="button"[^>]*>', content, re.IGNORECASE)
-            for div in div_buttons:
-                if 'tabindex' not in div.lower():
-                    issues.append("role='button' without tabindex")
-                    break
-        
-    except Exception as e:
-        issues.append(f"Error reading file: {str(e)[:50]}")
-    
-    return issues
+        _, source, tree = load_tree(file_path, tree_cache)
+    except OSError as e:
+        issue = f"Error reading file: {str(e)[:50]}"
+        return {"file": file_path, "issues": [issue], "hits": [[issue, None]]}
+    hits = check_tree(tree, source)
+    return {"file": file_path, "issues": list(dict.fromkeys(issue for issue, _ in hits)), "hits": hits}
+
+
+def issue_rule(issue: str) -> str:
+    """Rule id of an issue, without the element/role/id it names."""
+    return slug(re.sub(r"'[^']*'|: <\w+>$", "", issue))
+
+
+def file_findings(result: Dict[str, Any], rel_path: str) -> List[Dict[str, Any]]:
+    """One shared-schema finding per offending element."""
+    return [
+        make_finding("accessibility_checker", issue_rule(issue), ISSUE_SEVERITY.get(issue, "medium"), issue,
+                     file=rel_path, line=line, category="Accessibility")
+        for issue, line in result["hits"]
+    ]
 
 
 def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
-    
+    parser = argparse.ArgumentParser(description="WCAG accessibility audit for HTML/JSX/TSX files")
+    parser.add_argument("project_path", nargs="?", default=".", help="Project directory")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes (0 = all cores)")
+    parser.add_argument("--tree-cache", nargs="?", const="", default=None,
+                        help="Cache element trees per file hash (default dir: <project>/.agent-cache/elements)")
+    add_format_argument(parser)
+    args = parser.parse_args()
+
+    project_path = Path(args.project_path).resolve()
+    tree_cache = args.tree_cache
+    if tree_cache == "":
+        tree_cache = str(default_cache_dir(project_path))
+    writer = open_writer("accessibility_checker", args.format)
+
+    files = walk_files(str(project_path), EXTENSIONS, SKIP_DIRS)
+    all_issues = []
+    for result in iter_pool(partial(check_accessibility, tree_cache=tree_cache), files, args.jobs):
+        if result["issues"]:
+            result["file"] = os.path.relpath(result["file"], project_path).replace("\\", "/")
+            all_issues.append(result)
+            if writer:
+                writer.write_all(file_findings(result, result["file"]))
+
+    total_issues = sum(len(item["issues"]) for item in all_issues)
+    # Accessibility issues are important but not blocking
+    passed = total_issues < 5  # Allow minor issues
+
+    if writer:
+        writer.close(passed=passed, files_checked=len(files), files_with_issues=len(all_issues),
+                     issues_found=total_issues)
+        sys.exit(0 if passed else 1)
+
     print(f"\n{'='*60}")
     print(f"[ACCESSIBILITY CHECKER] WCAG Compliance Audit")
     print(f"{'='*60}")
     print(f"Project: {project_path}")
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("-"*60)
-    
-    # Find HTML files
-    files = find_html_files(project_path)
     print(f"Found {len(files)} HTML/JSX/TSX files")
-    
+
     if not files:
         output = {
             "script": "accessibility_checker",
@@ -133,38 +315,25 @@ def main():
         }
         print(json.dumps(output, indent=2))
         sys.exit(0)
-    
-    # Check each file
-    all_issues = []
-    
-    for f in files:
-        issues = check_accessibility(f)
-        if issues:
-            all_issues.append({
-                "file": str(f.name),
-                "issues": issues
-            })
-    
+
     # Summary
     print("\n" + "="*60)
     print("ACCESSIBILITY ISSUES")
     print("="*60)
-    
+
     if all_issues:
         for item in all_issues[:10]:
             print(f"\n{item['file']}:")
             for issue in item["issues"]:
-                print(f"  - {issue}")
-        
+                lines = [str(line) for hit, line in item["hits"] if hit == issue and line]
+                where = f" (line {', '.join(lines[:5])}{', ...' if len(lines) > 5 else ''})" if lines else ""
+                print(f"  - {issue}{where}")
+
         if len(all_issues) > 10:
             print(f"\n... and {len(all_issues) - 10} more files with issues")
     else:
         print("No accessibility issues found!")
-    
-    total_issues = sum(len(item["issues"]) for item in all_issues)
-    # Accessibility issues are important but not blocking
-    passed = total_issues < 5  # Allow minor issues
-    
+
     output = {
         "script": "accessibility_checker",
         "project": str(project_path),
@@ -173,9 +342,9 @@ def main():
         "issues_found": total_issues,
         "passed": passed
     }
-    
+
     print("\n" + json.dumps(output, indent=2))
-    
+
     sys.exit(0 if passed else 1)
 
 
@@ -93,14 +93,500 @@ import sys
 import os
 import re
 import json
+import argparse
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "code-analysis" / "scripts"))
+from findings import add_format_argument, make_finding, open_writer, slug, write_legacy
+from file_pool import SLOW_FILE_SECONDS, dedupe, iter_audits, slowest, walk_files
+from rule_engine import FileFeatures, compile_features, run_rules
+import style_model as sm
+import design_tokens as dt
+
+# ============ FEATURES ============
+# Computed at most once per file, on first use, and shared by every rule below.
+# Typography, color and motion features query the file's parsed style model
+# (CSS declarations + Tailwind utilities) instead of matching raw text.
+FEATURES = {
+    "style": ("derived", lambda f: sm.load_style_model(f.path, f.content, f.options.get("style_cache"))),
+
+    # Shared page traits
+    "long_text": ("any", r'<p|<div.*class=.*text|article|<span.*text', re.I),
+    "has_form": ("any", r'<form|<input|password|credit|card|payment', re.I),
+    "has_hero": ("any", r'hero|<h1|banner', re.I),
+    "has_footer": ("any", r'footer|<footer', re.I),
+    "complex_elements": ("count", r'<input|<select|<textarea|<option', re.I),
+
+    # Psychology laws
+    "nav_items": ("count", r'<NavLink|<Link|<a\s+href|nav-item', re.I),
+    "nav_labels": ("all", r'<NavLink|<Link|<a\s+href[^>]*>([^<]+)</a>', re.I),
+    "small_targets": ("any", r'height:\s*([0-3]\d)px|h-[1-9]\b|h-10\b'),
+    "form_fields": ("count", r'<input|<select|<textarea', re.I),
+    "multi_step": ("any", r'step|wizard|stage', re.I),
+    "button": ("any", r'button', re.I),
+    "primary_cta": ("any", r'primary|bg-primary|Button.*primary|variant=["\']primary', re.I),
+
+    # Emotional design
+    "gradient": ("any", r'gradient'),
+    "animations": ("derived", lambda f: sm.motion_count(f["style"])),
+    "background": ("any", r'background:|bg-'),
+    "click_handler": ("any", r'onClick|@click|onclick'),
+    "feedback": ("any", r'transition|animate|hover:|focus:|disabled|loading|spinner', re.I),
+    "state_change": ("any", r'setState|useState|disabled|loading'),
+    "reflective": ("any", r'about|story|mission|values|why we|our journey|testimonials', re.I),
+
+    # Trust building
+    "security_signals": ("any", r'ssl|secure|encrypt|lock|padlock|https', re.I),
+    "checkout": ("any", r'checkout|payment', re.I),
+    "social_proof": ("any", r'review|testimonial|rating|star|trust|trusted by|customer|logo', re.I),
+    "authority": ("any", r'certif|award|media|press|featured|as seen in', re.I),
+
+    # Cognitive load
+    "progressive": ("any", r'step|wizard|stage|accordion|collapsible|tab|more\.\.\.|advanced|show more', re.I),
+    "color_values": ("count", r'#[0-9a-fA-F]{3,6}|rgb|hsl'),
+    "border_decls": ("count", r'border:|border-'),
+    "labels": ("any", r'<label|placeholder|aria-label', re.I),
+
+    # Persuasive design
+    "defaults": ("any", r'checked|selected|default|value=["\'].*["\']'),
+    "radio_inputs": ("any", r'type=["\']radio', re.I),
+    "price": ("any", r'price|pricing|cost|\$\d+', re.I),
+    "anchor": ("any", r'original|was|strike|del|save \d+%', re.I),
+    "social": ("any", r'join|subscriber|member|user', re.I),
+    "specific_count": ("any", r'\d+[+kmb]|\d+,\d+'),
+    "progress": ("any", r'progress|step \d+|complete|%|bar', re.I),
+
+    # Typography
+    "font_families": ("derived", lambda f: sm.font_families(f["style"])),
+    "google_fonts": ("all", r'fonts\.googleapis\.com[^"\']*family=([^"&]+)', re.I),
+    "line_length_limit": ("derived", lambda f: sm.has_line_length_limit(f["style"])),
+    "text_elements": ("any", r'<p|<span|<div.*text|<h[1-6]', re.I),
+    "line_height": ("derived", lambda f: sm.has_line_height(f["style"])),
+    "heading_text": ("any", r'<h[1-6]|text-(?:xl|2xl|3xl|4xl|5xl|6xl)', re.I),
+    "line_heights": ("derived", lambda f: sm.line_heights(f["style"])),
+    "uppercase": ("derived", lambda f: sm.has_uppercase(f["style"])),
+    "tracking": ("derived", lambda f: sm.has_tracking(f["style"])),
+    "display_text": ("derived", lambda f: sm.display_text(f["style"])),
+    "tracking_tight": ("derived", lambda f: sm.has_tracking(f["style"], tight=True)),
+    "weights": ("derived", lambda f: sm.font_weights(f["style"])),
+    "font_sizes": ("derived", lambda f: sm.has_font_sizes(f["style"])),
+    "fluid_type": ("derived", lambda f: sm.has_fluid_type(f["style"])),
+    "headings": ("all", r'<(h[1-6])', re.I),
+    "font_size_values": ("derived", lambda f: sm.font_sizes(f["style"])),
+    "paragraphs": ("all", r'<p[^>]*>([^<]+)</p>', re.I),
+    "subheadings": ("any", r'<h[2-6]', re.I),
+
+    # Visual effects
+    "blur": ("derived", lambda f: f["blur_count"] > 0),
+    "translucent_bg": ("derived", lambda f: sm.has_translucent_background(f["style"])),
+    "keyframes": ("derived", lambda f: sm.motion_count(f["style"], include_utilities=False) > 0),
+    "expensive_props": ("derived", lambda f: [prop for prop in sm.animated_properties(f["style"])
+                                              if set(prop.split("-")) & set(LAYOUT_PROPERTIES)]),
+    "reduced_motion_js": ("any", r'prefers-reduced-motion|useReducedMotion'),
+    "reduced_motion": ("derived", lambda f: sm.reduced_motion(f["style"]) or f["reduced_motion_js"]),
+    "shadows": ("derived", lambda f: sm.shadows(f["style"])),
+    "shadow_opacities": ("derived", lambda f: [alpha for shadow in f["shadows"]
+                                               for alpha in SHADOW_ALPHA.findall(shadow)]),
+    "gradient_count": ("count", r'gradient', re.I),
+    "border_count": ("count", r'border:'),
+    "glow_shadows": ("derived", lambda f: sum(1 for shadow in f["shadows"] if GLOW_LAYER.search(shadow))),
+    "images": ("any", r'<img|background-image:|bg-\[url'),
+    "overlay": ("any", r'overlay|rgba\(0|gradient.*transparent|::after|::before'),
+    "will_change": ("derived", lambda f: sm.will_change(f["style"])),
+    "will_change_count": ("derived", lambda f: len(f["will_change"])),
+    "blur_count": ("derived", lambda f: sm.blur_effects(f["style"])),
+    "text_shadow_count": ("derived", lambda f: len(sm.text_shadows(f["style"]))),
+    "effect_count": ("derived", lambda f: (1 if f["gradient"] else 0) + len(f["shadows"])
+                     + len(sm.shadow_utilities(f["style"])) + f["blur_count"] + f["text_shadow_count"]),
+
+    # Color system
+    "colors": ("derived", lambda f: sm.color_values(f["style"])),
+    "hex_count": ("derived", lambda f: sum(1 for color in f["colors"] if color.startswith("#"))),
+    "hsl_count": ("derived", lambda f: sum(1 for color in f["colors"] if color.startswith("hsl"))),
+    "bg_declarations": ("any", r'(?:background|bg-|bg\[)([^;}\s]+)'),
+    "text_declarations": ("any", r'(?:color|text-)([^;}\s]+)'),
+    "unique_hexes": ("derived", lambda f: len({color.lower() for color in f["colors"] if len(color) == 7})),
+    "hsl_hues": ("derived", lambda f: sm.hsl_hues(f["style"])),
+    "pure_black": ("derived", lambda f: any(color.lower() in ("#000", "#000000") for color in f["colors"])),
+    "pure_white": ("derived", lambda f: any(color.lower() in ("#fff", "#ffffff") for color in sm.color_values(
+        f["style"], ("background", "background-color"), "bg-"))),
+    "dark_mode": ("derived", lambda f: sm.uses_dark_mode(f["style"])),
+    "low_contrast": ("derived", lambda f: any(
+        (any(LIGHT_BACKGROUND.match(u) for u in utilities) and any(LIGHT_TEXT.match(u) for u in utilities))
+        or (any(DARK_BACKGROUND.match(u) for u in utilities) and any(DARK_TEXT.match(u) for u in utilities))
+        for group in sm.class_groups(f["style"]) for utilities in group.values())),
+    "blue": ("any", r'bg-blue|text-blue|from-blue|#[0-9a-fA-F]*00[0-9A-Fa-f]{2}|#[0-9a-fA-F]*1[0-9A-Fa-f]{2}'),
+    "food_context": ("any", r'restaurant|food|cooking|recipe|menu|dish|meal', re.I),
+    "color_vars": ("any", r'--color-|color-|primary-|secondary-'),
+
+    # Animation
+    "durations": ("derived", lambda f: sm.durations(f["style"])),
+    "ease_in_entry": ("any", r'ease-in\s+.*entry|fade-in.*ease-in'),
+    "ease_out_exit": ("any", r'ease-out\s+.*exit|fade-out.*ease-out'),
+    "interactive": ("count", r'<button|<a\s+href|onClick|@click'),
+    "hover_focus": ("any", r'hover:|focus:|:hover|:focus'),
+    "async": ("any", r'async|await|fetch|axios|loading|isLoading'),
+    "loading_indicator": ("any", r'skeleton|spinner|progress|loading|<circle.*animate'),
+    "routing": ("any", r'router|navigate|Link.*to|useHistory'),
+    "page_transition": ("any", r'AnimatePresence|motion\.|transition.*page|fade.*route'),
+    "scroll_anim": ("any", r'onScroll|scroll.*trigger|IntersectionObserver'),
+    "scroll_layout": ("any", r'onScroll.*[^\w](width|height|top|left)'),
+
+    # Motion graphics
+    "lottie": ("any", r'lottie|Lottie|@lottie-react'),
+    "lottie_fallback": ("any", r'prefers-reduced-motion.*lottie|lottie.*isPaused|lottie.*stop'),
+    "gsap": ("any", r'gsap|ScrollTrigger|from\(.*gsap'),
+    "gsap_cleanup": ("any", r'kill\(|revert\(|useEffect.*return.*gsap'),
+    "svg_animations": ("count", r'<animate|<animateTransform|stroke-dasharray|stroke-dashoffset'),
+    "transform_3d": ("any", r'transform3d|perspective\(|rotate3d|translate3d'),
+    "perspective": ("any", r'perspective:\s*\d+px|perspective\s*\('),
+    "particles": ("any", r'particle|canvas.*loop|requestAnimationFrame.*draw|Three\.js'),
+    "scroll_driven": ("any", r'IntersectionObserver.*animate|scroll.*progress|view-timeline'),
+    "throttle": ("any", r'throttle|debounce|requestAnimationFrame'),
+    "total_animations": ("derived", lambda f: f["animations"] + (1 if f["lottie"] else 0) + (1 if f["gsap"] else 0)),
+    "functional_animations": ("count", r'hover:|focus:|disabled|loading|error|success'),
+
+    # Accessibility
+    "img_without_alt": ("any", r'<img(?![^>]*alt=)[^>]*>'),
+}
+
+SHADOW_Y_OFFSET = re.compile(r'\d+px\s+[1-9]\d*px')
+SHADOW_ALPHA = re.compile(r'(?:rgba|hsla)\([^)]*[,/]\s*([\d.]+)\s*\)')
+GLOW_LAYER = re.compile(r'(?:^|,)\s*(?:inset\s+)?0(?:px)?\s+0(?:px)?\s+[1-9]')
+TAILWIND_GRAYS = r'(?:gray|slate|zinc|neutral|stone)'
+LIGHT_BACKGROUND = re.compile(rf'bg-(?:white|{TAILWIND_GRAYS}-(?:50|100))$')
+LIGHT_TEXT = re.compile(rf'text-(?:white|{TAILWIND_GRAYS}-[123]00)$')
+DARK_BACKGROUND = re.compile(rf'bg-(?:black|{TAILWIND_GRAYS}-(?:800|900|950))$')
+DARK_TEXT = re.compile(rf'text-(?:black|{TAILWIND_GRAYS}-[6789]00)$')
+
+GENERIC_FONTS = {'sans-serif', 'serif', 'monospace', 'cursive', 'fantasy', 'system-ui', 'inherit', 'arial',
+                 'georgia', 'times new roman', 'courier new', 'verdana', 'helvetica', 'tahoma'}
+MODULAR_SCALE_RATIOS = {1.067, 1.125, 1.2, 1.25, 1.333, 1.5, 1.618}
+LAYOUT_PROPERTIES = ['width', 'height', 'top', 'left', 'right', 'bottom', 'margin', 'padding']
+PURPLE_MARKERS = ['#8B5CF6', '#A855F7', '#9333EA', '#7C3AED', '#6D28D9',
+                  '#8B5CF6', '#A78BFA', '#C4B5FD', '#DDD6FE', '#EDE9FE',
+                  '#8b5cf6', '#a855f7', '#9333ea', '#7c3aed', '#6d28d9',
+                  'purple', 'violet', 'fuchsia', 'magenta', 'lavender']
+IMPORTANT_NAV_WORDS = ['contact', 'login', 'sign', 'get started', 'cta', 'button']
+
+
+# ============ ANALYZERS ============
+# Checks that need more than a condition: each returns (level, category, message) tuples.
+def check_serial_position(content, f):
+    # Important items at beginning/end: is the last nav item a key action?
+    labels = f["nav_labels"]
+    if f["nav_items"] > 3 and len(labels) > 2:
+        last_item = labels[-1].lower()
+        if not any(x in last_item for x in IMPORTANT_NAV_WORDS):
+            return [("warning", "Serial Position", "Last nav item may not be important. Place key actions at start/end.")]
+    return []
+
+
+def check_font_families(content, f):
+    # Font pairing: @font-face, Google Fonts and the first font of each font-family stack
+    faces, stacks = f["font_families"]
+    font_families = {font.strip().lower() for font in faces}
+    for font in f["google_fonts"]:
+        for family in font.replace('+', ' ').split('|'):
+            font_families.add(family.split(':')[0].strip().lower())
+    for first_font in stacks:
+        if first_font.lower() not in GENERIC_FONTS:
+            font_families.add(first_font.lower())
+    if len(font_families) > 3:
+        return [("issue", "Typography", f"{len(font_families)} font families detected. Limit to 2-3 for cohesion.")]
+    return []
+
+
+def check_heading_line_height(content, f):
+    # Headings should be tighter (1.1-1.3)
+    if not f["heading_text"]:
+        return []
+    return [("warning", "Typography", f"Heading has line-height {lh:g} (>1.3). Headings should be tighter (1.1-1.3).")
+            for lh in f["line_heights"] if lh > 1.5]
+
+
+def check_font_weights(content, f):
+    # Weight contrast: adjacent levels (400/500) and too many levels
+    results = []
+    unique_weights = sorted(set(f["weights"]))
+    for lower, upper in zip(unique_weights, unique_weights[1:]):
+        if upper - lower == 100:
+            results.append(("warning", "Typography", f"Adjacent font weights ({lower}/{upper}). Skip at least 2 levels for contrast."))
+    if len(unique_weights) > 4:
+        results.append(("warning", "Typography", f"{len(unique_weights)} font weights. Limit to 3-4 per page."))
+    return results
+
+
+def check_heading_hierarchy(content, f):
+    # Sequential heading levels and a primary h1
+    headings = f["headings"]
+    if not headings:
+        return []
+    results = []
+    for i in range(len(headings) - 1):
+        curr = int(headings[i][1])
+        next_h = int(headings[i+1][1])
+        if next_h > curr + 1:
+            results.append(("warning", "Typography", f"Skipped heading level (h{curr} -> h{next_h}). Maintain sequential hierarchy."))
+    if 'h1' not in [h.lower() for h in headings] and f["long_text"]:
+        results.append(("warning", "Typography", "No h1 found. Each page should have one primary heading."))
+    return results
+
+
+def check_modular_scale(content, f):
+    # Font sizes (normalized to rem) should follow a common scale ratio
+    size_values = []
+    for size, unit in f["font_size_values"]:
+        size_values.append(size if unit in ('rem', 'em') else size / 16)
+    if len(size_values) <= 2:
+        return []
+    sorted_sizes = sorted(set(size_values))
+    ratios = [sorted_sizes[i] / sorted_sizes[i-1] for i in range(1, len(sorted_sizes)) if sorted_sizes[i-1] > 0]
+    for ratio in ratios[:3]:
+        if not any(abs(ratio - cr) < 0.05 for cr in MODULAR_SCALE_RATIOS):
+            return [("warning", "Typography", f"Font sizes may not follow modular scale (ratio: {ratio:.2f}). Consider consistent ratio like 1.25 (Major Third).")]
+    return []
+
+
+def check_readability(content, f):
+    # Long paragraphs (~5-6 lines) and long content without subheadings
+    paragraphs = f["paragraphs"]
+    results = []
+    for p in paragraphs:
+        word_count = len(p.split())
+        if word_count > 100:
+            results.append(("warning", "Typography", f"Long paragraph detected ({word_count} words). Break into 3-4 line chunks for readability."))
+    if len(paragraphs) > 5 and not f["subheadings"]:
+        results.append(("warning", "Typography", "Long content without subheadings. Add h2/h3 to break up text."))
+    return results
+
+
+def check_animated_properties(content, f):
+    # GPU acceleration: animate transform/opacity, not layout
+    if f["keyframes"] and f["expensive_props"]:
+        return [("warning", "Performance", f"Animating expensive properties ({', '.join(f['expensive_props'])}). Use transform/opacity where possible.")]
+    return []
+
+
+def check_shadows(content, f):
+    # Natural shadows (Y > X or layered), neomorphism insets, elevation hierarchy
+    shadows = f["shadows"]
+    results = []
+    for shadow in shadows:
+        if ',' not in shadow and not SHADOW_Y_OFFSET.search(shadow):
+            results.append(("warning", "Visual", "Simple/Unnatural shadow detected. Consider multiple layers or Y > X offset for realism."))
+    for shadow in shadows:
+        if ',' in shadow and '-' in shadow and 'inset' in shadow:
+            results.append(("warning", "Visual", "Neomorphism inset detected. Ensure adequate contrast for accessibility."))
+    if len(shadows) >= 3:
+        shadow_opacities = [float(o) for o in f["shadow_opacities"] if float(o) < 0.5]
+        if shadow_opacities and len(set(shadow_opacities)) < 2:
+            results.append(("warning", "Visual", "All shadows at same opacity level. Vary shadow intensity for elevation hierarchy."))
+    return results
+
+
+def check_will_change(content, f):
+    # will-change only for transform/opacity
+    results = []
+    for prop in f["will_change"]:
+        prop = prop.lower()
+        if prop in LAYOUT_PROPERTIES:
+            results.append(("issue", "Performance", f"will-change on '{prop}' (layout property). Use only for transform/opacity."))
+    return results
+
+
+def check_purple(content, f):
+    # PURPLE BAN - critical check from color-system.md
+    for purple in PURPLE_MARKERS:
+        if purple.lower() in f.lowered:
+            return [("issue", "Color", f"PURPLE DETECTED ('{purple}'). Banned by Maestro rules. Use Teal/Cyan/Emerald instead.")]
+    return []
+
+
+def check_monochromatic(content, f):
+    # Same hue, different lightness
+    if len(f["hsl_hues"]) < 3:
+        return []
+    hues = f["hsl_hues"]
+    hue_range = max(hues) - min(hues)
+    if hue_range < 10:
+        return [("warning", "Color", f"Monochromatic palette detected (hue variance: {hue_range}deg). Ensure adequate contrast.")]
+    return []
+
+
+def check_durations(content, f):
+    # 50ms minimum; transitions 100-300ms
+    results = []
+    for duration, unit, kind in f["durations"]:
+        duration_ms = float(duration) * (1000 if unit == 's' else 1)
+        if duration_ms < 50:
+            results.append(("warning", "Animation", f"Very fast animation ({duration}{unit}). Minimum 50ms for visibility."))
+        elif duration_ms > 1000 and kind == "transition":
+            results.append(("warning", "Animation", f"Long transition ({duration}{unit}). Transitions should be 100-300ms for responsiveness."))
+    return results
+
+
+# ============ RULES ============
+# (level, category, message, condition) or an analyzer; evaluated in order.
+# Messages are formatted with the file's features.
+RULES = [
+    # --- 1. PSYCHOLOGY LAWS ---
+    ("issue", "Hick's Law", "{nav_items} nav items (Max 7)", lambda f: f["nav_items"] > 7),
+    ("warning", "Fitts' Law", "Small targets (< 44px)", lambda f: f["small_targets"]),
+    ("warning", "Miller's Law", "Complex form ({form_fields} fields)",
+     lambda f: f["form_fields"] > 7 and not f["multi_step"]),
+    ("warning", "Von Restorff", "No primary CTA", lambda f: f["button"] and not f["primary_cta"]),
+    check_serial_position,
+
+    # --- 1.5 EMOTIONAL DESIGN (Don Norman) ---
+    ("warning", "Visceral", "Hero section lacks visual appeal. Consider gradients or subtle animations.",
+     lambda f: f["has_hero"] and not (f["gradient"] or f["animations"]) and not f["background"]),
+    ("warning", "Behavioral", "Interactive elements lack immediate feedback. Add hover/focus/disabled states.",
+     lambda f: f["click_handler"] and not f["feedback"] and not f["state_change"]),
+    ("warning", "Reflective", "Long-form content without brand story/values. Add 'About' or 'Why We Exist' section.",
+     lambda f: f["long_text"] and not f["reflective"]),
+
+    # --- 1.6 TRUST BUILDING ---
+    ("warning", "Trust", "Form without security indicators. Add 'SSL Secure' or lock icon.",
+     lambda f: f["has_form"] and not f["security_signals"] and not f["checkout"]),
+    ("passed", None, None, lambda f: f["social_proof"]),
+    ("warning", "Trust", "No social proof detected. Consider adding testimonials, ratings, or 'Trusted by' logos.",
+     lambda f: not f["social_proof"] and f["long_text"]),
+    ("warning", "Trust", "Footer lacks authority signals. Add certifications, awards, or media mentions.",
+     lambda f: f["has_footer"] and not f["authority"]),
+
+    # --- 1.7 COGNITIVE LOAD MANAGEMENT ---
+    ("warning", "Cognitive Load", "Many form elements without progressive disclosure. Consider accordion, tabs, or 'Advanced' toggle.",
+     lambda f: f["complex_elements"] > 5 and not f["progressive"]),
+    ("warning", "Cognitive Load", "High visual noise detected. Many colors and borders increase cognitive load.",
+     lambda f: f["color_values"] > 15 and f["border_decls"] > 10),
+    ("issue", "Cognitive Load", "Form inputs without labels. Use <label> for accessibility and clarity.",
+     lambda f: f["has_form"] and not f["labels"]),
+
+    # --- 1.8 PERSUASIVE DESIGN (Ethical) ---
+    ("warning", "Persuasion", "Radio buttons without default selection. Pre-select recommended option.",
+     lambda f: f["has_form"] and f["radio_inputs"] and not f["defaults"]),
+    ("warning", "Persuasion", "Prices without anchoring. Show original price to frame discount value.",
+     lambda f: f["price"] and not f["anchor"]),
+    ("warning", "Persuasion", "Social proof without specific numbers. Use 'Join 10,000+' format.",
+     lambda f: f["social"] and not f["specific_count"]),
+    ("warning", "Persuasion", "Long form without progress indicator. Add progress bar or 'Step X of Y'.",
+     lambda f: f["has_form"] and f["complex_elements"] > 5 and not f["progress"]),
+
+    # --- 2. TYPOGRAPHY SYSTEM ---
+    check_font_families,
+    ("warning", "Typography", "No line length constraint (45-75ch). Use max-w-prose or max-w-[65ch].",
+     lambda f: f["long_text"] and not f["line_length_limit"]),
+    ("warning", "Typography", "Text elements found without line-height. Body: 1.4-1.6, Headings: 1.1-1.3",
+     lambda f: f["text_elements"] and not f["line_height"]),
+    check_heading_line_height,
+    ("warning", "Typography", "Uppercase text without tracking. ALL CAPS needs +5-10% spacing.",
+     lambda f: f["uppercase"] and not f["tracking"]),
+    ("warning", "Typography", "Large display text without tracking-tight. Big text needs -1% to -4% spacing.",
+     lambda f: f["display_text"] and not f["tracking_tight"]),
+    check_font_weights,
+    ("warning", "Typography", "Fixed font sizes without clamp(). Consider fluid typography: clamp(MIN, PREFERRED, MAX)",
+     lambda f: f["font_sizes"] and not f["fluid_type"]),
+    check_heading_hierarchy,
+    check_modular_scale,
+    check_readability,
+
+    # --- 3. VISUAL EFFECTS ---
+    ("warning", "Visual", "Blur used without semi-transparent background (Glassmorphism fail)",
+     lambda f: f["blur"] and not f["translucent_bg"]),
+    check_animated_properties,
+    ("warning", "Accessibility", "Animations found without prefers-reduced-motion check",
+     lambda f: f["keyframes"] and not f["reduced_motion"]),
+    check_shadows,
+    ("warning", "Visual", "Many gradients detected ({gradient_count}). Ensure this serves purpose, not decoration.",
+     lambda f: f["gradient"] and f["gradient_count"] > 5),
+    ("warning", "Visual", "Hero section without visual interest. Consider gradient for depth.",
+     lambda f: not f["gradient"] and f["has_hero"] and not f["background"]),
+    ("warning", "Visual", "Many border declarations ({border_count}). Simplify for cleaner look.",
+     lambda f: f["border_count"] > 8),
+    ("warning", "Visual", "Multiple glow effects detected. Use sparingly for emphasis only.",
+     lambda f: f["glow_shadows"] > 2),
+    ("warning", "Visual", "Text over image without overlay. Add gradient overlay for readability.",
+     lambda f: f["images"] and f["long_text"] and not f["overlay"]),
+    check_will_change,
+    ("warning", "Performance", "Many will-change declarations ({will_change_count}). Use sparingly, only for heavy animations.",
+     lambda f: f["will_change_count"] > 3),
+    ("warning", "Visual", "Many visual effects ({effect_count}). Ensure effects serve purpose, not decoration.",
+     lambda f: f["effect_count"] > 10),
+    ("warning", "Visual", "Flat design with no depth. Consider shadows or subtle gradients for hierarchy.",
+     lambda f: f["long_text"] and f["effect_count"] == 0),
+
+    # --- 4. COLOR SYSTEM ---
+    check_purple,
+    ("warning", "Color", "{unique_hexes} distinct colors. Consider 60-30-10 rule: dominant (60%), secondary (30%), accent (10%).",
+     lambda f: f["hex_count"] + f["hsl_count"] > 3 and f["bg_declarations"] and f["text_declarations"]
+     and f["unique_hexes"] > 5),
+    check_monochromatic,
+    ("warning", "Color", "Pure black (#000000) detected. Use #1a1a1a or darker grays for better dark mode.",
+     lambda f: f["pure_black"]),
+    ("warning", "Color", "Pure white background in dark mode context. Use slight off-white (#f9fafb) for reduced eye strain.",
+     lambda f: f["pure_white"] and f["dark_mode"]),
+    ("warning", "Color", "Possible low-contrast combination detected. Verify WCAG AA (4.5:1 for text).",
+     lambda f: f["low_contrast"]),
+    ("warning", "Color", "Blue color in food context. Blue suppresses appetite; consider warm colors (red, orange, yellow).",
+     lambda f: f["blue"] and f["food_context"]),
+    ("warning", "Color", "Color variables without HSL. Consider HSL for easier palette adjustment (Hue, Saturation, Lightness).",
+     lambda f: f["color_vars"] and not f["hsl_count"]),
+
+    # --- 5. ANIMATION GUIDE ---
+    check_durations,
+    ("warning", "Animation", "Entry animation with ease-in. Entry should use ease-out for snappy feel.",
+     lambda f: f["ease_in_entry"]),
+    ("warning", "Animation", "Exit animation with ease-out. Exit should use ease-in for natural feel.",
+     lambda f: f["ease_out_exit"]),
+    ("warning", "Animation", "Interactive elements without hover/focus states. Add micro-interactions for feedback.",
+     lambda f: f["interactive"] > 2 and not f["hover_focus"]),
+    ("warning", "Animation", "Async operations without loading indicator. Add skeleton or spinner for perceived performance.",
+     lambda f: f["async"] and not f["loading_indicator"]),
+    ("warning", "Animation", "Routing detected without page transitions. Consider fade/slide for context continuity.",
+     lambda f: f["routing"] and not f["page_transition"]),
+    ("issue", "Animation", "Scroll handler animating layout properties. Use transform/opacity for 60fps.",
+     lambda f: f["scroll_anim"] and f["scroll_layout"]),
+
+    # --- 6. MOTION GRAPHICS ---
+    ("warning", "Motion", "Lottie animation without reduced-motion fallback. Add pause/stop for accessibility.",
+     lambda f: f["lottie"] and not f["lottie_fallback"]),
+    ("issue", "Motion", "GSAP animation without cleanup (kill/revert). Memory leak risk on unmount.",
+     lambda f: f["gsap"] and not f["gsap_cleanup"]),
+    ("warning", "Motion", "Multiple SVG animations detected. Ensure stroke-dashoffset is used sparingly for mobile performance.",
+     lambda f: f["svg_animations"] > 3),
+    ("warning", "Motion", "3D transform without perspective parent. Add perspective: 1000px for realistic depth.",
+     lambda f: f["transform_3d"] and not f["perspective"]),
+    ("warning", "Motion", "3D transforms detected. Test on mobile; can impact performance on low-end devices.",
+     lambda f: f["transform_3d"]),
+    ("warning", "Motion", "Particle effects detected. Ensure fallback or reduced-quality option for mobile devices.",
+     lambda f: f["particles"]),
+    ("issue", "Motion", "Scroll-driven animation without throttling. Add requestAnimationFrame for 60fps.",
+     lambda f: f["scroll_driven"] and not f["throttle"]),
+    ("warning", "Motion", "Many animations ({total_animations}). Ensure majority serve functional purpose (feedback, guidance), not decoration.",
+     lambda f: f["total_animations"] > 5 and f["functional_animations"] < f["total_animations"] / 2),
+
+    # --- 7. ACCESSIBILITY ---
+    ("issue", "Accessibility", "Missing img alt text", lambda f: f["img_without_alt"]),
+]
+
+COMPILED_FEATURES = compile_features(FEATURES)
+
+
 class UXAuditor:
-    def __init__(self):
+    def __init__(self, style_cache=None):
         self.issues = []
         self.warnings = []
         self.passed_count = 0
         self.files_checked = 0
+        self.writer = None      # FindingWriter: stream findings per file instead of buffering
+        self.root = None
+        self.streamed = {"issues": 0, "warnings": 0}
+        self.timings = []       # (seconds, relative path) per audited file
+        self.style_cache = style_cache  # style model cache directory (None = no cache)
+        self.file_data = None   # design tokens of the last audited file (read by file_pool)
+        self.token_index = dt.DesignTokenIndex()
+        self.design_tokens = None   # cross-file analysis, set by check_design_tokens()
     
     def audit_file(self, filepath: str) -> None:
         try:
@@ -110,574 +596,73 @@ class UXAuditor:
         
         self.files_checked += 1
         filename = os.path.basename(filepath)
-
-        # Pre-calculate common flags
-        has_long_text = bool(re.search(r'<p|<div.*class=.*text|article|<span.*text', content, re.IGNORECASE))
-        has_form = bool(re.search(r'<form|<input|password|credit|card|payment', content, re.IGNORECASE))
-        complex_elements = len(re.findall(r'<input|<select|<textarea|<option', content, re.IGNORECASE))
-
-        # --- 1. PSYCHOLOGY LAWS ---
-        # Hick's Law
-        nav_items = len(re.findall(r'<NavLink|<Link|<a\s+href|nav-item', content, re.IGNORECASE))
-        if nav_items > 7:
-            self.issues.append(f"[Hick's Law] {filename}: {nav_items} nav items (Max 7)")
-        
-        # Fitts' Law
-        if re.search(r'height:\s*([0-3]\d)px', content) or re.search(r'h-[1-9]\b|h-10\b', content):
-            self.warnings.append(f"[Fitts' Law] {filename}: Small targets (< 44px)")
         
-        # Miller's Law
-        form_fields = len(re.findall(r'<input|<select|<textarea', content, re.IGNORECASE))
-        if form_fields > 7 and not re.search(r'step|wizard|stage', content, re.IGNORECASE):
-            self.warnings.append(f"[Miller's Law] {filename}: Complex form ({form_fields} fields)")
-            
-        # Von Restorff
-        if 'button' in content.lower() and not re.search(r'primary|bg-primary|Button.*primary|variant=["\']primary', content, re.IGNORECASE):
-            self.warnings.append(f"[Von Restorff] {filename}: No primary CTA")
-
-        # Serial Position Effect - Important items at beginning/end
-        if nav_items > 3:
-            # Check if last nav item is important (contact, login, etc.)
-            nav_content = re.findall(r'<NavLink|<Link|<a\s+href[^>]*>([^<]+)</a>', content, re.IGNORECASE)
-            if nav_content and len(nav_content) > 2:
-                last_item = nav_content[-1].lower() if nav_content else ''
-                if not any(x in last_item for x in ['contact', 'login', 'sign', 'get started', 'cta', 'button']):
-                    self.warnings.append(f"[Serial Position] {filename}: Last nav item may not be important. Place key actions at start/end.")
-
-        # --- 1.5 EMOTIONAL DESIGN (Don Norman) ---
-
-        # Visceral: First impressions (aesthetics, gradients, animations)
-        has_hero = bool(re.search(r'hero|<h1|banner', content, re.IGNORECASE))
-        if has_hero:
-            # Check for visual appeal elements
-            has_gradient = bool(re.search(r'gradient|linear-gradient|radial-gradient', content))
-            has_animation = bool(re.search(r'@keyframes|transition:|animate-', content))
-            has_visual_interest = has_gradient or has_animation
-
-            if not has_visual_interest and not re.search(r'background:|bg-', content):
-                self.warnings.append(f"[Visceral] {filename}: Hero section lacks visual appeal. Consider gradients or subtle animations.")
-
-        # Behavioral: Instant feedback and usability
-        if 'onClick' in content or '@click' in content or 'onclick' in content:
-            has_feedback = re.search(r'transition|animate|hover:|focus:|disabled|loading|spinner', content, re.IGNORECASE)
-            has_state_change = re.search(r'setState|useState|disabled|loading', content)
-
-            if not has_feedback and not has_state_change:
-                self.warnings.append(f"[Behavioral] {filename}: Interactive elements lack immediate feedback. Add hover/focus/disabled states.")
-
-        # Reflective: Brand story, values, identity
-        has_reflective = bool(re.search(r'about|story|mission|values|why we|our journey|testimonials', content, re.IGNORECASE))
-        if has_long_text and not has_reflective:
-            self.warnings.append(f"[Reflective] {filename}: Long-form content without brand story/values. Add 'About' or 'Why We Exist' section.")
-
-        # --- 1.6 TRUST BUILDING (Enhanced) ---
-
-        # Security signals
-        if has_form:
-            security_signals = re.findall(r'ssl|secure|encrypt|lock|padlock|https', content, re.IGNORECASE)
-            if len(security_signals) == 0 and not re.search(r'checkout|payment', content, re.IGNORECASE):
-                self.warnings.append(f"[Trust] {filename}: Form without security indicators. Add 'SSL Secure' or lock icon.")
-
-        # Social proof elements
-        social_proof = re.findall(r'review|testimonial|rating|star|trust|trusted by|customer|logo', content, re.IGNORECASE)
-        if len(social_proof) > 0:
-            self.passed_count += 1
-        else:
-            if has_long_text:
-                self.warnings.append(f"[Trust] {filename}: No social proof detected. Consider adding testimonials, ratings, or 'Trusted by' logos.")
-
-        # Authority indicators
-        has_footer = bool(re.search(r'footer|<footer', content, re.IGNORECASE))
-        if has_footer:
-            authority = re.findall(r'certif|award|media|press|featured|as seen in', content, re.IGNORECASE)
-            if len(authority) == 0:
-                self.warnings.append(f"[Trust] {filename}: Footer lacks authority signals. Add certifications, awards, or media mentions.")
-
-        # --- 1.7 COGNITIVE LOAD MANAGEMENT ---
-
-        # Progressive disclosure
-        if complex_elements > 5:
-            has_progressive = re.search(r'step|wizard|stage|accordion|collapsible|tab|more\.\.\.|advanced|show more', content, re.IGNORECASE)
-            if not has_progressive:
-                self.warnings.append(f"[Cognitive Load] {filename}: Many form elements without progressive disclosure. Consider accordion, tabs, or 'Advanced' toggle.")
-
-        # Visual noise check
-        has_many_colors = len(re.findall(r'#[0-9a-fA-F]{3,6}|rgb|hsl', content)) > 15
-        has_many_borders = len(re.findall(r'border:|border-', content)) > 10
-        if has_many_colors and has_many_borders:
-            self.warnings.append(f"[Cognitive Load] {filename}: High visual noise detected. Many colors and borders increase cognitive load.")
-
-        # Familiar patterns
-        if has_form:
-            has_standard_labels = bool(re.search(r'<label|placeholder|aria-label', content, re.IGNORECASE))
-            if not has_standard_labels:
-                self.issues.append(f"[Cognitive Load] {filename}: Form inputs without labels. Use <label> for accessibility and clarity.")
-
-        # --- 1.8 PERSUASIVE DESIGN (Ethical) ---
-
-        # Smart defaults
-        if has_form:
-            has_defaults = bool(re.search(r'checked|selected|default|value=["\'].*["\']', content))
-            radio_inputs = len(re.findall(r'type=["\']radio', content, re.IGNORECASE))
-            if radio_inputs > 0 and not has_defaults:
-                self.warnings.append(f"[Persuasion] {filename}: Radio buttons without default selection. Pre-select recommended option.")
-
-        # Anchoring (showing original price)
-        if re.search(r'price|pricing|cost|\$\d+', content, re.IGNORECASE):
-            has_anchor = bool(re.search(r'original|was|strike|del|save \d+%', content, re.IGNORECASE))
-            if not has_anchor:
-                self.warnings.append(f"[Persuasion] {filename}: Prices without anchoring. Show original price to frame discount value.")
-
-        # Social proof live indicators
-        has_social = bool(re.search(r'join|subscriber|member|user', content, re.IGNORECASE))
-        if has_social:
-            has_count = bool(re.findall(r'\d+[+kmb]|\d+,\d+', content))
-            if not has_count:
-                self.warnings.append(f"[Persuasion] {filename}: Social proof without specific numbers. Use 'Join 10,000+' format.")
-
-        # Progress indicators
-        if has_form:
-            has_progress = bool(re.search(r'progress|step \d+|complete|%|bar', content, re.IGNORECASE))
-            if complex_elements > 5 and not has_progress:
-                self.warnings.append(f"[Persuasion] {filename}: Long form without progress indicator. Add progress bar or 'Step X of Y'.")
-
-        # --- 2. TYPOGRAPHY SYSTEM (Complete Coverage) ---
-
-        # 2.1 Font Pairing - Too many font families
-        font_families = set()
-        # Check for @font-face, Google Fonts, font-family declarations
-        font_faces = re.findall(r'@font-face\s*\{[^}]*family:\s*["\']?([^;"\'\s}]+)', content, re.IGNORECASE)
-        google_fonts = re.findall(r'fonts\.googleapis\.com[^"\']*family=([^"&]+)', content, re.IGNORECASE)
-        font_family_css = re.findall(r'font-family:\s*([^;]+)', content, re.IGNORECASE)
-
-        for font in font_faces: font_families.add(font.strip().lower())
-        for font in google_fonts:
-            for f in font.replace('+', ' ').split('|'):
-                font_families.add(f.split(':')[0].strip().lower())
-        for family in font_family_css:
-            # Extract first font from stack
-            first_font = family.split(',')[0].strip().strip('"\'')
-
-            if first_font.lower() not in {'sans-serif', 'serif', 'monospace', 'cursive', 'fantasy', 'system-ui', 'inherit', 'arial', 'georgia', 'times new roman', 'courier new', 'verdana', 'helvetica', 'tahoma'}:
-                font_families.add(first_font.lower())
-
-        if len(font_families) > 3:
-            self.issues.append(f"[Typography] {filename}: {len(font_families)} font families detected. Limit to 2-3 for cohesion.")
-
-        # 2.2 Line Length - Character-based width
-        if has_long_text and not re.search(r'max-w-(?:prose|[\[\\]?\d+ch[\]\\]?)|max-width:\s*\d+ch', content):
-            self.warnings.append(f"[Typography] {filename}: No line length constraint (45-75ch). Use max-w-prose or max-w-[65ch].")
-
-        # 2.3 Line Height - Proper leading ratios
-        # Check for text without proper line-height
-        text_elements = len(re.findall(r'<p|<span|<div.*text|<h[1-6]', content, re.IGNORECASE))
-        if text_elements > 0 and not re.search(r'leading-|line-height:', content):
-            self.warnings.append(f"[Typography] {filename}: Text elements found without line-height. Body: 1.4-1.6, Headings: 1.1-1.3")
-
-        # Check for heading-specific line height issues
-        if re.search(r'<h[1-6]|text-(?:xl|2xl|3xl|4xl|5xl|6xl)', content, re.IGNORECASE):
-            # Extract line-height values
-            line_heights = re.findall(r'(?:leading-|line-height:\s*)([\d.]+)', content)
-            for lh in line_heights:
-                if float(lh) > 1.5:
-                    self.warnings.append(f"[Typography] {filename}: Heading has line-height {lh} (>1.3). Headings should be tighter (1.1-1.3).")
-
-        # 2.4 Letter Spacing (Tracking)
-        # Uppercase without tracking
-        if re.search(r'uppercase|text-transform:\s*uppercase', content, re.IGNORECASE):
-            if not re.search(r'tracking-|letter-spacing:', content):
-                self.warnings.append(f"[Typography] {filename}: Uppercase text without tracking. ALL CAPS needs +5-10% spacing.")
-
-        # Large text (display/hero) should have negative tracking
-        if re.search(r'text-(?:4xl|5xl|6xl|7xl|8xl|9xl)|font-size:\s*[3-9]\dpx', content):
-            if not re.search(r'tracking-tight|letter-spacing:\s*-[0-9]', content):
-                self.warnings.append(f"[Typography] {filename}: Large display text without tracking-tight. Big text needs -1% to -4% spacing.")
-
-        # 2.5 Weight and Emphasis - Contrast levels
-        # Check for adjacent weight levels (poor contrast)
-        weights = re.findall(r'font-weight:\s*(\d+)|font-(?:thin|extralight|light|normal|medium|semibold|bold|extrabold|black)|fw-(\d+)', content, re.IGNORECASE)
-        weight_values = []
-        for w in weights:
-            val = w[0] or w[1]
-            if val:
-                # Map named weights to numbers
-                weight_map = {'thin': '100', 'extralight': '200', 'light': '300', 'normal': '400', 'medium': '500', 'semibold': '600', 'bold': '700', 'extrabold': '800', 'black': '900'}
-                val = weight_map.get(val.lower(), val)
-                try:
-                    weight_values.append(int(val))
-                except: pass
-
-        # Check for adjacent weights (400/500, 500/600, etc.)
-        for i in range(len(weight_values) - 1):
-            diff = abs(weight_values[i] - weight_values[i+1])
-            if diff == 100:
-                self.warnings.append(f"[Typography] {filename}: Adjacent font weights ({weight_values[i]}/{weight_values[i+1]}). Skip at least 2 levels for contrast.")
-
-        # Too many weight levels
-        unique_weights = set(weight_values)
-        if len(unique_weights) > 4:
-            self.warnings.append(f"[Typography] {filename}: {len(unique_weights)} font weights. Limit to 3-4 per page.")
-
-        # 2.6 Responsive Typography - Fluid sizing with clamp()
-        has_font_sizes = bool(re.search(r'font-size:|text-(?:xs|sm|base|lg|xl|2xl)', content))
-        if has_font_sizes and not re.search(r'clamp\(|responsive:', content):
-            self.warnings.append(f"[Typography] {filename}: Fixed font sizes without clamp(). Consider fluid typography: clamp(MIN, PREFERRED, MAX)")
-
-        # 2.7 Hierarchy - Heading structure
-        headings = re.findall(r'<(h[1-6])', content, re.IGNORECASE)
-        if headings:
-            # Check for skipped levels (h1 -> h3)
-            for i in range(len(headings) - 1):
-                curr = int(headings[i][1])
-                next_h = int(headings[i+1][1])
-                if next_h > curr + 1:
-                    self.warnings.append(f"[Typography] {filename}: Skipped heading level (h{curr} -> h{next_h}). Maintain sequential hierarchy.")
-
-            # Check if h1 exists for main content
-            if 'h1' not in [h.lower() for h in headings] and has_long_text:
-                self.warnings.append(f"[Typography] {filename}: No h1 found. Each page should have one primary heading.")
-
-        # 2.8 Modular Scale - Consistent sizing
-        # Extract font-size values
-        font_sizes = re.findall(r'font-size:\s*(\d+(?:\.\d+)?)(px|rem|em)', content)
-        size_values = []
-        for size, unit in font_sizes:
-            if unit == 'rem' or unit == 'em':
-                size_values.append(float(size))
-            elif unit == 'px':
-                size_values.append(float(size) / 16)  # Normalize to rem
-
-        if len(size_values) > 2:
-            # Check if sizes follow a modular scale roughly
-            sorted_sizes = sorted(set(size_values))
-            ratios = []
-            for i in range(1, len(sorted_sizes)):
-                if sorted_sizes[i-1] > 0:
-                    ratios.append(sorted_sizes[i] / sorted_sizes[i-1])
-
-            # Common scale ratios: 1.067, 1.125, 1.2, 1.25, 1.333, 1.5, 1.618
-            common_ratios = {1.067, 1.125, 1.2, 1.25, 1.333, 1.5, 1.618}
-            for ratio in ratios[:3]:  # Check first 3 ratios
-                if not any(abs(ratio - cr) < 0.05 for cr in common_ratios):
-                    self.warnings.append(f"[Typography] {filename}: Font sizes may not follow modular scale (ratio: {ratio:.2f}). Consider consistent ratio like 1.25 (Major Third).")
-                    break
-
-        # 2.9 Readability - Content chunking
-        # Check for very long paragraphs (>5 lines estimated)
-        paragraphs = re.findall(r'<p[^>]*>([^<]+)</p>', content, re.IGNORECASE)
-        for p in paragraphs:
-            word_count = len(p.split())
-            if word_count > 100:  # ~5-6 lines
-                self.warnings.append(f"[Typography] {filename}: Long paragraph detected ({word_count} words). Break into 3-4 line chunks for readability.")
-
-        # Check for missing subheadings in long content
-        if len(paragraphs) > 5:
-            subheadings = len(re.findall(r'<h[2-6]', content, re.IGNORECASE))
-            if subheadings == 0:
-                self.warnings.append(f"[Typography] {filename}: Long content without subheadings. Add h2/h3 to break up text.")
-
-        # --- 3. VISUAL EFFECTS (visual-effects.md) ---
-        
-        # Glassmorphism Check
-        if 'backdrop-filter' in content or 'blur(' in content:
-            if not re.search(r'background:\s*rgba|bg-opacity|bg-[a-z0-9]+\/\d+', content):
-                self.warnings.append(f"[Visual] {filename}: Blur used without semi-transparent background (Glassmorphism fail)")
-        
-        # GPU Acceleration / Performance
-        if re.search(r'@keyframes|transition:', content):
-            expensive_props = re.findall(r'width|height|top|left|right|bottom|margin|padding', content)
-            if expensive_props:
-                self.warnings.append(f"[Performance] {filename}: Animating expensive properties ({', '.join(set(expensive_props))}). Use transform/opacity where possible.")
-            
-            # Reduced Motion
-            if not re.search(r'prefers-reduced-motion', content):
-                self.warnings.append(f"[Accessibility] {filename}: Animations found without prefers-reduced-motion check")
-
-        # Natural Shadows
-        shadows = re.findall(r'box-shadow:\s*([^;]+)', content)
-        for shadow in shadows:
-            # Check if natural (Y > X) or multiple layers
-            if ',' not in shadow and not re.search(r'\d+px\s+[1-9]\d*px', shadow): # Simple heuristic for Y-offset
-                 self.warnings.append(f"[Visual] {filename}: Simple/Unnatural shadow detected. Consider multiple layers or Y > X offset for realism.")
-
-        # --- 3.1 NEOMORPHISM CHECK ---
-        # Check for neomorphism patterns (dual shadows with opposite directions)
-        neo_shadows = re.findall(r'box-shadow:\s*([^;]+)', content)
-        for shadow in neo_shadows:
-            # Neomorphism has two shadows: positive offset + negative offset
-            if ',' in shadow and '-' in shadow:
-                # Check for inset pattern (pressed state)
-                if 'inset' in shadow:
-                    self.warnings.append(f"[Visual] {filename}: Neomorphism inset detected. Ensure adequate contrast for accessibility.")
-
-        # --- 3.2 SHADOW HIERARCHY ---
-        # Count shadow levels to check for elevation consistency
-        shadow_count = len(shadows)
-        if shadow_count > 0:
-            # Check for shadow opacity levels (should indicate hierarchy)
-            opacities = re.findall(r'rgba?\([^)]+,\s*([\d.]+)\)', content)
-            shadow_opacities = [float(o) for o in opacities if float(o) < 0.5]
-            if shadow_count >= 3 and len(shadow_opacities) > 0:
-                # Check if there's variety in shadow opacities for different elevations
-                unique_opacities = len(set(shadow_opacities))
-                if unique_opacities < 2:
-                    self.warnings.append(f"[Visual] {filename}: All shadows at same opacity level. Vary shadow intensity for elevation hierarchy.")
-
-        # --- 3.3 GRADIENT CHECKS ---
-        # Check for gradient usage
-        has_gradient = bool(re.search(r'gradient|linear-gradient|radial-gradient|conic-gradient', content))
-        if has_gradient:
-            # Warn about mesh/aurora gradients (can be overused)
-            gradient_count = len(re.findall(r'gradient', content, re.IGNORECASE))
-            if gradient_count > 5:
-                self.warnings.append(f"[Visual] {filename}: Many gradients detected ({gradient_count}). Ensure this serves purpose, not decoration.")
-        else:
-            # Check if hero section exists without gradient
-            if has_hero and not re.search(r'background:|bg-', content):
-                self.warnings.append(f"[Visual] {filename}: Hero section without visual interest. Consider gradient for depth.")
-
-        # --- 3.4 BORDER EFFECTS ---
-        # Check for gradient borders or animated borders
-        has_border = bool(re.search(r'border:|border-', content))
-        if has_border:
-            # Check for overly complex borders
-            border_count = len(re.findall(r'border:', content))
-            if border_count > 8:
-                self.warnings.append(f"[Visual] {filename}: Many border declarations ({border_count}). Simplify for cleaner look.")
-
-        # --- 3.5 GLOW EFFECTS ---
-        # Check for text-shadow or multiple box-shadow layers (glow effects)
-        text_shadows = re.findall(r'text-shadow:', content)
-        for ts in text_shadows:
-            # Multiple text-shadow layers indicate glow
-            if ',' in ts:
-                self.warnings.append(f"[Visual] {filename}: Text glow effect detected. Ensure readability is maintained.")
-
-        # Check for box-shadow glow (multiple layers with 0 offset)
-        glow_shadows = re.findall(r'box-shadow:\s*[^;]*0\s+0\s+', content)
-        if len(glow_shadows) > 2:
-            self.warnings.append(f"[Visual] {filename}: Multiple glow effects detected. Use sparingly for emphasis only.")
-
-        # --- 3.6 OVERLAY TECHNIQUES ---
-        # Check for image overlays (for readability)
-        has_images = bool(re.search(r'<img|background-image:|bg-\[url', content))
-        if has_images and has_long_text:
-            has_overlay = bool(re.search(r'overlay|rgba\(0|gradient.*transparent|::after|::before', content))
-            if not has_overlay:
-                self.warnings.append(f"[Visual] {filename}: Text over image without overlay. Add gradient overlay for readability.")
-
-        # --- 3.7 PERFORMANCE: will-change ---
-        # Check for will-change usage
-        if re.search(r'will-change:', content):
-            will_change_props = re.findall(r'will-change:\s*([^;]+)', content)
-            for prop in will_change_props:
-                prop = prop.strip().lower()
-                if prop in ['width', 'height', 'top', 'left', 'right', 'bottom', 'margin', 'padding']:
-                    self.issues.append(f"[Performance] {filename}: will-change on '{prop}' (layout property). Use only for transform/opacity.")
-
-        # Check for excessive will-change usage
-        will_change_count = len(re.findall(r'will-change:', content))
-        if will_change_count > 3:
-            self.warnings.append(f"[Performance] {filename}: Many will-change declarations ({will_change_count}). Use sparingly, only for heavy animations.")
-
-        # --- 3.8 EFFECT SELECTION ---
-        # Check for effect overuse (too many visual effects)
-        effect_count = (
-            (1 if has_gradient else 0) +
-            shadow_count +
-            len(re.findall(r'backdrop-filter|blur\(', content)) +
-            len(re.findall(r'text-shadow:', content))
-        )
-        if effect_count > 10:
-            self.warnings.append(f"[Visual] {filename}: Many visual effects ({effect_count}). Ensure effects serve purpose, not decoration.")
-
-        # Check for static/flat design (no depth)
-        if has_long_text and effect_count == 0:
-            self.warnings.append(f"[Visual] {filename}: Flat design with no depth. Consider shadows or subtle gradients for hierarchy.")
-
-        # --- 4. COLOR SYSTEM (color-system.md) ---
-
-        # 4.1 PURPLE BAN - Critical check from color-system.md
-        purple_hexes = ['#8B5CF6', '#A855F7', '#9333EA', '#7C3AED', '#6D28D9',
-                        '#8B5CF6', '#A78BFA', '#C4B5FD', '#DDD6FE', '#EDE9FE',
-                        '#8b5cf6', '#a855f7', '#9333ea', '#7c3aed', '#6d28d9',
-                        'purple', 'violet', 'fuchsia', 'magenta', 'lavender']
-        for purple in purple_hexes:
-            if purple.lower() in content.lower():
-                self.issues.append(f"[Color] {filename}: PURPLE DETECTED ('{purple}'). Banned by Maestro rules. Use Teal/Cyan/Emerald instead.")
-                break
-
-        # 4.2 60-30-10 Rule check
-        # Count color usage to estimate ratio
-        color_hex_count = len(re.findall(r'#[0-9a-fA-F]{3,6}', content))
-        hsl_count = len(re.findall(r'hsl\(', content))
-        total_colors = color_hex_count + hsl_count
-        if total_colors > 3:
-            # Check for dominant colors (should be ~60%)
-            bg_declarations = re.findall(r'(?:background|bg-|bg\[)([^;}\s]+)', content)
-            text_declarations = re.findall(r'(?:color|text-)([^;}\s]+)', content)
-            if len(bg_declarations) > 0 and len(text_declarations) > 0:
-                # Just warn if too many distinct colors
-                unique_hexes = set(re.findall(r'#[0-9a-fA-F]{6}', content))
-                if len(unique_hexes) > 5:
-                    self.warnings.append(f"[Color] {filename}: {len(unique_hexes)} distinct colors. Consider 60-30-10 rule: dominant (60%), secondary (30%), accent (10%).")
-
-        # 4.3 Color Scheme Pattern Detection
-        # Detect monochromatic (same hue, different lightness)
-        hsl_matches = re.findall(r'hsl\((\d+),\s*\d+%,\s*\d+%\)', content)
-        if len(hsl_matches) >= 3:
-            hues = [int(h) for h in hsl_matches]
-            hue_range = max(hues) - min(hues)
-            if hue_range < 10:
-                self.warnings.append(f"[Color] {filename}: Monochromatic palette detected (hue variance: {hue_range}deg). Ensure adequate contrast.")
-
-        # 4.4 Dark Mode Compliance
-        # Check for pure black (#000000) or pure white (#FFFFFF) text (forbidden)
-        if re.search(r'color:\s*#000000|#000\b', content):
-            self.warnings.append(f"[Color] {filename}: Pure black (#000000) detected. Use #1a1a1a or darker grays for better dark mode.")
-        if re.search(r'background:\s*#ffffff|#fff\b', content) and re.search(r'dark:\s*|dark:', content):
-            self.warnings.append(f"[Color] {filename}: Pure white background in dark mode context. Use slight off-white (#f9fafb) for reduced eye strain.")
-
-        # 4.5 WCAG Contrast Pattern Check
-        # Look for potential low-contrast combinations
-        light_bg_light_text = bool(re.search(r'bg-(?:gray|slate|zinc)-50|bg-white.*text-(?:gray|slate)-[12]', content))
-        dark_bg_dark_text = bool(re.search(r'bg-(?:gray|slate|zinct)-9|bg-black.*text-(?:gray|slate)-[89]', content))
-        if light_bg_light_text or dark_bg_dark_text:
-            self.warnings.append(f"[Color] {filename}: Possible low-contrast combination detected. Verify WCAG AA (4.5:1 for text).")
-
-        # 4.6 Color Psychology Context Check
-        # Warn if blue used for food/restaurant context
-        has_blue = bool(re.search(r'bg-blue|text-blue|from-blue|#[0-9a-fA-F]*00[0-9A-Fa-f]{2}|#[0-9a-fA-F]*1[0-9A-Fa-f]{2}', content))
-        has_food_context = bool(re.search(r'restaurant|food|cooking|recipe|menu|dish|meal', content, re.IGNORECASE))
-        if has_blue and has_food_context:
-            self.warnings.append(f"[Color] {filename}: Blue color in food context. Blue suppresses appetite; consider warm colors (red, orange, yellow).")
-
-        # 4.7 HSL-Based Palette Detection
-        # Check if using HSL for palette (recommended in color-system.md)
-        has_color_vars = bool(re.search(r'--color-|color-|primary-|secondary-', content))
-        if has_color_vars and not re.search(r'hsl\(', content):
-            self.warnings.append(f"[Color] {filename}: Color variables without HSL. Consider HSL for easier palette adjustment (Hue, Saturation, Lightness).")
-
-        # --- 5. ANIMATION GUIDE (animation-guide.md) ---
-
-        # 5.1 Duration Appropriateness
-        # Check for excessively long or short animations
-        durations = re.findall(r'(?:duration|animation-duration|transition-duration):\s*([\d.]+)(s|ms)', content)
-        for duration, unit in durations:
-            duration_ms = float(duration) * (1000 if unit == 's' else 1)
-            if duration_ms < 50:
-                self.warnings.append(f"[Animation] {filename}: Very fast animation ({duration}{unit}). Minimum 50ms for visibility.")
-            elif duration_ms > 1000 and 'transition' in content.lower():
-                self.warnings.append(f"[Animation] {filename}: Long transition ({duration}{unit}). Transitions should be 100-300ms for responsiveness.")
-
-        # 5.2 Easing Function Correctness
-        # Check for incorrect easing patterns
-        if re.search(r'ease-in\s+.*entry|fade-in.*ease-in', content):
-            self.warnings.append(f"[Animation] {filename}: Entry animation with ease-in. Entry should use ease-out for snappy feel.")
-        if re.search(r'ease-out\s+.*exit|fade-out.*ease-out', content):
-            self.warnings.append(f"[Animation] {filename}: Exit animation with ease-out. Exit should use ease-in for natural feel.")
-
-        # 5.3 Micro-interaction Feedback Patterns
-        # Check for interactive elements without hover/focus states
-        interactive_elements = len(re.findall(r'<button|<a\s+href|onClick|@click', content))
-        has_hover_focus = bool(re.search(r'hover:|focus:|:hover|:focus', content))
-        if interactive_elements > 2 and not has_hover_focus:
-            self.warnings.append(f"[Animation] {filename}: Interactive elements without hover/focus states. Add micro-interactions for feedback.")
-
-        # 5.4 Loading State Indicators
-        # Check for loading patterns
-        has_async = bool(re.search(r'async|await|fetch|axios|loading|isLoading', content))
-        has_loading_indicator = bool(re.search(r'skeleton|spinner|progress|loading|<circle.*animate', content))
-        if has_async and not has_loading_indicator:
-            self.warnings.append(f"[Animation] {filename}: Async operations without loading indicator. Add skeleton or spinner for perceived performance.")
-
-        # 5.5 Page Transition Patterns
-        # Check for page/view transitions
-        has_routing = bool(re.search(r'router|navigate|Link.*to|useHistory', content))
-        has_page_transition = bool(re.search(r'AnimatePresence|motion\.|transition.*page|fade.*route', content))
-        if has_routing and not has_page_transition:
-            self.warnings.append(f"[Animation] {filename}: Routing detected without page transitions. Consider fade/slide for context continuity.")
-
-        # 5.6 Scroll Animation Performance
-        # Check for scroll-driven animations
-        has_scroll_anim = bool(re.search(r'onScroll|scroll.*trigger|IntersectionObserver', content))
-        if has_scroll_anim:
-            # Check if using expensive properties in scroll handlers
-            if re.search(r'onScroll.*[^\w](width|height|top|left)', content):
-                self.issues.append(f"[Animation] {filename}: Scroll handler animating layout properties. Use transform/opacity for 60fps.")
-
-        # --- 6. MOTION GRAPHICS (motion-graphics.md) ---
-
-        # 6.1 Lottie Animation Checks
-        has_lottie = bool(re.search(r'lottie|Lottie|@lottie-react', content))
-        if has_lottie:
-            # Check for reduced motion fallback
-            has_lottie_fallback = bool(re.search(r'prefers-reduced-motion.*lottie|lottie.*isPaused|lottie.*stop', content))
-            if not has_lottie_fallback:
-                self.warnings.append(f"[Motion] {filename}: Lottie animation without reduced-motion fallback. Add pause/stop for accessibility.")
-
-        # 6.2 GSAP Memory Leak Risks
-        has_gsap = bool(re.search(r'gsap|ScrollTrigger|from\(.*gsap', content))
-        if has_gsap:
-            # Check for cleanup patterns
-            has_gsap_cleanup = bool(re.search(r'kill\(|revert\(|useEffect.*return.*gsap', content))
-            if not has_gsap_cleanup:
-                self.issues.append(f"[Motion] {filename}: GSAP animation without cleanup (kill/revert). Memory leak risk on unmount.")
-
-        # 6.3 SVG Animation Performance
-        svg_animations = re.findall(r'<animate|<animateTransform|stroke-dasharray|stroke-dashoffset', content)
-        if len(svg_animations) > 3:
-            self.warnings.append(f"[Motion] {filename}: Multiple SVG animations detected. Ensure stroke-dashoffset is used sparingly for mobile performance.")
-
-        # 6.4 3D Transform Performance
-        has_3d_transform = bool(re.search(r'transform3d|perspective\(|rotate3d|translate3d', content))
-        if has_3d_transform:
-            # Check for perspective on parent
-            has_perspective_parent = bool(re.search(r'perspective:\s*\d+px|perspective\s*\(', content))
-            if not has_perspective_parent:
-                self.warnings.append(f"[Motion] {filename}: 3D transform without perspective parent. Add perspective: 1000px for realistic depth.")
-
-            # Warn about mobile performance
-            self.warnings.append(f"[Motion] {filename}: 3D transforms detected. Test on mobile; can impact performance on low-end devices.")
-
-        # 6.5 Particle Effect Warnings
-        # Check for canvas/WebGL particle systems
-        has_particles = bool(re.search(r'particle|canvas.*loop|requestAnimationFrame.*draw|Three\.js', content))
-        if has_particles:
-            self.warnings.append(f"[Motion] {filename}: Particle effects detected. Ensure fallback or reduced-quality option for mobile devices.")
-
-        # 6.6 Scroll-Driven Animation Performance
-        has_scroll_driven = bool(re.search(r'IntersectionObserver.*animate|scroll.*progress|view-timeline', content))
-        if has_scroll_driven:
-            # Check for throttling/debouncing
-            has_throttle = bool(re.search(r'throttle|debounce|requestAnimationFrame', content))
-            if not has_throttle:
-                self.issues.append(f"[Motion] {filename}: Scroll-driven animation without throttling. Add requestAnimationFrame for 60fps.")
-
-        # 6.7 Motion Decision Tree - Context Check
-        # Check if animation serves purpose (not just decoration)
-        total_animations = (
-            len(re.findall(r'@keyframes|transition:|animate-', content)) +
-            (1 if has_lottie else 0) +
-            (1 if has_gsap else 0)
-        )
-        if total_animations > 5:
-            # Check if animations are functional
-            functional_animations = len(re.findall(r'hover:|focus:|disabled|loading|error|success', content))
-            if functional_animations < total_animations / 2:
-                self.warnings.append(f"[Motion] {filename}: Many animations ({total_animations}). Ensure majority serve functional purpose (feedback, guidance), not decoration.")
-
-        # --- 7. ACCESSIBILITY ---
-        if re.search(r'<img(?![^>]*alt=)[^>]*>', content):
-            self.issues.append(f"[Accessibility] {filename}: Missing img alt text")
-
-    def audit_directory(self, directory: str) -> None:
+        features = FileFeatures(content, COMPILED_FEATURES, path=filepath,
+                                options={"style_cache": self.style_cache})
+        for level, category, message in run_rules(RULES, features):
+            if level == "passed":
+                self.passed_count += 1
+            elif level == "issue":
+                self.issues.append(f"[{category}] {filename}: {message}")
+            else:
+                self.warnings.append(f"[{category}] {filename}: {message}")
+        self.file_data = {"digest": dt.content_digest(content), "tokens": dt.extract_tokens(features["style"])}
+
+    def audit_directory(self, directory: str, jobs: int = 1) -> None:
         extensions = {'.tsx', '.jsx', '.html', '.vue', '.svelte', '.css'}
-        for root, dirs, files in os.walk(directory):
-            dirs[:] = [d for d in dirs if d not in {'node_modules', '.git', 'dist', 'build', '.next'}]
-            for file in files:
-                if Path(file).suffix in extensions:
-                    self.audit_file(os.path.join(root, file))
+        skip_dirs = {'node_modules', '.git', 'dist', 'build', '.next'}
+        files = walk_files(directory, extensions, skip_dirs)
+        self.audit_files(files, jobs)
+        self.token_index.prune(directory, (os.path.abspath(f) for f in files))
+
+    def audit_files(self, files: list, jobs: int = 1) -> None:
+        """
+        Audit files, in a process pool when jobs > 1. Each file's findings are
+        merged in input order, deduplicated per file, then streamed; its
+        design tokens replace the file's entry in the token index.
+        """
+        for result in iter_audits(type(self), files, jobs, options={"style_cache": self.style_cache}):
+            self.files_checked += result["checked"]
+            self.passed_count += result["passed"]
+            self.issues.extend(dedupe(result["issues"]))
+            self.warnings.extend(dedupe(result["warnings"]))
+            self.timings.append((result["seconds"], self.relpath(result["file"])))
+            if result["data"]:
+                self.token_index.update(os.path.abspath(result["file"]), **result["data"])
+            self.emit_findings(result["file"])
+
+    def check_design_tokens(self) -> None:
+        """
+        Cross-file phase: judge the design tokens of every indexed file
+        together (palette sprawl, near-duplicate colors / sizes / spacings).
+        Findings are project-wide warnings and do not affect compliance; a
+        single indexed file has nothing to compare against.
+        """
+        self.design_tokens = dt.analyze(self.token_index, relpath=self.relpath)
+        findings = self.design_tokens.pop("findings") if len(self.token_index.files) > 1 else []
+        self.design_tokens["warnings"] = [f"[{category}] {message}" for _, category, message in findings]
+        if self.writer:
+            for _, category, message in findings:
+                self.writer.write(make_finding("ux_audit", f"{slug(category)}/{slug(message.split(':')[0])}",
+                                               "medium", message, category=category))
+
+    def relpath(self, filepath: str) -> str:
+        return os.path.relpath(filepath, self.root) if self.root else filepath
+
+    def emit_findings(self, filepath: str) -> None:
+        """
+        Stream the findings collected so far (issues as high, warnings as
+        medium) and drop them from memory; get_report() keeps the counts.
+        """
+        if not self.writer:
+            return
+        rel_path = self.relpath(filepath)
+        write_legacy(self.writer, "ux_audit", self.issues, "high", file=rel_path)
+        write_legacy(self.writer, "ux_audit", self.warnings, "medium", file=rel_path)
+        self.streamed["issues"] += len(self.issues)
+        self.streamed["warnings"] += len(self.warnings)
+        self.issues.clear()
+        self.warnings.clear()
 
     def get_report(self):
         return {
@@ -685,22 +670,51 @@ class UXAuditor:
             "issues": self.issues,
             "warnings": self.warnings,
             "passed_checks": self.passed_count,
-            "compliant": len(self.issues) == 0
+            "compliant": len(self.issues) + self.streamed["issues"] == 0,
+            "slowest_files": slowest(self.timings),
+            "design_tokens": self.design_tokens
         }
 
 def main():
-    if len(sys.argv) < 2: sys.exit(1)
+    parser = argparse.ArgumentParser(description="UX audit for frontend design principles")
+    parser.add_argument("path", help="File or directory to audit")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes (0 = all cores)")
+    parser.add_argument("--style-cache", nargs="?", const="", default=None,
+                        help="Cache parsed style models per file hash (default dir: <path>/.agent-cache/styles)")
+    parser.add_argument("--design-index", nargs="?", const="", default=None,
+                        help="Keep the cross-file design token index in this JSON file and update it "
+                             "incrementally (default: <path>/.agent-cache/design-tokens.json)")
+    add_format_argument(parser)
+    args = parser.parse_args()
     
-    path = sys.argv[1]
-    is_json = "--json" in sys.argv
-    
-    auditor = UXAuditor()
-    if os.path.isfile(path): auditor.audit_file(path)
-    else: auditor.audit_directory(path)
+    path = args.path
+    style_cache = args.style_cache
+    if style_cache == "":
+        style_cache = str(sm.default_cache_dir(path if os.path.isdir(path) else os.path.dirname(path) or "."))
+    auditor = UXAuditor(style_cache=style_cache)
+    auditor.writer = open_writer("ux_audit", args.format)
+    auditor.root = path if os.path.isdir(path) else os.path.dirname(path)
+    design_index = args.design_index
+    if design_index == "":
+        design_index = str(dt.default_index_path(path if os.path.isdir(path) else os.path.dirname(path) or "."))
+    if design_index:
+        auditor.token_index = dt.DesignTokenIndex.load(design_index)
+    if os.path.isfile(path):
+        auditor.audit_files([path])
+    else:
+        auditor.audit_directory(path, args.jobs)
+    auditor.check_design_tokens()
+    if design_index:
+        auditor.token_index.save(design_index)
     
     report = auditor.get_report()
     
-    if is_json:
+    if auditor.writer:
+        auditor.writer.close(passed=report['compliant'], files_checked=report['files_checked'],
+                             passed_checks=report['passed_checks'],
+                             slowest_files=report['slowest_files'])
+    elif args.json:
         print(json.dumps(report))
     else:
         # Use ASCII-safe output for Windows console compatibility
@@ -712,7 +726,18 @@ def main():
         if report['warnings']:
             print(f"[*] WARNINGS ({len(report['warnings'])}):")
             for w in report['warnings'][:15]: print(f"  - {w}")
+        design = report['design_tokens']
+        if design and design['warnings']:
+            kinds = design['summary']['kinds']
+            print(f"[#] DESIGN TOKENS ({design['summary']['files']} files): "
+                  + ", ".join(f"{kinds[k]['distinct']} {k.replace('_', ' ')}" for k in dt.TOKEN_KINDS))
+            for w in design['warnings'][:10]: print(f"  - {w}")
         print(f"[+] PASSED CHECKS: {report['passed_checks']}")
+        slow = [t for t in report['slowest_files'] if t['ms'] >= SLOW_FILE_SECONDS * 1000]
+        if slow:
+            print(f"[~] SLOW FILES (>= {SLOW_FILE_SECONDS * 1000:.0f}ms):")
+            for t in slow:
+                print(f"  - {t['file']}: {t['ms']}ms")
         status = "PASS" if report['compliant'] else "FAIL"
         print(f"STATUS: {status}")
 
@@ -13,13 +13,28 @@ WHAT IT CHECKS:
     - JSX/TSX files (React page components)
     - NOT markdown files (those are developer docs, not public content)
 
+HOW:
+    Signals run as a compiled engine: each page is lowercased once and every
+    signal group is one combined regex pass, with hit counts and time spent
+    reported per signal. JSON-LD blocks are parsed as JSON to read @type.
+    All pages are checked (one directory walk, --jobs worker processes).
+
 Usage:
-    python geo_checker.py <project_path>
+    python geo_checker.py <project_path> [--jobs N] [--format jsonl|sarif]
 """
 import sys
+import os
 import re
 import json
+import time
+import argparse
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "code-analysis" / "scripts"))
+from findings import add_format_argument, make_finding, open_writer, slug
+from file_pool import iter_pool, resolve_jobs
+from page_dom import parse_json_ld
 
 # Fix Windows console encoding
 try:
@@ -43,6 +58,106 @@ SKIP_FILES = {
     'tailwind.config', 'postcss.config', 'next.config'
 }
 
+PAGE_EXTENSIONS = {'.html', '.htm', '.jsx', '.tsx'}
+HTML_EXTENSIONS = {'.html', '.htm'}
+
+
+# ============ SIGNAL ENGINE ============
+# Signal -> {hit kind: pattern}, matched against the lowercased page. Each
+# signal runs as one plain alternation (no capture groups, so the regex engine
+# keeps its first-character prefilter); a hit is then attributed to the first
+# kind whose pattern matches at the same position. Patterns start on rare
+# characters where they can: '%' and 'x' are checked behind for a digit.
+SIGNAL_PATTERNS = {
+    "structure": {
+        "h1": r'<h1[^>]*>',
+        "h2": r'<h2[^>]*>',
+        "list": r'<(?:ul|ol)[^>]*>',
+        "table": r'<table[^>]*>',
+    },
+    "author": {
+        "author": r'author',
+        "byline": r'byline',
+        "written_by": r'written-by',
+        "contributor": r'contributor',
+    },
+    "date": {
+        "published": r'datepublished|article:published|pubdate',
+        "modified": r'datemodified',
+        "datetime": r'datetime=',
+    },
+    "faq": {
+        "details": r'<details',
+        "faq": r'faq',
+        "frequently_asked": r'frequently.?asked',
+    },
+    "entity": {
+        "schema_type": r'"@type"\s*:\s*"(?:organization|localbusiness|brand)"',
+        "microdata": r'itemtype.*schema\.org/(?:organization|person|brand)',
+        "rel_author": r'rel="author"',
+    },
+    "statistics": {
+        "percent": r'(?<=\d)%',
+        "money": r'\$[\d,]+',
+        "study": r'study\s+(?:shows|found)',
+        "according": r'according to',
+        "data": r'data\s+(?:shows|reveals)',
+        "multiple": r'(?<=\d)x\s+(?:faster|better|more)',
+        "large_number": r'million|billion|trillion',
+    },
+    "direct_answer": {
+        "definition": r'is defined as|refers to|means that',
+        "answer": r'the answer is|in short,|simply put,',
+        "dfn": r'<dfn',
+    },
+}
+
+COMPILED_SIGNALS = {
+    name: (re.compile("|".join(f"(?:{pattern})" for pattern in kinds.values())),
+           [(kind, re.compile(pattern)) for kind, pattern in kinds.items()])
+    for name, kinds in SIGNAL_PATTERNS.items()
+}
+
+JSON_LD_SCRIPT = re.compile(r'<script\b[^>]*application/ld\+json[^>]*>([\s\S]*?)</script>', re.I)
+# JSX builds JSON-LD from object literals ({"@type": "Article"} / {'@type': 'Article'})
+LITERAL_TYPE = re.compile(r'["\']@type["\']\s*:\s*["\']([A-Za-z]+)["\']')
+ARTICLE_TYPES = {"Article", "BlogPosting", "NewsArticle", "TechArticle"}
+ENTITY_TYPES = {"Organization", "Person", "LocalBusiness", "Brand"}
+
+
+def run_signals(lower: str) -> Tuple[Dict[str, Dict[str, int]], Dict[str, float]]:
+    """Hit counts per signal and kind, and seconds spent per signal."""
+    hits, seconds = {}, {}
+    for name, (matcher, kinds) in COMPILED_SIGNALS.items():
+        started = time.perf_counter()
+        counts = dict.fromkeys(SIGNAL_PATTERNS[name], 0)
+        for match in matcher.finditer(lower):
+            start = match.start()
+            kind = next((kind for kind, pattern in kinds if pattern.match(lower, start)), None)
+            if kind:
+                counts[kind] += 1
+        hits[name] = counts
+        seconds[name] = time.perf_counter() - started
+    return hits, seconds
+
+
+def json_ld_signal(content: str, is_html: bool) -> Dict[str, Any]:
+    """JSON-LD blocks, their parsed @type values and how many failed to parse."""
+    blocks = JSON_LD_SCRIPT.findall(content)
+    types: Set[str] = set()
+    invalid = 0
+    for block in blocks:
+        parsed = parse_json_ld(block)
+        if parsed is None:
+            # in JSX the block is usually an expression, not JSON text
+            invalid += is_html
+        else:
+            types.update(parsed)
+    if not is_html and "application/ld+json" in content:
+        types.update(LITERAL_TYPE.findall(content))
+    return {"present": bool(blocks) or "application/ld+json" in content, "blocks": len(blocks),
+            "invalid": invalid, "types": types}
+
 
 def is_page_file(file_path: Path) -> bool:
     """Check if this file is likely a public-facing page."""
@@ -78,22 +193,29 @@ def is_page_file(file_path: Path) -> bool:
     return False
 
 
+def iter_web_pages(project_path: Path) -> Iterator[Path]:
+    """Yield public-facing web pages, in a stable order, from a single directory walk."""
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in PAGE_EXTENSIONS:
+                f = Path(root) / name
+                if is_page_file(f):
+                    yield f
+
+
 def find_web_pages(project_path: Path) -> list:
     """Find public-facing web pages only."""
-    patterns = ['**/*.html', '**/*.htm', '**/*.jsx', '**/*.tsx']
-    
-    files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            # Skip excluded directories
-            if any(skip in f.parts for skip in SKIP_DIRS):
-                continue
-            
-            # Check if it's likely a page
-            if is_page_file(f):
-                files.append(f)
-    
-    return files[:30]  # Limit to 30 pages
+    return list(iter_web_pages(project_path))
+
+
+def check_pages(pages: List[Path], jobs: int = 1) -> Iterator[dict]:
+    """Yield check_page() results in page order, in worker processes when jobs > 1."""
+    if resolve_jobs(jobs) <= 1:
+        for page in pages:
+            yield check_page(page)
+    else:
+        yield from iter_pool(check_page, pages, jobs)
 
 
 def check_page(file_path: Path) -> dict:
@@ -101,27 +223,36 @@ def check_page(file_path: Path) -> dict:
     try:
         content = file_path.read_text(encoding='utf-8', errors='ignore')
     except Exception as e:
-        return {'file': str(file_path.name), 'passed': [], 'issues': [f"Error: {e}"], 'score': 0}
+        return {'file': str(file_path), 'passed': [], 'issues': [f"Error: {e}"], 'score': 0, 'signals': {}}
     
     issues = []
     passed = []
+    lower = content.lower()
+    hits, seconds = run_signals(lower)
+    started = time.perf_counter()
+    json_ld = json_ld_signal(content, file_path.suffix.lower() in HTML_EXTENSIONS)
+    seconds["json_ld"] = time.perf_counter() - started
+    hits["json_ld"] = {"blocks": json_ld["blocks"], "invalid": json_ld["invalid"], "types": len(json_ld["types"])}
+    types = json_ld["types"]
     
     # 1. JSON-LD Structured Data (Critical for AI)
-    if 'application/ld+json' in content:
+    if json_ld["present"]:
         passed.append("JSON-LD structured data found")
-        if '"@type"' in content:
-            if 'Article' in content:
-                passed.append("Article schema present")
-            if 'FAQPage' in content:
-                passed.append("FAQ schema present")
-            if 'Organization' in content or 'Person' in content:
-                passed.append("Entity schema present")
+        if types & ARTICLE_TYPES:
+            passed.append("Article schema present")
+        if "FAQPage" in types:
+            passed.append("FAQ schema present")
+        if types & ENTITY_TYPES:
+            passed.append("Entity schema present")
+        if json_ld["invalid"]:
+            issues.append(f"Invalid JSON-LD ({json_ld['invalid']} block(s) not parseable as JSON)")
     else:
         issues.append("No JSON-LD structured data (AI engines prefer structured content)")
     
     # 2. Heading Structure
-    h1_count = len(re.findall(r'<h1[^>]*>', content, re.I))
-    h2_count = len(re.findall(r'<h2[^>]*>', content, re.I))
+    structure = hits["structure"]
+    h1_count = structure["h1"]
+    h2_count = structure["h2"]
     
     if h1_count == 1:
         passed.append("Single H1 heading (clear topic)")
@@ -136,92 +267,110 @@ def check_page(file_path: Path) -> dict:
         issues.append("Add more H2 subheadings for scannable content")
     
     # 3. Author Attribution (E-E-A-T signal)
-    author_patterns = ['author', 'byline', 'written-by', 'contributor', 'rel="author"']
-    has_author = any(p in content.lower() for p in author_patterns)
-    if has_author:
+    if any(hits["author"].values()):
         passed.append("Author attribution found")
     else:
         issues.append("No author info (AI prefers attributed content)")
     
     # 4. Publication Date (Freshness signal)
-    date_patterns = ['datePublished', 'dateModified', 'datetime=', 'pubdate', 'article:published']
-    has_date = any(re.search(p, content, re.I) for p in date_patterns)
-    if has_date:
+    if any(hits["date"].values()):
         passed.append("Publication date found")
     else:
         issues.append("No publication date (freshness matters for AI)")
     
     # 5. FAQ Section (Highly citable)
-    faq_patterns = [r'<details', r'faq', r'frequently.?asked', r'"FAQPage"']
-    has_faq = any(re.search(p, content, re.I) for p in faq_patterns)
-    if has_faq:
+    if any(hits["faq"].values()) or "FAQPage" in types:
         passed.append("FAQ section detected (highly citable)")
     
     # 6. Lists (Structured content)
-    list_count = len(re.findall(r'<(ul|ol)[^>]*>', content, re.I))
-    if list_count >= 2:
-        passed.append(f"{list_count} lists (structured content)")
+    if structure["list"] >= 2:
+        passed.append(f"{structure['list']} lists (structured content)")
     
     # 7. Tables (Comparison data)
-    table_count = len(re.findall(r'<table[^>]*>', content, re.I))
-    if table_count >= 1:
-        passed.append(f"{table_count} table(s) (comparison data)")
-    
-    # 8. Entity Recognition (E-E-A-T signal) - NEW 2025
-    entity_patterns = [
-        r'"@type"\s*:\s*"Organization"',
-        r'"@type"\s*:\s*"LocalBusiness"', 
-        r'"@type"\s*:\s*"Brand"',
-        r'itemtype.*schema\.org/(Organization|Person|Brand)',
-        r'rel="author"'
-    ]
-    has_entity = any(re.search(p, content, re.I) for p in entity_patterns)
-    if has_entity:
+    if structure["table"] >= 1:
+        passed.append(f"{structure['table']} table(s) (comparison data)")
+    
+    # 8. Entity Recognition (E-E-A-T signal)
+    if any(hits["entity"].values()) or types & (ENTITY_TYPES - {"Person"}):
         passed.append("Entity/Brand recognition (E-E-A-T)")
     
-    # 9. Original Statistics/Data (AI citation magnet) - NEW 2025
-    stat_patterns = [
-        r'\d+%',                    # Percentages
-        r'\$[\d,]+',                # Dollar amounts
-        r'study\s+(shows|found)',   # Research citations
-        r'according to',            # Source attribution
-        r'data\s+(shows|reveals)',  # Data-backed claims
-        r'\d+x\s+(faster|better|more)', # Comparison stats
-        r'(million|billion|trillion)', # Large numbers
-    ]
-    stat_matches = sum(1 for p in stat_patterns if re.search(p, content, re.I))
-    if stat_matches >= 2:
+    # 9. Original Statistics/Data (AI citation magnet) - two or more kinds
+    if sum(1 for count in hits["statistics"].values() if count) >= 2:
         passed.append("Original statistics/data (citation magnet)")
     
-    # 10. Conversational/Direct answers - NEW 2025
-    direct_answer_patterns = [
-        r'is defined as',
-        r'refers to',
-        r'means that',
-        r'the answer is',
-        r'in short,',
-        r'simply put,',
-        r'<dfn'
-    ]
-    has_direct = any(re.search(p, content, re.I) for p in direct_answer_patterns)
-    if has_direct:
+    # 10. Conversational/Direct answers
+    if any(hits["direct_answer"].values()):
         passed.append("Direct answer patterns (LLM-friendly)")
     
     # Calculate score
     total = len(passed) + len(issues)
     score = (len(passed) / total * 100) if total > 0 else 0
     
+    signal_hits = {name: sum(kinds.values()) for name, kinds in hits.items()}
+    signal_hits["json_ld"] = max(json_ld["blocks"], int(json_ld["present"]))
     return {
-        'file': str(file_path.name),
+        'file': str(file_path),
         'passed': passed,
         'issues': issues,
-        'score': round(score)
+        'score': round(score),
+        'signals': {name: {'hits': signal_hits[name], 'kinds': hits[name], 'ms': round(seconds[name] * 1000, 3)}
+                    for name in hits},
     }
 
 
+def signal_totals(results: List[dict]) -> Dict[str, Dict[str, Any]]:
+    """Per-signal hits, pages hit and total milliseconds across all pages."""
+    totals: Dict[str, Dict[str, Any]] = {}
+    for result in results:
+        for name, signal in result.get('signals', {}).items():
+            total = totals.setdefault(name, {'hits': 0, 'pages': 0, 'ms': 0.0})
+            total['hits'] += signal['hits']
+            total['pages'] += 1 if signal['hits'] else 0
+            total['ms'] += signal['ms']
+    for total in totals.values():
+        total['ms'] = round(total['ms'], 2)
+    return totals
+
+
+def page_findings(result: dict, rel_path: str) -> list:
+    """
+    Convert a check_page() result into shared-schema findings. GEO issues are
+    advisory ('low'); pass/fail stays with the average score.
+    """
+    return [
+        make_finding("geo_checker", slug(issue), "low", issue,
+                     file=rel_path, category="GEO", score=result['score'])
+        for issue in result['issues']
+    ]
+
+
 def main():
-    target = sys.argv[1] if len(sys.argv) > 1 else "."
-    target_path = Path(target).resolve()
+    parser = argparse.ArgumentParser(description="GEO audit for public web pages")
+    parser.add_argument("project_path", nargs="?", default=".", help="Project directory")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes (0 = all cores)")
+    add_format_argument(parser)
+    args = parser.parse_args()
+    
+    target_path = Path(args.project_path).resolve()
+    writer = open_writer("geo_checker", args.format)
+    
+    # Find web pages only
+    pages = find_web_pages(target_path)
+    results = []
+    for result in check_pages(pages, args.jobs):
+        result['file'] = str(Path(result['file']).relative_to(target_path)).replace("\\", "/")
+        results.append(result)
+        if writer:
+            # Machine-readable mode: stream each page's findings as it is checked
+            writer.write_all(page_findings(result, result['file']))
+    signals = signal_totals(results)
+    
+    if writer:
+        scores = [r['score'] for r in results]
+        avg_score = sum(scores) / len(scores) if scores else 100
+        passed = avg_score >= 60
+        writer.close(passed=passed, pages_checked=len(scores), average_score=round(avg_score), signals=signals)
+        sys.exit(0 if passed else 1)
     
     print("\n" + "=" * 60)
     print("  GEO CHECKER - AI Citation Readiness Audit")
@@ -229,9 +378,6 @@ def main():
     print(f"Project: {target_path}")
     print("-" * 60)
     
-    # Find web pages only
-    pages = find_web_pages(target_path)
-    
     if not pages:
         print("\n[!] No public web pages found.")
         print("    Looking for: HTML, JSX, TSX files in pages/app directories")
@@ -242,12 +388,6 @@ def main():
     
     print(f"Found {len(pages)} public pages to analyze\n")
     
-    # Check each page
-    results = []
-    for page in pages:
-        result = check_page(page)
-        results.append(result)
-    
     # Print results
     for result in results:
         status = "[OK]" if result['score'] >= 60 else "[!]"
@@ -256,6 +396,11 @@ def main():
             for issue in result['issues'][:2]:  # Show max 2 issues
                 print(f"    - {issue}")
     
+    # Signal engine stats
+    print("\nSignals (hits / pages / time):")
+    for name, total in sorted(signals.items(), key=lambda x: -x[1]['ms']):
+        print(f"  {name:<14} {total['hits']:>6} hits  {total['pages']:>5} pages  {total['ms']:>8.2f} ms")
+    
     # Average score
     avg_score = sum(r['score'] for r in results) / len(results) if results else 0
     
@@ -278,6 +423,7 @@ def main():
         "project": str(target_path),
         "pages_checked": len(results),
         "average_score": round(avg_score),
+        "signals": signals,
         "passed": avg_score >= 60
     }
     print("\n" + json.dumps(output, indent=2))
@@ -2,12 +2,34 @@
 """
 i18n Checker - Detects hardcoded strings and missing translations.
 Scans for untranslated text in React, Vue, and Python files.
+
+Every code file under the project is scanned (one directory walk, files
+read in a process pool with --jobs). The scan also indexes the translation
+keys referenced in code - t("a.b"), $t(), i18n.t(), i18nKey, gettext _() -
+against the keys defined in locale files, reporting keys used but never
+defined and keys defined but never used.
+
+Locale catalogs may be JSON (one file per language, or one folder per
+language with a file per namespace) or gettext .po/.pot. Keys are yielded
+by iterative readers - catalogs over 8 MB are streamed in chunks - and each
+language is compared in one pass against the base language's key set.
+
+Usage:
+    python i18n_checker.py <project_path> [--jobs N] [--format jsonl|sarif]
 """
 import sys
+import os
 import re
 import json
+import bisect
+import argparse
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "code-analysis" / "scripts"))
+from findings import add_format_argument, make_finding, open_writer, slug
+from file_pool import iter_pool, walk_files
+from source_tokens import language_for, tokenize_source
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -21,18 +43,18 @@ HARDCODED_PATTERNS = {
         # Text directly in JSX: <div>Hello World</div>
         r'>\s*[A-Z][a-zA-Z\s]{3,30}\s*</',
         # JSX attribute strings: title="Welcome"
-        r'(title|placeholder|label|alt|aria-label)="[A-Z][a-zA-Z\s]{2,}"',
+        r'(?:title|placeholder|label|alt|aria-label)="[A-Z][a-zA-Z\s]{2,}"',
         # Button/heading text
-        r'<(button|h[1-6]|p|span|label)[^>]*>\s*[A-Z][a-zA-Z\s!?.,]{3,}\s*</',
+        r'<(?:button|h[1-6]|p|span|label)[^>]*>\s*[A-Z][a-zA-Z\s!?.,]{3,}\s*</',
     ],
     'vue': [
         # Vue template text
         r'>\s*[A-Z][a-zA-Z\s]{3,30}\s*</',
-        r'(placeholder|label|title)="[A-Z][a-zA-Z\s]{2,}"',
+        r'(?:placeholder|label|title)="[A-Z][a-zA-Z\s]{2,}"',
     ],
     'python': [
         # print/raise with string literals
-        r'(print|raise\s+\w+)\s*\(\s*["\'][A-Z][^"\']{5,}["\']',
+        r'(?:print|raise\s+\w+)\s*\(\s*["\'][A-Z][^"\']{5,}["\']',
         # Flask flash messages
         r'flash\s*\(\s*["\'][A-Z][^"\']{5,}["\']',
     ]
@@ -50,137 +72,477 @@ I18N_PATTERNS = [
     r'i18n\.',             # Generic i18n
 ]
 
+# One matcher per file type, and one for i18n usage
+HARDCODED_MATCHERS = {
+    file_type: re.compile("|".join(f"(?:{p})" for p in patterns))
+    for file_type, patterns in HARDCODED_PATTERNS.items()
+}
+I18N_MATCHER = re.compile("|".join(I18N_PATTERNS))
+
+# Translation keys referenced in code: t('a.b'), $t("a"), i18n.t(`a.${x}`), _("msgid"),
+# <Trans i18nKey="a.b">, <FormattedMessage id="a.b">, formatMessage({ id: 'a.b' })
+KEY_REFERENCE = re.compile(
+    r'(?:(?<![\w$.])(?:t|\$t|_|gettext|ngettext)|\bi18n(?:ext)?\.t)\(\s*(["\'`])((?:(?!\1)[^\\\n]|\\.)+)\1'
+    r'|\bi18nKey=\{?\s*(["\'])([^"\'\n]+)\3'
+    r'|<FormattedMessage\s[^>]*?\bid=\{?\s*(["\'])([^"\'\n]+)\5'
+    r'|\bformatMessage\(\s*\{\s*id:\s*(["\'])([^"\'\n]+)\7'
+)
+# i18next plural/context suffixes: 'items' is used by 'items_one', 'items_other'
+PLURAL_SUFFIX = re.compile(r'_(?:zero|one|two|few|many|other|plural|\d+)$')
+# A locale folder named like a language holds one file per namespace (en/common.json)
+LANG_CODE = re.compile(r'^([a-z]{2,3})(?:[-_][A-Za-z]{2,4})?$')
+# ISO 639-1 codes: 'ui.json' or 'web/' are namespaces and folders, not languages
+ISO_LANGUAGES = set("""
+aa ab ae af ak am an ar as av ay az ba be bg bh bi bm bn bo br bs ca ce ch co cr cs cu cv cy da de dv dz
+ee el en eo es et eu fa ff fi fj fo fr fy ga gd gl gn gu gv ha he hi ho hr ht hu hy hz ia id ie ig ii ik
+io is it iu ja jv ka kg ki kj kk kl km kn ko kr ks ku kv kw ky la lb lg li ln lo lt lu lv mg mh mi mk ml
+mn mr ms mt my na nb nd ne ng nl nn no nr nv ny oc oj om or os pa pi pl ps pt qu rm rn ro ru rw sa sc sd
+se sg si sk sl sm sn so sq sr ss st su sv sw ta te tg th ti tk tl tn to tr ts tt tw ty ug uk ur uz ve vi
+vo wa wo xh yi yo za zh zu
+""".split())
+
+CODE_EXTENSIONS = {
+    '.tsx': 'jsx', '.jsx': 'jsx', '.ts': 'jsx', '.js': 'jsx',
+    '.vue': 'vue',
+    '.py': 'python'
+}
+SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '__pycache__', 'venv', '.venv',
+             'test', 'tests', '__tests__', 'spec', 'specs'}
+TEST_FILE = re.compile(r'\.(?:test|spec)\.\w+$|^test_.*\.py$|_test\.py$')
+MAX_EXAMPLES = 5
+
+# Locale catalogs: JSON under one of these folders, gettext .po/.pot anywhere
+LOCALE_DIRS = {'locales', 'locale', 'translations', 'lang', 'i18n', 'messages'}
+LOCALE_SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '__pycache__', 'venv', '.venv'}
+# JSON catalogs at least this large are streamed instead of loaded whole
+STREAM_THRESHOLD = 8 * 1024 * 1024
+CHUNK_SIZE = 1 << 16
+# "key":  |  scalar value  |  bracket - with trailing commas folded in
+JSON_TOKEN = re.compile(r'\s*(?:("(?:[^"\\]|\\.)*")\s*:|("(?:[^"\\]|\\.)*"|[^\s{}\[\]:,"]+)\s*,?|([{}\[\]])\s*,?)')
+PO_LINE = re.compile(r'^(msgctxt|msgid_plural|msgid|msgstr(?:\[\d+\])?)\s+(".*")$')
+
+# Findings severity per report marker
+MARKER_SEVERITY = {"[X]": "high", "[!]": "medium"}
+
 def find_locale_files(project_path: Path) -> list:
-    """Find translation/locale files."""
-    patterns = [
-        "**/locales/**/*.json",
-        "**/translations/**/*.json",
-        "**/lang/**/*.json",
-        "**/i18n/**/*.json",
-        "**/messages/*.json",
-        "**/*.po",  # gettext
-    ]
-    
+    """Find translation/locale files (JSON catalogs and gettext .po/.pot) in one directory walk."""
     files = []
-    for pattern in patterns:
-        files.extend(project_path.glob(pattern))
+    for root, dirs, names in os.walk(project_path):
+        dirs[:] = sorted(d for d in dirs if d not in LOCALE_SKIP_DIRS)
+        in_locale_dir = bool(LOCALE_DIRS.intersection(Path(root).relative_to(project_path).parts))
+        for name in sorted(names):
+            suffix = os.path.splitext(name)[1]
+            if suffix in ('.po', '.pot') or (suffix == '.json' and in_locale_dir):
+                files.append(Path(root) / name)
+    return files
+
+def is_language(name: str) -> bool:
+    """True for language tags (en, pt_BR, zh-Hant, fil_PH); catalog folders like po/ or web/ are not."""
+    match = LANG_CODE.match(name)
+    if not match or name in LOCALE_DIRS:
+        return False
+    # Three-letter codes only with a region, so 'app' or 'web' stay names
+    return match.group(1) in ISO_LANGUAGES or (len(match.group(1)) == 3 and match.group(0) != match.group(1))
+
+def locale_layout(locale_file: Path) -> tuple:
+    """
+    (language, catalog) of a locale file, whatever the layout:
+    locales/en/common.json -> (en, common), locales/en.json -> (en, locales),
+    locales/web/en.json -> (en, locales/web), locale/en/LC_MESSAGES/app.po -> (en, app),
+    po/pt_BR.po -> (pt_BR, po), app.pot -> (template, app).
+    The file name is checked before the folder; a .pot template belongs to the
+    catalog of the .po files next to it.
+    """
+    stem, parent = locale_file.stem, locale_file.parent
+    if parent.name == 'LC_MESSAGES':
+        return ('template' if locale_file.suffix == '.pot' else parent.parent.name), stem
+    if locale_file.suffix == '.pot':
+        # po/app.pot next to po/en.po templates the 'po' catalog
+        siblings = [f for f in parent.glob('*.po') if is_language(f.stem)]
+        return 'template', (str(parent) if siblings else stem)
+    if is_language(stem):
+        return stem, str(parent)
+    if is_language(parent.name):
+        return parent.name, stem
+    return parent.name, stem
+
+def iter_locale_keys(locale_file: Path, translated_only: bool = False):
+    """
+    Yield the keys a locale file defines, without loading large catalogs whole.
+    With translated_only, .po entries with an empty or fuzzy msgstr are skipped.
+    """
+    if locale_file.suffix in ('.po', '.pot'):
+        for key, translated in iter_po_entries(locale_file):
+            if translated or not translated_only:
+                yield key
+    elif locale_file.stat().st_size < STREAM_THRESHOLD:
+        with open(locale_file, 'r', encoding='utf-8') as f:
+            yield from flatten_keys(json.load(f))
+    else:
+        with open(locale_file, 'r', encoding='utf-8') as f:
+            yield from iter_json_keys(f)
+
+def flatten_keys(d, prefix=''):
+    """
+    Yield the dotted leaf keys of a nested dict. Iterative; each nested
+    prefix is built and interned once and shared by all of its children.
+    """
+    stack = [(f"{prefix}." if prefix else '', d)]
+    while stack:
+        base, node = stack.pop()
+        for k, v in node.items():
+            if isinstance(v, dict):
+                stack.append((sys.intern(f"{base}{k}."), v))
+            else:
+                yield base + k
+
+def iter_json_keys(f, chunk_size: int = CHUNK_SIZE):
+    """
+    Stream the dotted leaf keys of a JSON object from a file, chunk by chunk.
+    Arrays are leaves, like in flatten_keys.
+    """
+    stack = []      # interned "prefix." of each open object; None for arrays and anything inside them
+    key = None      # key awaiting its value in the innermost object
+    buffer = ''
+    more = True
+    while more:
+        chunk = f.read(chunk_size)
+        more = bool(chunk)
+        buffer += chunk
+        pos = 0
+        while True:
+            m = JSON_TOKEN.match(buffer, pos)
+            if not m or (more and m.end() == len(buffer)):
+                break   # token incomplete until the next chunk arrives
+            pos = m.end()
+            kind = m.lastindex
+            if kind == 1:       # "key":
+                if stack and stack[-1] is not None:
+                    token = m.group(1)
+                    key = json.loads(token) if '\\' in token else token[1:-1]
+            elif kind == 2:     # scalar value
+                if key is not None:
+                    yield stack[-1] + key
+                    key = None
+            elif m.group(3) in '{[':
+                bracket = m.group(3)
+                if not stack:
+                    stack.append('' if bracket == '{' else None)
+                elif key is not None:
+                    if bracket == '{':
+                        stack.append(sys.intern(f"{stack[-1]}{key}."))
+                    else:
+                        yield stack[-1] + key
+                        stack.append(None)
+                else:
+                    stack.append(None)
+                key = None
+            else:
+                if stack:
+                    stack.pop()
+                key = None
+        buffer = buffer[pos:]
+
+def iter_po_entries(po_file: Path):
+    """Yield (msgid, translated) for each gettext entry; msgctxt is joined with \\x04 like gettext."""
+    entry = {}
+    field = None
+    fuzzy = False
     
-    return [f for f in files if 'node_modules' not in str(f)]
+    def finish():
+        msgid = entry.get('msgid')
+        if not msgid:   # the header entry has an empty msgid
+            return None
+        key = f"{entry['msgctxt']}\x04{msgid}" if 'msgctxt' in entry else msgid
+        return key, not fuzzy and any(v for k, v in entry.items() if k.startswith('msgstr'))
+    
+    with open(po_file, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            line = line.strip()
+            m = PO_LINE.match(line)
+            # A comment, blank line, msgctxt or msgid after a msgstr starts the next entry
+            if any(k.startswith('msgstr') for k in entry) and (
+                    not line or line.startswith('#') or (m and m.group(1) in ('msgctxt', 'msgid'))):
+                done = finish()
+                if done:
+                    yield done
+                entry, field, fuzzy = {}, None, False
+            if line.startswith('#,') and 'fuzzy' in line:
+                fuzzy = True
+            elif m:
+                field = m.group(1)
+                entry[field] = _po_unquote(m.group(2))
+            elif line.startswith('"') and field:
+                entry[field] += _po_unquote(line)
+    done = finish()
+    if done:
+        yield done
+
+def _po_unquote(quoted: str) -> str:
+    try:
+        return json.loads(quoted)
+    except ValueError:
+        return quoted.strip('"')
 
-def check_locale_completeness(locale_files: list) -> dict:
-    """Check if all locales have the same keys."""
+def check_locale_completeness(locale_files: list, project_path: Path = None) -> dict:
+    """
+    Check if all locales have the same keys. Per catalog, the base language
+    (a .pot template, else the language with the largest files) is loaded into one
+    set and every other language streams its keys against it once.
+    """
     issues = []
     passed = []
     
     if not locale_files:
         return {'passed': [], 'issues': ["[!] No locale files found"]}
     
-    # Group by parent folder (language)
-    locales = {}
+    # Group by catalog, then language
+    catalogs = {}
     for f in locale_files:
-        if f.suffix == '.json':
-            try:
-                lang = f.parent.name
-                content = json.loads(f.read_text(encoding='utf-8'))
-                if lang not in locales:
-                    locales[lang] = {}
-                locales[lang][f.stem] = set(flatten_keys(content))
-            except:
-                continue
+        lang, catalog = locale_layout(f)
+        catalogs.setdefault(catalog, {}).setdefault(lang, []).append(f)
+    languages = sorted({lang for langs in catalogs.values() for lang in langs if lang != 'template'})
     
-    if len(locales) < 2:
+    if len(languages) < 2:
         passed.append(f"[OK] Found {len(locale_files)} locale file(s)")
         return {'passed': passed, 'issues': issues}
     
-    passed.append(f"[OK] Found {len(locales)} language(s): {', '.join(locales.keys())}")
+    passed.append(f"[OK] Found {len(languages)} language(s): {', '.join(languages)}")
+    display = lambda f: str(f.relative_to(project_path)).replace('\\', '/') if project_path else str(f)
     
-    # Compare keys across locales
-    all_langs = list(locales.keys())
-    base_lang = all_langs[0]
-    
-    for namespace in locales.get(base_lang, {}):
-        base_keys = locales[base_lang].get(namespace, set())
+    for catalog in sorted(catalogs):
+        langs = catalogs[catalog]
+        if len(langs) < 2:
+            continue
+        base_lang = 'template' if 'template' in langs else None
+        if base_lang is None:
+            # Base = largest catalog on disk, so only the base is read into a set
+            sizes = {lang: sum(_file_size(f) for f in files) for lang, files in langs.items()}
+            base_lang = min(sizes, key=lambda lang: (-sizes[lang], lang))
+        base_keys = set(k for f in langs[base_lang] for k in _safe_keys(f))
         
-        for lang in all_langs[1:]:
-            other_keys = locales.get(lang, {}).get(namespace, set())
-            
-            missing = base_keys - other_keys
+        for lang in sorted(langs):
+            if lang == base_lang:
+                continue
+            matched = set()
+            extra = 0
+            for f in langs[lang]:
+                for key in _safe_keys(f, translated_only=True):
+                    if key in base_keys:
+                        matched.add(key)
+                    else:
+                        extra += 1
+            location = display(langs[lang][0])
+            missing = len(base_keys) - len(matched)
             if missing:
-                issues.append(f"[X] {lang}/{namespace}: Missing {len(missing)} keys")
-            
-            extra = other_keys - base_keys
+                examples = sorted(base_keys - matched)[:3]
+                issues.append(f"[X] {location}: Missing {missing} keys vs {base_lang} (e.g. {', '.join(examples)})")
             if extra:
-                issues.append(f"[!] {lang}/{namespace}: {len(extra)} extra keys")
+                issues.append(f"[!] {location}: {extra} extra keys not in {base_lang}")
     
     if not issues:
         passed.append("[OK] All locales have matching keys")
     
     return {'passed': passed, 'issues': issues}
 
-def flatten_keys(d, prefix=''):
-    """Flatten nested dict keys."""
-    keys = set()
-    for k, v in d.items():
-        new_key = f"{prefix}.{k}" if prefix else k
-        if isinstance(v, dict):
-            keys.update(flatten_keys(v, new_key))
-        else:
-            keys.add(new_key)
-    return keys
-
-def check_hardcoded_strings(project_path: Path) -> dict:
-    """Check for hardcoded strings in code files."""
-    issues = []
-    passed = []
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+def _safe_keys(locale_file: Path, translated_only: bool = False):
+    """iter_locale_keys() that stops quietly at unreadable or malformed files."""
+    try:
+        yield from iter_locale_keys(locale_file, translated_only)
+    except (OSError, ValueError):
+        return
+
+def locale_namespace(locale_file: Path):
+    """Namespace a locale file adds to its keys in code ('common' for en/common.json), or None."""
+    if (locale_file.suffix == '.json' and is_language(locale_file.parent.name)
+            and not is_language(locale_file.stem)):
+        return locale_file.stem
+    return None
+
+def load_defined_keys(locale_files: list) -> dict:
+    """
+    Keys defined by each locale file: {file: set(keys)}. JSON keys are
+    flattened with dots; .po files define their msgids.
+    """
+    return {f: set(_safe_keys(f)) for f in locale_files}
+
+def locale_findings(issues: list) -> list:
+    """Convert '[X] lang/namespace: message' locale issues into findings."""
+    findings = []
+    for item in issues:
+        marker, _, text = item.partition(" ")
+        location, _, message = text.rpartition(": ")
+        # Rule ids leave out counts and examples: 'Missing 3 keys vs en (e.g. ...)' -> missing-keys-vs-en
+        rule = slug(re.sub(r'\d+ |\(.*', '', message))
+        findings.append(make_finding("i18n_checker", f"locale/{rule}",
+                                     MARKER_SEVERITY.get(marker, "medium"), text,
+                                     file=location or None, category="Locale"))
+    return findings
+
+def iter_code_files(project_path: Path):
+    """Code files to scan, in a stable order, from a single directory walk (tests excluded)."""
+    for f in walk_files(str(project_path), CODE_EXTENSIONS, SKIP_DIRS):
+        if not TEST_FILE.search(os.path.basename(f)):
+            yield f
+
+def code_only(content: str, file_path: str) -> str:
+    """
+    The content with comments - and in Python every string that is not a call
+    argument, i.e. docstrings - blanked out, so t('a.b') examples in prose are
+    not taken for key references. Line numbers are kept.
+    """
+    language = language_for(file_path)
+    if language is None:
+        return content
+    parts = []
+    cursor = 0
+    previous = None
+    for kind, text, _ in tokenize_source(content, language):
+        prose = kind == "comment" or (language == "python" and kind in ("string", "template") and previous != "(")
+        previous = text
+        if not prose:
+            continue
+        pos = content.find(text, cursor)
+        if pos < 0:
+            continue
+        parts.append(content[cursor:pos])
+        parts.append(re.sub(r"[^\n]", " ", text))
+        cursor = pos + len(text)
+    parts.append(content[cursor:])
+    return "".join(parts)
+
+def scan_code_file(file_path: str) -> dict:
+    """
+    One read of a code file: i18n usage, the first hardcoded string (when the
+    file does not use i18n) and every translation key it references.
+    """
+    result = {"file": file_path, "has_i18n": False, "hardcoded": None, "keys": [], "prefixes": []}
+    try:
+        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+            content = f.read()
+    except OSError:
+        return result
     
-    # Find code files
-    extensions = {
-        '.tsx': 'jsx', '.jsx': 'jsx', '.ts': 'jsx', '.js': 'jsx',
-        '.vue': 'vue',
-        '.py': 'python'
-    }
+    newlines = [m.start() for m in re.finditer("\n", content)]
+    line_of = lambda pos: bisect.bisect_right(newlines, pos) + 1
     
-    code_files = []
-    for ext in extensions:
-        code_files.extend(project_path.rglob(f"*{ext}"))
+    result["has_i18n"] = bool(I18N_MATCHER.search(content))
+    if not result["has_i18n"]:
+        m = HARDCODED_MATCHERS[CODE_EXTENSIONS.get(os.path.splitext(file_path)[1], 'jsx')].search(content)
+        if m:
+            result["hardcoded"] = [" ".join(m.group(0).split())[:40], line_of(m.start())]
     
-    code_files = [f for f in code_files if not any(x in str(f) for x in 
-                  ['node_modules', '.git', 'dist', 'build', '__pycache__', 'venv', 'test', 'spec'])]
+    for m in KEY_REFERENCE.finditer(code_only(content, file_path)):
+        key = m.group(2) or m.group(4) or m.group(6) or m.group(8)
+        if m.group(1) == "`" and "${" in key:
+            # Dynamic key: everything under its static prefix counts as used
+            prefix = key.split("${", 1)[0]
+            if prefix:
+                result["prefixes"].append(prefix)
+            continue
+        result["keys"].append([key, line_of(m.start())])
+    return result
+
+def build_key_index(scans: list, defined: dict, project_path: Path) -> dict:
+    """
+    Compare keys referenced in code with keys defined in locale files:
+    {"referenced", "defined", "missing": [[key, file, line]], "unused": {locale_file: [keys]}}.
+    """
+    # Every form under which a defined key may be referenced
+    known = set()
+    for locale_file, keys in defined.items():
+        namespace = locale_namespace(locale_file)
+        for key in keys:
+            base = PLURAL_SUFFIX.sub('', key)
+            known.update((key, base))
+            if namespace:
+                known.update((f"{namespace}:{key}", f"{namespace}.{key}", f"{namespace}:{base}", f"{namespace}.{base}"))
     
+    referenced = set()
+    prefixes = set()
+    missing = []
+    for scan in scans:
+        rel_path = os.path.relpath(scan["file"], project_path).replace("\\", "/")
+        prefixes.update(scan["prefixes"])
+        for key, line in scan["keys"]:
+            referenced.add(key)
+            if defined and key not in known:
+                missing.append([key, rel_path, line])
+    # 'ns:key' references match the dotted form too
+    referenced |= {key.replace(":", ".", 1) for key in referenced if ":" in key}
+    prefix_list = tuple(sorted(prefixes))
+    
+    unused = {}
+    for locale_file in sorted(defined):
+        namespace = locale_namespace(locale_file)
+        never = []
+        for key in sorted(defined[locale_file]):
+            forms = {key, PLURAL_SUFFIX.sub('', key)}
+            if namespace:
+                forms |= {f"{namespace}.{form}" for form in forms}
+            if forms & referenced or (prefix_list and any(form.startswith(prefix_list) for form in forms)):
+                continue
+            never.append(key)
+        if never:
+            unused[os.path.relpath(locale_file, project_path).replace("\\", "/")] = never
+    return {"referenced": len(referenced), "defined": len(set().union(*defined.values())),
+            "missing": missing, "unused": unused}
+
+def key_index_findings(index: dict) -> list:
+    """Findings for keys used but not defined (per reference) and keys never used (per locale file)."""
+    findings = [
+        make_finding("i18n_checker", "keys/missing", "high",
+                     f"Translation key '{key}' is not defined in any locale file",
+                     file=rel_path, line=line, category="Keys", key=key)
+        for key, rel_path, line in index["missing"]
+    ]
+    for locale_file, keys in index["unused"].items():
+        examples = ", ".join(keys[:MAX_EXAMPLES]) + (", ..." if len(keys) > MAX_EXAMPLES else "")
+        findings.append(make_finding("i18n_checker", "keys/unused", "low",
+                                     f"{len(keys)} keys never referenced in code ({examples})",
+                                     file=locale_file, category="Keys", count=len(keys)))
+    return findings
+
+def check_hardcoded_strings(project_path: Path, writer=None, jobs: int = 1, defined: dict = None) -> dict:
+    """
+    Check for hardcoded strings in code files and index translation key
+    usage. With a findings writer, each file with hardcoded strings is
+    streamed as soon as it is analyzed.
+    """
+    issues = []
+    passed = []
+    
+    code_files = list(iter_code_files(project_path))
     if not code_files:
-        return {'passed': ["[!] No code files found"], 'issues': []}
+        return {'passed': ["[!] No code files found"], 'issues': [], 'key_index': None}
     
     files_with_i18n = 0
     files_with_hardcoded = 0
     hardcoded_examples = []
+    scans = []
     
-    for file_path in code_files[:50]:  # Limit
-        try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            ext = file_path.suffix
-            file_type = extensions.get(ext, 'jsx')
-            
-            # Check for i18n usage
-            has_i18n = any(re.search(p, content) for p in I18N_PATTERNS)
-            if has_i18n:
-                files_with_i18n += 1
-            
-            # Check for hardcoded strings
-            patterns = HARDCODED_PATTERNS.get(file_type, [])
-            hardcoded_found = False
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, content)
-                if matches and not has_i18n:
-                    hardcoded_found = True
-                    if len(hardcoded_examples) < 5:
-                        hardcoded_examples.append(f"{file_path.name}: {str(matches[0])[:40]}...")
-            
-            if hardcoded_found:
-                files_with_hardcoded += 1
-                
-        except:
-            continue
+    for scan in iter_pool(scan_code_file, code_files, jobs):
+        rel_path = os.path.relpath(scan["file"], project_path).replace("\\", "/")
+        if scan["has_i18n"]:
+            files_with_i18n += 1
+        if scan["hardcoded"]:
+            text, line = scan["hardcoded"]
+            files_with_hardcoded += 1
+            if len(hardcoded_examples) < MAX_EXAMPLES:
+                hardcoded_examples.append(f"{os.path.basename(scan['file'])}: {text}...")
+            if writer:
+                writer.write(make_finding(
+                    "i18n_checker", "hardcoded-string", "high",
+                    f"Possible hardcoded string: {text}",
+                    file=rel_path, line=line, category="Hardcoded"))
+        if scan["keys"] or scan["prefixes"]:
+            scans.append(scan)
     
     passed.append(f"[OK] Analyzed {len(code_files)} code files")
     
@@ -194,11 +556,42 @@ def check_hardcoded_strings(project_path: Path) -> dict:
     else:
         passed.append("[OK] No obvious hardcoded strings detected")
     
-    return {'passed': passed, 'issues': issues}
+    # Key usage index
+    index = build_key_index(scans, defined or {}, project_path) if defined else None
+    if index:
+        if index["missing"]:
+            missing_keys = sorted({key for key, _, _ in index["missing"]})
+            issues.append(f"[X] {len(missing_keys)} translation keys used in code but not defined")
+            for key, rel_path, line in index["missing"][:MAX_EXAMPLES]:
+                issues.append(f"   → {rel_path}:{line}: {key}")
+        elif index["referenced"]:
+            passed.append(f"[OK] All {index['referenced']} referenced translation keys are defined")
+        unused_total = sum(len(keys) for keys in index["unused"].values())
+        if unused_total:
+            issues.append(f"[!] {unused_total} of {index['defined']} locale keys never referenced in code")
+    
+    return {'passed': passed, 'issues': issues, 'key_index': index}
 
 def main():
-    target = sys.argv[1] if len(sys.argv) > 1 else "."
-    project_path = Path(target)
+    parser = argparse.ArgumentParser(description="i18n audit: hardcoded strings and locale completeness")
+    parser.add_argument("project_path", nargs="?", default=".", help="Project directory")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for code files (0 = all cores)")
+    add_format_argument(parser)
+    args = parser.parse_args()
+    
+    project_path = Path(args.project_path)
+    writer = open_writer("i18n_checker", args.format)
+    
+    if writer:
+        # Machine-readable mode: locale findings first, then code files as they are read
+        locale_files = find_locale_files(project_path)
+        writer.write_all(locale_findings(check_locale_completeness(locale_files, project_path)['issues']))
+        code_result = check_hardcoded_strings(project_path, writer, args.jobs, load_defined_keys(locale_files))
+        if code_result['key_index']:
+            writer.write_all(key_index_findings(code_result['key_index']))
+        passed = writer.counts["high"] == 0
+        writer.close(passed=passed, locale_files=len(locale_files))
+        sys.exit(0 if passed else 1)
     
     print("\n" + "=" * 60)
     print("  i18n CHECKER - Internationalization Audit")
@@ -206,10 +599,10 @@ def main():
     
     # Check locale files
     locale_files = find_locale_files(project_path)
-    locale_result = check_locale_completeness(locale_files)
+    locale_result = check_locale_completeness(locale_files, project_path)
     
-    # Check hardcoded strings
-    code_result = check_hardcoded_strings(project_path)
+    # Check hardcoded strings and translation key usage
+    code_result = check_hardcoded_strings(project_path, jobs=args.jobs, defined=load_defined_keys(locale_files))
     
     # Print results
     print("[LOCALE FILES]")
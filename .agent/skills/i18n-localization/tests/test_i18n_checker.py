@@ -0,0 +1,42 @@
+"""Fixtures for i18n_checker.py: locale layouts and key references."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+from i18n_checker import check_locale_completeness, find_locale_files, locale_layout, scan_code_file
+
+
+def write(path: Path, text: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_layouts(tmp_path):
+    assert locale_layout(tmp_path / "po" / "en.po") == ("en", str(tmp_path / "po"))
+    assert locale_layout(tmp_path / "po" / "pt_BR.po") == ("pt_BR", str(tmp_path / "po"))
+    assert locale_layout(tmp_path / "locales" / "web" / "en.json") == ("en", str(tmp_path / "locales" / "web"))
+    assert locale_layout(tmp_path / "locales" / "en" / "common.json") == ("en", "common")
+    assert locale_layout(tmp_path / "locales" / "en" / "ui.json") == ("en", "ui")
+    assert locale_layout(tmp_path / "locale" / "de" / "LC_MESSAGES" / "app.po") == ("de", "app")
+
+
+def test_gettext_po_directory(tmp_path):
+    write(tmp_path / "po" / "app.pot", 'msgid ""\nmsgstr ""\n\nmsgid "Hello"\nmsgstr ""\n\nmsgid "Bye"\nmsgstr ""\n')
+    write(tmp_path / "po" / "en.po", 'msgid "Hello"\nmsgstr "Hello"\n\nmsgid "Bye"\nmsgstr "Bye"\n')
+    write(tmp_path / "po" / "pt_BR.po", 'msgid "Hello"\nmsgstr "Olá"\n\nmsgid "Bye"\nmsgstr ""\n')
+
+    files = find_locale_files(tmp_path)
+    assert locale_layout(tmp_path / "po" / "app.pot") == ("template", str(tmp_path / "po"))
+
+    result = check_locale_completeness(files, tmp_path)
+    assert "[OK] Found 2 language(s): en, pt_BR" in result["passed"]
+    assert result["issues"] == ["[X] po/pt_BR.po: Missing 1 keys vs template (e.g. Bye)"]
+
+
+def test_keys_in_comments_and_docstrings_are_not_references(tmp_path):
+    py = write(tmp_path / "app.py", '"""Translate with t(\'a.b\') or _("msgid")."""\n# _("comment")\nlabel = _("Hello")\n')
+    js = write(tmp_path / "App.tsx", "// t('in.comment')\n/* t('block') */\nconst x = t('real.key');\n")
+
+    assert scan_code_file(str(py))["keys"] == [["Hello", 3]]
+    assert scan_code_file(str(js))["keys"] == [["real.key", 3]]
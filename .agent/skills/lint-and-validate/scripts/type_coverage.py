@@ -2,11 +2,48 @@
 """
 Type Coverage Checker - Measures TypeScript/Python type coverage.
 Identifies untyped functions, any usage, and type safety issues.
+
+Every .ts/.tsx/.py file under the project is counted (one pruned directory
+walk, files analyzed in a process pool with --jobs). TypeScript is counted
+on the shared token stream and Python on its AST, so nested parentheses,
+strings and comments cannot skew the numbers. A function counts as typed
+when it annotates a parameter or its return type; arrow functions count
+when assigned (const f = (x) => ...), and a typed declaration
+(const f: Handler = ...) types them.
+
+Per-file stats are cached by content hash with --cache, so re-runs only
+analyze changed files.
+
+Trend database (--db): per-file and per-directory stats are stored in a
+SQLite file keyed by commit. Stats come from the committed blobs (not the
+working tree), and only files in the git diff against the nearest recorded
+ancestor are recomputed. --regressions lists the directories whose typed
+function ratio dropped or whose 'any' count rose against a base commit
+(default: HEAD's first parent), so CI can gate on regressions instead of
+absolute thresholds.
+
+Usage:
+    python type_coverage.py <project_path> [--jobs N] [--cache [DIR]] [--json]
+    python type_coverage.py <project_path> --db [PATH] [--regressions [BASE]] [--tolerance PP]
+Exit code: 1 on critical issues, or with --regressions when a directory regressed.
 """
 import sys
-import re
+import os
+import ast
+import json
+import sqlite3
+import argparse
+import posixpath
 import subprocess
+from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "code-analysis" / "scripts"))
+from file_pool import (default_result_cache_dir, iter_pool, load_result, result_key, rules_fingerprint,
+                       save_result, walk_files)
+from source_tokens import code_tokens, language_for, tokenize_source
 
 # Fix Windows console encoding for Unicode output
 try:
@@ -15,41 +52,292 @@ try:
 except AttributeError:
     pass  # Python < 3.7
 
-def check_typescript_coverage(project_path: Path) -> dict:
+SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '__pycache__', 'venv', '.venv', 'env',
+             '.next', 'coverage', '.agent-cache'}
+EXTENSIONS = {'.ts', '.tsx', '.py'}
+RULES_FINGERPRINT = rules_fingerprint(__file__)
+
+OPENERS = {'(': ')', '[': ']', '{': '}'}
+CLOSERS = {')', ']', '}'}
+# Tokens that end the declaration an assigned arrow function belongs to
+DECLARATION_START = {'const', 'let', 'var', ';', '{', '}', '(', ',', 'readonly', 'private', 'public',
+                     'protected', 'static'}
+ARROW_LOOKBACK = 60
+LEAST_TYPED_SHOWN = 5
+STAT_KEYS = ('any_count', 'typed_functions', 'untyped_functions')
+DEFAULT_DB = Path('.agent-cache') / 'type_coverage.sqlite'
+ANCESTOR_SEARCH = 200   # commits walked back looking for a recorded run
+BLOB_BATCH = 512        # blobs read from git and analyzed per round
+
+# ============ TYPESCRIPT ============
+def _match_forward(tokens: List[tuple], i: int) -> int:
+    """Index of the bracket closing the one at i (or the last token)."""
+    depth = 0
+    for j in range(i, len(tokens)):
+        text = tokens[j][1]
+        if text in OPENERS:
+            depth += 1
+        elif text in CLOSERS:
+            depth -= 1
+            if depth == 0:
+                return j
+    return len(tokens) - 1
+
+def _skip_generics(tokens: List[tuple], i: int) -> int:
+    """Index after a <...> type parameter list starting at i (i itself when there is none)."""
+    if i >= len(tokens) or tokens[i][1] != '<':
+        return i
+    depth = 0
+    for j in range(i, min(len(tokens), i + 200)):
+        text = tokens[j][1]
+        if text == '<':
+            depth += 1
+        elif text == '>':
+            depth -= 1
+            if depth == 0:
+                return j + 1
+        elif text == '>>':
+            depth -= 2
+            if depth <= 0:
+                return j + 1
+    return i
+
+def _params_annotated(tokens: List[tuple], open_index: int, close_index: int) -> bool:
+    """Whether a parameter list has a ':' annotation at its top level (default values skipped)."""
+    depth = 0
+    in_default = False
+    for j in range(open_index + 1, close_index):
+        text = tokens[j][1]
+        if text in OPENERS:
+            depth += 1
+        elif text in CLOSERS:
+            depth -= 1
+        elif depth == 0:
+            if text == ',':
+                in_default = False
+            elif text == '=':
+                in_default = True
+            elif text == ':' and not in_default:
+                return True
+    return False
+
+def _return_type_then_arrow(tokens: List[tuple], i: int) -> bool:
+    """Whether tokens from i (a ':') are a return type followed by '=>'."""
+    depth = 0
+    for j in range(i + 1, min(len(tokens), i + ARROW_LOOKBACK)):
+        text = tokens[j][1]
+        if text in OPENERS or text == '<':
+            depth += 1
+        elif text in CLOSERS or text == '>':
+            depth -= 1
+            if depth < 0:
+                return False
+        elif depth == 0 and text == '=>':
+            return True
+        elif depth == 0 and text in (';', '=', ','):
+            return False
+    return False
+
+def _assignment_context(tokens: List[tuple], eq_index: int) -> Optional[str]:
+    """
+    What the '=' at eq_index assigns to: 'type' for a type alias,
+    'annotated' for a declaration with a type (const f: Fn =), else 'plain'.
+    """
+    j = eq_index - 1
+    if j >= 0 and tokens[j][1] == '>':
+        # type Fn<T> = ...
+        depth = 0
+        while j >= 0:
+            text = tokens[j][1]
+            if text == '>':
+                depth += 1
+            elif text == '<':
+                depth -= 1
+                if depth == 0:
+                    j -= 1
+                    break
+            j -= 1
+    if j >= 1 and tokens[j][0] == 'ident' and tokens[j - 1][1] == 'type':
+        return 'type'
+    depth = 0
+    for k in range(eq_index - 1, max(-1, eq_index - ARROW_LOOKBACK), -1):
+        text = tokens[k][1]
+        if text in CLOSERS:
+            depth += 1
+        elif text in OPENERS:
+            if depth == 0:
+                return 'plain'
+            depth -= 1
+        elif depth == 0:
+            if text == ':':
+                return 'annotated'
+            if text in DECLARATION_START or text == '=':
+                return 'plain'
+    return 'plain'
+
+def typescript_stats(tokens: List[tuple]) -> Dict[str, int]:
+    """Count 'any' types and typed/untyped functions on a TS token stream."""
+    tokens = code_tokens(tokens)
+    stats = {'any_count': 0, 'typed_functions': 0, 'untyped_functions': 0}
+    n = len(tokens)
+
+    for i, (kind, text, _) in enumerate(tokens):
+        if kind != 'ident' and text != '(':
+            continue
+
+        if text == 'any' and kind == 'ident':
+            before = tokens[i - 1][1] if i else ''
+            after = tokens[i + 1][1] if i + 1 < n else ''
+            if before not in ('.', 'const', 'let', 'var', 'function') and after not in ('(', '.', '=', ':', '=>'):
+                stats['any_count'] += 1
+
+        elif text == 'function' and kind == 'ident':
+            j = i + 1
+            if j < n and tokens[j][1] == '*':
+                j += 1
+            if j < n and tokens[j][0] == 'ident':
+                j += 1
+            j = _skip_generics(tokens, j)
+            if j >= n or tokens[j][1] != '(':
+                continue
+            close = _match_forward(tokens, j)
+            typed = _params_annotated(tokens, j, close) or (close + 1 < n and tokens[close + 1][1] == ':')
+            stats['typed_functions' if typed else 'untyped_functions'] += 1
+
+        elif text == '(':
+            # Assigned arrow function: = (..) =>, = async (..) =>, = <T>(..) =>
+            k = i - 1
+            if k >= 0 and tokens[k][1] == '>':
+                while k >= 0 and tokens[k][1] != '<':
+                    k -= 1
+                k -= 1
+            if k >= 0 and tokens[k][1] == 'async':
+                k -= 1
+            if k < 0 or tokens[k][1] != '=':
+                continue
+            close = _match_forward(tokens, i)
+            if close + 1 >= n:
+                continue
+            follower = tokens[close + 1][1]
+            has_return = follower == ':' and _return_type_then_arrow(tokens, close + 1)
+            if follower != '=>' and not has_return:
+                continue
+            context = _assignment_context(tokens, k)
+            if context == 'type':
+                continue
+            typed = has_return or context == 'annotated' or _params_annotated(tokens, i, close)
+            stats['typed_functions' if typed else 'untyped_functions'] += 1
+
+    return stats
+
+# ============ PYTHON ============
+def _count_any(annotation: Optional[ast.AST]) -> int:
+    if annotation is None:
+        return 0
+    count = 0
+    for node in ast.walk(annotation):
+        if isinstance(node, ast.Name) and node.id == 'Any':
+            count += 1
+        elif isinstance(node, ast.Attribute) and node.attr == 'Any':
+            count += 1
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            count += sum(1 for word in node.value.replace('[', ' ').replace(',', ' ').replace(']', ' ').split()
+                         if word in ('Any', 'typing.Any'))
+    return count
+
+def python_stats(source: str) -> Dict[str, int]:
+    """Count 'Any' annotations and typed/untyped functions from the Python AST."""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return python_token_stats(tokenize_source(source, 'python'))
+
+    stats = {'any_count': 0, 'typed_functions': 0, 'untyped_functions': 0}
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            args = node.args
+            params = [a for a in args.posonlyargs + args.args + args.kwonlyargs + [args.vararg, args.kwarg]
+                      if a is not None and a.arg not in ('self', 'cls')]
+            typed = node.returns is not None or any(a.annotation is not None for a in params)
+            stats['typed_functions' if typed else 'untyped_functions'] += 1
+            stats['any_count'] += _count_any(node.returns) + sum(_count_any(a.annotation) for a in params)
+        elif isinstance(node, ast.AnnAssign):
+            stats['any_count'] += _count_any(node.annotation)
+    return stats
+
+def python_token_stats(tokens: List[tuple]) -> Dict[str, int]:
+    """Token-level fallback for files the running Python cannot parse."""
+    tokens = code_tokens(tokens)
+    stats = {'any_count': 0, 'typed_functions': 0, 'untyped_functions': 0}
+    n = len(tokens)
+    for i, (kind, text, _) in enumerate(tokens):
+        if kind != 'ident':
+            continue
+        if text == 'Any' and i and tokens[i - 1][1] in (':', '[', ',', '->', '|', '.'):
+            stats['any_count'] += 1
+        elif text == 'def' and i + 2 < n and tokens[i + 2][1] == '(':
+            close = _match_forward(tokens, i + 2)
+            typed = _params_annotated(tokens, i + 2, close) or (close + 1 < n and tokens[close + 1][1] == '->')
+            stats['typed_functions' if typed else 'untyped_functions'] += 1
+    return stats
+
+# ============ FILES ============
+def file_stats(file_path: str, cache_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Stats of one file: {"file", "language", "stats"}; cached by content hash when cache_dir is set."""
+    language = language_for(file_path)
+    result = {'file': file_path, 'language': language, 'stats': None}
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return result
+    result['stats'] = source_stats(data.decode('utf-8', errors='replace'), language, cache_dir)
+    return result
+
+def source_stats(source: str, language: str, cache_dir: Optional[str] = None) -> Dict[str, int]:
+    key = result_key(source, RULES_FINGERPRINT)
+    stats = load_result(cache_dir, key)
+    if stats is None:
+        if language == 'python':
+            stats = python_stats(source)
+        else:
+            stats = typescript_stats(tokenize_source(source, language))
+        save_result(cache_dir, key, stats)
+    return stats
+
+def iter_source_files(project_path: Path) -> List[str]:
+    """TypeScript and Python files from one pruned walk (declaration files excluded)."""
+    return [f for f in walk_files(str(project_path), EXTENSIONS, SKIP_DIRS) if not f.endswith('.d.ts')]
+
+def collect_stats(project_path: Path, jobs: int = 1, cache_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Per-file stats for every source file, in walk order."""
+    files = iter_source_files(project_path)
+    return [r for r in iter_pool(partial(file_stats, cache_dir=cache_dir), files, jobs) if r['stats'] is not None]
+
+def least_typed(results: List[Dict[str, Any]], project_path: Path) -> List[str]:
+    ranked = sorted((r for r in results if r['stats']['untyped_functions']),
+                    key=lambda r: (-r['stats']['untyped_functions'], r['file']))
+    return [f"{os.path.relpath(r['file'], project_path)}: {r['stats']['untyped_functions']} untyped functions"
+            for r in ranked[:LEAST_TYPED_SHOWN]]
+
+def check_typescript_coverage(project_path: Path, results: Optional[List[Dict[str, Any]]] = None) -> dict:
     """Check TypeScript type coverage."""
     issues = []
     passed = []
     stats = {'any_count': 0, 'untyped_functions': 0, 'total_functions': 0}
-    
-    ts_files = list(project_path.rglob("*.ts")) + list(project_path.rglob("*.tsx"))
-    ts_files = [f for f in ts_files if 'node_modules' not in str(f) and '.d.ts' not in str(f)]
-    
-    if not ts_files:
+
+    if results is None:
+        results = collect_stats(project_path)
+    ts_results = [r for r in results if r['language'] == 'typescript']
+
+    if not ts_results:
         return {'type': 'typescript', 'files': 0, 'passed': [], 'issues': ["[!] No TypeScript files found"], 'stats': stats}
-    
-    for file_path in ts_files[:30]:  # Limit
-        try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            
-            # Count 'any' usage
-            any_matches = re.findall(r':\s*any\b', content)
-            stats['any_count'] += len(any_matches)
-            
-            # Find functions without return types
-            # function name(params) { - no return type
-            untyped = re.findall(r'function\s+\w+\s*\([^)]*\)\s*{', content)
-            # Arrow functions without types: const fn = (x) => or (x) =>
-            untyped += re.findall(r'=\s*\([^:)]*\)\s*=>', content)
-            stats['untyped_functions'] += len(untyped)
-            
-            # Count typed functions
-            typed = re.findall(r'function\s+\w+\s*\([^)]*\)\s*:\s*\w+', content)
-            typed += re.findall(r':\s*\([^)]*\)\s*=>\s*\w+', content)
-            stats['total_functions'] += len(typed) + len(untyped)
-            
-        except Exception:
-            continue
-    
+
+    for r in ts_results:
+        stats['any_count'] += r['stats']['any_count']
+        stats['untyped_functions'] += r['stats']['untyped_functions']
+        stats['total_functions'] += r['stats']['typed_functions'] + r['stats']['untyped_functions']
+
     # Analyze results
     if stats['any_count'] == 0:
         passed.append("[OK] No 'any' types found")
@@ -57,7 +345,7 @@ def check_typescript_coverage(project_path: Path) -> dict:
         issues.append(f"[!] {stats['any_count']} 'any' types found (acceptable)")
     else:
         issues.append(f"[X] {stats['any_count']} 'any' types found (too many)")
-    
+
     if stats['total_functions'] > 0:
         typed_ratio = (stats['total_functions'] - stats['untyped_functions']) / stats['total_functions'] * 100
         if typed_ratio >= 80:
@@ -66,45 +354,31 @@ def check_typescript_coverage(project_path: Path) -> dict:
             issues.append(f"[!] Type coverage: {typed_ratio:.0f}% (improve)")
         else:
             issues.append(f"[X] Type coverage: {typed_ratio:.0f}% (too low)")
-    
-    passed.append(f"[OK] Analyzed {len(ts_files)} TypeScript files")
-    
-    return {'type': 'typescript', 'files': len(ts_files), 'passed': passed, 'issues': issues, 'stats': stats}
 
-def check_python_coverage(project_path: Path) -> dict:
+    passed.append(f"[OK] Analyzed {len(ts_results)} TypeScript files")
+
+    return {'type': 'typescript', 'files': len(ts_results), 'passed': passed, 'issues': issues, 'stats': stats,
+            'least_typed': least_typed(ts_results, project_path)}
+
+def check_python_coverage(project_path: Path, results: Optional[List[Dict[str, Any]]] = None) -> dict:
     """Check Python type hints coverage."""
     issues = []
     passed = []
     stats = {'untyped_functions': 0, 'typed_functions': 0, 'any_count': 0}
-    
-    py_files = list(project_path.rglob("*.py"))
-    py_files = [f for f in py_files if not any(x in str(f) for x in ['venv', '__pycache__', '.git', 'node_modules'])]
-    
-    if not py_files:
+
+    if results is None:
+        results = collect_stats(project_path)
+    py_results = [r for r in results if r['language'] == 'python']
+
+    if not py_results:
         return {'type': 'python', 'files': 0, 'passed': [], 'issues': ["[!] No Python files found"], 'stats': stats}
-    
-    for file_path in py_files[:30]:  # Limit
-        try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            
-            # Count Any usage
-            any_matches = re.findall(r':\s*Any\b', content)
-            stats['any_count'] += len(any_matches)
-            
-            # Find functions with type hints
-            typed_funcs = re.findall(r'def\s+\w+\s*\([^)]*:[^)]+\)', content)
-            typed_funcs += re.findall(r'def\s+\w+\s*\([^)]*\)\s*->', content)
-            stats['typed_functions'] += len(typed_funcs)
-            
-            # Find functions without type hints
-            all_funcs = re.findall(r'def\s+\w+\s*\(', content)
-            stats['untyped_functions'] += len(all_funcs) - len(typed_funcs)
-            
-        except Exception:
-            continue
-    
+
+    for r in py_results:
+        for key in stats:
+            stats[key] += r['stats'][key]
+
     total = stats['typed_functions'] + stats['untyped_functions']
-    
+
     if total > 0:
         typed_ratio = stats['typed_functions'] / total * 100
         if typed_ratio >= 70:
@@ -113,44 +387,323 @@ def check_python_coverage(project_path: Path) -> dict:
             issues.append(f"[!] Type hints coverage: {typed_ratio:.0f}%")
         else:
             issues.append(f"[X] Type hints coverage: {typed_ratio:.0f}% (add type hints)")
-    
+
     if stats['any_count'] == 0:
         passed.append("[OK] No 'Any' types found")
     elif stats['any_count'] <= 3:
         issues.append(f"[!] {stats['any_count']} 'Any' types found")
     else:
         issues.append(f"[X] {stats['any_count']} 'Any' types found")
-    
-    passed.append(f"[OK] Analyzed {len(py_files)} Python files")
-    
-    return {'type': 'python', 'files': len(py_files), 'passed': passed, 'issues': issues, 'stats': stats}
 
-def main():
-    target = sys.argv[1] if len(sys.argv) > 1 else "."
-    project_path = Path(target)
-    
+    passed.append(f"[OK] Analyzed {len(py_results)} Python files")
+
+    return {'type': 'python', 'files': len(py_results), 'passed': passed, 'issues': issues, 'stats': stats,
+            'least_typed': least_typed(py_results, project_path)}
+
+# ============ TREND DATABASE ============
+DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    commit_sha TEXT PRIMARY KEY, base_sha TEXT, recorded TEXT, files INTEGER, recomputed INTEGER);
+CREATE TABLE IF NOT EXISTS file_stats (
+    commit_sha TEXT, path TEXT, language TEXT, any_count INTEGER, typed_functions INTEGER,
+    untyped_functions INTEGER, PRIMARY KEY (commit_sha, path));
+CREATE TABLE IF NOT EXISTS dir_stats (
+    commit_sha TEXT, dir TEXT, files INTEGER, any_count INTEGER, typed_functions INTEGER,
+    untyped_functions INTEGER, PRIMARY KEY (commit_sha, dir));
+"""
+
+def _git(project_path: Path, *args: str) -> str:
+    try:
+        proc = subprocess.run(['git', *args], cwd=str(project_path), capture_output=True,
+                              text=True, encoding='utf-8', errors='replace')
+    except FileNotFoundError:
+        raise RuntimeError("git not found")
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip() or f"git {args[0]} failed")
+    return proc.stdout
+
+def _tracked(path: str) -> bool:
+    """Whether a project-relative path is one iter_source_files would analyze."""
+    parts = path.split('/')
+    return (os.path.splitext(path)[1] in EXTENSIONS and not path.endswith('.d.ts')
+            and not any(part in SKIP_DIRS for part in parts[:-1]))
+
+def open_db(db_path: Path) -> sqlite3.Connection:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript(DB_SCHEMA)
+    return conn
+
+def resolve_commit(project_path: Path, rev: str) -> str:
+    return _git(project_path, 'rev-parse', '--verify', '--quiet', f"{rev}^{{commit}}").strip()
+
+def tree_blobs(project_path: Path, commit: str, prefix: str) -> Dict[str, str]:
+    """{project-relative path: blob sha} of every analyzed file in a commit."""
+    blobs = {}
+    for entry in _git(project_path, 'ls-tree', '-r', '-z', '--full-tree', commit).split('\0'):
+        if not entry:
+            continue
+        meta, path = entry.split('\t', 1)
+        mode, kind, sha = meta.split()
+        if kind == 'blob' and mode.startswith('100') and path.startswith(prefix) and _tracked(path[len(prefix):]):
+            blobs[path[len(prefix):]] = sha
+    return blobs
+
+def changed_blobs(project_path: Path, base: str, commit: str, prefix: str) -> Dict[str, Optional[str]]:
+    """{project-relative path: new blob sha, or None when deleted} from git diff base..commit."""
+    output = _git(project_path, 'diff', '--raw', '-z', '--no-renames', '--full-index', base, commit)
+    fields = output.split('\0')
+    changed = {}
+    for meta, path in zip(fields[0::2], fields[1::2]):
+        if not meta.startswith(':') or not path.startswith(prefix) or not _tracked(path[len(prefix):]):
+            continue
+        _, new_mode, _, new_sha, status = meta[1:].split()
+        deleted = status == 'D' or not new_mode.startswith('100')
+        changed[path[len(prefix):]] = None if deleted else new_sha
+    return changed
+
+def read_blobs(project_path: Path, shas: List[str]) -> List[str]:
+    """Contents of blobs, in order, from one git cat-file --batch call."""
+    proc = subprocess.run(['git', 'cat-file', '--batch'], cwd=str(project_path), capture_output=True,
+                          input=''.join(f"{sha}\n" for sha in shas).encode())
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.decode('utf-8', errors='replace').strip() or "git cat-file failed")
+    out = proc.stdout
+    contents = []
+    pos = 0
+    for _ in shas:
+        header_end = out.index(b'\n', pos)
+        header = out[pos:header_end].split()
+        if header[-1] == b'missing':
+            contents.append('')
+            pos = header_end + 1
+            continue
+        size = int(header[2])
+        contents.append(out[header_end + 1:header_end + 1 + size].decode('utf-8', errors='replace'))
+        pos = header_end + 1 + size + 1
+    return contents
+
+def _blob_stats(item: Tuple[str, str], cache_dir: Optional[str] = None) -> Tuple[str, Optional[str], Dict[str, int]]:
+    path, source = item
+    language = language_for(path)
+    return path, language, source_stats(source, language, cache_dir)
+
+def directory_totals(rows: Dict[str, tuple]) -> Dict[str, List[int]]:
+    """{dir: [files, any, typed, untyped]} summed into every ancestor directory ('.' is the project)."""
+    dirs: Dict[str, List[int]] = {}
+    for path, (_, any_count, typed, untyped) in rows.items():
+        parent = posixpath.dirname(path)
+        while True:
+            totals = dirs.setdefault(parent or '.', [0, 0, 0, 0])
+            totals[0] += 1
+            totals[1] += any_count
+            totals[2] += typed
+            totals[3] += untyped
+            if not parent:
+                break
+            parent = posixpath.dirname(parent)
+    return dirs
+
+def nearest_recorded(project_path: Path, conn: sqlite3.Connection, commit: str) -> Optional[str]:
+    recorded = {row[0] for row in conn.execute('SELECT commit_sha FROM runs')}
+    if not recorded:
+        return None
+    for sha in _git(project_path, 'rev-list', f'--max-count={ANCESTOR_SEARCH}', commit).split()[1:]:
+        if sha in recorded:
+            return sha
+    return None
+
+def record_commit(project_path: Path, conn: sqlite3.Connection, commit: str, jobs: int = 1,
+                  cache_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Store per-file and per-directory stats of a commit. Rows of the nearest
+    recorded ancestor are reused; only files in its git diff are analyzed.
+    """
+    row = conn.execute('SELECT base_sha, files, recomputed FROM runs WHERE commit_sha = ?', (commit,)).fetchone()
+    if row:
+        return {'commit': commit, 'base': row[0], 'files': row[1], 'recomputed': 0, 'cached': True}
+
+    prefix = _git(project_path, 'rev-parse', '--show-prefix').strip()
+    base = nearest_recorded(project_path, conn, commit)
+    if base:
+        rows = {path: tuple(stats) for path, *stats in conn.execute(
+            'SELECT path, language, any_count, typed_functions, untyped_functions FROM file_stats '
+            'WHERE commit_sha = ?', (base,))}
+        todo = {}
+        for path, sha in changed_blobs(project_path, base, commit, prefix).items():
+            rows.pop(path, None)
+            if sha:
+                todo[path] = sha
+    else:
+        rows = {}
+        todo = tree_blobs(project_path, commit, prefix)
+
+    paths = sorted(todo)
+    for start in range(0, len(paths), BLOB_BATCH):
+        batch = paths[start:start + BLOB_BATCH]
+        sources = read_blobs(project_path, [todo[path] for path in batch])
+        for path, language, stats in iter_pool(partial(_blob_stats, cache_dir=cache_dir),
+                                               list(zip(batch, sources)), jobs):
+            rows[path] = (language,) + tuple(stats[key] for key in STAT_KEYS)
+
+    with conn:
+        conn.executemany('INSERT INTO file_stats VALUES (?, ?, ?, ?, ?, ?)',
+                         [(commit, path) + rows[path] for path in sorted(rows)])
+        conn.executemany('INSERT INTO dir_stats VALUES (?, ?, ?, ?, ?, ?)',
+                         [(commit, d, *totals) for d, totals in sorted(directory_totals(rows).items())])
+        conn.execute('INSERT INTO runs VALUES (?, ?, ?, ?, ?)',
+                     (commit, base, datetime.now().isoformat(timespec='seconds'), len(rows), len(paths)))
+    return {'commit': commit, 'base': base, 'files': len(rows), 'recomputed': len(paths), 'cached': False}
+
+def _typed_ratio(typed: int, untyped: int) -> Optional[float]:
+    total = typed + untyped
+    return typed / total * 100 if total else None
+
+def coverage_regressions(conn: sqlite3.Connection, base: str, head: str,
+                         tolerance: float = 0.0) -> List[Dict[str, Any]]:
+    """Directories in both commits whose typed ratio dropped by more than tolerance points or whose 'any' count rose."""
+    query = 'SELECT dir, any_count, typed_functions, untyped_functions FROM dir_stats WHERE commit_sha = ?'
+    before = {d: stats for d, *stats in conn.execute(query, (base,))}
+    regressions = []
+    for d, any_count, typed, untyped in conn.execute(query, (head,)):
+        if d not in before:
+            continue
+        old_any, old_typed, old_untyped = before[d]
+        old_ratio = _typed_ratio(old_typed, old_untyped)
+        new_ratio = _typed_ratio(typed, untyped)
+        drop = old_ratio - new_ratio if old_ratio is not None and new_ratio is not None else 0.0
+        if drop > tolerance or any_count > old_any:
+            regressions.append({'dir': d, 'coverage_before': round(old_ratio, 1) if old_ratio is not None else None,
+                                'coverage_after': round(new_ratio, 1) if new_ratio is not None else None,
+                                'drop': round(drop, 1), 'any_before': old_any, 'any_after': any_count,
+                                'untyped_added': untyped - old_untyped})
+    regressions.sort(key=lambda r: (-r['drop'], -(r['any_after'] - r['any_before']), r['dir']))
+    return regressions
+
+def run_trend(project_path: Path, db_path: Path, regressions_base: Optional[str], tolerance: float,
+              jobs: int = 1, cache_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Record HEAD (and the base) in the trend database; list regressions when a base is asked for."""
+    head = resolve_commit(project_path, 'HEAD')
+    report: Dict[str, Any] = {'script': 'type_coverage', 'db': str(db_path), 'passed': True}
+    conn = open_db(db_path)
+    try:
+        base = None
+        if regressions_base is not None:
+            try:
+                base = resolve_commit(project_path, regressions_base or 'HEAD^')
+            except RuntimeError:
+                if regressions_base:
+                    raise RuntimeError(f"Unknown base commit: {regressions_base}")
+            if base:
+                report['base'] = record_commit(project_path, conn, base, jobs, cache_dir)
+        report['head'] = record_commit(project_path, conn, head, jobs, cache_dir)
+        totals = conn.execute('SELECT files, any_count, typed_functions, untyped_functions FROM dir_stats '
+                              "WHERE commit_sha = ? AND dir = '.'", (head,)).fetchone() or (0, 0, 0, 0)
+        ratio = _typed_ratio(totals[2], totals[3])
+        report['totals'] = {'files': totals[0], 'any_count': totals[1], 'typed_functions': totals[2],
+                            'untyped_functions': totals[3], 'coverage': round(ratio, 1) if ratio is not None else None}
+        if regressions_base is not None:
+            report['regressions'] = coverage_regressions(conn, base, head, tolerance) if base else []
+            report['passed'] = not report['regressions']
+    finally:
+        conn.close()
+    return report
+
+def print_trend(report: Dict[str, Any]):
+    head = report['head']
+    totals = report['totals']
     print("\n" + "=" * 60)
-    print("  TYPE COVERAGE CHECKER")
-    print("=" * 60 + "\n")
-    
+    print("  TYPE COVERAGE TREND")
+    print("=" * 60)
+    print(f"Database: {report['db']}")
+    if 'base' in report:
+        base = report['base']
+        state = "already recorded" if base['cached'] else f"{base['recomputed']} files analyzed"
+        print(f"Base:   {base['commit'][:12]} ({state})")
+    state = "already recorded" if head['cached'] else f"{head['recomputed']} of {head['files']} files analyzed"
+    print(f"Commit: {head['commit'][:12]} ({state})")
+    coverage = f"{totals['coverage']:.0f}%" if totals['coverage'] is not None else "n/a"
+    print(f"Type coverage: {coverage} over {totals['files']} files, {totals['any_count']} 'any'")
+
+    if 'regressions' not in report:
+        return
+    print("-" * 60)
+    if 'base' not in report:
+        print("[!] No base commit to compare against")
+    elif not report['regressions']:
+        print("[OK] No directory lost type coverage")
+    else:
+        print(f"[X] {len(report['regressions'])} directories regressed:")
+        for r in report['regressions']:
+            parts = []
+            if r['drop'] > 0:
+                parts.append(f"coverage {r['coverage_before']:.0f}% -> {r['coverage_after']:.0f}%")
+            if r['any_after'] > r['any_before']:
+                parts.append(f"'any' {r['any_before']} -> {r['any_after']}")
+            print(f"  - {r['dir']}: {', '.join(parts)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="TypeScript/Python type coverage")
+    parser.add_argument("project_path", nargs="?", default=".", help="Project directory")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes (0 = all cores)")
+    parser.add_argument("--cache", nargs="?", const="", default=None,
+                        help="Cache per-file stats by content hash (default dir: <project>/.agent-cache/type_coverage)")
+    parser.add_argument("--db", nargs="?", const="", default=None,
+                        help=f"Record per-file/per-directory stats of HEAD in a SQLite trend database "
+                             f"(default: <project>/{DEFAULT_DB.as_posix()})")
+    parser.add_argument("--regressions", nargs="?", const="", default=None, metavar="BASE",
+                        help="List directories whose coverage dropped against BASE (default: HEAD^); implies --db")
+    parser.add_argument("--tolerance", type=float, default=0.0,
+                        help="Coverage drop in percentage points allowed before a directory counts as regressed")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    project_path = Path(args.project_path)
+    cache_dir = args.cache
+    if cache_dir == "":
+        cache_dir = str(default_result_cache_dir(project_path, "type_coverage"))
+
+    if args.db is not None or args.regressions is not None:
+        db_path = Path(args.db) if args.db else project_path / DEFAULT_DB
+        try:
+            report = run_trend(project_path, db_path, args.regressions, args.tolerance, args.jobs, cache_dir)
+        except RuntimeError as e:
+            print(json.dumps({"script": "type_coverage", "error": str(e), "passed": False}))
+            sys.exit(1)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print_trend(report)
+        sys.exit(0 if report['passed'] else 1)
+
+    file_results = collect_stats(project_path, args.jobs, cache_dir)
     results = []
-    
+
     # Check TypeScript
-    ts_result = check_typescript_coverage(project_path)
+    ts_result = check_typescript_coverage(project_path, file_results)
     if ts_result['files'] > 0:
         results.append(ts_result)
-    
+
     # Check Python
-    py_result = check_python_coverage(project_path)
+    py_result = check_python_coverage(project_path, file_results)
     if py_result['files'] > 0:
         results.append(py_result)
-    
+
+    critical_issues = sum(1 for result in results for item in result['issues'] if item.startswith("[X]"))
+
+    if args.json:
+        print(json.dumps({"script": "type_coverage", "results": results, "passed": critical_issues == 0}, indent=2))
+        sys.exit(0 if critical_issues == 0 else 1)
+
+    print("\n" + "=" * 60)
+    print("  TYPE COVERAGE CHECKER")
+    print("=" * 60 + "\n")
+
     if not results:
         print("[!] No TypeScript or Python files found.")
         sys.exit(0)
-    
+
     # Print results
-    critical_issues = 0
     for result in results:
         print(f"\n[{result['type'].upper()}]")
         print("-" * 40)
@@ -158,9 +711,11 @@ def main():
             print(f"  {item}")
         for item in result['issues']:
             print(f"  {item}")
-            if item.startswith("[X]"):
-                critical_issues += 1
-    
+        if result.get('least_typed'):
+            print("  Least typed files:")
+            for item in result['least_typed']:
+                print(f"    - {item}")
+
     print("\n" + "=" * 60)
     if critical_issues == 0:
         print("[OK] TYPE COVERAGE: ACCEPTABLE")
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+Query Audit - unbounded queries and N+1 patterns in the data access layer
+
+Parses Drizzle query chains (db.select().from(t).where(...).limit(n),
+db.query.t.findMany(...), db.insert/update/delete) in the server sources -
+typically server/storage.ts and the route files - and flags the patterns
+that get slower as tables grow:
+
+    query/unbounded-select     select without limit on a growing table
+                               (audit_logs, usage_records, notifications, ...)
+    query/conditional-limit    the limit is applied on some paths only
+    query/query-in-loop        a query, or a method that queries, runs once per
+                               iteration of for/forEach/map (N+1)
+    route/storage-call-in-loop a route handler calls storage.* once per iteration
+    route/n-plus-one-via-storage
+                               a route handler calls a storage method that
+                               queries inside a loop
+    index/unindexed-filter     where/join columns that no index declared in
+                               the Drizzle schema (shared/schema.ts) leads with
+
+Route handlers come from the shared route index (app.get(...) registrations),
+tables and indexes from the shared Drizzle schema parser.
+
+Usage:
+    python query_audit.py <project_path> [--growing-table NAME ...] [--json] [--format jsonl|sarif]
+Exit code: 0 when there are no critical/high findings, 1 otherwise.
+"""
+import sys
+import os
+import re
+import json
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "code-analysis" / "scripts"))
+from drizzle_schema import FILTER_CALLS, filter_refs, indexed_columns, load_drizzle_schema
+from file_pool import walk_files
+from findings import add_format_argument, make_finding, open_writer
+from route_index import build_route_index, index_functions
+from source_tokens import code_tokens, default_cache_dir, load_tokens, match_bracket
+
+# Fix Windows console encoding
+try:
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+except:
+    pass
+
+
+# ============ CONFIGURATION ============
+EXTENSIONS = {'.ts', '.js', '.mts', '.mjs'}
+SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '.next', 'coverage', '.agent-cache', '.agent', '__tests__'}
+QUERY_HINT = re.compile(r'\b(?:db|tx|trx)\s*\.\s*(?:select|selectDistinct|insert|update|delete|query|execute)\b')
+FAILING_SEVERITIES = {"critical", "high"}
+
+# Tables whose row count grows with usage rather than with the number of tenants
+GROWING_TABLE = re.compile(r'(?:^|_)(?:logs?|records?|events?|history|notifications?|audits?|usage|metrics?'
+                           r'|messages?|activit(?:y|ies))(?:_|$)')
+DB_RECEIVERS = {'db', 'tx', 'trx'}
+QUERY_STARTS = {'select', 'selectDistinct', 'insert', 'update', 'delete', 'execute', 'query'}
+AGGREGATES = {'count', 'sum', 'avg', 'min', 'max', 'countDistinct'}
+LOOP_CALLBACKS = {'forEach', 'map', 'flatMap', 'filter', 'reduce', 'some', 'every', 'find'}
+STORAGE_RECEIVER = re.compile(r'^\w*[sS]torage$')
+METHOD_EXCLUDES = {'if', 'for', 'while', 'switch', 'catch', 'function', 'return', 'constructor', 'super', 'await'}
+MAX_NAMES = 4           # query sites quoted per index finding
+
+
+# ============ SOURCE STRUCTURE ============
+def _type_end(tokens: List[tuple], j: int) -> int:
+    """Index of the '{' opening a method body after a return type starting at j (or -1)."""
+    angle = 0
+    for k in range(j, min(len(tokens), j + 200)):
+        text = tokens[k][1]
+        if text == '<':
+            angle += 1
+        elif text == '>':
+            angle -= 1
+        elif text == '>>':
+            angle -= 2
+        elif text in ('(', '['):
+            k = match_bracket(tokens, k)
+        elif text == '{':
+            if angle <= 0:
+                return k
+        elif text in (';', '=>', '=') and angle <= 0:
+            return -1
+    return -1
+
+
+def index_methods(tokens: List[tuple]) -> List[Tuple[str, int, int, int]]:
+    """(name, start, end, line) of class methods and function declarations, in source order."""
+    scopes = []
+    for i in range(1, len(tokens) - 1):
+        kind, text, line = tokens[i]
+        if kind != 'ident' or tokens[i + 1][1] != '(' or text in METHOD_EXCLUDES:
+            continue
+        if tokens[i - 1][1] not in ('async', '{', '}', ';', 'static', 'public', 'private', 'protected', '*'):
+            continue
+        close = match_bracket(tokens, i + 1)
+        if close + 1 >= len(tokens):
+            continue
+        body = close + 1 if tokens[close + 1][1] == '{' else (
+            _type_end(tokens, close + 2) if tokens[close + 1][1] == ':' else -1)
+        if body > 0:
+            scopes.append((text, i, match_bracket(tokens, body) + 1, line))
+    for name, (start, end) in index_functions(tokens).items():
+        scopes.append((name, start, end, tokens[start][2]))
+    scopes.sort(key=lambda scope: (scope[1], -scope[2]))
+    return scopes
+
+
+def find_loops(tokens: List[tuple]) -> List[Dict[str, Any]]:
+    """Loop bodies: for/while statements and iteration callbacks (.map(...), .forEach(...))."""
+    loops = []
+    parallel = []
+    n = len(tokens)
+    for i in range(n - 1):
+        kind, text, line = tokens[i]
+        if kind != 'ident':
+            continue
+        if text == 'all' and i >= 2 and tokens[i - 2][1] == 'Promise' and tokens[i + 1][1] == '(':
+            parallel.append((i + 1, match_bracket(tokens, i + 1)))
+        elif text in ('for', 'while') and tokens[i + 1][1] == '(' and (i == 0 or tokens[i - 1][1] != '.'):
+            close = match_bracket(tokens, i + 1)
+            if close + 1 >= n or (text == 'while' and tokens[close + 1][1] == ';'):
+                continue  # do { } while (...);
+            header = {t[1] for t in tokens[i + 2:close]}
+            loop_kind = 'for...of' if 'of' in header else 'for...in' if 'in' in header else text
+            if tokens[close + 1][1] == '{':
+                end = match_bracket(tokens, close + 1)
+            else:
+                end = next((k for k in range(close + 1, n) if tokens[k][1] == ';'), n - 1)
+            loops.append({'start': close + 1, 'end': end, 'kind': loop_kind, 'line': line,
+                          'counter': loop_kind in ('for', 'while'), 'parallel': False})
+        elif (text in LOOP_CALLBACKS and i and tokens[i - 1][1] in ('.', '?.') and tokens[i + 1][1] == '('):
+            loops.append({'start': i + 1, 'end': match_bracket(tokens, i + 1), 'kind': f'.{text}()',
+                          'line': line, 'counter': False, 'parallel': False})
+    for loop in loops:
+        loop['parallel'] = any(start < loop['start'] and loop['end'] <= end for start, end in parallel)
+    return loops
+
+
+def _innermost(regions: List[Dict[str, Any]], pos: int) -> Optional[Dict[str, Any]]:
+    found = None
+    for region in regions:
+        if region['start'] <= pos <= region['end'] and (found is None or region['start'] >= found['start']):
+            found = region
+    return found
+
+
+def _scope_at(scopes: List[Tuple[str, int, int, int]], pos: int) -> Optional[Tuple[str, int, int, int]]:
+    found = None
+    for scope in scopes:
+        if scope[1] <= pos < scope[2] and (found is None or scope[1] >= found[1]):
+            found = scope
+    return found
+
+
+# ============ QUERIES ============
+def parse_query(tokens: List[tuple], i: int, tables: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The Drizzle query chain starting at the db receiver tokens[i]."""
+    n = len(tokens)
+    calls = []
+    j = i + 1
+    while j + 1 < n and tokens[j][1] in ('.', '?.') and tokens[j + 1][0] == 'ident':
+        name = tokens[j + 1][1]
+        if j + 2 < n and tokens[j + 2][1] == '(':
+            close = match_bracket(tokens, j + 2)
+            calls.append((name, j + 2, close))
+            j = close + 1
+        else:
+            calls.append((name, None, None))
+            j += 2
+    if not calls or calls[0][0] not in QUERY_STARTS:
+        return None
+
+    names = [name for name, _, _ in calls]
+    kind = 'select' if names[0] in ('select', 'selectDistinct', 'query') else names[0]
+    table = None
+    has_limit = 'limit' in names
+    aggregate = False
+    single = False
+    if names[0] == 'query' and len(calls) >= 3:
+        # db.query.<table>.findMany({ limit }) / findFirst()
+        table = names[1]
+        single = names[2] == 'findFirst'
+        _, open_index, close = calls[2]
+        has_limit = has_limit or (open_index is not None
+                                  and any(t[1] == 'limit' for t in tokens[open_index:close]))
+    elif kind == 'select':
+        source = next(((o, c) for name, o, c in calls if name == 'from' and o is not None), None)
+        if source:
+            table = next((t[1] for t in tokens[source[0] + 1:source[1]] if t[0] == 'ident'), None)
+        _, open_index, close = calls[0]
+        if open_index is not None:
+            selected = tokens[open_index + 1:close]
+            aggregate = any((t[1] in AGGREGATES and k + 1 < len(selected) and selected[k + 1][1] == '(')
+                            or (t[0] == 'template' and 'count(' in t[1].lower())
+                            for k, t in enumerate(selected))
+    elif calls[0][1] is not None:
+        table = next((t[1] for t in tokens[calls[0][1] + 1:calls[0][2]] if t[0] == 'ident'), None)
+
+    filters = []
+    for name, open_index, close in calls:
+        if name not in FILTER_CALLS or open_index is None:
+            continue
+        filters.extend(filter_refs(tokens, open_index + 1, close, tables))
+
+    # How the result is used: const [row] = await db...; const query = db...; return await db...
+    k = i - 1
+    if k >= 0 and tokens[k][1] == 'await':
+        k -= 1
+    assigned = None
+    if k >= 1 and tokens[k][1] == '=':
+        if tokens[k - 1][1] == ']':
+            single = True
+        elif tokens[k - 1][0] == 'ident':
+            assigned = tokens[k - 1][1]
+    return {'pos': i, 'end': j, 'line': tokens[i][2], 'kind': kind, 'table': table, 'has_limit': has_limit,
+            'aggregate': aggregate, 'single': single, 'assigned': assigned, 'filters': filters}
+
+
+def analyze_source(path: str, tokens: List[tuple], tables: Dict[str, Any]) -> Dict[str, Any]:
+    """Scopes, loops, queries and method calls of one file."""
+    scopes = index_methods(tokens)
+    loops = find_loops(tokens)
+    queries = []
+    calls = []
+    for i in range(len(tokens) - 2):
+        kind, text, line = tokens[i]
+        if kind != 'ident' or tokens[i + 1][1] != '.' or (i and tokens[i - 1][1] in ('.', '?.')):
+            continue
+        if text in DB_RECEIVERS:
+            query = parse_query(tokens, i, tables)
+            if query:
+                scope = _scope_at(scopes, i)
+                query['scope'] = scope[0] if scope else None
+                if query['assigned'] and not query['has_limit'] and scope:
+                    # const query = db.select()...; if (limit) return query.limit(limit); return query;
+                    body = tokens[query['end']:scope[2]]
+                    query['conditional_limit'] = any(
+                        body[k][1] == query['assigned'] and body[k + 1][1] == '.' and body[k + 2][1] == 'limit'
+                        for k in range(len(body) - 2))
+                queries.append(query)
+        elif (text == 'this' or STORAGE_RECEIVER.match(text)) and tokens[i + 2][0] == 'ident' \
+                and i + 3 < len(tokens) and tokens[i + 3][1] == '(':
+            scope = _scope_at(scopes, i)
+            calls.append({'pos': i, 'line': line, 'receiver': text, 'method': tokens[i + 2][1],
+                          'scope': scope[0] if scope else None})
+    return {'file': path, 'scopes': scopes, 'loops': loops, 'queries': queries, 'calls': calls}
+
+
+def querying_methods(sources: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    {method: {"queries": bool, "loop": (file, line) or None}} over every scope:
+    whether it queries (directly or through this.* calls) and where it
+    queries inside a loop.
+    """
+    methods: Dict[str, Dict[str, Any]] = {}
+    for source in sources:
+        for name, _, _, _ in source['scopes']:
+            methods.setdefault(name, {'queries': False, 'loop': None, 'calls': set(), 'file': source['file']})
+        for query in source['queries']:
+            if query['scope']:
+                methods[query['scope']]['queries'] = True
+        for call in source['calls']:
+            if call['scope'] and call['receiver'] == 'this':
+                methods[call['scope']]['calls'].add(call['method'])
+    changed = True
+    while changed:
+        changed = False
+        for info in methods.values():
+            if not info['queries'] and any(methods.get(m, {}).get('queries') for m in info['calls']):
+                info['queries'] = changed = True
+    for source in sources:
+        for site in source['queries'] + [c for c in source['calls'] if methods.get(c['method'], {}).get('queries')]:
+            loop = _innermost(source['loops'], site['pos'])
+            if loop and site['scope'] and methods[site['scope']]['loop'] is None:
+                methods[site['scope']]['loop'] = (source['file'], site['line'])
+    return methods
+
+
+# ============ AUDIT ============
+def _route_scopes(routes: List[Dict[str, Any]]) -> Dict[str, List[Tuple[int, int, str]]]:
+    """{file: [(first line, last line, "GET /path")]} of inline route handlers."""
+    scopes: Dict[str, List[Tuple[int, int, str]]] = {}
+    for route in routes:
+        if route['handler'] and not route['handler_name']:
+            scopes.setdefault(os.path.normpath(route['file']), []).append(
+                (route['handler'][0][2], route['handler'][-1][2], f"{route['method']} {route['path']}"))
+    return scopes
+
+
+def run_audit(project_path: Path, growing: Set[str], writer=None) -> Dict[str, Any]:
+    """Analyze the data access layer and the route handlers of a project."""
+    cache_dir = default_cache_dir(project_path)
+    schema = load_drizzle_schema(project_path, cache_dir)
+    tables = schema['tables']
+    route_index = build_route_index(project_path, cache_dir)
+    route_scopes = _route_scopes(route_index['routes'])
+
+    files = []
+    for path in walk_files(str(project_path), EXTENSIONS, SKIP_DIRS):
+        try:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                if QUERY_HINT.search(f.read()):
+                    files.append(path)
+        except OSError:
+            continue
+    files = sorted({os.path.normpath(f) for f in files + route_index['files']}
+                   - {os.path.normpath(f) for f in schema['files']})
+
+    sources = []
+    for path in files:
+        try:
+            tokens = code_tokens(load_tokens(path, cache_dir)[2])
+        except (OSError, ValueError):
+            continue
+        sources.append(analyze_source(path, tokens, tables))
+    methods = querying_methods(sources)
+
+    def is_growing(table_var: Optional[str]) -> bool:
+        table = tables.get(table_var)
+        name = table['name'] if table else (table_var or '')
+        return name in growing or (table_var or '') in growing or bool(GROWING_TABLE.search(name))
+
+    def table_label(table_var: Optional[str]) -> str:
+        table = tables.get(table_var)
+        return table['name'] if table else (table_var or '?')
+
+    findings: List[Dict[str, Any]] = []
+
+    def emit(rule: str, severity: str, message: str, file: str, line: int, **props):
+        finding = make_finding("query_audit", rule, severity, message, file=os.path.relpath(file, project_path),
+                               line=line, category="Database", **props)
+        findings.append(finding)
+        if writer:
+            writer.write(finding)
+
+    unindexed: Dict[Tuple[str, str], List[Tuple[str, int, str]]] = {}
+    for source in sources:
+        path = source['file']
+
+        def label(site: Dict[str, Any]) -> str:
+            spans = [s for s in route_scopes.get(path, []) if s[0] <= site['line'] <= s[1]]
+            if spans:
+                return min(spans, key=lambda s: s[1] - s[0])[2]
+            return site['scope'] or '<module>'
+
+        for query in source['queries']:
+            where = label(query)
+            loop = _innermost(source['loops'], query['pos'])
+            if (query['kind'] == 'select' and not query['has_limit'] and not query['single']
+                    and not query['aggregate'] and is_growing(query['table'])):
+                if query.get('conditional_limit'):
+                    emit("query/conditional-limit", "medium",
+                         f"{where}: select from {table_label(query['table'])} is limited only on some paths",
+                         path, query['line'], table=table_label(query['table']))
+                else:
+                    emit("query/unbounded-select", "high",
+                         f"{where}: select from {table_label(query['table'])} has no limit (the table grows without bound)",
+                         path, query['line'], table=table_label(query['table']))
+            if loop:
+                emit("query/query-in-loop", _loop_severity(loop),
+                     f"{where}: {query['kind']} on {table_label(query['table'])} runs once per iteration of "
+                     f"{loop['kind']} (line {loop['line']}){_loop_note(loop)}",
+                     path, query['line'], table=table_label(query['table']))
+            for key in dict.fromkeys(query['filters']):
+                unindexed.setdefault(key, []).append((path, query['line'], where))
+
+        for call in source['calls']:
+            info = methods.get(call['method'])
+            if not info or not info['queries']:
+                continue
+            loop = _innermost(source['loops'], call['pos'])
+            receiver = 'this' if call['receiver'] == 'this' else call['receiver']
+            where = label(call)
+            if loop:
+                rule = "query/query-in-loop" if receiver == 'this' else "route/storage-call-in-loop"
+                emit(rule, _loop_severity(loop),
+                     f"{where}: {receiver}.{call['method']}() queries the database once per iteration of "
+                     f"{loop['kind']} (line {loop['line']}){_loop_note(loop)}",
+                     path, call['line'], method=call['method'])
+            elif receiver != 'this' and info['loop'] and where != call['method']:
+                loop_file, loop_line = info['loop']
+                emit("route/n-plus-one-via-storage", "medium",
+                     f"{where}: {receiver}.{call['method']}() queries inside a loop "
+                     f"({os.path.relpath(loop_file, project_path)}:{loop_line})",
+                     path, call['line'], method=call['method'])
+
+    for (table_var, column), sites in sorted(unindexed.items(), key=lambda item: (item[1][0][0], item[1][0][1])):
+        table = tables[table_var]
+        if column in indexed_columns(table):
+            continue
+        column_info = table['columns'][column]
+        scopes = list(dict.fromkeys(site[2] for site in sites))
+        listed = ", ".join(scopes[:MAX_NAMES]) + (f" +{len(scopes) - MAX_NAMES}" if len(scopes) > MAX_NAMES else "")
+        emit("index/unindexed-filter", "high" if is_growing(table_var) else "medium",
+             f"{table['name']}.{column_info['name']} is filtered in {len(sites)} "
+             f"quer{'y' if len(sites) == 1 else 'ies'} ({listed}) but no index in "
+             f"{os.path.relpath(table['file'], project_path)} leads with it",
+             sites[0][0], sites[0][1], table=table['name'], column=column_info['name'],
+             schema=f"{os.path.relpath(table['file'], project_path)}:{column_info['line']}")
+
+    by_rule: Dict[str, Dict[str, Any]] = {}
+    for finding in findings:
+        entry = by_rule.setdefault(finding['rule'], {'rule': finding['rule'], 'severity': finding['severity'], 'count': 0})
+        entry['count'] += 1
+        if finding['severity'] == 'high':
+            entry['severity'] = 'high'
+    return {
+        "script": "query_audit",
+        "project": str(project_path),
+        "files_checked": len(sources),
+        "queries": sum(len(source['queries']) for source in sources),
+        "tables": len(tables),
+        "growing_tables": sorted(t['name'] for var, t in tables.items() if is_growing(var)),
+        "routes": len(route_index['routes']),
+        "rules": sorted(by_rule.values(), key=lambda e: (e['severity'] != 'high', -e['count'], e['rule'])),
+        "findings": findings,
+        "passed": not any(f['severity'] in FAILING_SEVERITIES for f in findings),
+    }
+
+
+def _loop_severity(loop: Dict[str, Any]) -> str:
+    return 'medium' if loop['counter'] or loop['parallel'] else 'high'
+
+
+def _loop_note(loop: Dict[str, Any]) -> str:
+    if loop['parallel']:
+        return ", in parallel under Promise.all"
+    return " (N+1)" if not loop['counter'] else ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Unbounded queries, N+1 patterns and missing indexes in the data access layer")
+    parser.add_argument("project_path", nargs="?", default=".", help="Project directory")
+    parser.add_argument("--growing-table", action="append", default=[], metavar="NAME",
+                        help="Table (SQL or variable name) that grows without bound, in addition to the "
+                             "log/record/event/history/notification name patterns (repeatable)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    add_format_argument(parser)
+    args = parser.parse_args()
+
+    project_path = Path(args.project_path).resolve()
+    if not project_path.is_dir():
+        print(json.dumps({"error": f"Directory not found: {project_path}"}))
+        sys.exit(1)
+
+    writer = open_writer("query_audit", args.format)
+    report = run_audit(project_path, set(args.growing_table), writer)
+
+    if writer:
+        writer.close(passed=report["passed"], files_checked=report["files_checked"], queries=report["queries"])
+    elif args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"\n[QUERY AUDIT] {report['queries']} queries in {report['files_checked']} files, "
+              f"{report['tables']} tables, {report['routes']} routes")
+        if report["growing_tables"]:
+            print(f"Growing tables: {', '.join(report['growing_tables'])}")
+        print("-" * 60)
+        for entry in report["rules"]:
+            print(f"[{entry['severity'].upper()}] {entry['rule']}: {entry['count']} finding(s)")
+            for finding in [f for f in report["findings"] if f["rule"] == entry["rule"]][:5]:
+                print(f"  - {finding['file']}:{finding['line']}: {finding['message']}")
+        if not report["rules"]:
+            print("[OK] No unbounded queries, N+1 patterns or unindexed filters found")
+        print(f"STATUS: {'PASS' if report['passed'] else 'FAIL'}")
+
+    sys.exit(0 if report["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
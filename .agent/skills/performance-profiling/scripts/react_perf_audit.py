@@ -0,0 +1,588 @@
+#!/usr/bin/env python3
+"""
+React Performance Audit - executable detectors for the ui-ux-pro-max perf data
+
+react-performance.csv and web-interface.csv describe performance
+antipatterns as searchable rows. This script pairs rows with detectors that
+run over React source (token streams, so strings and comments never match)
+and reports each finding against the row it comes from:
+
+    react-performance.csv  Barrel Imports        5+ named imports through a package barrel the
+                                                 bundler does not trim (medium at most)
+                           Dynamic Imports       router files importing page components eagerly
+                           Memoized Components   inline object/array props on components in .map()
+                           SWR Deduplication     data fetched inside useEffect
+                           Promise.all Parallel  sequential awaits of independent reads
+                           Conditional Render    {list.length && <X />} renders "0"
+    web-interface.csv      Virtualize Lists      row/item lists rendered without virtualization
+
+Severity, advice and category come from the CSV row; a detector whose row is
+missing from the data is not run. Given a project root with a client/ (or
+frontend/) folder, only that folder is audited, so server code never gets
+React findings.
+
+Usage:
+    python react_perf_audit.py <project_path> [--jobs N] [--token-cache [DIR]] [--json]
+                                              [--format jsonl|sarif]
+Exit code: 0 when there are no critical/high findings, 1 otherwise.
+"""
+import sys
+import os
+import re
+import csv
+import json
+import argparse
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "code-analysis" / "scripts"))
+from findings import add_format_argument, make_finding, open_writer, slug
+from file_pool import iter_pool, walk_files
+from source_tokens import code_tokens, default_cache_dir, load_tokens
+
+# Fix Windows console encoding
+try:
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+except:
+    pass
+
+
+# ============ CONFIGURATION ============
+DATA_DIR = Path(__file__).resolve().parents[3] / ".shared" / "ui-ux-pro-max" / "data"
+EXTENSIONS = {'.tsx', '.jsx', '.ts', '.js'}
+SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '.next', 'coverage', '.agent-cache', '__tests__'}
+CLIENT_DIRS = ('client', 'frontend')
+
+CSV_SEVERITY = {"Critical": "critical", "High": "high", "Medium-High": "high", "Medium": "medium",
+                "Low-Medium": "low", "Low": "low"}
+SEVERITY_ORDER = ["info", "low", "medium", "high", "critical"]
+# Highest severity per detector, whatever the CSV row says: a barrel import costs
+# bundle size in one build setup, it does not break the page
+SEVERITY_CAPS = {"Barrel Imports": "medium"}
+FAILING_SEVERITIES = {"critical", "high"}
+
+# Packages whose entry point re-exports everything (Next.js optimizePackageImports defaults)
+BARREL_PACKAGES = {"lucide-react", "@tabler/icons-react", "@mui/material", "@mui/icons-material",
+                   "@radix-ui/react-icons", "lodash", "lodash-es", "ramda", "date-fns", "rxjs", "antd",
+                   "recharts", "@headlessui/react", "react-use"}
+BARREL_PREFIXES = ("react-icons/", "@heroicons/react/")
+# ESM barrels marked side-effect free: Vite/Rollup/webpack production builds drop the unused exports
+ESM_BARRELS = {"lucide-react", "@tabler/icons-react", "lodash-es", "date-fns", "ramda", "rxjs",
+               "@radix-ui/react-icons"}
+TREE_SHAKING_BUNDLERS = {"vite", "rollup", "esbuild", "webpack", "@rspack/core", "parcel"}
+OPTIMIZE_PACKAGE_IMPORTS = re.compile(r'optimizePackageImports\s*:\s*\[([^\]]*)\]')
+NEXT_CONFIGS = ("next.config.js", "next.config.mjs", "next.config.ts", "next.config.cjs")
+BARREL_MIN_NAMES = 5    # fewer named imports through an unoptimized barrel are not worth a finding
+VIRTUALIZATION_PACKAGES = ("react-window", "react-virtualized", "@tanstack/react-virtual", "react-virtuoso",
+                           "@virtuoso.dev/", "@shopify/flash-list")
+PAGINATION_HINT = re.compile(r'\b(?:pageSize|perPage|paginat\w*|fetchNextPage|useInfiniteQuery|hasNextPage)\b'
+                             r'|\.slice\(\s*0\s*,|content-visibility')
+ROUTE_MODULE = re.compile(r'(?:^|[/@])(?:pages|routes|views|screens)/')
+ROUTER_TAGS = {"Route", "Routes", "Switch"}
+ROUTER_CALLS = {"createBrowserRouter", "createHashRouter", "useRoutes", "createRoutesFromElements"}
+LIST_ITEM_TAGS = {"tr", "li", "TableRow", "ListItem", "Tr"}
+READ_CALL = re.compile(r'(?:fetch|get|load|read|list|find|query|retrieve|search)', re.I)
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+FETCH_CALLS = {"fetch", "apiRequest", "ky"}
+DECLARATIONS = {"const", "let", "var"}
+# Control flow between two awaits makes the later one depend on the earlier result
+GUARDS = {"if", "return", "throw"}
+OPENERS = {")": "(", "]": "[", "}": "{"}
+MAX_NAMES = 4           # names quoted per finding
+
+
+# ============ CSV ROWS ============
+def load_rows(data_dir: Path = DATA_DIR) -> Dict[Tuple[str, str], Dict[str, str]]:
+    """CSV rows keyed by (file name, Issue)."""
+    rows = {}
+    for name in ("react-performance.csv", "web-interface.csv"):
+        try:
+            with open(data_dir / name, "r", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    rows[(name, row["Issue"])] = row
+        except OSError:
+            continue
+    return rows
+
+
+def row_reference(name: str, row: Dict[str, str]) -> str:
+    """'react-performance.csv#6'"""
+    return f"{name}#{row['No']}"
+
+
+def rule_id(name: str, row: Dict[str, str]) -> str:
+    """'react-performance/barrel-imports'"""
+    return f"{Path(name).stem}/{slug(row['Issue'])}"
+
+
+def _package_dir(project_path: Path) -> Optional[Path]:
+    """Directory of the nearest package.json at or above project_path."""
+    for directory in [project_path, *project_path.parents]:
+        if (directory / "package.json").is_file():
+            return directory
+    return None
+
+
+def project_dependencies(project_path: Path) -> Set[str]:
+    """Dependency names from the nearest package.json at or above project_path."""
+    directory = _package_dir(project_path)
+    if directory is None:
+        return set()
+    try:
+        data = json.loads((directory / "package.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return set()
+    return set(data.get("dependencies", {})) | set(data.get("devDependencies", {}))
+
+
+def optimized_barrels(project_path: Path, dependencies: Set[str]) -> Set[str]:
+    """
+    Barrel packages the project's bundler already trims to the imported names:
+    every BARREL_PACKAGES entry under Next.js (optimizePackageImports defaults,
+    plus the packages listed in next.config), ESM_BARRELS under Vite, Rollup,
+    webpack and the like.
+    """
+    optimized: Set[str] = set()
+    if "next" in dependencies:
+        optimized |= BARREL_PACKAGES
+        directory = _package_dir(project_path)
+        for name in NEXT_CONFIGS if directory else ():
+            try:
+                config = (directory / name).read_text(encoding="utf-8")
+            except OSError:
+                continue
+            for listed in OPTIMIZE_PACKAGE_IMPORTS.findall(config):
+                optimized |= set(re.findall(r'["\']([^"\']+)["\']', listed))
+    elif dependencies & TREE_SHAKING_BUNDLERS:
+        optimized |= ESM_BARRELS
+    return optimized
+
+
+# ============ SOURCE VIEW ============
+class SourceView:
+    """Code tokens of one file with bracket pairs, enclosing blocks and imports."""
+
+    def __init__(self, source: str, tokens: List[Tuple[str, str, int]]):
+        self.source = source
+        self.tokens = code_tokens(tokens)
+        self.pairs: Dict[int, int] = {}
+        self.openers: Dict[int, int] = {}
+        self.block: List[int] = []      # index of the innermost enclosing '{' (-1 at top level)
+        stack: List[int] = []
+        for i, (kind, text, _) in enumerate(self.tokens):
+            braces = [j for j in stack if self.tokens[j][1] == "{"]
+            self.block.append(braces[-1] if braces else -1)
+            if kind != "punct":
+                continue
+            if text in ("(", "[", "{"):
+                stack.append(i)
+            elif text in OPENERS:
+                # JSX text can swallow a bracket into a string: unwind to the nearest opener
+                for depth in range(len(stack) - 1, -1, -1):
+                    if self.tokens[stack[depth]][1] == OPENERS[text]:
+                        self.pairs[stack[depth]] = i
+                        self.openers[i] = stack[depth]
+                        del stack[depth:]
+                        break
+        self.imports = self._imports()
+
+    def text(self, i: int) -> str:
+        return self.tokens[i][1] if 0 <= i < len(self.tokens) else ""
+
+    def kind(self, i: int) -> str:
+        return self.tokens[i][0] if 0 <= i < len(self.tokens) else ""
+
+    def line(self, i: int) -> int:
+        return self.tokens[i][2]
+
+    def is_punct(self, i: int, text: str) -> bool:
+        return self.kind(i) == "punct" and self.text(i) == text
+
+    def end_of(self, i: int) -> int:
+        """Index of the bracket closing the one at i (the last token when unbalanced)."""
+        return self.pairs.get(i, len(self.tokens) - 1)
+
+    def _imports(self) -> List[Dict[str, Any]]:
+        """Static imports: module, line, imported names, local names, type_only."""
+        found = []
+        for i, (kind, text, line) in enumerate(self.tokens):
+            if kind != "ident" or text != "import" or self.is_punct(i + 1, "(") or self.is_punct(i - 1, "."):
+                continue
+            entry = {"module": None, "line": line, "names": [], "locals": [],
+                     "type_only": self.text(i + 1) == "type"}
+            j = i + 1
+            while j < len(self.tokens) and j < i + 400:
+                kind_j, text_j, _ = self.tokens[j]
+                if kind_j == "string":
+                    entry["module"] = text_j[1:-1]
+                    break
+                if kind_j == "punct" and text_j == "{":
+                    close = self.end_of(j)
+                    specifiers = [t for t in self.tokens[j + 1:close] if t[0] == "ident" and t[1] != "type"]
+                    k = 0
+                    while k < len(specifiers):
+                        name = specifiers[k][1]
+                        local = name
+                        if k + 2 < len(specifiers) and specifiers[k + 1][1] == "as":
+                            local = specifiers[k + 2][1]
+                            k += 2
+                        entry["names"].append(name)
+                        entry["locals"].append(local)
+                        k += 1
+                    j = close + 1
+                    continue
+                if kind_j == "ident" and text_j not in ("from", "type", "as"):
+                    entry["locals"].append(text_j)
+                if kind_j == "punct" and text_j == ";":
+                    break
+                j += 1
+            if entry["module"] is not None:
+                found.append(entry)
+        return found
+
+    def jsx_tags(self, start: int, stop: int) -> List[Tuple[int, str, List[Tuple[str, int]]]]:
+        """
+        JSX opening tags in tokens[start:stop]: (index, name, [(attribute, value token index)])
+        for every attribute written as name={...}.
+        """
+        tags = []
+        i = start
+        while i < stop:
+            if self.is_punct(i, "<") and self.kind(i + 1) == "ident" and not (
+                    self.kind(i - 1) in ("ident", "number", "string") or self.text(i - 1) in (")", "]")):
+                name_end = i + 1
+                while self.is_punct(name_end + 1, ".") and self.kind(name_end + 2) == "ident":
+                    name_end += 2
+                name = "".join(t[1] for t in self.tokens[i + 1:name_end + 1])
+                attributes = []
+                j = name_end + 1
+                while j < stop and not (self.is_punct(j, ">") or self.is_punct(j, "/") and self.is_punct(j + 1, ">")):
+                    if self.is_punct(j, "{"):
+                        j = self.end_of(j) + 1
+                        continue
+                    if self.kind(j) == "ident" and self.is_punct(j + 1, "=") and self.is_punct(j + 2, "{"):
+                        attributes.append((self.text(j), j + 3))
+                    j += 1
+                tags.append((i, name, attributes))
+            i += 1
+        return tags
+
+    def calls(self, name: str) -> List[Tuple[int, int, int]]:
+        """(name index, '(' index, ')' index) for every call of name (or .name)."""
+        found = []
+        for i, (kind, text, _) in enumerate(self.tokens):
+            if kind == "ident" and text == name and self.is_punct(i + 1, "("):
+                found.append((i, i + 1, self.end_of(i + 1)))
+        return found
+
+
+# ============ DETECTORS ============
+# Each takes (view, context) and returns [(line, message)].
+def detect_barrel_imports(view: SourceView, context: Dict[str, Any]) -> List[Tuple[int, str]]:
+    hits = []
+    optimized = context.get("optimized_barrels", set())
+    for entry in view.imports:
+        module = entry["module"]
+        barrel = module in BARREL_PACKAGES or module.startswith(BARREL_PREFIXES)
+        if module in optimized or module.startswith(tuple(p for p in optimized if p.endswith("/"))):
+            continue
+        names = entry["names"]
+        if barrel and len(names) >= BARREL_MIN_NAMES and not entry["type_only"]:
+            shown = ", ".join(names[:MAX_NAMES]) + (" ..." if len(names) > MAX_NAMES else "")
+            hits.append((entry["line"], f"{len(names)} named imports through the {module} barrel ({shown})"))
+    return hits
+
+
+def detect_eager_routes(view: SourceView, context: Dict[str, Any]) -> List[Tuple[int, str]]:
+    names = {tag for _, tag, _ in view.jsx_tags(0, len(view.tokens))}
+    idents = [t[1] for t in view.tokens if t[0] == "ident"]
+    if not (names & ROUTER_TAGS or ROUTER_CALLS.intersection(idents)):
+        return []
+    eager = [entry for entry in view.imports if ROUTE_MODULE.search(entry["module"]) and not entry["type_only"]]
+    used = [local for entry in eager for local in entry["locals"] if idents.count(local) > 1]
+    if not used:
+        return []
+    shown = ", ".join(used[:MAX_NAMES]) + (" ..." if len(used) > MAX_NAMES else "")
+    first = min(entry["line"] for entry in eager if set(entry["locals"]) & set(used))
+    return [(first, f"{len(used)} route component(s) imported eagerly ({shown}); load them with React.lazy()")]
+
+
+def _map_callbacks(view: SourceView) -> List[Tuple[int, int, int]]:
+    """(receiver end index, '(' index, ')' index) for every .map( call."""
+    return [(i - 2, i + 1, close) for i, _, close in view.calls("map") if view.is_punct(i - 1, ".")]
+
+
+def detect_inline_list_props(view: SourceView, context: Dict[str, Any]) -> List[Tuple[int, str]]:
+    hits, seen = [], set()
+    for _, open_paren, close in _map_callbacks(view):
+        props = []
+        for index, name, attributes in view.jsx_tags(open_paren + 1, close):
+            if not name[:1].isupper():
+                continue    # DOM elements are not memoized
+            for attribute, value in attributes:
+                if value not in seen and view.text(value) in ("{", "["):
+                    seen.add(value)
+                    props.append((view.line(index), f"{name}.{attribute}"))
+        if props:
+            shown = ", ".join(prop for _, prop in props[:MAX_NAMES]) + (" ..." if len(props) > MAX_NAMES else "")
+            hits.append((props[0][0], f"{len(props)} inline object/array prop(s) on components inside .map() "
+                                      f"({shown}); each item gets new props every render, defeating memo()"))
+    return hits
+
+
+def detect_unvirtualized_lists(view: SourceView, context: Dict[str, Any]) -> List[Tuple[int, str]]:
+    if any(entry["module"].startswith(VIRTUALIZATION_PACKAGES) for entry in view.imports) \
+            or PAGINATION_HINT.search(view.source):
+        return []
+    hits = []
+    maps = _map_callbacks(view)
+    for receiver, open_paren, close in maps:
+        if any(outer < open_paren < outer_close for _, outer, outer_close in maps):
+            continue    # per-item sublist: the outer list is the one to virtualize
+        # literal arrays and sliced windows are bounded
+        if view.text(receiver) == "]" or view.text(receiver) == ")" and view.text(view.openers.get(receiver, 0) - 1) == "slice":
+            continue
+        name = view.text(receiver)
+        if view.kind(receiver) == "ident" and re.search(r'\bconst\s+%s\s*(?::[^=]+)?=\s*\[' % re.escape(name), view.source):
+            continue    # static config array declared in this file
+        tags = view.jsx_tags(open_paren + 1, close)
+        item = next((tag for _, tag, _ in tags if tag in LIST_ITEM_TAGS), None)
+        if item and tags[0][1] in LIST_ITEM_TAGS | {"Fragment", "React.Fragment"}:
+            hits.append((view.line(open_paren), f"{name}.map() renders every <{item}> with no virtualization "
+                                                f"or pagination"))
+    return hits
+
+
+def detect_effect_fetch(view: SourceView, context: Dict[str, Any]) -> List[Tuple[int, str]]:
+    hits = []
+    for index, open_paren, close in view.calls("useEffect"):
+        body = view.tokens[open_paren + 1:close]
+        fetches = [t[1] for k, t in enumerate(body) if t[0] == "ident" and (
+            t[1] in FETCH_CALLS and k + 1 < len(body) and body[k + 1][1] == "("
+            or t[1] == "axios" and k + 1 < len(body) and body[k + 1][1] in (".", "("))]
+        if fetches:
+            library = next((lib for lib in ("@tanstack/react-query", "swr") if lib in context["dependencies"]), None)
+            note = f"; {library} is already a dependency" if library else ""
+            hits.append((view.line(index), f"{fetches[0]}() inside useEffect: no request dedup or caching{note}"))
+    return hits
+
+
+def _declared_names(view: SourceView, i: int) -> List[str]:
+    """Names declared by 'const x' / 'const { a, b }' / 'const [a, b]' starting at token i."""
+    target = i + 1
+    if view.kind(target) == "ident":
+        return [view.text(target)]
+    if view.text(target) in ("{", "["):
+        return [t[1] for t in view.tokens[target + 1:view.end_of(target)] if t[0] == "ident"]
+    return []
+
+
+def _awaited_read(view: SourceView, i: int) -> Optional[Tuple[str, Set[str]]]:
+    """For 'await a.b.getX(args)' at i: (callee, identifiers used) when it looks like a read."""
+    j = i + 1
+    chain = []
+    while view.kind(j) == "ident":
+        chain.append(view.text(j))
+        if not view.is_punct(j + 1, "."):
+            break
+        j += 2
+    if not chain or not view.is_punct(j + 1, "("):
+        return None
+    open_paren = j + 1
+    args = view.tokens[open_paren + 1:view.end_of(open_paren)]
+    callee = chain[-1]
+    if callee in FETCH_CALLS:
+        strings = {t[1][1:-1].upper() for t in args if t[0] == "string"}
+        if strings & WRITE_METHODS:
+            return None
+    elif not READ_CALL.match(callee):
+        return None
+    return ".".join(chain), set(chain) | {t[1] for t in args if t[0] == "ident"}
+
+
+def detect_await_waterfalls(view: SourceView, context: Dict[str, Any]) -> List[Tuple[int, str]]:
+    """
+    Reads awaited one after another in the same block where the later call
+    uses nothing declared since the first await and no if/return/throw
+    stands between them: they could run together. A guard in between
+    (if (!membership) return res.status(403)) orders the reads on purpose.
+    """
+    blocks: Dict[int, Dict[str, Any]] = {}
+    groups: List[List[Tuple[int, str]]] = []
+    last_declared: Dict[int, List[str]] = {}
+    for i, (kind, text, _) in enumerate(view.tokens):
+        if kind != "ident":
+            continue
+        block = blocks.get(view.block[i])
+        if text in GUARDS:
+            if block and not block["broken"]:
+                block["broken"] = True
+                if len(block["calls"]) > 1:
+                    groups.append(block["calls"])
+            continue
+        if text in DECLARATIONS:
+            last_declared[view.block[i]] = _declared_names(view, i)
+            if block:
+                block["declared"].update(last_declared[view.block[i]])
+        if text != "await":
+            continue
+        read = _awaited_read(view, i)
+        if read is None:
+            if block and not block["broken"]:
+                block["broken"] = True     # a write or unknown await orders what follows
+                if len(block["calls"]) > 1:
+                    groups.append(block["calls"])
+            continue
+        callee, used = read
+        if block is None or block["broken"] or used & block["declared"]:
+            # 'const x = await ...' binds x for the awaits that follow
+            if block and not block["broken"] and len(block["calls"]) > 1:
+                groups.append(block["calls"])
+            declared = set(last_declared.get(view.block[i], [])) if view.is_punct(i - 1, "=") else set()
+            blocks[view.block[i]] = {"declared": declared, "calls": [(i, callee)], "broken": False}
+            continue
+        block["calls"].append((i, callee))
+    groups.extend(block["calls"] for block in blocks.values() if not block["broken"] and len(block["calls"]) > 1)
+    hits = []
+    for calls in groups:
+        names = ", ".join(callee for _, callee in calls[:MAX_NAMES])
+        hits.append((view.line(calls[1][0]), f"{len(calls)} independent reads awaited in sequence ({names}); "
+                                             f"start them together with Promise.all()"))
+    return sorted(hits)
+
+
+def detect_length_and(view: SourceView, context: Dict[str, Any]) -> List[Tuple[int, str]]:
+    hits = []
+    for i, (kind, text, line) in enumerate(view.tokens):
+        if kind == "ident" and text == "length" and view.is_punct(i - 1, ".") and view.is_punct(i + 1, "&&") \
+                and (view.is_punct(i + 2, "<") or view.is_punct(i + 2, "(") and view.is_punct(i + 3, "<")):
+            hits.append((line, f"{view.text(i - 2)}.length && <...> renders 0 for an empty list; use length > 0"))
+    return hits
+
+
+# Detector -> the CSV row it implements, by file and Issue
+DETECTORS = [
+    ("react-performance.csv", "Barrel Imports", detect_barrel_imports),
+    ("react-performance.csv", "Dynamic Imports", detect_eager_routes),
+    ("react-performance.csv", "Memoized Components", detect_inline_list_props),
+    ("react-performance.csv", "SWR Deduplication", detect_effect_fetch),
+    ("react-performance.csv", "Promise.all Parallel", detect_await_waterfalls),
+    ("react-performance.csv", "Conditional Render", detect_length_and),
+    ("web-interface.csv", "Virtualize Lists", detect_unvirtualized_lists),
+]
+
+
+# ============ AUDIT ============
+def audit_file(filepath: str, active: List[Tuple[str, str]], context: Dict[str, Any],
+               token_cache: Optional[str] = None) -> Dict[str, Any]:
+    """Run the active detectors over one file: {"file", "hits": [[csv, issue, line, message]]}."""
+    try:
+        _, source, tokens = load_tokens(filepath, token_cache)
+    except (OSError, ValueError) as e:
+        return {"file": filepath, "hits": [], "error": str(e)}
+    view = SourceView(source, tokens)
+    detectors = {(name, issue): detector for name, issue, detector in DETECTORS}
+    hits = []
+    for key in active:
+        for line, message in detectors[key](view, context):
+            hits.append([key[0], key[1], line, message])
+    return {"file": filepath, "hits": hits}
+
+
+def run_audit(project_path: Path, jobs: int = 1, token_cache: Optional[str] = None,
+              writer=None) -> Dict[str, Any]:
+    """
+    Audit the client sources under project_path (its client/ or frontend/
+    folder when it has one); findings are streamed to writer when given.
+    """
+    rows = load_rows()
+    active = [(name, issue) for name, issue, _ in DETECTORS if (name, issue) in rows]
+    dependencies = project_dependencies(project_path)
+    context = {"dependencies": dependencies, "optimized_barrels": optimized_barrels(project_path, dependencies)}
+    source_root = next((project_path / name for name in CLIENT_DIRS if (project_path / name).is_dir()), project_path)
+    files = walk_files(str(source_root), EXTENSIONS, SKIP_DIRS)
+    worker = partial(audit_file, active=active, context=context, token_cache=token_cache)
+
+    findings, errors = [], []
+    for result in iter_pool(worker, files, jobs):
+        rel_path = os.path.relpath(result["file"], project_path)
+        if result.get("error"):
+            errors.append({"file": rel_path, "error": result["error"]})
+        for name, issue, line, message in result["hits"]:
+            row = rows[(name, issue)]
+            severity = CSV_SEVERITY.get(row["Severity"], "medium")
+            if issue in SEVERITY_CAPS and SEVERITY_ORDER.index(severity) > SEVERITY_ORDER.index(SEVERITY_CAPS[issue]):
+                severity = SEVERITY_CAPS[issue]
+            finding = make_finding("react_perf_audit", rule_id(name, row), severity,
+                                   f"{message}. {row['Do']}.", file=rel_path, line=line, category=row["Category"],
+                                   source=row_reference(name, row), issue=issue)
+            if writer:
+                writer.write(finding)
+            findings.append(finding)
+
+    by_rule: Dict[str, Dict[str, Any]] = {}
+    for finding in findings:
+        entry = by_rule.setdefault(finding["rule"], {"source": finding["properties"]["source"],
+                                                     "issue": finding["properties"]["issue"],
+                                                     "severity": finding["severity"], "count": 0, "files": set()})
+        entry["count"] += 1
+        entry["files"].add(finding["file"])
+    summary = [dict(entry, rule=rule, files=len(entry["files"])) for rule, entry in by_rule.items()]
+    summary.sort(key=lambda entry: (-SEVERITY_ORDER.index(entry["severity"]),
+                                    -entry["count"], entry["rule"]))
+    return {
+        "script": "react_perf_audit",
+        "project": str(project_path),
+        "files_checked": len(files),
+        "detectors": [f"{name}: {issue}" for name, issue in active],
+        "rules": summary,
+        "findings": findings,
+        "errors": errors,
+        "passed": not any(finding["severity"] in FAILING_SEVERITIES for finding in findings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="React performance antipatterns from react-performance.csv / web-interface.csv")
+    parser.add_argument("project_path", nargs="?", default=".", help="Project or client directory")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes (0 = all cores)")
+    parser.add_argument("--token-cache", nargs="?", const="", default=None,
+                        help="Cache token streams per file hash (default dir: <project>/.agent-cache/tokens)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    add_format_argument(parser)
+    args = parser.parse_args()
+
+    project_path = Path(args.project_path).resolve()
+    if not project_path.is_dir():
+        print(json.dumps({"error": f"Directory not found: {project_path}"}))
+        sys.exit(1)
+    token_cache = args.token_cache
+    if token_cache == "":
+        token_cache = str(default_cache_dir(project_path))
+
+    writer = open_writer("react_perf_audit", args.format)
+    report = run_audit(project_path, args.jobs, token_cache, writer)
+
+    if writer:
+        writer.close(passed=report["passed"], files_checked=report["files_checked"], detectors=report["detectors"])
+    elif args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"\n[REACT PERF AUDIT] {report['files_checked']} files checked, {len(report['detectors'])} detectors")
+        print("-" * 60)
+        for entry in report["rules"]:
+            print(f"[{entry['severity'].upper()}] {entry['issue']} ({entry['source']}): "
+                  f"{entry['count']} finding(s) in {entry['files']} file(s)")
+            shown = [f for f in report["findings"] if f["rule"] == entry["rule"]][:3]
+            for finding in shown:
+                print(f"  - {finding['file']}:{finding['line']}: {finding['message']}")
+        if not report["rules"]:
+            print("[OK] No performance antipatterns found")
+        print(f"STATUS: {'PASS' if report['passed'] else 'FAIL'}")
+
+    sys.exit(0 if report["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Fixtures for react_perf_audit.py: await waterfalls and barrel imports."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+from react_perf_audit import SourceView, detect_await_waterfalls, detect_barrel_imports, optimized_barrels
+from source_tokens import tokenize_source
+
+
+def waterfalls(source: str):
+    return detect_await_waterfalls(SourceView(source, tokenize_source(source, "typescript")), {})
+
+
+def test_independent_reads_are_reported():
+    hits = waterfalls("""
+async function load(id) {
+  const account = await storage.getAccount(id);
+  const buckets = await storage.getBuckets(id);
+  return { account, buckets };
+}
+""")
+    assert len(hits) == 1
+    assert "storage.getAccount, storage.getBuckets" in hits[0][1]
+
+
+def test_guard_between_reads_orders_them():
+    assert waterfalls("""
+app.get("/api/accounts/:id", async (req, res) => {
+  const membership = await storage.getMembership(req.params.id, userId);
+  if (!membership) return res.status(403).json({ message: "Forbidden" });
+  const account = await storage.getAccount(req.params.id);
+  res.json(account);
+});
+""") == []
+
+
+def test_cache_miss_fallback_is_not_reported():
+    assert waterfalls("""
+async function resolve(host) {
+  const cached = await cache.getDomain(host);
+  if (cached) {
+    return cached;
+  }
+  const domain = await storage.getDomainByHost(host);
+  return domain;
+}
+""") == []
+
+
+def barrels(source: str, dependencies):
+    context = {"optimized_barrels": optimized_barrels(Path("/nonexistent"), set(dependencies))}
+    return detect_barrel_imports(SourceView(source, tokenize_source(source, "typescript")), context)
+
+
+def test_tree_shaken_barrels_are_skipped():
+    source = 'import { A, B, C, D, E, F } from "lucide-react";\n'
+    assert barrels(source, {"vite", "react"}) == []
+    assert len(barrels(source, {"react"})) == 1
+
+
+def test_few_names_through_a_barrel_are_not_reported():
+    assert barrels('import { AlertCircle } from "lucide-react";\n', {"react"}) == []
+    hits = barrels('import { A, B, C, D, E } from "recharts";\n', {"vite"})
+    assert [line for line, _ in hits] == [1]
+    assert hits[0][1].startswith("5 named imports through the recharts barrel")
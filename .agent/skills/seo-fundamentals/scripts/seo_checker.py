@@ -13,15 +13,28 @@ WHAT IT CHECKS:
     - HTML files (actual web pages)
     - JSX/TSX files (React page components)
     - Only files that are likely PUBLIC pages
+    - Across the site: duplicate titles, meta descriptions and H1s
+
+Every page under the project is checked (one directory walk, pages parsed in
+a process pool with --jobs); the site-level pass only keeps each page's
+title, description and H1 text, so it stays linear in the number of pages.
 
 Usage:
-    python seo_checker.py <project_path>
+    python seo_checker.py <project_path> [--jobs N] [--format jsonl|sarif]
 """
 import sys
+import os
 import json
 import re
+import argparse
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, Iterable, Iterator, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "code-analysis" / "scripts"))
+from findings import add_format_argument, make_finding, open_writer, slug
+from file_pool import iter_pool, resolve_jobs
+from page_dom import SITE_SIGNALS, normalize_text, site_duplicates
 
 # Fix Windows console encoding
 try:
@@ -37,6 +50,27 @@ SKIP_DIRS = {
     '__tests__', 'spec', 'docs', 'documentation', 'examples'
 }
 
+# Findings severity per issue (anything else is medium)
+ISSUE_SEVERITY = {
+    "Missing <title> tag": "high",
+    "Missing meta description": "high",
+}
+
+PAGE_EXTENSIONS = {'.html', '.htm', '.jsx', '.tsx'}
+PAGE_DIRS = {'pages', 'app', 'routes', 'views', 'screens'}
+PAGE_NAMES = ['page', 'index', 'home', 'about', 'contact', 'blog',
+              'post', 'article', 'product', 'landing', 'layout']
+MAX_LISTED_PAGES = 3
+
+H1_TAG = re.compile(r'<h1[^>]*>', re.I)
+H1_TEXT = re.compile(r'<h1[^>]*>([\s\S]*?)</h1>', re.I)
+IMG_TAG = re.compile(r'<img[^>]+>', re.I)
+TITLE_TEXT = re.compile(r'<title[^>]*>([^<{]*)</title>', re.I)
+DOCUMENT_TITLE = re.compile(r'document\.title\s*=\s*(["\'])([^"\'\n]+)\1')
+META_DESCRIPTION = re.compile(r'<meta\b[^>]*\bname=["\']description["\'][^>]*>', re.I)
+CONTENT_ATTR = re.compile(r'\bcontent=(["\'])([^"\']*)\1', re.I)
+INNER_TAG = re.compile(r'<[^>]*>')
+
 # Files to skip (not pages)
 SKIP_PATTERNS = [
     'config', 'setup', 'util', 'helper', 'hook', 'context', 'store',
@@ -55,17 +89,11 @@ def is_page_file(file_path: Path) -> bool:
         return False
     
     # Check path - pages in specific directories are likely pages
-    parts = [p.lower() for p in file_path.parts]
-    page_dirs = ['pages', 'app', 'routes', 'views', 'screens']
-    
-    if any(d in parts for d in page_dirs):
+    if any(p.lower() in PAGE_DIRS for p in file_path.parts):
         return True
     
     # Filename indicators for pages
-    page_names = ['page', 'index', 'home', 'about', 'contact', 'blog', 
-                  'post', 'article', 'product', 'landing', 'layout']
-    
-    if any(p in stem for p in page_names):
+    if any(p in stem for p in PAGE_NAMES):
         return True
     
     # HTML files are usually pages
@@ -75,22 +103,30 @@ def is_page_file(file_path: Path) -> bool:
     return False
 
 
+def iter_pages(project_path: Path) -> Iterator[Path]:
+    """Yield page files to check, in a stable order, from a single directory walk."""
+    for root, dirs, files in os.walk(project_path):
+        # Prune excluded directories so they are never descended into
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in PAGE_EXTENSIONS:
+                f = Path(root) / name
+                if is_page_file(f):
+                    yield f
+
+
 def find_pages(project_path: Path) -> list:
     """Find page files to check."""
-    patterns = ['**/*.html', '**/*.htm', '**/*.jsx', '**/*.tsx']
-    
-    files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            # Skip excluded directories
-            if any(skip in f.parts for skip in SKIP_DIRS):
-                continue
-            
-            # Check if it's likely a page
-            if is_page_file(f):
-                files.append(f)
-    
-    return files[:50]  # Limit to 50 files
+    return list(iter_pages(project_path))
+
+
+def check_pages(pages: Iterable[Path], jobs: int = 1) -> Iterator[dict]:
+    """Yield check_page() results in page order, parsing in worker processes when jobs > 1."""
+    if resolve_jobs(jobs) <= 1:
+        for f in pages:
+            yield check_page(f)
+    else:
+        yield from iter_pool(check_page, list(pages), jobs)
 
 
 def check_page(file_path: Path) -> dict:
@@ -100,34 +136,34 @@ def check_page(file_path: Path) -> dict:
     try:
         content = file_path.read_text(encoding='utf-8', errors='ignore')
     except Exception as e:
-        return {"file": str(file_path.name), "issues": [f"Error: {e}"]}
+        return {"file": str(file_path), "issues": [f"Error: {e}"], "site": {}}
+    lower = content.lower()
     
     # Detect if this is a layout/template file (has Head component)
-    is_layout = 'Head>' in content or '<head' in content.lower()
+    is_layout = 'Head>' in content or '<head' in lower
     
     # 1. Title tag
-    has_title = '<title' in content.lower() or 'title=' in content or 'Head>' in content
+    has_title = '<title' in lower or 'title=' in content or 'Head>' in content
     if not has_title and is_layout:
         issues.append("Missing <title> tag")
     
     # 2. Meta description
-    has_description = 'name="description"' in content.lower() or 'name=\'description\'' in content.lower()
+    has_description = 'name="description"' in lower or 'name=\'description\'' in lower
     if not has_description and is_layout:
         issues.append("Missing meta description")
     
     # 3. Open Graph tags
-    has_og = 'og:' in content or 'property="og:' in content.lower()
+    has_og = 'og:' in content or 'property="og:' in lower
     if not has_og and is_layout:
         issues.append("Missing Open Graph tags")
     
     # 4. Heading hierarchy - multiple H1s
-    h1_matches = re.findall(r'<h1[^>]*>', content, re.I)
+    h1_matches = H1_TAG.findall(content)
     if len(h1_matches) > 1:
         issues.append(f"Multiple H1 tags ({len(h1_matches)})")
     
     # 5. Images without alt
-    img_pattern = r'<img[^>]+>'
-    imgs = re.findall(img_pattern, content, re.I)
+    imgs = IMG_TAG.findall(content)
     for img in imgs:
         if 'alt=' not in img.lower():
             issues.append("Image missing alt attribute")
@@ -140,13 +176,77 @@ def check_page(file_path: Path) -> dict:
     # has_canonical = 'rel="canonical"' in content.lower()
     
     return {
-        "file": str(file_path.name),
-        "issues": issues
+        "file": str(file_path),
+        "issues": issues,
+        "site": site_signals(content),
     }
 
 
+def site_signals(content: str) -> Dict[str, List[str]]:
+    """Static title, meta description and H1 texts of a page, for the site-level pass."""
+    titles = [m.group(1) for m in TITLE_TEXT.finditer(content)]
+    titles += [m.group(2) for m in DOCUMENT_TITLE.finditer(content)]
+    descriptions = []
+    for tag in META_DESCRIPTION.findall(content):
+        attr = CONTENT_ATTR.search(tag)
+        if attr:
+            descriptions.append(attr.group(2))
+    # Dynamic headings ({...} expressions) differ per render, so only static text counts
+    h1s = [INNER_TAG.sub(" ", m.group(1)) for m in H1_TEXT.finditer(content) if "{" not in m.group(1)]
+    signals = {"title": titles, "description": descriptions, "h1": h1s}
+    return {key: sorted({normalize_text(v) for v in values if v.strip()}) for key, values in signals.items()}
+
+
+def duplicate_findings(duplicate: dict, tool: str = "seo_checker") -> list:
+    """One finding per page in a duplicate group, naming the other pages."""
+    label, severity = SITE_SIGNALS[duplicate["signal"]]
+    findings = []
+    for f in duplicate["files"]:
+        others = [o for o in duplicate["files"] if o != f]
+        listed = ", ".join(others[:MAX_LISTED_PAGES]) + (f" +{len(others) - MAX_LISTED_PAGES}" if len(others) > MAX_LISTED_PAGES else "")
+        findings.append(make_finding(tool, f"duplicate-{duplicate['signal']}", severity,
+                                     f"Duplicate {label} \"{duplicate['text'][:80]}\" (also on {listed})",
+                                     file=f, category="SEO", text=duplicate["text"], pages=len(duplicate["files"])))
+    return findings
+
+
+def page_findings(result: dict, rel_path: str) -> list:
+    """Convert a check_page() result into shared-schema findings."""
+    return [
+        make_finding("seo_checker", slug(issue), ISSUE_SEVERITY.get(issue, "medium"), issue,
+                     file=rel_path, category="SEO")
+        for issue in result["issues"]
+    ]
+
+
 def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    parser = argparse.ArgumentParser(description="SEO audit for HTML/JSX/TSX pages")
+    parser.add_argument("project_path", nargs="?", default=".", help="Project directory")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for page parsing (0 = all cores)")
+    add_format_argument(parser)
+    args = parser.parse_args()
+    
+    project_path = Path(args.project_path).resolve()
+    writer = open_writer("seo_checker", args.format)
+    
+    # Check each page; results keep only issues and site signals, never page content
+    results = []
+    for result in check_pages(iter_pages(project_path), args.jobs):
+        result["file"] = str(Path(result["file"]).relative_to(project_path)).replace("\\", "/")
+        results.append(result)
+        if writer and result["issues"]:
+            # Machine-readable mode: stream each page's findings as it is parsed
+            writer.write_all(page_findings(result, result["file"]))
+    duplicates = site_duplicates(results)
+    files_with_issues = sum(1 for r in results if r["issues"])
+    
+    if writer:
+        for duplicate in duplicates:
+            writer.write_all(duplicate_findings(duplicate))
+        passed = writer.total == 0
+        writer.close(passed=passed, files_checked=len(results), files_with_issues=files_with_issues,
+                     site_duplicates=len(duplicates))
+        sys.exit(0 if passed else 1)
     
     print(f"\n{'='*60}")
     print(f"  SEO CHECKER - Search Engine Optimization Audit")
@@ -155,24 +255,15 @@ def main():
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("-"*60)
     
-    # Find pages
-    pages = find_pages(project_path)
-    
-    if not pages:
+    if not results:
         print("\n[!] No page files found.")
         print("    Looking for: HTML, JSX, TSX in pages/app/routes directories")
         output = {"script": "seo_checker", "files_checked": 0, "passed": True}
         print("\n" + json.dumps(output, indent=2))
         sys.exit(0)
     
-    print(f"Found {len(pages)} page files to analyze\n")
-    
-    # Check each page
-    all_issues = []
-    for f in pages:
-        result = check_page(f)
-        if result["issues"]:
-            all_issues.append(result)
+    print(f"Found {len(results)} page files to analyze\n")
+    all_issues = [r for r in results if r["issues"]]
     
     # Summary
     print("=" * 60)
@@ -195,18 +286,30 @@ def main():
             print(f"  - {item['file']}")
         if len(all_issues) > 5:
             print(f"  ... and {len(all_issues) - 5} more")
-    else:
+    
+    if duplicates:
+        print(f"\nSite-level duplicates ({len(duplicates)}):")
+        for duplicate in duplicates[:10]:
+            label = SITE_SIGNALS[duplicate["signal"]][0]
+            print(f"  [{len(duplicate['files'])} pages] {label}: \"{duplicate['text'][:60]}\"")
+            for f in duplicate["files"][:MAX_LISTED_PAGES]:
+                print(f"      {f}")
+        if len(duplicates) > 10:
+            print(f"  ... and {len(duplicates) - 10} more")
+    
+    if not all_issues and not duplicates:
         print("\n[OK] No SEO issues found!")
     
     total_issues = sum(len(item["issues"]) for item in all_issues)
-    passed = total_issues == 0
+    passed = total_issues == 0 and not duplicates
     
     output = {
         "script": "seo_checker",
         "project": str(project_path),
-        "files_checked": len(pages),
+        "files_checked": len(results),
         "files_with_issues": len(all_issues),
         "issues_found": total_issues,
+        "site_duplicates": len(duplicates),
         "passed": passed
     }
     
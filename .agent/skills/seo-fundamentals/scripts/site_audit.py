@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Site Audit - SEO + GEO audit of rendered HTML
+Audits what a server or static build actually serves, not TSX source.
+
+PURPOSE:
+    - Catch titles, meta tags and headings that only exist after rendering
+      (prerendered/SSR pages, or a static build such as Vite's dist/)
+    - Run the SEO and GEO rule sets over one parse of each page
+    - Find broken pages, duplicate titles/descriptions and H1 collisions site-wide
+
+HOW IT WORKS:
+    - URL target: same-origin crawl from the given URL (plus any --path seeds),
+      async over a bounded keep-alive connection pool; each response is parsed
+      by a streaming HTML parser as it arrives
+    - Directory target: every .html file of the build is a route, parsed in a
+      process pool (--jobs)
+    - Pages rendered only by client-side JavaScript show their HTML shell here;
+      use webapp-testing's playwright_runner for those
+
+Usage:
+    python site_audit.py <url|build_dir> [--path /pricing ...] [--concurrency 32]
+                         [--max-pages 10000] [--jobs N] [--json] [--format jsonl|sarif]
+Exit code: 0 when there are no critical/high findings and the average GEO
+score is at least 60, 1 otherwise.
+"""
+import sys
+import json
+import asyncio
+import argparse
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "code-analysis" / "scripts"))
+from findings import add_format_argument, make_finding, open_writer, slug
+from page_dom import SITE_SIGNALS, geo_signals, page_site_signals, seo_issues, seo_severity, site_duplicates
+from site_crawl import (AIOHTTP_AVAILABLE, DEFAULT_CONCURRENCY, DEFAULT_MAX_PAGES, crawl_site,
+                        iter_static_pages, normalize_url)
+
+# Fix Windows console encoding
+try:
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+except:
+    pass
+
+
+GEO_PASS_SCORE = 60
+FAILING_SEVERITIES = {"critical", "high"}
+MAX_LISTED_PAGES = 3
+
+
+# ============ PER PAGE ============
+def audit_page(page: Dict[str, Any]) -> Dict[str, Any]:
+    """SEO issues, GEO score and site signals of one fetched page."""
+    result = {"file": page["url"], "status": page.get("status"), "referrer": page.get("referrer")}
+    if page.get("error") or page.get("status") is None or page["status"] >= 400:
+        result["error"] = page.get("error") or f"HTTP {page['status']}"
+        return result
+    geo = geo_signals(page)
+    result.update(seo=seo_issues(page), geo=geo["issues"], geo_passed=geo["passed"], score=geo["score"],
+                  site=page_site_signals(page), ms=page.get("ms"))
+    return result
+
+
+def page_findings(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Shared-schema findings for one audited page."""
+    url = result["file"]
+    if result.get("error"):
+        detail = f" (linked from {result['referrer']})" if result.get("referrer") else ""
+        # Fixed rule ids: the status code or exception text goes in the properties
+        if result.get("status") is not None and result["status"] >= 400:
+            rule, props = "http/status", {"status": result["status"]}
+        else:
+            rule, props = "http/fetch-error", {"error": result["error"]}
+        return [make_finding("site_audit", rule, "high", f"Page failed: {result['error']}{detail}",
+                             file=url, category="HTTP", **props)]
+    findings = [make_finding("site_audit", f"seo/{slug(issue)}", seo_severity(issue), issue,
+                             file=url, category="SEO") for issue in result["seo"]]
+    findings += [make_finding("site_audit", f"geo/{slug(issue)}", "low", issue,
+                              file=url, category="GEO", score=result["score"]) for issue in result["geo"]]
+    return findings
+
+
+def duplicate_findings(duplicate: Dict[str, Any]) -> List[Dict[str, Any]]:
+    label, severity = SITE_SIGNALS[duplicate["signal"]]
+    findings = []
+    for url in duplicate["files"]:
+        others = [o for o in duplicate["files"] if o != url]
+        listed = ", ".join(others[:MAX_LISTED_PAGES]) + (f" +{len(others) - MAX_LISTED_PAGES}" if len(others) > MAX_LISTED_PAGES else "")
+        findings.append(make_finding("site_audit", f"seo/duplicate-{duplicate['signal']}", severity,
+                                     f"Duplicate {label} \"{duplicate['text'][:80]}\" (also on {listed})",
+                                     file=url, category="SEO", text=duplicate["text"], pages=len(duplicate["files"])))
+    return findings
+
+
+# ============ RUN ============
+def run_audit(target: str, seeds: List[str], concurrency: int, max_pages: int, jobs: int,
+              writer=None) -> Dict[str, Any]:
+    """Fetch or read every page, audit it once, then run the site-level pass."""
+    results: List[Dict[str, Any]] = []
+    findings: List[Dict[str, Any]] = []
+
+    def emit(result: Dict[str, Any]):
+        page_found = page_findings(result)
+        findings.extend(page_found)
+        if writer:
+            writer.write_all(page_found)
+
+    if target.startswith(("http://", "https://")):
+        start_urls = [target] + [normalize_url(target, seed) for seed in seeds]
+        crawl = asyncio.run(crawl_site([url for url in start_urls if url], lambda page: results.append(audit_page(page)),
+                                       concurrency, max_pages))
+        # Pages finish in network order: sort, and use the timing-independent referrers
+        referrers = crawl.pop("referrers")
+        results.sort(key=lambda r: r["file"])
+        for result in results:
+            result["referrer"] = referrers.get(result["file"])
+            emit(result)
+    else:
+        build_dir = Path(target).resolve()
+        started = datetime.now()
+        for page in iter_static_pages(build_dir, jobs):
+            results.append(audit_page(page))
+            emit(results[-1])
+        seconds = (datetime.now() - started).total_seconds()
+        crawl = {"origin": str(build_dir), "client": "static", "fetched": len(results), "truncated": False,
+                 "seconds": round(seconds, 2), "pages_per_second": round(len(results) / seconds, 1) if seconds else 0.0}
+
+    audited = [r for r in results if not r.get("error")]
+    duplicates = site_duplicates(audited)
+    for duplicate in duplicates:
+        found = duplicate_findings(duplicate)
+        findings.extend(found)
+        if writer:
+            writer.write_all(found)
+
+    scores = [r["score"] for r in audited]
+    avg_score = sum(scores) / len(scores) if scores else 100
+    issue_counts: Dict[str, int] = {}
+    for finding in findings:
+        issue_counts[finding["rule"]] = issue_counts.get(finding["rule"], 0) + 1
+    return {
+        "script": "site_audit",
+        "target": target,
+        "crawl": crawl,
+        "pages_checked": len(audited),
+        "pages_failed": len(results) - len(audited),
+        "average_geo_score": round(avg_score),
+        "site_duplicates": len(duplicates),
+        "issue_counts": dict(sorted(issue_counts.items(), key=lambda x: (-x[1], x[0]))),
+        "results": results,
+        "duplicates": duplicates,
+        "passed": avg_score >= GEO_PASS_SCORE and not any(f["severity"] in FAILING_SEVERITIES for f in findings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SEO + GEO audit of rendered HTML (crawl or static build)")
+    parser.add_argument("target", help="Base URL of a running site, or a static build directory (e.g. dist/)")
+    parser.add_argument("--path", action="append", default=[], help="Extra route to seed the crawl (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Open connections while crawling")
+    parser.add_argument("--max-pages", type=int, default=DEFAULT_MAX_PAGES, help="Stop discovering routes after this many")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for a static build (0 = all cores)")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    add_format_argument(parser)
+    args = parser.parse_args()
+
+    if not args.target.startswith(("http://", "https://")) and not Path(args.target).is_dir():
+        print(json.dumps({"error": f"Not a URL or directory: {args.target}"}))
+        sys.exit(1)
+
+    writer = open_writer("site_audit", args.format)
+    report = run_audit(args.target, args.path, args.concurrency, args.max_pages, args.jobs, writer)
+    crawl = report["crawl"]
+
+    if writer:
+        writer.close(passed=report["passed"], pages_checked=report["pages_checked"],
+                     pages_failed=report["pages_failed"], average_geo_score=report["average_geo_score"],
+                     truncated=crawl["truncated"])
+    elif args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"\n{'='*60}")
+        print(f"  SITE AUDIT - SEO + GEO on rendered HTML")
+        print(f"{'='*60}")
+        print(f"Target: {args.target} ({crawl['client']})")
+        print(f"Pages: {report['pages_checked']} audited, {report['pages_failed']} failed "
+              f"in {crawl['seconds']}s ({crawl['pages_per_second']} pages/s)")
+        if crawl["truncated"]:
+            print(f"[!] Stopped discovering routes at --max-pages {args.max_pages}")
+        if not AIOHTTP_AVAILABLE and args.target.startswith("http"):
+            print("    (pip install aiohttp for the aiohttp client; using the built-in asyncio client)")
+        print("-"*60)
+
+        if report["issue_counts"]:
+            print("\nIssue Summary:")
+            for rule, count in list(report["issue_counts"].items())[:20]:
+                print(f"  [{count}] {rule}")
+        failed = [r for r in report["results"] if r.get("error")]
+        if failed:
+            print(f"\nFailed pages ({len(failed)}):")
+            for r in failed[:5]:
+                print(f"  - {r['file']}: {r['error']}")
+        if report["duplicates"]:
+            print(f"\nSite-level duplicates ({len(report['duplicates'])}):")
+            for duplicate in report["duplicates"][:10]:
+                label = SITE_SIGNALS[duplicate["signal"]][0]
+                print(f"  [{len(duplicate['files'])} pages] {label}: \"{duplicate['text'][:60]}\"")
+        if not report["issue_counts"]:
+            print("\n[OK] No SEO/GEO issues found!")
+
+        print(f"\nAVERAGE GEO SCORE: {report['average_geo_score']}%")
+        output = {key: report[key] for key in ("script", "target", "pages_checked", "pages_failed",
+                                               "average_geo_score", "site_duplicates", "passed")}
+        print("\n" + json.dumps(output, indent=2))
+
+    sys.exit(0 if report["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+Skill: vulnerability-scanner
+Script: dependency_analyzer.py
+Purpose: Offline dependency vulnerability check against a local advisory snapshot
+Usage:
+    python dependency_analyzer.py <project_path> [--db PATH] [--output json|summary] [--fail-on LEVEL]
+    python dependency_analyzer.py <project_path> --refresh [--db PATH]
+Output: JSON with vulnerable packages
+Exit code: 1 for vulnerabilities at or above --fail-on, or when a lockfile
+exists but the advisory snapshot is missing; 0 otherwise.
+
+The npm lockfile (npm-shrinkwrap.json or package-lock.json, v1-v3) is parsed
+directly - streamed with ijson when it is installed - and every resolved
+version is matched against advisories indexed by package name. Scanning never
+touches the network; only --refresh does, rebuilding the snapshot from the
+npm bulk advisory endpoint for the packages in the lockfile. Refresh on a
+connected machine, then ship the snapshot into air-gapped builds.
+
+Snapshot format (default: <project>/.security/npm-advisories.json):
+    {
+      "generated": "2026-01-01T00:00:00",
+      "source": "https://registry.npmjs.org/-/npm/v1/security/advisories/bulk",
+      "lockfile_sha256": "...",
+      "packages": {
+        "<name>": [{"id": 1, "severity": "high", "title": "...", "url": "...",
+                    "vulnerable_versions": ">=2.0.0 <2.1.1"}]
+      }
+    }
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import urllib.request
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Fix Windows console encoding for Unicode output
+try:
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+except AttributeError:
+    pass  # Python < 3.7
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+
+# ============================================================================
+#  CONFIGURATION
+# ============================================================================
+
+DEFAULT_ADVISORY_DB = os.path.join(".security", "npm-advisories.json")
+LOCKFILES = ["npm-shrinkwrap.json", "package-lock.json"]  # npm's precedence
+
+BULK_ADVISORY_URL = "https://registry.npmjs.org/-/npm/v1/security/advisories/bulk"
+REFRESH_BATCH_SIZE = 500
+REFRESH_TIMEOUT = 60
+
+SEVERITY_ORDER = ["low", "moderate", "high", "critical"]
+ADVISORY_FIELDS = ["id", "severity", "title", "url", "vulnerable_versions"]
+
+
+# ============================================================================
+#  LOCKFILE PARSING
+# ============================================================================
+
+def find_lockfile(project_path: str) -> Optional[Path]:
+    """Return the lockfile npm would use, if any."""
+    for name in LOCKFILES:
+        path = Path(project_path) / name
+        if path.exists():
+            return path
+    return None
+
+
+def _package_name(key: str, entry: Dict[str, Any]) -> Optional[str]:
+    """Name of a v2/v3 "packages" entry keyed by its node_modules path."""
+    if "node_modules/" not in key:
+        return None  # root project or workspace folder
+    return entry.get("name") or key.rsplit("node_modules/", 1)[-1]
+
+
+def _iter_v1_dependencies(dependencies: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    """Walk a v1 nested "dependencies" tree without recursion."""
+    stack = [dependencies]
+    while stack:
+        for name, entry in stack.pop().items():
+            if entry.get("version"):
+                yield name, entry["version"]
+            if entry.get("dependencies"):
+                stack.append(entry["dependencies"])
+
+
+def iter_lock_packages(lock_path: Path) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (name, version) for every installed package in the lockfile.
+    With ijson the "packages" map is streamed entry by entry; lockfiles
+    without it (v1) fall back to a full parse.
+    """
+    if IJSON_AVAILABLE:
+        streamed = False
+        with open(lock_path, 'rb') as f:
+            for key, entry in ijson.kvitems(f, 'packages'):
+                streamed = True
+                name = _package_name(key, entry)
+                if name and entry.get("version") and not entry.get("link"):
+                    yield name, entry["version"]
+        if streamed:
+            return
+
+    with open(lock_path, 'r', encoding='utf-8') as f:
+        lock = json.load(f)
+
+    if "packages" in lock:
+        for key, entry in lock["packages"].items():
+            name = _package_name(key, entry)
+            if name and entry.get("version") and not entry.get("link"):
+                yield name, entry["version"]
+    else:
+        yield from _iter_v1_dependencies(lock.get("dependencies", {}))
+
+
+def file_sha256(path: Path) -> str:
+    """sha256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# ============================================================================
+#  SEMVER RANGES
+# ============================================================================
+
+VERSION_RE = re.compile(
+    r'^\s*v?(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?\s*$'
+)
+PARTIAL_RE = re.compile(
+    r'^v?(\d+|[xX*])(?:\.(\d+|[xX*]))?(?:\.(\d+|[xX*]))?(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?$'
+)
+COMPARATOR_RE = re.compile(r'^(>=|<=|>|<|=|\^|~>?)?\s*(.*)$')
+
+RELEASE = (1,)  # sorts after every prerelease tag
+
+
+def _prerelease_key(prerelease: Optional[str]) -> Tuple:
+    """Order prerelease tags per semver: numeric < alphanumeric, release last."""
+    if not prerelease:
+        return RELEASE
+    parts = []
+    for part in prerelease.split('.'):
+        parts.append((0, int(part), '') if part.isdigit() else (1, 0, part))
+    return (0, tuple(parts))
+
+
+@lru_cache(maxsize=None)
+def parse_version(version: str) -> Optional[Tuple]:
+    """Return a sortable key for a concrete version, or None if it is not semver."""
+    match = VERSION_RE.match(version)
+    if not match:
+        return None
+    major, minor, patch, prerelease = match.groups()
+    return (int(major), int(minor or 0), int(patch or 0), _prerelease_key(prerelease))
+
+
+def _key(major: int, minor: int = 0, patch: int = 0, prerelease: Optional[str] = None) -> Tuple:
+    return (major, minor, patch, _prerelease_key(prerelease))
+
+
+def _lowest(major: int, minor: int = 0, patch: int = 0) -> Tuple:
+    """Key below every version (including prereleases) of major.minor.patch."""
+    return (major, minor, patch, (0, ()))
+
+
+def _expand_comparator(op: str, text: str) -> List[Tuple[str, Tuple]]:
+    """Translate one comparator (with x-ranges, ^ and ~) into primitive (op, key) pairs."""
+    if text in ('', '*', 'x', 'X', 'latest'):
+        return []
+    match = PARTIAL_RE.match(text)
+    if not match:
+        raise ValueError(f"Unsupported version: {text}")
+
+    parts, prerelease = match.groups()[:3], match.group(4)
+    numbers = [int(p) for p in parts if p is not None and p not in ('x', 'X', '*')]
+    # Anything after a wildcard is a wildcard too
+    for index, part in enumerate(parts):
+        if part is None or part in ('x', 'X', '*'):
+            numbers = numbers[:index]
+            break
+
+    if not numbers:
+        return [] if op in ('', '=', '>=', '<=', '^', '~', '~>') else [('<', _lowest(0))]
+
+    full = len(numbers) == 3
+    major, minor, patch = (numbers + [0, 0])[:3]
+
+    if op in ('', '='):
+        if full:
+            return [('=', _key(major, minor, patch, prerelease))]
+        upper = _lowest(major + 1) if len(numbers) == 1 else _lowest(major, minor + 1)
+        return [('>=', _lowest(major, minor)), ('<', upper)]
+    if op == '>':
+        if full:
+            return [('>', _key(major, minor, patch, prerelease))]
+        return [('>=', _lowest(major + 1) if len(numbers) == 1 else _lowest(major, minor + 1))]
+    if op == '>=':
+        return [('>=', _key(major, minor, patch, prerelease) if full else _lowest(major, minor))]
+    if op == '<':
+        return [('<', _key(major, minor, patch, prerelease) if full else _lowest(major, minor))]
+    if op == '<=':
+        if full:
+            return [('<=', _key(major, minor, patch, prerelease))]
+        return [('<', _lowest(major + 1) if len(numbers) == 1 else _lowest(major, minor + 1))]
+
+    lower = ('>=', _key(major, minor, patch, prerelease) if full else _lowest(major, minor, patch))
+    if op in ('~', '~>'):
+        upper = _lowest(major + 1) if len(numbers) == 1 else _lowest(major, minor + 1)
+        return [lower, ('<', upper)]
+
+    # Caret: allow changes that do not modify the left-most non-zero component
+    if major > 0 or len(numbers) == 1:
+        upper = _lowest(major + 1)
+    elif minor > 0 or len(numbers) == 2:
+        upper = _lowest(0, minor + 1)
+    else:
+        upper = _lowest(0, 0, patch + 1)
+    return [lower, ('<', upper)]
+
+
+@lru_cache(maxsize=None)
+def parse_range(range_text: str) -> Tuple[Tuple[Tuple[str, Tuple], ...], ...]:
+    """
+    Parse an npm range into alternatives (||) of comparator sets.
+    Prereleases are compared like any other version - stricter than npm,
+    which is the safe direction for a vulnerability check.
+    """
+    alternatives = []
+    for alternative in range_text.split('||'):
+        alternative = alternative.strip()
+        comparators = []
+
+        hyphen = re.match(r'^(\S+)\s+-\s+(\S+)$', alternative)
+        if hyphen:
+            comparators += _expand_comparator('>=', hyphen.group(1))
+            comparators += _expand_comparator('<=', hyphen.group(2))
+        else:
+            # Allow "> 1.2.3" style spacing between operator and version
+            tokens = re.sub(r'(>=|<=|>|<|=|\^|~>?)\s+', r'\1', alternative).split()
+            for token in tokens:
+                op, text = COMPARATOR_RE.match(token).groups()
+                comparators += _expand_comparator(op or '', text)
+
+        alternatives.append(tuple(comparators))
+    return tuple(alternatives)
+
+
+COMPARE = {
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+    '=': lambda a, b: a == b,
+}
+
+
+def satisfies(version: str, range_text: str) -> bool:
+    """True when version falls inside the npm range."""
+    key = parse_version(version)
+    if key is None:
+        return False
+    try:
+        alternatives = parse_range(range_text)
+    except ValueError:
+        return False
+    return any(all(COMPARE[op](key, bound) for op, bound in comparators) for comparators in alternatives)
+
+
+# ============================================================================
+#  ADVISORY SNAPSHOT
+# ============================================================================
+
+def resolve_db_path(project_path: str, db_path: Optional[str] = None) -> Path:
+    """Explicit --db path, or the default location inside the project."""
+    return Path(db_path) if db_path else Path(project_path) / DEFAULT_ADVISORY_DB
+
+
+def load_snapshot(db_path: Path) -> Dict[str, Any]:
+    """Load the advisory snapshot."""
+    with open(db_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def refresh_snapshot(project_path: str, db_path: Optional[str] = None,
+                     timeout: int = REFRESH_TIMEOUT) -> Dict[str, Any]:
+    """
+    Rebuild the snapshot for every package in the lockfile from the npm
+    bulk advisory endpoint. This is the only function that uses the network.
+    """
+    lock_path = find_lockfile(project_path)
+    if not lock_path:
+        return {"error": "No package-lock.json or npm-shrinkwrap.json found"}
+
+    versions: Dict[str, set] = {}
+    for name, version in iter_lock_packages(lock_path):
+        versions.setdefault(name, set()).add(version)
+
+    names = sorted(versions)
+    packages: Dict[str, List[Dict[str, Any]]] = {}
+    for start in range(0, len(names), REFRESH_BATCH_SIZE):
+        batch = {name: sorted(versions[name]) for name in names[start:start + REFRESH_BATCH_SIZE]}
+        request = urllib.request.Request(
+            BULK_ADVISORY_URL,
+            data=json.dumps(batch).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            advisories = json.load(response)
+        for name, entries in advisories.items():
+            packages[name] = [{field: entry.get(field) for field in ADVISORY_FIELDS} for entry in entries]
+
+    snapshot = {
+        "generated": datetime.now().isoformat(),
+        "source": BULK_ADVISORY_URL,
+        "lockfile_sha256": file_sha256(lock_path),
+        "packages": {name: packages[name] for name in sorted(packages)}
+    }
+
+    target = resolve_db_path(project_path, db_path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, indent=2)
+        f.write("\n")
+
+    return {
+        "snapshot": str(target),
+        "packages_queried": len(names),
+        "packages_with_advisories": len(packages)
+    }
+
+
+# ============================================================================
+#  AUDIT
+# ============================================================================
+
+def audit_lockfile(project_path: str, db_path: Optional[str] = None) -> Dict[str, Any]:
+    """Match every locked package version against the advisory snapshot."""
+    results = {
+        "tool": "offline_advisory_scanner",
+        "lockfile": None,
+        "snapshot": None,
+        "packages_checked": 0,
+        "vulnerable": [],
+        "malformed_advisories": [],
+        "by_severity": {severity: 0 for severity in reversed(SEVERITY_ORDER)}
+    }
+
+    lock_path = find_lockfile(project_path)
+    if not lock_path:
+        results["error"] = "No package-lock.json or npm-shrinkwrap.json found"
+        return results
+    results["lockfile"] = lock_path.name
+
+    snapshot_path = resolve_db_path(project_path, db_path)
+    if not snapshot_path.exists():
+        results["error"] = f"Advisory snapshot not found: {snapshot_path} (run with --refresh)"
+        return results
+
+    snapshot = load_snapshot(snapshot_path)
+    advisories = snapshot.get("packages", {})
+    results["snapshot"] = {
+        "path": str(snapshot_path),
+        "generated": snapshot.get("generated"),
+        # Locked versions changed since the refresh; new ones may be unknown
+        "stale": snapshot.get("lockfile_sha256") not in (None, file_sha256(lock_path))
+    }
+
+    # An advisory without a range would match every version ("" is "*" in semver)
+    for name, entries in advisories.items():
+        for advisory in entries:
+            if not (advisory.get("vulnerable_versions") or "").strip():
+                results["malformed_advisories"].append({"package": name, "id": advisory.get("id")})
+
+    worst: Dict[str, str] = {}  # package -> highest severity, counted like npm audit
+    seen = set()
+    for name, version in iter_lock_packages(lock_path):
+        if (name, version) in seen:
+            continue
+        seen.add((name, version))
+
+        for advisory in advisories.get(name, ()):
+            vulnerable_versions = (advisory.get("vulnerable_versions") or "").strip()
+            if not vulnerable_versions or not satisfies(version, vulnerable_versions):
+                continue
+            severity = (advisory.get("severity") or "low").lower()
+            if severity not in SEVERITY_ORDER:
+                severity = "low"
+            results["vulnerable"].append({
+                "package": name,
+                "version": version,
+                "severity": severity,
+                "id": advisory.get("id"),
+                "title": advisory.get("title"),
+                "url": advisory.get("url"),
+                "vulnerable_versions": advisory.get("vulnerable_versions")
+            })
+            if name not in worst or SEVERITY_ORDER.index(severity) > SEVERITY_ORDER.index(worst[name]):
+                worst[name] = severity
+
+    results["packages_checked"] = len(seen)
+    for severity in worst.values():
+        results["by_severity"][severity] += 1
+    results["vulnerable"].sort(key=lambda v: (-SEVERITY_ORDER.index(v["severity"]), v["package"], v["version"]))
+
+    return results
+
+
+# ============================================================================
+#  MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Offline npm dependency audit against a local advisory snapshot"
+    )
+    parser.add_argument("project_path", nargs="?", default=".", help="Project directory")
+    parser.add_argument("--db", help=f"Advisory snapshot path (default: <project>/{DEFAULT_ADVISORY_DB})")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Rebuild the snapshot from the npm registry (needs network)")
+    parser.add_argument("--output", choices=["json", "summary"], default="summary",
+                        help="Output format")
+    parser.add_argument("--fail-on", choices=SEVERITY_ORDER, default="high",
+                        help="Exit non-zero for vulnerabilities at or above this severity")
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.project_path):
+        print(json.dumps({"error": f"Directory not found: {args.project_path}"}))
+        sys.exit(1)
+
+    if args.refresh:
+        try:
+            result = refresh_snapshot(args.project_path, args.db)
+        except OSError as e:
+            result = {"error": f"Refresh failed: {e}"}
+        print(json.dumps(result, indent=2))
+        sys.exit(1 if "error" in result else 0)
+
+    result = audit_lockfile(args.project_path, args.db)
+
+    if args.output == "json":
+        print(json.dumps(result, indent=2))
+    else:
+        print("\n" + "=" * 60)
+        print("  OFFLINE DEPENDENCY AUDIT")
+        print("=" * 60 + "\n")
+        if "error" in result:
+            print(f"[!] {result['error']}")
+        else:
+            print(f"Lockfile: {result['lockfile']}")
+            print(f"Snapshot: {result['snapshot']['path']} ({result['snapshot']['generated']})")
+            if result["snapshot"]["stale"]:
+                print("[!] Lockfile changed since the snapshot was refreshed")
+            print(f"Packages checked: {result['packages_checked']}")
+            if result["malformed_advisories"]:
+                print(f"[!] Skipped {len(result['malformed_advisories'])} advisories without vulnerable_versions")
+            for severity, count in result["by_severity"].items():
+                print(f"  {severity.capitalize()}: {count}")
+            for vuln in result["vulnerable"][:15]:
+                print(f"  - [{vuln['severity']}] {vuln['package']}@{vuln['version']}: {vuln['title']}")
+            if len(result["vulnerable"]) > 15:
+                print(f"  ... and {len(result['vulnerable']) - 15} more")
+        print()
+
+    if "error" in result:
+        # No lockfile: nothing to audit. A lockfile without a snapshot must not pass the gate.
+        sys.exit(1 if result["lockfile"] else 0)
+
+    threshold = SEVERITY_ORDER.index(args.fail_on)
+    failing = sum(count for severity, count in result["by_severity"].items()
+                  if SEVERITY_ORDER.index(severity) >= threshold)
+    sys.exit(1 if failing else 0)
+
+
+if __name__ == "__main__":
+    main()
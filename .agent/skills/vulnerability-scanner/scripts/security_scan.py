@@ -3,14 +3,41 @@
 Skill: vulnerability-scanner
 Script: security_scan.py
 Purpose: Validate that security principles from SKILL.md are applied correctly
-Usage: python security_scan.py <project_path> [--scan-type all|deps|secrets|patterns|config]
-Output: JSON with validation findings
+Usage: python security_scan.py <project_path> [--scan-type all|deps|secrets|patterns|config] [--jobs N]
+       [--pattern-mode regex|ast] [--token-cache [DIR]] [--format jsonl|sarif]
+Output: JSON with validation findings (or a JSONL / SARIF findings stream)
 
 This script verifies:
 1. Dependencies - Supply chain security (OWASP A03)
 2. Secrets - No hardcoded credentials (OWASP A04)
 3. Code Patterns - Dangerous patterns identified (OWASP A05)
 4. Configuration - Security settings validated (OWASP A02)
+
+File scans can be spread over a process pool with --jobs (0 = all cores).
+Files are streamed in fixed-size windows (mmap for large files), so memory
+stays flat; binaries and files above --max-file-size (MB) are skipped.
+
+Accepted findings can be recorded in a baseline (--baseline, written with
+--update-baseline) keyed by (rule, file, content fingerprint); only new
+findings are reported. With --cache, files whose content hash is unchanged
+since a clean (or fully baselined) scan are skipped entirely.
+
+Secrets without a known prefix are caught by entropy scoring: candidate
+tokens are scored for Shannon entropy and character classes in one batch per
+file (vectorized with NumPy when installed). Disable with --no-entropy.
+
+With --pattern-mode ast, dangerous patterns in Python and JS/TS are matched
+on AST nodes and tokens instead of raw text, so comments, strings and method
+names such as regex.exec() no longer match. Token streams can be cached per
+file hash (--token-cache) and reused by the other checkers.
+
+With --format jsonl or sarif, every finding is written in the shared findings
+schema (see .agent/.shared/code-analysis/scripts/findings.py) as soon as its
+file has been scanned, untruncated; orchestrators can act on it mid-scan.
+
+Dependency checks run offline against a local advisory snapshot (see
+dependency_analyzer.py) when one exists or --offline is given; otherwise
+they fall back to npm audit.
 """
 import subprocess
 import json
@@ -18,10 +45,33 @@ import os
 import sys
 import re
 import argparse
+import ast
+import hashlib
+import math
+import mmap
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Optional, Set, Tuple
 from datetime import datetime
 
+try:
+    import re._parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "code-analysis" / "scripts"))
+from dependency_analyzer import audit_lockfile, find_lockfile, resolve_db_path
+from source_tokens import code_tokens, default_cache_dir, language_for, tokenize_source
+from findings import add_format_argument, make_finding, open_writer, slug
+from file_pool import iter_pool, resolve_jobs, walk_files
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -85,19 +135,817 @@ DANGEROUS_PATTERNS = [
     (r'yaml\.load\s*\([^)]*\)(?!\s*,\s*Loader)', "Unsafe YAML load", "high", "Deserialization risk"),
 ]
 
-SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '__pycache__', '.venv', 'venv', '.next'}
+CONFIG_ISSUE_PATTERNS = [
+    (r'"DEBUG"\s*:\s*true', "Debug mode enabled", "high"),
+    (r'debug\s*=\s*True', "Debug mode enabled", "high"),
+    (r'NODE_ENV.*development', "Development mode in config", "medium"),
+    (r'"CORS_ALLOW_ALL".*true', "CORS allow all origins", "high"),
+    (r'"Access-Control-Allow-Origin".*\*', "CORS wildcard", "high"),
+    (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
+]
+
+SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '__pycache__', '.venv', 'venv', '.next', '.agent-cache'}
 CODE_EXTENSIONS = {'.js', '.ts', '.jsx', '.tsx', '.py', '.go', '.java', '.rb', '.php'}
 CONFIG_EXTENSIONS = {'.json', '.yaml', '.yml', '.toml', '.env', '.env.local', '.env.development'}
+CONFIG_FILENAMES = {'next.config.js', 'webpack.config.js', '.eslintrc.js'}
+
+# Entropy-based secret detection: candidate tokens, allowlists and thresholds
+ENTROPY_TOKEN_CHARS = r'A-Za-z0-9+/=_\-'
+ENTROPY_CANDIDATE_PATTERN = rf'(?<![{ENTROPY_TOKEN_CHARS}])[{ENTROPY_TOKEN_CHARS}]{{20,256}}(?![{ENTROPY_TOKEN_CHARS}])'
+ENTROPY_ALLOWLIST = [
+    r'^sha(?:1|256|384|512)-',                                   # lockfile integrity (SRI) strings
+    r'^[0-9a-fA-F]+$',                                           # hex digests, git SHAs
+    r'^[0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12}$',  # UUIDs
+    r'ABCDEFGH|abcdefgh|01234567',                               # alphabet / charset constants
+    r'^[-_/]?(?:[a-z0-9]{1,16}[-_/])+[a-z0-9]{0,16}$',          # kebab/snake/path identifiers
+]
+ENTROPY_SKIP_AFTER = (b'.', b'/', b'base64,')                    # URL paths, domains, data URIs
+ENTROPY_THRESHOLD = 4.2                                          # bits per character
+ENTROPY_LENGTH_FACTOR = 0.9                                      # short tokens: 90% of log2(len)
+ENTROPY_MIN_CLASSES = 3
+SECRET_CONTEXT_PATTERN = r'key|token|secret|passw|auth|credential|bearer'
+SECRET_CONTEXT_BYTES = 40
+NUMPY_MIN_BATCH = 256                                            # smaller batches are faster in pure Python
+
+# Character classes as bit flags: lower, upper, digit, symbol
+CLASS_LOWER, CLASS_UPPER, CLASS_DIGIT, CLASS_SYMBOL = 1, 2, 4, 8
+CLASS_TABLE = [
+    CLASS_LOWER if 97 <= b <= 122 else
+    CLASS_UPPER if 65 <= b <= 90 else
+    CLASS_DIGIT if 48 <= b <= 57 else
+    CLASS_SYMBOL
+    for b in range(256)
+]
+CLASS_BITS = [bin(mask).count("1") for mask in range(16)]
+
+# Compiled once per process (workers compile them on import). Patterns run
+# over raw bytes so large files can be scanned straight from an mmap.
+SECRET_REGEXES = [re.compile(p.encode(), re.IGNORECASE) for p, _, _ in SECRET_PATTERNS]
+ENTROPY_CANDIDATE_REGEX = re.compile(ENTROPY_CANDIDATE_PATTERN.encode())
+ENTROPY_ALLOWLIST_REGEXES = [re.compile(p.encode()) for p in ENTROPY_ALLOWLIST]
+SECRET_CONTEXT_REGEX = re.compile(SECRET_CONTEXT_PATTERN.encode(), re.IGNORECASE)
+DANGEROUS_REGEXES = [re.compile(p.encode(), re.IGNORECASE) for p, _, _, _ in DANGEROUS_PATTERNS]
+CONFIG_ISSUE_REGEXES = [re.compile(p.encode(), re.IGNORECASE) for p, _, _ in CONFIG_ISSUE_PATTERNS]
+
+# AST-aware pattern mode (--pattern-mode ast): Python files are parsed with
+# ast and JS/TS files tokenized, so rules only fire on real code. Files
+# without any trigger are never parsed, so each language's trigger regex
+# must match wherever one of its rules can fire.
+PATTERN_MODES = ("regex", "ast")
+SQL_KEYWORD_PATTERN = (r'(?i:\bselect\s[^;]{0,200}?\sfrom\s|\binsert\s+into\s|\bdelete\s+from\s'
+                       r'|\bupdate\s+[\w."`]+\s+set\s)')
+SHARED_TRIGGERS = r'--insecure|(?i:disable[_-]?ssl)|' + SQL_KEYWORD_PATTERN
+AST_TRIGGER_PATTERNS = {
+    "python": r'\b(?:eval|exec|pickle|yaml)\b|\b(?:shell|verify)\s*=|' + SHARED_TRIGGERS,
+    "javascript": (r'\b(?:eval|exec|Function|innerHTML|dangerouslySetInnerHTML|rejectUnauthorized)\b'
+                   r'|\bdocument\s*\.\s*write|' + SHARED_TRIGGERS),
+}
+AST_TRIGGER_PATTERNS["typescript"] = AST_TRIGGER_PATTERNS["javascript"]
+SSL_DISABLED_NAME = r'(?i)disable[_-]?ssl'
+PY_SHELL_MODULES = {'subprocess'}
+PY_PICKLE_CALLS = {'pickle.load', 'pickle.loads', 'cPickle.load', 'cPickle.loads'}
+SQL_TAG_NAMES = {'sql'}             # tagged templates that bind ${} as parameters (drizzle, slonik)
+DANGEROUS_RULES = {name: (index, severity, category)
+                   for index, (_, name, severity, category) in enumerate(DANGEROUS_PATTERNS)}
+
+SQL_KEYWORD_REGEX = re.compile(SQL_KEYWORD_PATTERN)
+AST_TRIGGER_REGEXES = {language: re.compile(p.encode()) for language, p in AST_TRIGGER_PATTERNS.items()}
+SSL_DISABLED_REGEX = re.compile(SSL_DISABLED_NAME)
+
+# Streaming limits
+CHUNK_SIZE = 1024 * 1024            # bytes per window (files above this are mmap'd)
+MAX_OVERLAP = 4096                  # cap for unbounded patterns such as [^"']+
+BINARY_SNIFF_BYTES = 8192           # a NUL byte in this prefix marks a binary file
+DEFAULT_MAX_FILE_SIZE_MB = 10
+
+# Baseline / cache
+BASELINE_VERSION = 1
+CACHE_VERSION = 1
+FINGERPRINT_LENGTH = 16             # hex chars of sha256 kept per finding
+
+
+def rules_digest(entropy: bool, pattern_mode: str = "regex") -> str:
+    """Hash of every rule that decides findings; cached verdicts depend on it."""
+    rules = [SECRET_PATTERNS, DANGEROUS_PATTERNS, CONFIG_ISSUE_PATTERNS]
+    if pattern_mode == "ast":
+        rules.append([AST_TRIGGER_PATTERNS, SSL_DISABLED_NAME, sorted(SQL_TAG_NAMES)])
+    if entropy:
+        rules.append([ENTROPY_CANDIDATE_PATTERN, ENTROPY_ALLOWLIST, ENTROPY_THRESHOLD,
+                      ENTROPY_LENGTH_FACTOR, ENTROPY_MIN_CLASSES])
+    return hashlib.sha256(json.dumps(rules).encode()).hexdigest()
+
+
+# ============================================================================
+#  FILE COLLECTION & PARALLEL EXECUTION
+# ============================================================================
+
+def collect_files(project_path: str, extensions: Iterable[str], filenames: Iterable[str] = ()) -> List[Path]:
+    """Project files to scan, in the stable order that keeps parallel results deterministic."""
+    return [Path(f) for f in walk_files(project_path, extensions, SKIP_DIRS, filenames)]
+
+
+def iter_scan_files(file_scanner: Callable, files: List[Path], project_path: str,
+                    jobs: int = 1) -> Iterator[Dict[str, Any]]:
+    """Run file_scanner over every file (see file_pool.iter_pool); one result per file, in order."""
+    return iter_pool(partial(file_scanner, project_path=project_path), files, jobs)
+
+
+def scan_files(file_scanner: Callable, files: List[Path], project_path: str, jobs: int = 1) -> List[Dict[str, Any]]:
+    """Run file_scanner over every file; one result per file, in order."""
+    return list(iter_scan_files(file_scanner, files, project_path, jobs))
+
+
+# ============================================================================
+#  STREAMING
+# ============================================================================
+
+def max_match_width(regexes: List[re.Pattern]) -> int:
+    """Longest possible match across regexes, capped at MAX_OVERLAP."""
+    widest = 0
+    for regex in regexes:
+        try:
+            width = sre_parse.parse(regex.pattern, regex.flags).getwidth()[1]
+        except Exception:
+            width = MAX_OVERLAP
+        widest = max(widest, min(width, MAX_OVERLAP))
+    return widest
+
+
+SECRET_OVERLAP = max_match_width(SECRET_REGEXES + [ENTROPY_CANDIDATE_REGEX])
+CONFIG_ISSUE_OVERLAP = max_match_width(CONFIG_ISSUE_REGEXES)
+# Dangerous patterns are line-scoped: the overlap has to hold the rest of the
+# last line in a window rather than the widest match.
+DANGEROUS_OVERLAP = MAX_OVERLAP
+
+
+def skip_reason(filepath: Path, size: int, max_file_size: int) -> Optional[str]:
+    """Return why a file should not be scanned, or None to scan it."""
+    if size > max_file_size:
+        return "too_large"
+    with open(filepath, 'rb') as f:
+        if b'\x00' in f.read(BINARY_SNIFF_BYTES):
+            return "binary"
+    return None
+
+
+def iter_windows(filepath: Path, size: int, overlap: int) -> Iterator[Tuple[int, bytes, bool]]:
+    """
+    Yield (offset, data, is_last) windows of CHUNK_SIZE bytes plus overlap.
+    Small files come back as a single window; large files are read via mmap.
+    """
+    with open(filepath, 'rb') as f:
+        if size <= CHUNK_SIZE + overlap:
+            yield 0, f.read(), True
+            return
+        
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            mm = None
+        
+        if mm is not None:
+            with mm:
+                for offset in range(0, size, CHUNK_SIZE):
+                    end = offset + CHUNK_SIZE + overlap
+                    yield offset, mm[offset:end], end >= size
+                    if end >= size:
+                        return
+            return
+        
+        # No mmap (e.g. special files): plain buffered reads with carry-over
+        data = f.read(CHUNK_SIZE + overlap)
+        offset = 0
+        while True:
+            more = f.read(CHUNK_SIZE)
+            yield offset, data, not more
+            if not more:
+                return
+            data = data[CHUNK_SIZE:] + more
+            offset += CHUNK_SIZE
+
+
+def iter_line_hits(regex: re.Pattern, data: bytes, begin: int, limit: int) -> Iterator[int]:
+    """
+    Yield (start, end) of the first match on each line starting in
+    [begin, limit), with matches confined to a single line.
+    """
+    pos = begin
+    while pos < limit:
+        match = regex.search(data, pos)
+        if not match:
+            return
+        line_start = data.rfind(b'\n', 0, match.start()) + 1
+        if line_start >= limit:
+            return
+        line_end = data.find(b'\n', match.start())
+        if line_end == -1:
+            line_end = len(data)
+        if match.end() > line_end:
+            # Crossed a newline: retry with the search confined to this line
+            match = regex.search(data, line_start, line_end)
+        if match:
+            yield match.start(), match.end()
+        pos = line_end + 1
+
+
+def iter_matches(filepath: Path, size: int, regexes: List[re.Pattern], overlap: int,
+                 line_scoped: bool = False) -> Iterator[Tuple[int, int, bytes, int, int]]:
+    """
+    Stream a file and yield (regex_index, line_number, window, start, end)
+    for every match. Matches starting in the overlap are left to the next
+    window, and line numbers are counted incrementally across windows.
+    With line_scoped, each regex reports at most one match per line and
+    never matches across a newline.
+    """
+    window_line = 1
+    consumed = [0] * len(regexes)  # absolute end of the last match kept per regex
+    
+    for offset, data, is_last in iter_windows(filepath, size, overlap):
+        limit = len(data) if is_last else CHUNK_SIZE
+        hits = []
+        
+        if line_scoped:
+            # The previous window owns the line that straddles our start
+            begin = data.find(b'\n', 0, limit) + 1 if offset else 0
+            if offset and not begin:
+                begin = limit
+            for index, regex in enumerate(regexes):
+                hits.extend((start, index, end) for start, end in iter_line_hits(regex, data, begin, limit))
+            regexes_to_scan = ()
+        else:
+            regexes_to_scan = regexes
+        
+        for index, regex in enumerate(regexes_to_scan):
+            for match in regex.finditer(data):
+                start = match.start()
+                if start >= limit:
+                    break
+                if offset + start < consumed[index]:
+                    continue
+                consumed[index] = offset + match.end()
+                hits.append((start, index, match.end()))
+        
+        hits.sort()
+        cursor, line = 0, window_line
+        for start, index, end in hits:
+            line += data.count(b'\n', cursor, start)
+            cursor = start
+            yield index, line, data, start, end
+        
+        window_line += data.count(b'\n', 0, limit)
+
+
+def line_snippet(data: bytes, position: int, length: int = 80) -> str:
+    """Return the stripped source line around position, truncated to length."""
+    start = data.rfind(b'\n', 0, position) + 1
+    end = data.find(b'\n', position)
+    if end == -1:
+        end = len(data)
+    line = data[start:min(end, start + length * 4)]
+    return line.decode('utf-8', errors='ignore').strip()[:length]
+
+
+def fingerprint(content: bytes) -> str:
+    """Short content hash identifying a finding independently of its line."""
+    return hashlib.sha256(content).hexdigest()[:FINGERPRINT_LENGTH]
+
+
+def file_digest(filepath: Path) -> str:
+    """sha256 of a file's content, read in CHUNK_SIZE blocks."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# ============================================================================
+#  ENTROPY SCORING
+# ============================================================================
+
+def score_tokens(tokens: List[bytes]) -> Tuple[List[float], List[int]]:
+    """
+    Shannon entropy (bits/char) and character-class bitmask for a batch of
+    tokens. With NumPy a large batch is scored in a handful of array ops.
+    """
+    if not tokens:
+        return [], []
+    
+    if NUMPY_AVAILABLE and len(tokens) >= NUMPY_MIN_BATCH:
+        lengths = np.fromiter((len(t) for t in tokens), dtype=np.int64, count=len(tokens))
+        flat = np.frombuffer(b''.join(tokens), dtype=np.uint8)
+        owner = np.repeat(np.arange(len(tokens)), lengths)
+        
+        # Histogram of (token, byte) pairs -> per-token probabilities
+        pairs, counts = np.unique(owner * 256 + flat, return_counts=True)
+        pair_owner = pairs // 256
+        probabilities = counts / lengths[pair_owner]
+        entropy = -np.bincount(pair_owner, weights=probabilities * np.log2(probabilities),
+                               minlength=len(tokens))
+        
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        classes = np.bitwise_or.reduceat(np.asarray(CLASS_TABLE, dtype=np.uint8)[flat], starts)
+        return entropy.tolist(), classes.tolist()
+    
+    entropies, classes = [], []
+    for token in tokens:
+        length = len(token)
+        entropy = 0.0
+        mask = 0
+        for byte in set(token):
+            p = token.count(byte) / length
+            entropy -= p * math.log2(p)
+            mask |= CLASS_TABLE[byte]
+        entropies.append(entropy)
+        classes.append(mask)
+    return entropies, classes
+
+
+def is_allowlisted_token(token: bytes, data: bytes, start: int) -> bool:
+    """Skip hashes, integrity strings, UUIDs, URL paths and data URIs."""
+    for prefix in ENTROPY_SKIP_AFTER:
+        if data[max(0, start - len(prefix)):start] == prefix:
+            return True
+    return any(regex.search(token) for regex in ENTROPY_ALLOWLIST_REGEXES)
+
+
+def is_high_entropy(token: bytes, entropy: float, classes: int) -> bool:
+    """Random-looking: entropy near the maximum for its length and mixed classes."""
+    threshold = min(ENTROPY_THRESHOLD, math.log2(len(token)) * ENTROPY_LENGTH_FACTOR)
+    return (
+        entropy >= threshold
+        and CLASS_BITS[classes] >= ENTROPY_MIN_CLASSES
+        and bool(classes & CLASS_DIGIT)
+        and bool(classes & (CLASS_LOWER | CLASS_UPPER))
+    )
+
+
+# ============================================================================
+#  PER-FILE SCANNERS (run inside workers)
+# ============================================================================
+
+def scan_file_secrets(filepath: Path, project_path: str,
+                      max_file_size: int = DEFAULT_MAX_FILE_SIZE_MB * 1024 * 1024,
+                      entropy: bool = True) -> Dict[str, Any]:
+    """
+    Return secret findings (one per rule per distinct value) for a single file.
+    Entropy candidates ride along in the same streaming pass and are scored
+    in one batch at the end; tokens already inside a pattern match are skipped.
+    """
+    result = {"findings": [], "skipped": None}
+    counts, first_line = {}, {}
+    candidate_index = len(SECRET_REGEXES)
+    regexes = SECRET_REGEXES + [ENTROPY_CANDIDATE_REGEX] if entropy else SECRET_REGEXES
+    pattern_text_by_line = {}
+    candidates = []  # (token, line, keyed)
+    try:
+        size = filepath.stat().st_size
+        result["skipped"] = skip_reason(filepath, size, max_file_size)
+        if result["skipped"]:
+            return result
+        for index, line, data, start, end in iter_matches(filepath, size, regexes, SECRET_OVERLAP):
+            text = data[start:end]
+            if index == candidate_index:
+                if is_allowlisted_token(text, data, start):
+                    continue
+                if any(text in matched for matched in pattern_text_by_line.get(line, ())):
+                    continue
+                keyed = bool(SECRET_CONTEXT_REGEX.search(data, max(0, start - SECRET_CONTEXT_BYTES), start))
+                candidates.append((text, line, keyed))
+                continue
+            pattern_text_by_line.setdefault(line, []).append(text)
+            key = (index, fingerprint(text))
+            counts[key] = counts.get(key, 0) + 1
+            first_line.setdefault(key, line)
+    except OSError:
+        return result
+    
+    for index, value_fingerprint in sorted(counts, key=lambda key: (key[0], first_line[key])):
+        key = (index, value_fingerprint)
+        _, secret_type, severity = SECRET_PATTERNS[index]
+        result["findings"].append({
+            "file": str(filepath.relative_to(project_path)),
+            "type": secret_type,
+            "severity": severity,
+            "line": first_line[key],
+            "count": counts[key],
+            "fingerprint": value_fingerprint
+        })
+    
+    entropy_findings = {}
+    entropies, classes = score_tokens([token for token, _, _ in candidates])
+    for (token, line, keyed), token_entropy, token_classes in zip(candidates, entropies, classes):
+        if not is_high_entropy(token, token_entropy, token_classes):
+            continue
+        value_fingerprint = fingerprint(token)
+        if value_fingerprint in entropy_findings:
+            entropy_findings[value_fingerprint]["count"] += 1
+            continue
+        entropy_findings[value_fingerprint] = {
+            "file": str(filepath.relative_to(project_path)),
+            "type": "High-Entropy String",
+            # Assigned to a key/token/password-like name: treat as a real secret
+            "severity": "high" if keyed else "medium",
+            "line": line,
+            "count": 1,
+            "fingerprint": value_fingerprint,
+            "entropy": round(token_entropy, 2)
+        }
+    result["findings"].extend(entropy_findings.values())
+    
+    return result
+
+
+def scan_file_patterns(filepath: Path, project_path: str,
+                       max_file_size: int = DEFAULT_MAX_FILE_SIZE_MB * 1024 * 1024) -> Dict[str, Any]:
+    """Return dangerous pattern findings (one per pattern per line) for a single file."""
+    result = {"findings": [], "skipped": None}
+    snippets = {}
+    try:
+        size = filepath.stat().st_size
+        result["skipped"] = skip_reason(filepath, size, max_file_size)
+        if result["skipped"]:
+            return result
+        matches = iter_matches(filepath, size, DANGEROUS_REGEXES, DANGEROUS_OVERLAP, line_scoped=True)
+        for index, line, data, start, _ in matches:
+            if (line, index) not in snippets:
+                snippets[(line, index)] = line_snippet(data, start, length=MAX_OVERLAP)
+    except OSError:
+        return result
+    
+    for line, index in sorted(snippets):
+        _, name, severity, category = DANGEROUS_PATTERNS[index]
+        result["findings"].append({
+            "file": str(filepath.relative_to(project_path)),
+            "line": line,
+            "pattern": name,
+            "severity": severity,
+            "category": category,
+            "snippet": snippets[(line, index)][:80],
+            "fingerprint": fingerprint(snippets[(line, index)].encode())
+        })
+    
+    return result
+
+
+def dotted_name(node: ast.AST) -> str:
+    """Return 'a.b.c' for Name/Attribute chains, '' for anything else."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return ""
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def string_parts(node: ast.AST) -> Iterator[str]:
+    """Yield the literal text of a string constant or f-string."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        yield node.value
+    elif isinstance(node, ast.JoinedStr):
+        for value in node.values:
+            yield from string_parts(value)
+
+
+def is_sql_text(node: ast.AST) -> bool:
+    return any(SQL_KEYWORD_REGEX.search(part) for part in string_parts(node))
+
+
+def find_python_dangers(source: str) -> List[Tuple[int, str]]:
+    """
+    Return (line, pattern name) for dangerous calls in Python source,
+    matched on AST nodes. Raises SyntaxError for unparsable files.
+    """
+    hits = []
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Call):
+            name = dotted_name(node.func)
+            keywords = {kw.arg: kw.value for kw in node.keywords if kw.arg}
+            if name in ("eval", "exec"):
+                hits.append((node.lineno, f"{name}() usage"))
+            elif name.split(".")[0] in PY_SHELL_MODULES and getattr(keywords.get("shell"), "value", None) is True:
+                hits.append((node.lineno, "subprocess with shell=True"))
+            elif name in PY_PICKLE_CALLS:
+                hits.append((node.lineno, "pickle usage"))
+            elif name == "yaml.load":
+                loader = keywords.get("Loader", node.args[1] if len(node.args) > 1 else None)
+                if loader is None or not dotted_name(loader).endswith("SafeLoader"):
+                    hits.append((node.lineno, "Unsafe YAML load"))
+            elif isinstance(node.func, ast.Attribute) and node.func.attr == "format" and is_sql_text(node.func.value):
+                hits.append((node.lineno, "SQL String Concat"))
+            if getattr(keywords.get("verify"), "value", True) is False:
+                hits.append((node.lineno, "SSL Verify Disabled"))
+        elif isinstance(node, ast.JoinedStr):
+            if any(isinstance(v, ast.FormattedValue) for v in node.values) and is_sql_text(node):
+                hits.append((node.lineno, "SQL f-string"))
+        elif isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Mod)):
+            operands = (node.left, node.right)
+            if any(is_sql_text(o) for o in operands) and not all(isinstance(o, ast.Constant) for o in operands):
+                hits.append((node.lineno, "SQL String Concat"))
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str) and "--insecure" in node.value:
+            hits.append((node.lineno, "Insecure flag"))
+        elif isinstance(node, (ast.Name, ast.Attribute, ast.keyword, ast.arg, ast.FunctionDef)):
+            ident = getattr(node, "id", None) or getattr(node, "attr", None) or getattr(node, "arg", None) or getattr(node, "name", None)
+            if ident and SSL_DISABLED_REGEX.search(ident) and getattr(node, "lineno", None):
+                hits.append((node.lineno, "SSL Disabled"))
+    return hits
+
+
+def find_js_dangers(tokens: List[Tuple[str, str, int]]) -> List[Tuple[int, str]]:
+    """
+    Return (line, pattern name) for dangerous calls in a JS/TS token stream.
+    Comments are ignored and strings only count where they are built from
+    variables, so method names like regex.exec() or text like "eval(" do not match.
+    """
+    hits = []
+    code = code_tokens(tokens)
+    count = len(code)
+    for i, (kind, text, line) in enumerate(code):
+        prev = code[i - 1][1] if i else ""
+        nxt = code[i + 1][1] if i + 1 < count else ""
+        if kind == "ident":
+            if text in ("eval", "exec") and nxt == "(" and prev not in (".", "?.", "function"):
+                hits.append((line, f"{text}() usage"))
+            elif text == "exec" and nxt == "(" and prev == "." and i > 1 and code[i - 2][1] == "child_process":
+                hits.append((line, "child_process.exec"))
+            elif text == "Function" and nxt == "(" and prev not in (".", "?."):
+                hits.append((line, "Function constructor"))
+            elif text == "dangerouslySetInnerHTML":
+                hits.append((line, "dangerouslySetInnerHTML"))
+            elif text == "innerHTML" and prev in (".", "?.") and nxt in ("=", "+="):
+                hits.append((line, "innerHTML assignment"))
+            elif text in ("write", "writeln") and nxt == "(" and prev == "." and i > 1 and code[i - 2][1] == "document":
+                hits.append((line, "document.write"))
+            elif text == "rejectUnauthorized" and nxt in (":", "=") and i + 2 < count and code[i + 2][1] == "false":
+                hits.append((line, "SSL Verify Disabled"))
+            elif SSL_DISABLED_REGEX.search(text):
+                hits.append((line, "SSL Disabled"))
+        elif kind in ("string", "template"):
+            if "--insecure" in text:
+                hits.append((line, "Insecure flag"))
+            if not SQL_KEYWORD_REGEX.search(text):
+                continue
+            if kind == "template":
+                if "${" in text and prev not in SQL_TAG_NAMES:
+                    hits.append((line, "SQL String Concat"))
+            elif "+" in (prev, nxt) or (nxt == "." and i + 2 < count and code[i + 2][1] in ("concat", "replace")):
+                hits.append((line, "SQL String Concat"))
+    return hits
+
+
+def scan_file_patterns_ast(filepath: Path, project_path: str,
+                           max_file_size: int = DEFAULT_MAX_FILE_SIZE_MB * 1024 * 1024,
+                           token_cache: Optional[str] = None) -> Dict[str, Any]:
+    """
+    AST-aware variant of scan_file_patterns for Python and JS/TS files.
+    Other languages, and Python files that do not parse, use the regex scan.
+    """
+    language = language_for(filepath)
+    if language is None:
+        return scan_file_patterns(filepath, project_path, max_file_size)
+    
+    result = {"findings": [], "skipped": None}
+    try:
+        size = filepath.stat().st_size
+        result["skipped"] = skip_reason(filepath, size, max_file_size)
+        if result["skipped"]:
+            return result
+        with open(filepath, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return result
+    
+    if not AST_TRIGGER_REGEXES[language].search(data):
+        return result
+    
+    source = data.decode('utf-8', errors='replace')
+    if language == "python":
+        try:
+            hits = find_python_dangers(source)
+        except (SyntaxError, ValueError):
+            return scan_file_patterns(filepath, project_path, max_file_size)
+    else:
+        digest = hashlib.sha256(data).hexdigest()
+        hits = find_js_dangers(tokenize_source(source, language, digest, token_cache))
+    
+    lines = source.split('\n')
+    for line, name in sorted(set(hits), key=lambda hit: (hit[0], DANGEROUS_RULES[hit[1]][0])):
+        _, severity, category = DANGEROUS_RULES[name]
+        text = lines[line - 1].strip()[:MAX_OVERLAP] if line <= len(lines) else ""
+        result["findings"].append({
+            "file": str(filepath.relative_to(project_path)),
+            "line": line,
+            "pattern": name,
+            "severity": severity,
+            "category": category,
+            "snippet": text[:80],
+            "fingerprint": fingerprint(text.encode())
+        })
+    
+    return result
+
+
+def scan_file_config(filepath: Path, project_path: str,
+                     max_file_size: int = DEFAULT_MAX_FILE_SIZE_MB * 1024 * 1024) -> Dict[str, Any]:
+    """Return configuration findings for a single file."""
+    result = {"findings": [], "skipped": None}
+    found = {}
+    try:
+        size = filepath.stat().st_size
+        result["skipped"] = skip_reason(filepath, size, max_file_size)
+        if result["skipped"]:
+            return result
+        for index, _, data, start, end in iter_matches(filepath, size, CONFIG_ISSUE_REGEXES, CONFIG_ISSUE_OVERLAP):
+            found.setdefault(index, fingerprint(data[start:end]))
+            if len(found) == len(CONFIG_ISSUE_REGEXES):
+                break
+    except OSError:
+        return result
+    
+    for index in sorted(found):
+        _, issue, severity = CONFIG_ISSUE_PATTERNS[index]
+        result["findings"].append({
+            "file": str(filepath.relative_to(project_path)),
+            "issue": issue,
+            "severity": severity,
+            "fingerprint": found[index]
+        })
+    
+    return result
+
+
+def scan_file_cached(file_scanner: Callable, max_file_size: int, known_clean: Dict[str, List],
+                     filepath: Path, project_path: str) -> Dict[str, Any]:
+    """
+    Run file_scanner unless the file is unchanged since a clean scan.
+    known_clean maps relative paths to [size, mtime_ns, sha256]; a matching
+    size and mtime avoids hashing, otherwise the content hash decides.
+    """
+    rel_path = str(filepath.relative_to(project_path))
+    try:
+        stat = filepath.stat()
+        cached = known_clean.get(rel_path)
+        if cached and cached[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return {"findings": [], "skipped": "unchanged", "state": cached}
+        digest = file_digest(filepath)
+    except OSError:
+        return {"findings": [], "skipped": None, "state": None}
+    
+    state = [stat.st_size, stat.st_mtime_ns, digest]
+    if cached and cached[2] == digest:
+        return {"findings": [], "skipped": "unchanged", "state": state}
+    
+    result = file_scanner(filepath, project_path, max_file_size=max_file_size)
+    result["state"] = state
+    return result
+
+
+def count_skipped(file_results: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Tally skipped files by reason."""
+    skipped = {"too_large": 0, "binary": 0, "unchanged": 0}
+    for file_result in file_results:
+        if file_result["skipped"]:
+            skipped[file_result["skipped"]] += 1
+    return skipped
+
+
+# ============================================================================
+#  BASELINE & CACHE
+# ============================================================================
+
+def common_finding(scan_name: str, rule_field: str, finding: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a scanner finding into the shared findings schema."""
+    rule = finding.get(rule_field) or finding.get("type") or finding.get("issue") or "finding"
+    message = finding.get("message") or finding.get("issue") or rule
+    if finding.get("category"):
+        message = f"{rule} ({finding['category']})"
+    elif finding.get("count", 1) > 1:
+        message = f"{message} ({finding['count']} occurrences)"
+    extra = {key: finding[key] for key in ("snippet", "count", "entropy", "recommendation") if key in finding}
+    return make_finding("security_scan", f"{scan_name}/{slug(rule)}", finding.get("severity", "low"), message,
+                        file=finding.get("file"), line=finding.get("line"), category=finding.get("category"),
+                        fingerprint=finding.get("fingerprint"), **extra)
+
+
+def baseline_key(scan_name: str, rule_field: str, finding: Dict[str, Any]) -> Tuple[str, str, str]:
+    """Identify a finding by (rule, file, content fingerprint)."""
+    return (f"{scan_name}:{finding.get(rule_field)}", finding.get("file", ""), finding.get("fingerprint", ""))
+
+
+def load_baseline(baseline_path: Optional[str]) -> Set[Tuple[str, str, str]]:
+    """Load accepted findings; a missing baseline file means nothing is accepted."""
+    if not baseline_path or not os.path.exists(baseline_path):
+        return set()
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {(entry["rule"], entry["file"], entry["fingerprint"]) for entry in data.get("findings", [])}
+
+
+def save_baseline(baseline_path: str, baseline: Set[Tuple[str, str, str]]):
+    """Write accepted findings in a stable, diff-friendly order."""
+    data = {
+        "version": BASELINE_VERSION,
+        "findings": [
+            {"rule": rule, "file": file, "fingerprint": value}
+            for rule, file, value in sorted(baseline)
+        ]
+    }
+    with open(baseline_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def baseline_digest(baseline: Set[Tuple[str, str, str]]) -> str:
+    """Hash of the baseline; cached verdicts are only valid for the same one."""
+    return hashlib.sha256(json.dumps(sorted(baseline)).encode()).hexdigest()
+
+
+def load_cache(cache_path: Optional[str], baseline: Set[Tuple[str, str, str]],
+               rules: str) -> Optional[Dict[str, Any]]:
+    """
+    Load the per-file scan cache. It is discarded when the rules or the
+    baseline changed, since either can turn a clean file into a finding.
+    """
+    if not cache_path:
+        return None
+    
+    fresh = {
+        "version": CACHE_VERSION,
+        "rules": rules,
+        "baseline": baseline_digest(baseline),
+        "files": {}
+    }
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return fresh
+    
+    if any(cache.get(key) != fresh[key] for key in ("version", "rules", "baseline")):
+        return fresh
+    return cache
+
+
+def save_cache(cache_path: str, cache: Dict[str, Any]):
+    """Persist the per-file scan cache."""
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+
+
+def run_file_scan(scan_name: str, rule_field: str, file_scanner: Callable, files: List[Path],
+                  project_path: str, jobs: int, max_file_size: int,
+                  baseline: Optional[Set[Tuple[str, str, str]]],
+                  cache: Optional[Dict[str, Any]],
+                  accept_new: bool = False, writer=None) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Scan files, drop baselined findings and refresh the cache entries.
+    With accept_new, new findings are still reported but also added to
+    baseline (in place) so the caller can save it. With a writer, each
+    file's findings are streamed as soon as that file is done.
+    Returns (file_results, baselined_count).
+    """
+    if baseline is None:
+        baseline = set()
+    if cache is None:
+        worker = partial(file_scanner, max_file_size=max_file_size)
+    else:
+        known_clean = cache["files"].setdefault(scan_name, {})
+        worker = partial(scan_file_cached, file_scanner, max_file_size, known_clean)
+    
+    file_results = []
+    baselined = 0
+    for filepath, file_result in zip(files, iter_scan_files(worker, files, project_path, jobs)):
+        file_results.append(file_result)
+        kept = [f for f in file_result["findings"] if baseline_key(scan_name, rule_field, f) not in baseline]
+        baselined += len(file_result["findings"]) - len(kept)
+        file_result["findings"] = kept
+        if writer:
+            writer.write_all(common_finding(scan_name, rule_field, f) for f in kept)
+        if accept_new:
+            baseline.update(baseline_key(scan_name, rule_field, f) for f in kept)
+        
+        if cache is not None:
+            rel_path = str(filepath.relative_to(project_path))
+            clean = file_result["skipped"] in (None, "unchanged") and (accept_new or not kept)
+            if clean and file_result.get("state"):
+                known_clean[rel_path] = file_result["state"]
+            else:
+                known_clean.pop(rel_path, None)
+    
+    return file_results, baselined
 
 
 # ============================================================================
 #  SCANNING FUNCTIONS
 # ============================================================================
 
-def scan_dependencies(project_path: str) -> Dict[str, Any]:
+def scan_dependencies(project_path: str, advisory_db: Optional[str] = None,
+                      offline: bool = False, writer=None) -> Dict[str, Any]:
     """
     Validate supply chain security (OWASP A03).
-    Checks: npm audit, lock file presence, dependency age.
+    Checks: npm audit (or an offline advisory snapshot), lock file presence, dependency age.
     """
     results = {"tool": "dependency_scanner", "findings": [], "status": "[OK] Secure"}
     
@@ -128,8 +976,40 @@ def scan_dependencies(project_path: str) -> Dict[str, Any]:
                     "message": f"{manager}: No lock file found. Supply chain integrity at risk."
                 })
     
+    # Offline advisory snapshot when available (no network, deterministic)
+    use_snapshot = find_lockfile(project_path) and (
+        offline or resolve_db_path(project_path, advisory_db).exists()
+    )
+    if use_snapshot:
+        audit = audit_lockfile(project_path, advisory_db)
+        if "error" in audit:
+            results["findings"].append({
+                "type": "offline audit",
+                "severity": "medium",
+                "message": audit["error"]
+            })
+        else:
+            severity_count = audit["by_severity"]
+            if severity_count["critical"] > 0:
+                results["status"] = "[!!] Critical vulnerabilities"
+                results["findings"].append({
+                    "type": "offline audit",
+                    "severity": "critical",
+                    "message": f"{severity_count['critical']} critical vulnerabilities in dependencies"
+                })
+            elif severity_count["high"] > 0:
+                results["status"] = "[!] High vulnerabilities"
+                results["findings"].append({
+                    "type": "offline audit",
+                    "severity": "high",
+                    "message": f"{severity_count['high']} high severity vulnerabilities"
+                })
+            results["offline_audit"] = severity_count
+            results["advisory_snapshot"] = audit["snapshot"]
+            results["vulnerable_packages"] = audit["vulnerable"][:15]
+    
     # Run npm audit if applicable
-    if (Path(project_path) / "package.json").exists():
+    elif (Path(project_path) / "package.json").exists() and not offline:
         try:
             result = subprocess.run(
                 ["npm", "audit", "--json"],
@@ -174,14 +1054,21 @@ def scan_dependencies(project_path: str) -> Dict[str, Any]:
     
     if not results["findings"]:
         results["status"] = "[OK] Supply chain checks passed"
+    elif writer:
+        writer.write_all(common_finding("dependencies", "type", f) for f in results["findings"])
     
     return results
 
 
-def scan_secrets(project_path: str) -> Dict[str, Any]:
+def scan_secrets(project_path: str, jobs: int = 1,
+                 max_file_size: int = DEFAULT_MAX_FILE_SIZE_MB * 1024 * 1024,
+                 baseline: Optional[Set[Tuple[str, str, str]]] = None,
+                 cache: Optional[Dict[str, Any]] = None,
+                 accept_new: bool = False,
+                 entropy: bool = True, writer=None) -> Dict[str, Any]:
     """
     Validate no hardcoded secrets (OWASP A04).
-    Checks: API keys, tokens, passwords, cloud credentials.
+    Checks: API keys, tokens, passwords, cloud credentials, high-entropy strings.
     """
     results = {
         "tool": "secret_scanner",
@@ -191,34 +1078,18 @@ def scan_secrets(project_path: str) -> Dict[str, Any]:
         "by_severity": {"critical": 0, "high": 0, "medium": 0}
     }
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS and ext not in CONFIG_EXTENSIONS:
-                continue
-                
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, secret_type, severity in SECRET_PATTERNS:
-                        matches = re.findall(pattern, content, re.IGNORECASE)
-                        if matches:
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "type": secret_type,
-                                "severity": severity,
-                                "count": len(matches)
-                            })
-                            results["by_severity"][severity] += len(matches)
-                            
-            except Exception:
-                pass
+    files = collect_files(project_path, CODE_EXTENSIONS | CONFIG_EXTENSIONS)
+    file_results, results["baselined"] = run_file_scan(
+        "secrets", "type", partial(scan_file_secrets, entropy=entropy), files, project_path,
+        jobs, max_file_size, baseline, cache, accept_new, writer
+    )
+    results["skipped_files"] = count_skipped(file_results)
+    results["scanned_files"] = len(files) - sum(results["skipped_files"].values())
+    
+    for file_result in file_results:
+        for finding in file_result["findings"]:
+            results["findings"].append(finding)
+            results["by_severity"][finding["severity"]] += finding["count"]
     
     if results["by_severity"]["critical"] > 0:
         results["status"] = "[!!] CRITICAL: Secrets exposed!"
@@ -233,10 +1104,17 @@ def scan_secrets(project_path: str) -> Dict[str, Any]:
     return results
 
 
-def scan_code_patterns(project_path: str) -> Dict[str, Any]:
+def scan_code_patterns(project_path: str, jobs: int = 1,
+                       max_file_size: int = DEFAULT_MAX_FILE_SIZE_MB * 1024 * 1024,
+                       baseline: Optional[Set[Tuple[str, str, str]]] = None,
+                       cache: Optional[Dict[str, Any]] = None,
+                       accept_new: bool = False, pattern_mode: str = "regex",
+                       token_cache: Optional[str] = None, writer=None) -> Dict[str, Any]:
     """
     Validate dangerous code patterns (OWASP A05).
     Checks: Injection risks, XSS, unsafe deserialization.
+    In "ast" mode Python/JS/TS rules match real calls only; token streams
+    are cached under token_cache when given.
     """
     results = {
         "tool": "pattern_scanner",
@@ -246,36 +1124,25 @@ def scan_code_patterns(project_path: str) -> Dict[str, Any]:
         "by_category": {}
     }
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS:
-                continue
-                
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    
-                    for line_num, line in enumerate(lines, 1):
-                        for pattern, name, severity, category in DANGEROUS_PATTERNS:
-                            if re.search(pattern, line, re.IGNORECASE):
-                                results["findings"].append({
-                                    "file": str(filepath.relative_to(project_path)),
-                                    "line": line_num,
-                                    "pattern": name,
-                                    "severity": severity,
-                                    "category": category,
-                                    "snippet": line.strip()[:80]
-                                })
-                                results["by_category"][category] = results["by_category"].get(category, 0) + 1
-                                
-            except Exception:
-                pass
+    if pattern_mode == "ast":
+        file_scanner = partial(scan_file_patterns_ast, token_cache=token_cache)
+        results["pattern_mode"] = "ast"
+    else:
+        file_scanner = scan_file_patterns
+    
+    files = collect_files(project_path, CODE_EXTENSIONS)
+    file_results, results["baselined"] = run_file_scan(
+        "code_patterns", "pattern", file_scanner, files, project_path,
+        jobs, max_file_size, baseline, cache, accept_new, writer
+    )
+    results["skipped_files"] = count_skipped(file_results)
+    results["scanned_files"] = len(files) - sum(results["skipped_files"].values())
+    
+    for file_result in file_results:
+        for finding in file_result["findings"]:
+            results["findings"].append(finding)
+            category = finding["category"]
+            results["by_category"][category] = results["by_category"].get(category, 0) + 1
     
     critical_count = sum(1 for f in results["findings"] if f["severity"] == "critical")
     high_count = sum(1 for f in results["findings"] if f["severity"] == "high")
@@ -293,7 +1160,11 @@ def scan_code_patterns(project_path: str) -> Dict[str, Any]:
     return results
 
 
-def scan_configuration(project_path: str) -> Dict[str, Any]:
+def scan_configuration(project_path: str, jobs: int = 1,
+                       max_file_size: int = DEFAULT_MAX_FILE_SIZE_MB * 1024 * 1024,
+                       baseline: Optional[Set[Tuple[str, str, str]]] = None,
+                       cache: Optional[Dict[str, Any]] = None,
+                       accept_new: bool = False, writer=None) -> Dict[str, Any]:
     """
     Validate security configuration (OWASP A02).
     Checks: Security headers, CORS, debug modes.
@@ -306,39 +1177,13 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
     }
     
     # Check common config files for issues
-    config_issues = [
-        (r'"DEBUG"\s*:\s*true', "Debug mode enabled", "high"),
-        (r'debug\s*=\s*True', "Debug mode enabled", "high"),
-        (r'NODE_ENV.*development', "Development mode in config", "medium"),
-        (r'"CORS_ALLOW_ALL".*true', "CORS allow all origins", "high"),
-        (r'"Access-Control-Allow-Origin".*\*', "CORS wildcard", "high"),
-        (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
-    ]
-    
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CONFIG_EXTENSIONS and file not in ['next.config.js', 'webpack.config.js', '.eslintrc.js']:
-                continue
-                
-            filepath = Path(root) / file
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, issue, severity in config_issues:
-                        if re.search(pattern, content, re.IGNORECASE):
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "issue": issue,
-                                "severity": severity
-                            })
-                            
-            except Exception:
-                pass
+    files = collect_files(project_path, CONFIG_EXTENSIONS, CONFIG_FILENAMES)
+    file_results, results["baselined"] = run_file_scan(
+        "configuration", "issue", scan_file_config, files, project_path,
+        jobs, max_file_size, baseline, cache, accept_new, writer
+    )
+    for file_result in file_results:
+        results["findings"].extend(file_result["findings"])
     
     # Check for security header configurations
     header_files = ["next.config.js", "next.config.mjs", "middleware.ts", "nginx.conf"]
@@ -354,6 +1199,8 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
             "severity": "medium",
             "recommendation": "Configure CSP, HSTS, X-Frame-Options headers"
         })
+        if writer:
+            writer.write(common_finding("configuration", "issue", results["findings"][-1]))
     
     if any(f["severity"] == "critical" for f in results["findings"]):
         results["status"] = "[!!] CRITICAL: Configuration issues"
@@ -369,27 +1216,50 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
 #  MAIN
 # ============================================================================
 
-def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
-    """Execute security validation scans."""
+def run_full_scan(project_path: str, scan_type: str = "all", jobs: int = 1,
+                  max_file_size_mb: float = DEFAULT_MAX_FILE_SIZE_MB,
+                  baseline_path: Optional[str] = None, cache_path: Optional[str] = None,
+                  update_baseline: bool = False, advisory_db: Optional[str] = None,
+                  offline: bool = False, entropy: bool = True, pattern_mode: str = "regex",
+                  token_cache: Optional[str] = None, writer=None) -> Dict[str, Any]:
+    """
+    Execute security validation scans. With a writer (see findings.py),
+    every finding is also streamed as soon as it is known.
+    """
+    
+    baseline = load_baseline(baseline_path)
+    cache = load_cache(cache_path, baseline, rules_digest(entropy, pattern_mode))
     
     report = {
         "project": project_path,
         "timestamp": datetime.now().isoformat(),
         "scan_type": scan_type,
+        "jobs": resolve_jobs(jobs),
         "scans": {},
         "summary": {
             "total_findings": 0,
             "critical": 0,
             "high": 0,
+            "baselined": 0,
             "overall_status": "[OK] SECURE"
         }
     }
     
+    file_options = {
+        "jobs": jobs,
+        "max_file_size": int(max_file_size_mb * 1024 * 1024),
+        "baseline": baseline,
+        "cache": cache,
+        "accept_new": update_baseline,
+        "writer": writer,
+    }
     scanners = {
-        "deps": ("dependencies", scan_dependencies),
-        "secrets": ("secrets", scan_secrets),
-        "patterns": ("code_patterns", scan_code_patterns),
-        "config": ("configuration", scan_configuration),
+        "deps": ("dependencies", partial(scan_dependencies, advisory_db=advisory_db, offline=offline,
+                                         writer=writer)),
+        "secrets": ("secrets", partial(scan_secrets, entropy=entropy, **file_options)),
+        "patterns": ("code_patterns", partial(scan_code_patterns, pattern_mode=pattern_mode,
+                                              token_cache=token_cache, **file_options)),
+        "config": ("configuration", partial(scan_configuration, **file_options)),
     }
     
     for key, (name, scanner) in scanners.items():
@@ -399,6 +1269,7 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
             
             findings_count = len(result.get("findings", []))
             report["summary"]["total_findings"] += findings_count
+            report["summary"]["baselined"] += result.get("baselined", 0)
             
             for finding in result.get("findings", []):
                 sev = finding.get("severity", "low")
@@ -415,6 +1286,14 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
     elif report["summary"]["total_findings"] > 0:
         report["summary"]["overall_status"] = "[?] REVIEW RECOMMENDED"
     
+    if update_baseline and baseline_path:
+        save_baseline(baseline_path, baseline)
+        report["baseline_updated"] = {"path": baseline_path, "entries": len(baseline)}
+        if cache is not None:
+            cache["baseline"] = baseline_digest(baseline)
+    if cache is not None:
+        save_cache(cache_path, cache)
+    
     return report
 
 
@@ -427,16 +1306,47 @@ def main():
                         default="all", help="Type of scan to run")
     parser.add_argument("--output", choices=["json", "summary"], default="json",
                         help="Output format")
+    add_format_argument(parser)
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Worker processes for file scans (0 = all cores)")
+    parser.add_argument("--max-file-size", type=float, default=DEFAULT_MAX_FILE_SIZE_MB,
+                        help="Skip files larger than this many MB")
+    parser.add_argument("--baseline", help="JSON file of accepted findings to suppress")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Accept all current findings into the --baseline file")
+    parser.add_argument("--cache", help="JSON file of per-file hashes; unchanged clean files are skipped")
+    parser.add_argument("--advisory-db", help="Offline advisory snapshot (default: <project>/.security/npm-advisories.json)")
+    parser.add_argument("--offline", action="store_true", help="Never run npm audit; use the advisory snapshot only")
+    parser.add_argument("--no-entropy", action="store_true", help="Disable entropy-based secret detection")
+    parser.add_argument("--pattern-mode", choices=PATTERN_MODES, default="regex",
+                        help="Dangerous-pattern matching: regex (all languages) or ast (Python/JS/TS call nodes)")
+    parser.add_argument("--token-cache", nargs="?", const="", default=None,
+                        help="Cache token streams per file hash (default dir: <project>/.agent-cache/tokens)")
     
     args = parser.parse_args()
     
+    if args.update_baseline and not args.baseline:
+        parser.error("--update-baseline requires --baseline")
+    
     if not os.path.isdir(args.project_path):
         print(json.dumps({"error": f"Directory not found: {args.project_path}"}))
         sys.exit(1)
     
-    result = run_full_scan(args.project_path, args.scan_type)
+    token_cache = args.token_cache
+    if token_cache == "":
+        token_cache = str(default_cache_dir(args.project_path))
+    
+    writer = open_writer("security_scan", args.format)
+    result = run_full_scan(args.project_path, args.scan_type, args.jobs, args.max_file_size,
+                           args.baseline, args.cache, args.update_baseline,
+                           args.advisory_db, args.offline, not args.no_entropy, args.pattern_mode,
+                           token_cache, writer)
     
-    if args.output == "summary":
+    if writer:
+        writer.close(passed=result["summary"]["critical"] == 0,
+                     overall_status=result["summary"]["overall_status"],
+                     baselined=result["summary"]["baselined"])
+    elif args.output == "summary":
         print(f"\n{'='*60}")
         print(f"Security Scan: {result['project']}")
         print(f"{'='*60}")
@@ -444,6 +1354,7 @@ def main():
         print(f"Total Findings: {result['summary']['total_findings']}")
         print(f"  Critical: {result['summary']['critical']}")
         print(f"  High: {result['summary']['high']}")
+        print(f"Baselined (suppressed): {result['summary']['baselined']}")
         print(f"{'='*60}\n")
         
         for scan_name, scan_result in result['scans'].items():
@@ -4,15 +4,28 @@ Skill: webapp-testing
 Script: playwright_runner.py
 Purpose: Run basic Playwright browser tests
 Usage: python playwright_runner.py <url> [--screenshot]
+       python playwright_runner.py <url> [<url> ...] [--path /route ...] [--routes FILE]
+                                   [--contexts N] [--storage-state FILE] [--a11y] [--screenshot]
 Output: JSON with page info, health status, and optional screenshot path
 Note: Requires playwright (pip install playwright && playwright install chromium)
 Screenshots: Saved to system temp directory (auto-cleaned by OS)
+
+Multi-URL mode (more than one route): one browser launch, a pool of N
+browser contexts draining an async queue of routes. Each page reports
+navigation timing, element counts, console errors and a summary of its
+accessibility tree (--a11y includes the full snapshot). Contexts are reused
+across routes, so a --storage-state login applies to every route.
 """
 import sys
 import json
 import os
+import re
+import time
+import asyncio
+import argparse
 import tempfile
 from datetime import datetime
+from urllib.parse import urljoin
 
 # Fix Windows console encoding for Unicode output
 try:
@@ -23,11 +36,48 @@ except AttributeError:
 
 try:
     from playwright.sync_api import sync_playwright
+    from playwright.async_api import async_playwright
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
 
 
+DEFAULT_CONTEXTS = 4
+NAVIGATION_TIMEOUT = 30000
+CONTEXT_OPTIONS = {
+    "viewport": {"width": 1280, "height": 720},
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+}
+# Roles that must have an accessible name
+NAMED_ROLES = {"button", "link", "textbox", "checkbox", "radio", "combobox", "img", "switch",
+               "tab", "menuitem", "searchbox", "slider", "spinbutton"}
+
+# Timing, element counts and a11y counts of a loaded page in one round trip
+PAGE_METRICS_JS = """() => {
+    const count = (selector) => document.querySelectorAll(selector).length;
+    const nav = performance.getEntriesByType("navigation")[0];
+    const t = performance.timing;
+    return {
+        performance: nav ? {
+            ttfb: Math.round(nav.responseStart),
+            dom_content_loaded: Math.round(nav.domContentLoadedEventEnd),
+            load_complete: Math.round(nav.loadEventEnd),
+            transfer_size: nav.transferSize
+        } : {
+            dom_content_loaded: t.domContentLoadedEventEnd - t.navigationStart,
+            load_complete: t.loadEventEnd - t.navigationStart
+        },
+        elements: {links: count("a"), buttons: count("button"), inputs: count("input"),
+                   images: count("img"), forms: count("form")},
+        headings: {h1: count("h1"), h2: count("h2"), h3: count("h3")},
+        images_with_alt: count("img[alt]"),
+        images_without_alt: count("img:not([alt])"),
+        form_labels: count("label")
+    };
+}"""
+ARIA_SNAPSHOT_LINE = re.compile(r'^\s*- (\w+)(?: "((?:[^"\\]|\\.)*)")?')
+
+
 def run_basic_test(url: str, take_screenshot: bool = False) -> dict:
     """Run basic browser test on URL."""
     if not PLAYWRIGHT_AVAILABLE:
@@ -149,6 +199,171 @@ def run_accessibility_check(url: str) -> dict:
     return result
 
 
+# ============ MULTI-URL POOL ============
+def summarize_ax_tree(tree) -> dict:
+    """Node count, role histogram and unnamed interactive nodes of an accessibility snapshot."""
+    roles, unnamed = {}, {}
+    stack = [tree] if tree else []
+    while stack:
+        node = stack.pop()
+        role = node.get("role", "")
+        roles[role] = roles.get(role, 0) + 1
+        if role in NAMED_ROLES and not (node.get("name") or "").strip():
+            unnamed[role] = unnamed.get(role, 0) + 1
+        stack.extend(node.get("children") or [])
+    return {"nodes": sum(roles.values()), "roles": dict(sorted(roles.items())), "unnamed": unnamed}
+
+
+def summarize_aria_snapshot(snapshot: str) -> dict:
+    """Same summary from the YAML aria snapshot of newer Playwright versions."""
+    roles, unnamed = {}, {}
+    for line in snapshot.splitlines():
+        m = ARIA_SNAPSHOT_LINE.match(line)
+        if not m:
+            continue
+        role = m.group(1)
+        roles[role] = roles.get(role, 0) + 1
+        if role in NAMED_ROLES and not (m.group(2) or "").strip():
+            unnamed[role] = unnamed.get(role, 0) + 1
+    return {"nodes": sum(roles.values()), "roles": dict(sorted(roles.items())), "unnamed": unnamed}
+
+
+async def accessibility_snapshot(page) -> tuple:
+    """(summary, raw snapshot) of the page's accessibility tree."""
+    if hasattr(page, "accessibility"):
+        tree = await page.accessibility.snapshot()
+        return summarize_ax_tree(tree), tree
+    snapshot = await page.locator("body").aria_snapshot()
+    return summarize_aria_snapshot(snapshot), snapshot
+
+
+async def check_route(context, url: str, index: int, take_screenshot: bool, include_tree: bool) -> dict:
+    """Load one route in a fresh page of a reused context and collect its metrics."""
+    result = {"url": url, "status": "pending"}
+    page = await context.new_page()
+    console_errors = []
+    # Listen before navigating so errors thrown during load are kept
+    page.on("console", lambda msg: console_errors.append(msg.text) if msg.type == "error" else None)
+    page.on("pageerror", lambda exc: console_errors.append(str(exc)))
+    started = time.perf_counter()
+    try:
+        response = await page.goto(url, wait_until="networkidle", timeout=NAVIGATION_TIMEOUT)
+        title = await page.title()
+        metrics = await page.evaluate(PAGE_METRICS_JS)
+        summary, tree = await accessibility_snapshot(page)
+
+        result["page"] = {"title": title, "url": page.url, "status_code": response.status if response else None}
+        result["health"] = {
+            "loaded": response.ok if response else False,
+            "has_title": bool(title),
+            "has_h1": metrics["headings"]["h1"] > 0,
+            "has_links": metrics["elements"]["links"] > 0,
+            "has_images": metrics["elements"]["images"] > 0,
+        }
+        result["performance"] = metrics["performance"]
+        result["elements"] = metrics["elements"]
+        result["accessibility"] = {
+            "images_with_alt": metrics["images_with_alt"],
+            "images_without_alt": metrics["images_without_alt"],
+            "form_labels": metrics["form_labels"],
+            "headings": metrics["headings"],
+            "tree": summary,
+        }
+        if include_tree:
+            result["accessibility"]["snapshot"] = tree
+
+        if take_screenshot:
+            screenshot_dir = os.path.join(tempfile.gettempdir(), "maestro_screenshots")
+            os.makedirs(screenshot_dir, exist_ok=True)
+            screenshot_path = os.path.join(screenshot_dir, f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{index}.png")
+            await page.screenshot(path=screenshot_path, full_page=True)
+            result["screenshot"] = screenshot_path
+
+        result["status"] = "success" if result["health"]["loaded"] else "failed"
+    except Exception as e:  # navigation timeouts, closed targets, evaluation errors
+        result["status"] = "error"
+        result["error"] = str(e)
+    finally:
+        result["console_errors"] = console_errors
+        result["ms"] = round((time.perf_counter() - started) * 1000)
+        await page.close()
+    return result
+
+
+async def _run_pool(urls: list, contexts: int, take_screenshot: bool, include_tree: bool,
+                    storage_state: str = None) -> list:
+    queue: asyncio.Queue = asyncio.Queue()
+    for index, url in enumerate(urls):
+        queue.put_nowait((index, url))
+    results = [None] * len(urls)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            options = dict(CONTEXT_OPTIONS, storage_state=storage_state) if storage_state else CONTEXT_OPTIONS
+            pool = [await browser.new_context(**options) for _ in range(max(1, min(contexts, len(urls))))]
+
+            async def worker(context):
+                while not queue.empty():
+                    index, url = queue.get_nowait()
+                    results[index] = await check_route(context, url, index, take_screenshot, include_tree)
+
+            await asyncio.gather(*(worker(context) for context in pool))
+        finally:
+            await browser.close()
+    return results
+
+
+def run_pool(urls: list, contexts: int = DEFAULT_CONTEXTS, take_screenshot: bool = False,
+             include_tree: bool = False, storage_state: str = None) -> dict:
+    """Check many routes with one browser and a pool of reused contexts; results keep input order."""
+    if not PLAYWRIGHT_AVAILABLE:
+        return {
+            "error": "Playwright not installed",
+            "fix": "pip install playwright && playwright install chromium"
+        }
+
+    started = time.perf_counter()
+    try:
+        results = asyncio.run(_run_pool(urls, contexts, take_screenshot, include_tree, storage_state))
+    except Exception as e:  # browser failed to launch
+        return {"script": "playwright_runner", "status": "error", "error": str(e), "passed": False}
+    seconds = time.perf_counter() - started
+
+    failed = [r["url"] for r in results if r["status"] != "success"]
+    return {
+        "script": "playwright_runner",
+        "timestamp": datetime.now().isoformat(),
+        "browser_launches": 1,
+        "contexts": max(1, min(contexts, len(urls))),
+        "pages_checked": len(results),
+        "pages_failed": len(failed),
+        "failed": failed,
+        "console_errors": sum(len(r["console_errors"]) for r in results),
+        "unnamed_controls": sum(sum(r["accessibility"]["tree"]["unnamed"].values())
+                                for r in results if "accessibility" in r),
+        "seconds": round(seconds, 2),
+        "pages_per_second": round(len(results) / seconds, 1) if seconds else 0.0,
+        "results": results,
+        "passed": not failed,
+    }
+
+
+def collect_urls(targets: list, paths: list, routes_file: str = None) -> list:
+    """
+    URLs from the positional targets plus routes joined onto the first one.
+    Non-URL targets (the project path the orchestrators pass first) are skipped.
+    """
+    urls = [t for t in targets if t.startswith(("http://", "https://"))]
+    routes = list(paths)
+    if routes_file:
+        with open(routes_file, "r", encoding="utf-8") as f:
+            routes += [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+    if urls and routes:
+        urls += [urljoin(urls[0], route) for route in routes]
+    return list(dict.fromkeys(urls))
+
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print(json.dumps({
@@ -161,13 +376,28 @@ if __name__ == "__main__":
         }, indent=2))
         sys.exit(1)
     
-    url = sys.argv[1]
-    take_screenshot = "--screenshot" in sys.argv
-    check_a11y = "--a11y" in sys.argv
-    
-    if check_a11y:
-        result = run_accessibility_check(url)
+    parser = argparse.ArgumentParser(description="Playwright browser checks for one or many routes")
+    parser.add_argument("targets", nargs="+", help="URL(s) to check")
+    parser.add_argument("--path", action="append", default=[], help="Route joined onto the first URL (repeatable)")
+    parser.add_argument("--routes", help="File with one route or URL per line")
+    parser.add_argument("--contexts", type=int, default=DEFAULT_CONTEXTS, help="Browser contexts checking routes concurrently")
+    parser.add_argument("--storage-state", help="Playwright storage state (cookies/localStorage) for every context")
+    parser.add_argument("--screenshot", action="store_true", help="Save a full-page screenshot")
+    parser.add_argument("--a11y", action="store_true", help="Accessibility check (full tree snapshot in multi-URL mode)")
+    args = parser.parse_args()
+
+    urls = collect_urls(args.targets, args.path, args.routes)
+    if not urls:
+        urls = args.targets[-1:]
+
+    if len(urls) > 1:
+        result = run_pool(urls, args.contexts, args.screenshot, args.a11y, args.storage_state)
+        print(json.dumps(result, indent=2))
+        sys.exit(0 if result.get("passed", False) else 1)
+
+    if args.a11y:
+        result = run_accessibility_check(urls[0])
     else:
-        result = run_basic_test(url, take_screenshot)
+        result = run_basic_test(urls[0], args.screenshot)
     
     print(json.dumps(result, indent=2))